@@ -0,0 +1,413 @@
+"""
+CliMaPan-Lab: Climate-Pandemic Economic Modeling Laboratory
+Objective Emulator
+
+Each calibration or validation objective costs a full simulation (minutes at
+``n_years=30``), while the stored evaluations from earlier searches already
+say a lot about where good parameters are. ``ObjectiveEmulator`` fits a
+surrogate of the objective on those evaluations:
+
+  - ``"gp"``: Gaussian process (Matern 5/2 kernel with one length scale per
+    parameter plus a noise term), the default for a few hundred points;
+  - ``"gbr"``: gradient-boosted quantile regressors (16/50/84 %), for larger
+    or rougher evaluation sets.
+
+Both predict a mean and a standard deviation, so drivers can score thousands
+of random candidates and only simulate those that are promising or uncertain
+(lowest ``mean - kappa * std``, see ``screen``).
+
+Parameters are mapped to the unit cube of ``param_space`` (log scale for
+ranges spanning more than two decades, as in ``sample_param_space``). The
+emulator is persisted as JSON (evaluations plus the fitted kernel
+hyperparameters) and updated with each new simulation; refits warm-start from
+the previous hyperparameters. ``load_evaluations`` reads the calibration trial
+logs (``calibration_results.json``), the re-score snapshot
+(``calibration_eval_ambr047.json``) and ``Validator`` output files.
+"""
+
+import datetime
+import json
+import os
+import re
+import warnings
+
+import numpy as np
+
+EMULATOR_FORMAT = "climapan-objective-emulator"
+EMULATOR_VERSION = 1
+
+# Objectives at or above this value are failed runs (``save_results`` writes 1e10)
+_FAILED_OBJECTIVE = 1e10
+_QUANTILES = (0.16, 0.5, 0.84)
+_VALIDATOR_LINE = re.compile(r"(\d+)\s+\[([^\]]*)\]\s+(\S+)")
+
+
+def _is_log_scaled(low, high):
+    return low > 0 and high / low > 100
+
+
+def _clean_objective(objective):
+    if objective is None:
+        return float("inf")
+    objective = float(objective)
+    if not np.isfinite(objective) or objective >= _FAILED_OBJECTIVE:
+        return float("inf")
+    return objective
+
+
+class ObjectiveEmulator:
+    """Surrogate of an expensive objective over a box-bounded parameter space."""
+
+    def __init__(self, param_space, kind="gp", path=None, seed=0):
+        """
+        Args:
+            param_space: ``{name: (low, high)}`` search space (e.g. ``PARAM_SPACE``)
+            kind: ``"gp"`` (Gaussian process) or ``"gbr"`` (gradient boosting)
+            path: Optional JSON file used by ``save`` (and ``update`` autosave)
+            seed: Random state of the underlying regressors
+        """
+        if kind not in ("gp", "gbr"):
+            raise ValueError(f"Unknown emulator kind: {kind}")
+        self.param_space = {k: tuple(v) for k, v in param_space.items()}
+        self.param_names = list(self.param_space)
+        self.kind = kind
+        self.path = path
+        self.seed = seed
+        self.observations = []  # {"params", "objective", "source"}
+
+        self._kernel_theta = None
+        self._model = None
+        self._fitted_on = 0
+
+    def __len__(self):
+        return len(self.observations)
+
+    # ----------------------------------------
+    # Observations
+    # ----------------------------------------
+
+    def to_unit(self, params):
+        """Map one parameter dict (or a list of them) to unit-cube vectors."""
+        single = isinstance(params, dict)
+        rows = [params] if single else list(params)
+        X = np.empty((len(rows), len(self.param_names)))
+        for j, (name, (low, high)) in enumerate(self.param_space.items()):
+            values = np.array(
+                [row.get(name, (low + high) / 2) for row in rows], dtype=np.float64
+            )
+            if _is_log_scaled(low, high):
+                X[:, j] = (np.log(values) - np.log(low)) / (np.log(high) - np.log(low))
+            else:
+                X[:, j] = (values - low) / (high - low)
+        X = np.clip(X, 0.0, 1.0)
+        return X[0] if single else X
+
+    def add(self, params, objective, source=None):
+        """Record one evaluation without refitting."""
+        self.observations.append(
+            {
+                "params": {
+                    k: float(v) for k, v in params.items() if k in self.param_space
+                },
+                "objective": _clean_objective(objective),
+                "source": source,
+            }
+        )
+
+    def add_evaluations(self, evaluations, source=None):
+        """Record ``(params, objective)`` pairs, e.g. from ``load_evaluations``."""
+        for params, objective in evaluations:
+            self.add(params, objective, source)
+
+    def update(self, params, objective, source=None):
+        """Record one new simulation, refit, and save if the emulator has a path."""
+        self.add(params, objective, source)
+        self.fit()
+        if self.path:
+            self.save()
+
+    def training_data(self):
+        """
+        ``(X, y)`` used for fitting.
+
+        Failed runs are kept at the worst finite objective, so the emulator
+        learns to avoid them without the scale blowing up.
+        """
+        X = self.to_unit([o["params"] for o in self.observations])
+        y = np.array([o["objective"] for o in self.observations], dtype=np.float64)
+        finite = np.isfinite(y)
+        if not finite.any():
+            return X[:0], y[:0]
+        y[~finite] = y[finite].max()
+        return X, y
+
+    # ----------------------------------------
+    # Fitting and prediction
+    # ----------------------------------------
+
+    def fit(self):
+        """(Re)fit the surrogate on all observations; returns self."""
+        X, y = self.training_data()
+        if len(y) < 2:
+            self._model = None
+            self._fitted_on = len(self.observations)
+            return self
+
+        if self.kind == "gp":
+            self._model = self._fit_gp(X, y)
+        else:
+            self._model = self._fit_gbr(X, y)
+        self._fitted_on = len(self.observations)
+        return self
+
+    def _fit_gp(self, X, y):
+        from sklearn.exceptions import ConvergenceWarning
+        from sklearn.gaussian_process import GaussianProcessRegressor
+        from sklearn.gaussian_process.kernels import ConstantKernel, Matern, WhiteKernel
+
+        kernel = ConstantKernel(1.0, (1e-3, 1e3)) * Matern(
+            length_scale=np.full(X.shape[1], 0.5),
+            length_scale_bounds=(1e-2, 1e2),
+            nu=2.5,
+        ) + WhiteKernel(1e-2, (1e-8, 1.0))
+        if self._kernel_theta is not None and len(self._kernel_theta) == len(
+            kernel.theta
+        ):
+            # Warm start from the previous fit instead of restarting
+            kernel = kernel.clone_with_theta(np.asarray(self._kernel_theta))
+
+        model = GaussianProcessRegressor(
+            kernel=kernel,
+            normalize_y=True,
+            n_restarts_optimizer=0 if self._kernel_theta is not None else 2,
+            random_state=self.seed,
+        )
+        with warnings.catch_warnings():
+            # Hyperparameters on their bounds are common with few observations
+            warnings.simplefilter("ignore", ConvergenceWarning)
+            model.fit(X, y)
+        self._kernel_theta = model.kernel_.theta.tolist()
+        return model
+
+    def _fit_gbr(self, X, y):
+        from sklearn.ensemble import GradientBoostingRegressor
+
+        models = []
+        for alpha in _QUANTILES:
+            model = GradientBoostingRegressor(
+                loss="quantile",
+                alpha=alpha,
+                n_estimators=200,
+                max_depth=3,
+                learning_rate=0.05,
+                subsample=0.8,
+                random_state=self.seed,
+            )
+            models.append(model.fit(X, y))
+        return models
+
+    def predict(self, params):
+        """
+        Predicted objective for candidates.
+
+        Args:
+            params: Parameter dict or list of dicts
+
+        Returns:
+            ``(mean, std)`` arrays (one entry per candidate); before two
+            finite observations exist the mean is 0 and the std is infinite
+        """
+        X = self.to_unit(params)
+        X = X.reshape(1, -1) if X.ndim == 1 else X
+        if self._fitted_on != len(self.observations):
+            self.fit()
+        if self._model is None:
+            return np.zeros(len(X)), np.full(len(X), np.inf)
+
+        if self.kind == "gp":
+            mean, std = self._model.predict(X, return_std=True)
+        else:
+            low, mean, high = (model.predict(X) for model in self._model)
+            std = np.maximum((high - low) / 2, 0.0)
+        return mean, std
+
+    def lower_confidence_bound(self, params, kappa=2.0):
+        """``mean - kappa * std``: low for promising or uncertain candidates."""
+        mean, std = self.predict(params)
+        return mean - kappa * std
+
+    def screen(self, candidates, n_select=1, kappa=2.0, pending=(), min_distance=0.05):
+        """
+        Pick the candidates worth simulating.
+
+        Args:
+            candidates: List of parameter dicts (typically thousands of random draws)
+            n_select: Number of candidates to keep
+            kappa: Exploration weight of the confidence bound
+            pending: Parameter dicts already being simulated; candidates closer
+                than ``min_distance`` (unit-cube RMS distance) to them, or to
+                each other, are skipped
+            min_distance: Minimum distance between selected candidates
+
+        Returns:
+            Indices into ``candidates``, most promising first
+        """
+        if not len(candidates):
+            return []
+        if self._fitted_on != len(self.observations):
+            self.fit()
+        if self._model is None:
+            # Nothing learned yet: keep the first draws (they are random)
+            return list(range(min(n_select, len(candidates))))
+
+        scores = self.lower_confidence_bound(candidates, kappa)
+        X = self.to_unit(candidates)
+        taken = [self.to_unit(p) for p in pending]
+        selected = []
+        scale = np.sqrt(X.shape[1])
+        for i in np.argsort(scores):
+            if len(selected) >= n_select:
+                break
+            if taken:
+                distances = np.linalg.norm(np.asarray(taken) - X[i], axis=1) / scale
+                if distances.min() < min_distance:
+                    continue
+            selected.append(int(i))
+            taken.append(X[i])
+        return selected
+
+    # ----------------------------------------
+    # Persistence
+    # ----------------------------------------
+
+    def save(self, path=None):
+        """Write the emulator to JSON (atomically, so readers never see half a file)."""
+        path = path or self.path
+        if not path:
+            raise ValueError("No path given for saving the emulator")
+        state = {
+            "format": EMULATOR_FORMAT,
+            "version": EMULATOR_VERSION,
+            "saved": datetime.datetime.now().isoformat(),
+            "kind": self.kind,
+            "seed": self.seed,
+            "param_space": self.param_space,
+            "kernel_theta": self._kernel_theta,
+            "observations": [
+                dict(
+                    o, objective=o["objective"] if np.isfinite(o["objective"]) else None
+                )
+                for o in self.observations
+            ],
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=1)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Load an emulator written by ``save`` (refit lazily on first use)."""
+        with open(path) as f:
+            state = json.load(f)
+        if state.get("format") != EMULATOR_FORMAT:
+            raise ValueError(f"{path} is not a CliMaPan-Lab objective emulator")
+        if state["version"] > EMULATOR_VERSION:
+            raise ValueError(
+                f"Emulator version {state['version']} is newer than supported "
+                f"version {EMULATOR_VERSION}"
+            )
+        emulator = cls(state["param_space"], state["kind"], path, state["seed"])
+        emulator._kernel_theta = state.get("kernel_theta")
+        for o in state["observations"]:
+            emulator.add(o["params"], o["objective"], o.get("source"))
+        return emulator
+
+    @classmethod
+    def open(cls, path, param_space, kind="gp"):
+        """Load ``path`` if it exists, otherwise start an empty emulator saved there."""
+        if os.path.exists(path):
+            emulator = cls.load(path)
+            if set(emulator.param_names) != set(param_space):
+                raise ValueError(f"{path} was built for a different parameter space")
+            return emulator
+        return cls(param_space, kind=kind, path=path)
+
+
+# =============================================================================
+# Stored evaluations
+# =============================================================================
+
+
+def _report_params(label, param_space):
+    """Parameter vector behind a labelled report of the re-score snapshot."""
+    if label == "optimized_params":
+        from ..optimized_params import optimized_params
+
+        return dict(optimized_params)
+    if label == "baseline_defaults":
+        from ..base_params import economic_params
+
+        return {k: economic_params[k] for k in param_space if k in economic_params}
+    if label == "param_space_midpoint":
+        return {k: (low + high) / 2 for k, (low, high) in param_space.items()}
+    return None
+
+
+def load_evaluations(path, param_names=None, param_space=None):
+    """
+    Read stored ``(params, objective)`` pairs.
+
+    Supported files:
+
+      - calibration trial logs (a JSON list of ``{"params", "objective"}``);
+      - re-score snapshots (a JSON dict with ``reports``; reports without a
+        ``params`` entry are resolved from their label where possible and
+        skipped otherwise, e.g. ``random_0``);
+      - ``Validator`` output (``idx [values] loss`` lines), which needs
+        ``param_names`` in the order of the value arrays.
+
+    Args:
+        path: File to read
+        param_names: Parameter order of ``Validator`` value arrays
+        param_space: Search space used to resolve snapshot labels
+
+    Returns:
+        List of ``(params, objective)`` tuples
+    """
+    with open(path) as f:
+        text = f.read()
+
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = None
+
+    if isinstance(data, list):
+        return [(r["params"], r["objective"]) for r in data if "params" in r]
+
+    if isinstance(data, dict):
+        evaluations = []
+        for report in data.get("reports", []):
+            if not report.get("ok", True):
+                continue
+            params = report.get("params") or _report_params(
+                report.get("label"), param_space or {}
+            )
+            if params is None:
+                print(f"Skipping report {report.get('label')!r}: no parameters")
+                continue
+            evaluations.append((params, report["objective"]))
+        return evaluations
+
+    if param_names is None:
+        raise ValueError(f"{path} looks like Validator output; param_names required")
+    evaluations = []
+    for match in _VALIDATOR_LINE.finditer(text):
+        values = np.array(match.group(2).split(), dtype=np.float64)
+        if len(values) != len(param_names):
+            continue
+        evaluations.append((dict(zip(param_names, values)), float(match.group(3))))
+    return evaluations
@@ -0,0 +1,368 @@
+"""
+CliMaPan-Lab: Climate-Pandemic Economic Modeling Laboratory
+Ensemble Aggregation
+
+Seed batches used to keep the full results frame of every run and
+concatenate them at the end, so memory grew with the number of runs.
+``EnsembleAggregator`` folds each run into per-variable, per-month
+statistics as soon as it finishes and then lets it go:
+
+  - count, mean and variance by Welford's online update (``RunningMoments``);
+  - minimum and maximum;
+  - quantiles by the P² estimator of Jain & Chlamtac (``P2Quantile``), which
+    tracks five markers per quantile instead of storing the observations.
+
+Every statistic is a NumPy vector over the months of a variable, so adding a
+run costs a few array operations per variable. Per-agent records (e.g. the
+wage of every consumer) are reduced to one value per month first, by default
+their sum. The state is bounded by variables x months x quantiles, whatever
+the number of runs. ``summary()`` returns the ensemble table (one row per
+variable and month), and ``keep_runs=True`` additionally keeps every frame
+for callers that still need the raw runs.
+"""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from ..src.sketches import SKETCH_SUFFIX
+
+DEFAULT_QUANTILES = (0.05, 0.5, 0.95)
+
+# Columns that index the rows rather than describe the economy
+INDEX_COLUMNS = ("date", "t")
+
+
+def _grow(array, size, fill):
+    """``array`` extended along its last axis to ``size`` with ``fill``."""
+    missing = size - array.shape[-1]
+    if missing <= 0:
+        return array
+    pad = np.full(array.shape[:-1] + (missing,), fill, dtype=array.dtype)
+    return np.concatenate([array, pad], axis=-1)
+
+
+class RunningMoments:
+    """Element-wise count, mean, variance, min and max of observed vectors."""
+
+    def __init__(self, size=0):
+        self.n = np.zeros(size, dtype=np.int64)
+        self.mean = np.zeros(size)
+        self.min = np.full(size, np.inf)
+        self.max = np.full(size, -np.inf)
+        self._m2 = np.zeros(size)
+
+    def _resize(self, size):
+        self.n = _grow(self.n, size, 0)
+        self.mean = _grow(self.mean, size, 0.0)
+        self.min = _grow(self.min, size, np.inf)
+        self.max = _grow(self.max, size, -np.inf)
+        self._m2 = _grow(self._m2, size, 0.0)
+
+    @classmethod
+    def of(cls, block):
+        """Moments of a block of observations (rows), NaN entries skipped."""
+        block = np.asarray(block, dtype=float)
+        moments = cls(block.shape[1])
+        seen = ~np.isnan(block)
+        n = seen.sum(axis=0)
+        present = n > 0
+        moments.n = n.astype(np.int64)
+        moments.mean[present] = (
+            np.where(seen, block, 0.0).sum(axis=0)[present] / n[present]
+        )
+        moments._m2 = (np.where(seen, block - moments.mean, 0.0) ** 2).sum(axis=0)
+        moments.min = np.where(seen, block, np.inf).min(axis=0, initial=np.inf)
+        moments.max = np.where(seen, block, -np.inf).max(axis=0, initial=-np.inf)
+        return moments
+
+    def merge(self, other):
+        """Fold in the moments of other observations (Chan et al.)."""
+        size = max(len(self.n), len(other.n))
+        self._resize(size)
+        other_n = _grow(other.n, size, 0)
+        other_mean = _grow(other.mean, size, 0.0)
+        n = self.n + other_n
+        delta = other_mean - self.mean
+        with np.errstate(divide="ignore", invalid="ignore"):
+            share = np.where(n > 0, other_n / n, 0.0)
+        self.mean = self.mean + delta * share
+        self._m2 = self._m2 + _grow(other._m2, size, 0.0) + delta**2 * self.n * share
+        self.min = np.minimum(self.min, _grow(other.min, size, np.inf))
+        self.max = np.maximum(self.max, _grow(other.max, size, -np.inf))
+        self.n = n
+        return self
+
+    def add(self, values):
+        """Account one observation per element (NaN entries are skipped)."""
+        values = np.asarray(values, dtype=float)
+        self._resize(len(values))
+        seen = ~np.isnan(values)
+        index = np.flatnonzero(seen)
+        x = values[index]
+
+        self.n[index] += 1
+        delta = x - self.mean[index]
+        self.mean[index] += delta / self.n[index]
+        self._m2[index] += delta * (x - self.mean[index])
+        self.min[index] = np.minimum(self.min[index], x)
+        self.max[index] = np.maximum(self.max[index], x)
+
+    @property
+    def variance(self):
+        """Sample variance (NaN where fewer than two observations)."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.n > 1, self._m2 / (self.n - 1), np.nan)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+
+class P2Quantile:
+    """
+    Element-wise P² estimate of the ``p`` quantile of observed vectors.
+
+    Each element keeps five marker heights and positions. The first five
+    observations are stored and give the exact sample quantile; later ones
+    move the markers, adjusting their heights by piecewise-parabolic
+    interpolation.
+    """
+
+    def __init__(self, p, size=0):
+        if not 0 < p < 1:
+            raise ValueError("p must lie strictly between 0 and 1")
+        self.p = p
+        self.n = np.zeros(size, dtype=np.int64)
+        self.heights = np.zeros((5, size))
+        self.positions = np.tile(np.arange(5.0)[:, None], (1, size))
+        self.desired = np.tile(self._initial_desired()[:, None], (1, size))
+        self.increments = np.array([0.0, p / 2, p, (1 + p) / 2, 1.0])[:, None]
+
+    def _initial_desired(self):
+        p = self.p
+        return np.array([0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0])
+
+    def _resize(self, size):
+        self.n = _grow(self.n, size, 0)
+        self.heights = _grow(self.heights, size, 0.0)
+        new = size - self.positions.shape[1]
+        if new > 0:
+            self.positions = np.concatenate(
+                [self.positions, np.tile(np.arange(5.0)[:, None], (1, new))], axis=1
+            )
+            self.desired = np.concatenate(
+                [self.desired, np.tile(self._initial_desired()[:, None], (1, new))],
+                axis=1,
+            )
+
+    def add(self, values):
+        """Account one observation per element (NaN entries are skipped)."""
+        values = np.asarray(values, dtype=float)
+        self._resize(len(values))
+        seen = ~np.isnan(values)
+        filling = np.flatnonzero(seen & (self.n < 5))
+        index = np.flatnonzero(seen & (self.n >= 5))
+
+        # Warm-up: the first five observations are stored as they come
+        self.heights[self.n[filling], filling] = values[filling]
+        self.n[filling] += 1
+        ready = filling[self.n[filling] == 5]
+        self.heights[:, ready] = np.sort(self.heights[:, ready], axis=0)
+
+        if len(index):
+            self._update(index, values[index])
+
+    def _update(self, index, x):
+        q = self.heights[:, index]
+        pos = self.positions[:, index]
+
+        # Cell of each observation; the extreme markers follow new extremes
+        q[0] = np.minimum(q[0], x)
+        q[4] = np.maximum(q[4], x)
+        cell = np.clip((x[None, :] >= q[1:4]).sum(axis=0), 0, 3)
+        pos += np.arange(5)[:, None] > cell[None, :]
+        desired = self.desired[:, index] + self.increments
+        self.n[index] += 1
+
+        for i in (1, 2, 3):
+            d = desired[i] - pos[i]
+            move = ((d >= 1) & (pos[i + 1] - pos[i] > 1)) | (
+                (d <= -1) & (pos[i - 1] - pos[i] < -1)
+            )
+            if not move.any():
+                continue
+            step = np.sign(d) * move
+            with np.errstate(divide="ignore", invalid="ignore"):
+                parabolic = q[i] + step / (pos[i + 1] - pos[i - 1]) * (
+                    (pos[i] - pos[i - 1] + step)
+                    * (q[i + 1] - q[i])
+                    / (pos[i + 1] - pos[i])
+                    + (pos[i + 1] - pos[i] - step)
+                    * (q[i] - q[i - 1])
+                    / (pos[i] - pos[i - 1])
+                )
+                neighbour = np.where(step > 0, i + 1, i - 1)
+                columns = np.arange(len(index))
+                linear = q[i] + step * (q[neighbour, columns] - q[i]) / (
+                    pos[neighbour, columns] - pos[i]
+                )
+            inside = (q[i - 1] < parabolic) & (parabolic < q[i + 1])
+            q[i] = np.where(move, np.where(inside, parabolic, linear), q[i])
+            pos[i] += step
+
+        self.heights[:, index] = q
+        self.positions[:, index] = pos
+        self.desired[:, index] = desired
+
+    @property
+    def value(self):
+        """Current estimate (exact while fewer than five observations)."""
+        estimate = self.heights[2].copy()
+        for count in range(1, 5):
+            small = self.n == count
+            if small.any():
+                estimate[small] = np.quantile(
+                    self.heights[:count, small], self.p, axis=0
+                )
+        estimate[self.n == 0] = np.nan
+        return estimate
+
+
+def monthly_values(frame, variables=None, reducers=None):
+    """
+    One value per month for each numeric variable of a results frame.
+
+    Args:
+        frame: EconModel results DataFrame (one row per step)
+        variables: Variables to extract (default: every numeric column but
+            the distribution sketches)
+        reducers: ``{variable: function}`` reducing per-agent records to one
+            number (default ``np.sum``)
+
+    Returns:
+        ``{variable: (months,) float array}`` and the month labels (``date``)
+    """
+    reducers = reducers or {}
+    if "date" in frame.columns:
+        rows = np.flatnonzero(frame["date"].notna().to_numpy())
+        dates = frame["date"].to_numpy(dtype=object)[rows]
+    else:
+        rows = np.arange(len(frame))
+        dates = rows
+    names = variables or [
+        c
+        for c in frame.columns
+        if c not in INDEX_COLUMNS and not c.endswith(SKETCH_SUFFIX)
+    ]
+
+    monthly = {}
+    for name in names:
+        if name not in frame.columns:
+            continue
+        reduce = reducers.get(name, np.sum)
+        values = np.full(len(rows), np.nan)
+        try:
+            for k, value in enumerate(frame[name].to_numpy(dtype=object)[rows]):
+                if value is None:
+                    continue
+                if np.ndim(value) == 0:
+                    values[k] = value
+                elif np.size(value):
+                    values[k] = reduce(value)
+        except (TypeError, ValueError):
+            # Labels such as the consumer type have no ensemble statistics
+            continue
+        monthly[name] = values
+    return monthly, dates
+
+
+class EnsembleAggregator:
+    """Per-variable, per-month statistics over runs, updated one run at a time."""
+
+    def __init__(
+        self,
+        variables=None,
+        quantiles=DEFAULT_QUANTILES,
+        reducers=None,
+        keep_runs=False,
+    ):
+        """
+        Args:
+            variables: Variables to aggregate (default: every numeric column)
+            quantiles: Quantiles estimated with P²
+            reducers: ``{variable: function}`` reducing per-agent records to one
+                number per month (default ``np.sum``)
+            keep_runs: Also keep every added frame in ``runs``
+        """
+        self.variables = variables
+        self.quantiles = tuple(quantiles)
+        self.reducers = reducers or {}
+        self.keep_runs = keep_runs
+        self.runs = {}
+        self.n_runs = 0
+        self.dates = np.zeros(0, dtype=object)
+
+        self._moments = {}
+        self._quantiles = {}
+        self._lock = threading.Lock()
+
+    def add(self, frame, run_id=None):
+        """Fold one run's results frame into the statistics."""
+        monthly, dates = monthly_values(frame, self.variables, self.reducers)
+        with self._lock:
+            for name, values in monthly.items():
+                if name not in self._moments:
+                    self._moments[name] = RunningMoments()
+                    self._quantiles[name] = [P2Quantile(p) for p in self.quantiles]
+                self._moments[name].add(values)
+                for estimator in self._quantiles[name]:
+                    estimator.add(values)
+            if len(dates) > len(self.dates):
+                self.dates = np.asarray(dates, dtype=object)
+            if self.keep_runs:
+                self.runs[self.n_runs if run_id is None else run_id] = frame
+            self.n_runs += 1
+
+    def summary(self):
+        """
+        Ensemble table with one row per variable and month.
+
+        Columns: ``variable``, ``month``, ``date``, ``n``, ``mean``, ``std``,
+        ``min``, ``max`` and one ``q<percent>`` column per quantile.
+        """
+        with self._lock:
+            tables = []
+            for name, moments in self._moments.items():
+                months = len(moments.n)
+                table = {
+                    "variable": name,
+                    "month": np.arange(months),
+                    "date": _grow(self.dates, months, None)[:months],
+                    "n": moments.n,
+                    "mean": np.where(moments.n > 0, moments.mean, np.nan),
+                    "std": moments.std,
+                    "min": np.where(moments.n > 0, moments.min, np.nan),
+                    "max": np.where(moments.n > 0, moments.max, np.nan),
+                }
+                for estimator in self._quantiles[name]:
+                    table[f"q{estimator.p * 100:g}"] = estimator.value
+                tables.append(pd.DataFrame(table))
+        if not tables:
+            return pd.DataFrame()
+        return pd.concat(tables, ignore_index=True)
+
+    def save(self, path):
+        """Write ``summary()`` as (gzip-compressed, for ``.gz``) CSV."""
+        tmp_path = f"{path}.tmp"
+        compression = "gzip" if path.endswith(".gz") else None
+        self.summary().to_csv(tmp_path, index=False, compression=compression)
+        os.replace(tmp_path, path)
+
+    def runs_frame(self):
+        """The kept runs concatenated (requires ``keep_runs=True``)."""
+        if not self.keep_runs:
+            raise ValueError("Runs are only kept with keep_runs=True")
+        return pd.concat(self.runs)
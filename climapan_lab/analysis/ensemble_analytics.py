@@ -0,0 +1,385 @@
+"""
+CliMaPan-Lab: Climate-Pandemic Economic Modeling Laboratory
+Out-of-Core Ensemble Analytics
+
+The helpers in ``src/utils.py`` (``calculate_average``,
+``calculate_confidence_interval``, ``group_average``) expect the whole
+ensemble in one DataFrame, which stops working long before a 10,000-run
+sensitivity study. ``ensemble_bands`` computes the same statistics by
+scanning a directory of run stores in chunks:
+
+  - HDF5 batch stores (``results.h5`` of ``SensitivityAnalyzer``, see
+    ``storage.BatchResultStore``) are read block by block of runs
+    (``chunk_runs``), one dataset per requested variable;
+  - run folders with a ``single_run.csv.gz`` (``run_sim``) are read with only
+    the ``date`` column and the requested variables.
+
+Chunks are processed in a process pool (spawned, so scripts need the usual
+``if __name__ == "__main__":`` guard). Each returns mergeable moments
+(``analysis.ensemble.RunningMoments``: count, mean, variance, min, max per
+time step), and quantile bands come from a second pass that fills per-step
+histograms over the observed range (``bins`` bins; the estimate is within one
+bin width of the empirical ``p * n``-th observation). Memory is bounded by ``chunk_runs`` runs per worker plus
+time steps x bins counts, however many runs there are.
+
+Runs can be grouped by a parameter (or any function of the store and the run
+parameters), like ``group_average``. ``EnsembleBand`` holds the result of one
+variable: the mean, confidence interval, quantile bands and HP-filtered trend
+as arrays, and ``plot_inputs`` arranges bands the way ``pline_plot_with_ci``
+takes them.
+"""
+
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+from ..storage.batch_store import BATCH_STORE_FORMAT, BatchResultReader
+from .ensemble import DEFAULT_QUANTILES, RunningMoments
+
+RUN_FRAME_NAME = "single_run.csv.gz"
+DEFAULT_CHUNK_RUNS = 256
+DEFAULT_BINS = 512
+
+
+def find_run_stores(directory):
+    """
+    Run stores below ``directory``, in a stable order.
+
+    Returns:
+        ``(kind, path)`` pairs, ``kind`` being ``"batch"`` for HDF5 batch stores
+        and ``"frame"`` for ``single_run.csv.gz`` run frames
+    """
+    stores = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            if name == RUN_FRAME_NAME:
+                stores.append(("frame", path))
+            elif name.endswith((".h5", ".hdf5")) and _is_batch_store(path):
+                stores.append(("batch", path))
+    return stores
+
+
+def _is_batch_store(path):
+    import h5py
+
+    try:
+        with h5py.File(path, "r") as f:
+            return f.attrs.get("format") == BATCH_STORE_FORMAT
+    except OSError:
+        return False
+
+
+def _tasks(stores, chunk_runs):
+    # One task per block of batch-store runs, one per run frame
+    tasks = []
+    for kind, path in stores:
+        if kind == "batch":
+            with BatchResultReader(path) as reader:
+                n_runs = len(reader.run_seeds)
+            for start in range(0, n_runs, chunk_runs):
+                tasks.append((kind, path, start, min(start + chunk_runs, n_runs)))
+        else:
+            tasks.append((kind, path, 0, 1))
+    return tasks
+
+
+def _group_label(group_by, path, params):
+    if group_by is None:
+        return None
+    if callable(group_by):
+        return group_by(path, params)
+    return params.get(group_by)
+
+
+def _read_batch(path, start, stop, variables, group_by):
+    with BatchResultReader(path) as reader:
+        known = set(reader.variables)
+        blocks = {
+            name: reader.output_rows(name, start, stop)
+            for name in variables
+            if name in known
+        }
+        if group_by is None:
+            return [(None, blocks)]
+
+        # Group label of each run, from its parameter sample
+        position = {idx: k for k, idx in enumerate(reader.sample_idx)}
+        labels = []
+        for idx in reader.run_batch_idx[start:stop]:
+            params = dict(reader.base_params)
+            params.update(zip(reader.param_names, reader.param_values[position[idx]]))
+            labels.append(_group_label(group_by, path, params))
+
+    groups = []
+    for label in dict.fromkeys(labels):
+        rows = np.array([lab == label for lab in labels])
+        groups.append((label, {name: block[rows] for name, block in blocks.items()}))
+    return groups
+
+
+def _read_frame(path, variables, group_by):
+    import pandas as pd
+
+    header = pd.read_csv(path, nrows=0).columns
+    columns = [name for name in variables if name in header]
+    frame = pd.read_csv(path, usecols=["date", *columns])
+    frame = frame[frame["date"].notna()]
+    # Per-agent list columns are stored as text and have no numeric reading
+    blocks = {
+        name: pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype=float)[None]
+        for name in columns
+    }
+
+    params = {}
+    params_path = os.path.join(os.path.dirname(path), "params.txt")
+    if group_by is not None and os.path.exists(params_path):
+        with open(params_path) as f:
+            params = json.load(f)
+    return [(_group_label(group_by, path, params), blocks)]
+
+
+def _read_task(task, variables, group_by):
+    """``[(group label, {variable: (runs, steps) array})]`` of one task."""
+    kind, path, start, stop = task
+    if kind == "batch":
+        return _read_batch(path, start, stop, variables, group_by)
+    return _read_frame(path, variables, group_by)
+
+
+def _moments_task(task, variables, group_by):
+    return [
+        (label, {name: RunningMoments.of(block) for name, block in blocks.items()})
+        for label, blocks in _read_task(task, variables, group_by)
+    ]
+
+
+def _histogram(block, low, high, bins):
+    # Per-step counts of ``block`` over ``bins`` equal bins of [low, high]
+    steps = min(block.shape[1], len(low))
+    block = block[:, :steps]
+    low, high = low[:steps], high[:steps]
+    row, step = np.nonzero(~np.isnan(block))
+    width = high - low
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scaled = (block[row, step] - low[step]) / width[step] * bins
+    index = np.clip(np.nan_to_num(scaled, nan=0.0).astype(np.int64), 0, bins - 1)
+    counts = np.bincount(step * bins + index, minlength=steps * bins)
+    return counts.reshape(steps, bins)
+
+
+def _histogram_task(task, variables, group_by, ranges, bins):
+    counts = []
+    for label, blocks in _read_task(task, variables, group_by):
+        group = {}
+        for name, block in blocks.items():
+            low, high = ranges[label][name]
+            group[name] = _histogram(block, low, high, bins)
+        counts.append((label, group))
+    return counts
+
+
+def _histogram_quantiles(counts, low, high, p):
+    # Linear interpolation inside the bin holding the p-th observation
+    steps, bins = counts.shape
+    n = counts.sum(axis=1)
+    cumulative = np.cumsum(counts, axis=1)
+    target = p * n
+    k = np.minimum((cumulative < target[:, None]).sum(axis=1), bins - 1)
+    before = np.where(k > 0, cumulative[np.arange(steps), k - 1], 0)
+    inside = counts[np.arange(steps), k]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = np.where(inside > 0, (target - before) / inside, 0.0)
+    values = low + (k + fraction) * (high - low) / bins
+    values = np.clip(values, low, high)
+    values[n == 0] = np.nan
+    return values
+
+
+class EnsembleBand:
+    """Ensemble statistics of one variable at each time step."""
+
+    def __init__(self, moments, quantiles=None):
+        """
+        Args:
+            moments: ``RunningMoments`` over the runs
+            quantiles: Optional ``{p: array}`` quantile estimates
+        """
+        self.moments = moments
+        self.quantiles = dict(quantiles or {})
+
+    @property
+    def n(self):
+        """Number of runs observed at each step."""
+        return self.moments.n
+
+    @property
+    def mean(self):
+        return np.where(self.n > 0, self.moments.mean, np.nan)
+
+    @property
+    def std(self):
+        """Standard deviation over runs (population, as ``calculate_confidence_interval``)."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.sqrt(np.where(self.n > 0, self.moments._m2 / self.n, np.nan))
+
+    @property
+    def min(self):
+        return np.where(self.n > 0, self.moments.min, np.nan)
+
+    @property
+    def max(self):
+        return np.where(self.n > 0, self.moments.max, np.nan)
+
+    def ci(self, confidence=0.95):
+        """Normal confidence interval of the mean, as ``(lower, upper)``."""
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            margin = z * self.std / np.sqrt(self.n)
+        return self.mean - margin, self.mean + margin
+
+    def band(self, low=0.05, high=0.95):
+        """Quantile band ``(lower, upper)`` over runs."""
+        missing = {low, high} - set(self.quantiles)
+        if missing:
+            raise KeyError(f"Quantiles {sorted(missing)} were not computed")
+        return self.quantiles[low], self.quantiles[high]
+
+    def trend(self, series=None, hp_lambda=14400):
+        """
+        Hodrick-Prescott trend of ``series`` (default: the mean).
+
+        The filter is linear, so the trend of the mean equals the mean of the
+        per-run trends. Steps without observations are left out and stay NaN.
+        """
+        from statsmodels.tsa.filters.hp_filter import hpfilter
+
+        series = self.mean if series is None else np.asarray(series, dtype=float)
+        trend = np.full(len(series), np.nan)
+        observed = np.isfinite(series)
+        if observed.sum() > 2:
+            trend[observed] = hpfilter(series[observed], lamb=hp_lambda)[1]
+        return trend
+
+
+def ensemble_bands(
+    source,
+    variables,
+    group_by=None,
+    quantiles=DEFAULT_QUANTILES,
+    chunk_runs=DEFAULT_CHUNK_RUNS,
+    max_workers=None,
+    bins=DEFAULT_BINS,
+):
+    """
+    Per-step ensemble statistics over every run in ``source``.
+
+    Args:
+        source: Directory searched with ``find_run_stores``, or a list of
+            ``(kind, path)`` stores
+        variables: Recorded variables to summarize
+        group_by: None, a parameter name (as ``group_average``'s group column)
+            or ``function(store_path, run_params) -> label`` (a module-level
+            function when using a pool)
+        quantiles: Quantiles for the bands (empty: skip the histogram pass)
+        chunk_runs: Runs of a batch store read per task
+        max_workers: Pool processes (None: one per CPU, 0: in this process)
+        bins: Histogram bins per step for the quantiles
+
+    Returns:
+        ``{variable: EnsembleBand}``, or ``{group: {variable: EnsembleBand}}``
+        when grouping
+    """
+    stores = find_run_stores(source) if isinstance(source, str) else list(source)
+    tasks = _tasks(stores, chunk_runs)
+    variables = list(variables)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    pool = None
+    if max_workers > 0 and len(tasks) > 1:
+        # Spawned workers open their own HDF5 handles
+        pool = ProcessPoolExecutor(
+            max_workers=min(max_workers, len(tasks)),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def run(function, *args):
+        if pool is None:
+            return (function(task, *args) for task in tasks)
+        return pool.map(function, tasks, *[[a] * len(tasks) for a in args])
+
+    try:
+        # Pass 1: moments, which also give the range of each step
+        moments = {}
+        for groups in run(_moments_task, variables, group_by):
+            for label, partial in groups:
+                merged = moments.setdefault(label, {})
+                for name, value in partial.items():
+                    if name in merged:
+                        merged[name].merge(value)
+                    else:
+                        merged[name] = value
+
+        # Pass 2: histograms over those ranges for the quantiles
+        estimates = {label: {} for label in moments}
+        if quantiles:
+            ranges = {
+                label: {name: (m.min, m.max) for name, m in group.items()}
+                for label, group in moments.items()
+            }
+            counts = {}
+            for groups in run(_histogram_task, variables, group_by, ranges, bins):
+                for label, partial in groups:
+                    merged = counts.setdefault(label, {})
+                    for name, value in partial.items():
+                        steps = max(len(value), len(merged.get(name, value)))
+                        total = np.zeros((steps, bins), dtype=np.int64)
+                        total[: len(value)] += value
+                        if name in merged:
+                            total[: len(merged[name])] += merged[name]
+                        merged[name] = total
+            for label, group in counts.items():
+                for name, value in group.items():
+                    low, high = ranges[label][name]
+                    estimates[label][name] = {
+                        p: _histogram_quantiles(value, low, high, p) for p in quantiles
+                    }
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    bands = {
+        label: {
+            name: EnsembleBand(value, estimates[label].get(name))
+            for name, value in group.items()
+        }
+        for label, group in moments.items()
+    }
+    if group_by is None:
+        return bands.get(None, {})
+    return bands
+
+
+def plot_inputs(bands, interval="ci", confidence=0.95, low=0.05, high=0.95):
+    """
+    ``(data, ci_data)`` for ``pline_plot_with_ci`` from a list of bands.
+
+    Args:
+        bands: ``EnsembleBand`` objects, one per plotted line
+        interval: ``"ci"`` for confidence intervals of the mean, ``"quantile"``
+            for the ``low``-``high`` quantile band
+        confidence: Confidence level of ``"ci"``
+    """
+    if interval == "ci":
+        ci_data = [band.ci(confidence) for band in bands]
+    elif interval == "quantile":
+        ci_data = [band.band(low, high) for band in bands]
+    else:
+        raise ValueError(f"Unknown interval: {interval}")
+    return [band.mean for band in bands], ci_data
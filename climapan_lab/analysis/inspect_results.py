@@ -1,15 +1,50 @@
 #!/usr/bin/env python3
 """
 Inspect the structure of simulation results.
+
+Accepts either a compact model artifact (``model_run_*.npz`` written by
+``run_sim`` batch runs) or a legacy pickle.
 """
 
 import argparse
+import os
 import pickle
 import sys
 
 
+def inspect_artifact(artifact_path):
+    """Inspect a compact model artifact (``.npz``)."""
+    try:
+        from climapan_lab.storage import load_model_artifact
+    except ImportError:
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+        from climapan_lab.storage import load_model_artifact
+
+    print(f"Loading model artifact from {artifact_path}")
+    artifact = load_model_artifact(artifact_path)
+
+    print("Artifact version:", artifact.version)
+    print("Parameters:", len(artifact.params))
+    print("Model scalars:", artifact.scalars)
+    if artifact.manifest.get("extra"):
+        print("Extra:", artifact.manifest["extra"])
+
+    for group, info in artifact.groups.items():
+        print(f"\n{group}: {info['size']} agent(s), {len(info['columns'])} column(s)")
+        print("  Columns:", info["columns"])
+        if info["ragged"]:
+            print("  History columns:", info["ragged"])
+        if info["skipped"]:
+            print("  Not stored:", info["skipped"])
+
+    return artifact
+
+
 def inspect_results(results_path):
     """Inspect the structure of saved results."""
+    if results_path.endswith(".npz"):
+        return inspect_artifact(results_path)
+
     print(f"Loading results from {results_path}")
 
     with open(results_path, "rb") as f:
@@ -53,7 +88,9 @@ def inspect_results(results_path):
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Inspect simulation results structure")
-    parser.add_argument("results_path", help="Path to the results pickle file")
+    parser.add_argument(
+        "results_path", help="Path to a model artifact (.npz) or results pickle file"
+    )
     args = parser.parse_args()
 
     inspect_results(args.results_path)
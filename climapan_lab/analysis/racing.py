@@ -0,0 +1,209 @@
+"""
+CliMaPan-Lab: Climate-Pandemic Economic Modeling Laboratory
+Seed Racing
+
+A fixed number of replicates per parameter point (``num_seeds=50`` in the
+sensitivity analysis) spends as much on points whose output barely moves
+between seeds as on noisy ones. ``RacingEvaluator`` runs the replicates of one
+point incrementally instead and stops as soon as either:
+
+  - the confidence interval of the running mean is tight enough
+    (``half_width <= max(abs_tol, rel_tol * |mean|)``), or
+  - the point is dominated: its whole interval lies on the wrong side of the
+    interval of the best point raced so far (calibration objectives only).
+
+Each race returns a JSON-compatible record with the seed count, mean, standard
+deviation and interval, and the reason it stopped. Drivers keep these records
+in a JSON-lines file (``storage.append_jsonl``), and ``best_race_record`` picks
+the current best point from it, which lets worker processes share it.
+"""
+
+import math
+
+import numpy as np
+from scipy import stats
+
+
+class ReplicateStats:
+    """Running mean, variance and t-interval of replicate values (Welford)."""
+
+    def __init__(self, confidence=0.95):
+        self.confidence = confidence
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value):
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def std(self):
+        return math.sqrt(self._m2 / (self.n - 1)) if self.n > 1 else float("inf")
+
+    @property
+    def half_width(self):
+        if self.n < 2:
+            return float("inf")
+        t = stats.t.ppf((1 + self.confidence) / 2, self.n - 1)
+        return float(t * self.std / math.sqrt(self.n))
+
+    @property
+    def interval(self):
+        return self.mean - self.half_width, self.mean + self.half_width
+
+
+def summarize_output(values):
+    """Mean of all finite numbers in a recorded output (scalar, series, panel)."""
+    if hasattr(values, "to_numpy"):
+        values = values.to_numpy()
+    flat = []
+    for value in np.ravel(np.asarray(values, dtype=object)):
+        try:
+            flat.append(np.ravel(np.asarray(value, dtype=np.float64)))
+        except (TypeError, ValueError):
+            continue
+    if not flat:
+        return float("nan")
+    flat = np.concatenate(flat)
+    flat = flat[np.isfinite(flat)]
+    return float(flat.mean()) if len(flat) else float("nan")
+
+
+class RacingEvaluator:
+    """Adaptive number of seeds per parameter point."""
+
+    def __init__(
+        self,
+        min_seeds=3,
+        max_seeds=50,
+        rel_tol=0.05,
+        abs_tol=0.0,
+        confidence=0.95,
+        minimize=None,
+    ):
+        """
+        Args:
+            min_seeds: Replicates run before any stopping rule applies
+            max_seeds: Upper bound on replicates per point
+            rel_tol: Target interval half-width relative to ``|mean|``
+            abs_tol: Target absolute interval half-width
+            confidence: Confidence level of the t-interval
+            minimize: ``True``/``False`` to race against the best point so far
+                (lower/higher is better); None disables dominance
+        """
+        if min_seeds < 2:
+            raise ValueError("min_seeds must be at least 2 to estimate an interval")
+        self.min_seeds = min_seeds
+        self.max_seeds = max(max_seeds, min_seeds)
+        self.rel_tol = rel_tol
+        self.abs_tol = abs_tol
+        self.confidence = confidence
+        self.minimize = minimize
+        self.incumbent = None  # Record of the best point raced so far
+
+    def converged(self, replicates):
+        tolerance = max(self.abs_tol, self.rel_tol * abs(replicates.mean))
+        return replicates.half_width <= tolerance
+
+    def dominated(self, replicates, incumbent=None):
+        """Whether the interval lies entirely beyond the incumbent's."""
+        incumbent = incumbent or self.incumbent
+        if self.minimize is None or incumbent is None:
+            return False
+        low, high = replicates.interval
+        if self.minimize:
+            return low > incumbent["upper"]
+        return high < incumbent["lower"]
+
+    def race(self, evaluate, seeds, incumbent=None):
+        """
+        Run replicates of one point until a stopping rule fires.
+
+        Args:
+            evaluate: ``f(seed) -> (value, payload)``; ``value`` is the raced
+                scalar, ``payload`` anything the caller wants back per seed
+            seeds: Seeds to use, in order (at most ``max_seeds`` are used)
+            incumbent: Record of the best point so far (defaults to the best
+                point raced by this evaluator)
+
+        Returns:
+            ``(record, payloads)``; ``record`` holds ``n_seeds``, ``seeds``,
+            ``mean``, ``std``, ``half_width``, ``lower``, ``upper`` and
+            ``stop_reason`` (``converged``, ``dominated``, ``max_seeds``,
+            ``failed`` or ``exhausted``)
+        """
+        replicates = ReplicateStats(self.confidence)
+        used, payloads = [], []
+        stop_reason = "exhausted"
+
+        for seed in list(seeds)[: self.max_seeds]:
+            value, payload = evaluate(seed)
+            used.append(seed)
+            payloads.append(payload)
+            if value is None or not np.isfinite(value):
+                stop_reason = "failed"
+                replicates.add(float("inf"))
+                break
+            replicates.add(float(value))
+
+            if replicates.n < self.min_seeds:
+                continue
+            if self.converged(replicates):
+                stop_reason = "converged"
+                break
+            if self.dominated(replicates, incumbent):
+                stop_reason = "dominated"
+                break
+            if replicates.n >= self.max_seeds:
+                stop_reason = "max_seeds"
+                break
+
+        low, high = replicates.interval
+        record = {
+            "n_seeds": replicates.n,
+            "seeds": [int(s) for s in used],
+            "mean": replicates.mean,
+            "std": replicates.std if replicates.n > 1 else None,
+            "half_width": replicates.half_width if replicates.n > 1 else None,
+            "lower": low if replicates.n > 1 else None,
+            "upper": high if replicates.n > 1 else None,
+            "stop_reason": stop_reason,
+        }
+        if not np.isfinite(record["mean"]):
+            record["mean"] = None
+        self.observe(record)
+        return record, payloads
+
+    def observe(self, record):
+        """Make ``record`` the incumbent if it is a better (finished) point."""
+        if self.minimize is None or not _comparable(record):
+            return
+        if self.incumbent is None or _better(record, self.incumbent, self.minimize):
+            self.incumbent = record
+
+
+def _comparable(record):
+    return record.get("upper") is not None and record["stop_reason"] in (
+        "converged",
+        "max_seeds",
+        "exhausted",
+    )
+
+
+def _better(record, other, minimize):
+    # Compare on the pessimistic bound so a lucky short race does not win
+    if minimize:
+        return record["upper"] < other["upper"]
+    return record["lower"] > other["lower"]
+
+
+def best_race_record(records, minimize=True):
+    """Best finished point of a list of race records (``load_jsonl``), or None."""
+    best = None
+    for record in records:
+        if _comparable(record) and (best is None or _better(record, best, minimize)):
+            best = record
+    return best
@@ -0,0 +1,199 @@
+"""
+CliMaPan-Lab: Climate-Pandemic Economic Modeling Laboratory
+Extendable Parameter Designs
+
+The sensitivity and validation drivers used to build their design with
+``sobol_seq.i4_sobol_generate`` (pure Python) from scratch on every start, so
+growing a 500-point study to 1,000 points meant simulating all 1,000 again.
+``ParameterDesign`` builds designs with ``scipy.stats.qmc`` instead:
+
+  - ``"sobol"``: scrambled Sobol points; an extension continues the same
+    sequence (``fast_forward``), so the first ``n`` points never change;
+  - ``"lhs"``: Latin hypercube; each extension adds an independent LHS block
+    (a union of blocks is not itself a Latin hypercube);
+  - ``"saltelli"``: Saltelli's design for first/total-order Sobol indices,
+    built from a scrambled ``2 * d``-dimensional Sobol sequence of base
+    samples. Each base sample ``j`` owns ``d + 2`` consecutive rows
+    ``A_j, AB_j^(1), ..., AB_j^(d), B_j`` (the SALib layout without second
+    order terms), and extensions add whole base samples.
+
+The design (unit-cube points plus method, seed and bounds) is saved to a
+compressed ``.npz`` file after each extension, so a driver can reopen it,
+extend it to a larger budget and simulate only the rows it has not run yet.
+"""
+
+import json
+import os
+import warnings
+
+import numpy as np
+from scipy.stats import qmc
+
+DESIGN_FORMAT = "climapan-parameter-design"
+DESIGN_VERSION = 1
+METHODS = ("sobol", "lhs", "saltelli")
+
+_MANIFEST_KEY = "__manifest__"
+
+
+def _sobol(d, seed, skip, n):
+    sampler = qmc.Sobol(d, scramble=True, seed=seed)
+    if skip:
+        sampler.fast_forward(skip)
+    with warnings.catch_warnings():
+        # Budgets are rarely powers of two; the prefix is still low-discrepancy
+        warnings.simplefilter("ignore", UserWarning)
+        return sampler.random(n)
+
+
+def saltelli_rows(base, d):
+    """Expand ``(n, 2d)`` base samples into ``n * (d + 2)`` Saltelli rows."""
+    A, B = base[:, :d], base[:, d:]
+    rows = np.empty((len(base), d + 2, d))
+    rows[:, 0] = A
+    for i in range(d):
+        rows[:, i + 1] = A
+        rows[:, i + 1, i] = B[:, i]
+    rows[:, d + 1] = B
+    return rows.reshape(-1, d)
+
+
+class ParameterDesign:
+    """Persistable design over a box of parameters that can be extended."""
+
+    def __init__(self, param_space, method="sobol", seed=0, path=None):
+        """
+        Args:
+            param_space: ``{name: (low, high)}`` ranges
+            method: ``"sobol"``, ``"lhs"`` or ``"saltelli"``
+            seed: Scrambling / sampling seed
+            path: Optional ``.npz`` file written after every extension
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown design method: {method}")
+        self.param_names = list(param_space)
+        self.bounds = np.array([param_space[k] for k in self.param_names], float)
+        self.method = method
+        self.seed = seed
+        self.path = path
+        self.unit = np.zeros((0, len(self.param_names)))
+        self.n_base = 0  # Sobol/Saltelli base samples drawn so far
+        self.n_blocks = 0
+
+    def __len__(self):
+        return len(self.unit)
+
+    @property
+    def n_dims(self):
+        return len(self.param_names)
+
+    @property
+    def points(self):
+        """Design rows scaled to the parameter ranges."""
+        return qmc.scale(self.unit, self.bounds[:, 0], self.bounds[:, 1])
+
+    @property
+    def rows_per_sample(self):
+        """Rows per base sample (``d + 2`` for Saltelli, 1 otherwise)."""
+        return self.n_dims + 2 if self.method == "saltelli" else 1
+
+    def extend(self, n):
+        """
+        Append ``n`` samples (base samples for Saltelli).
+
+        Returns:
+            Indices of the new rows
+        """
+        start = len(self.unit)
+        if n <= 0:
+            return np.arange(start, start)
+
+        d = self.n_dims
+        if self.method == "sobol":
+            new = _sobol(d, self.seed, self.n_base, n)
+        elif self.method == "lhs":
+            rng = np.random.default_rng([self.seed, self.n_blocks])
+            new = qmc.LatinHypercube(d, seed=rng).random(n)
+        else:
+            new = saltelli_rows(_sobol(2 * d, self.seed, self.n_base, n), d)
+
+        self.unit = np.vstack([self.unit, new])
+        self.n_base += n
+        self.n_blocks += 1
+        if self.path:
+            self.save()
+        return np.arange(start, len(self.unit))
+
+    def extend_to(self, budget):
+        """
+        Grow the design to ``budget`` samples (Saltelli: base samples).
+
+        Returns:
+            Indices of the new rows (empty if the design is already that large)
+        """
+        return self.extend(budget - self.n_base)
+
+    def save(self, path=None):
+        path = path or self.path
+        if not path:
+            raise ValueError("No path given for saving the design")
+        manifest = {
+            "format": DESIGN_FORMAT,
+            "version": DESIGN_VERSION,
+            "method": self.method,
+            "seed": self.seed,
+            "param_names": self.param_names,
+            "bounds": self.bounds.tolist(),
+            "n_base": self.n_base,
+            "n_blocks": self.n_blocks,
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        np.savez_compressed(
+            path,
+            unit=self.unit,
+            **{
+                _MANIFEST_KEY: np.frombuffer(
+                    json.dumps(manifest).encode("utf-8"), dtype=np.uint8
+                )
+            },
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as npz:
+            unit = npz["unit"]
+            manifest = json.loads(npz[_MANIFEST_KEY].tobytes().decode("utf-8"))
+        if manifest.get("format") != DESIGN_FORMAT:
+            raise ValueError(f"{path} is not a CliMaPan-Lab parameter design")
+        if manifest["version"] > DESIGN_VERSION:
+            raise ValueError(
+                f"Design version {manifest['version']} is newer than supported "
+                f"version {DESIGN_VERSION}"
+            )
+        param_space = dict(zip(manifest["param_names"], map(tuple, manifest["bounds"])))
+        design = cls(param_space, manifest["method"], manifest["seed"], path)
+        design.unit = unit
+        design.n_base = manifest["n_base"]
+        design.n_blocks = manifest["n_blocks"]
+        return design
+
+    @classmethod
+    def open(cls, path, param_space, method="sobol", seed=0):
+        """Load the design at ``path`` (checking it matches) or start a new one."""
+        if not os.path.exists(path):
+            return cls(param_space, method, seed, path)
+
+        design = cls.load(path)
+        expected = cls(param_space, method, seed)
+        if (
+            design.method != method
+            or design.seed != seed
+            or design.param_names != expected.param_names
+            or not np.allclose(design.bounds, expected.bounds)
+        ):
+            raise ValueError(
+                f"{path} holds a different design ({design.method}, seed "
+                f"{design.seed}, parameters {design.param_names})"
+            )
+        return design
@@ -4,11 +4,24 @@ import json
 import multiprocessing
 import os
 import shutil
+import threading
+import time
 from multiprocessing import Pool
 
 import numpy as np
-import sobol_seq
+from analysis.racing import RacingEvaluator, summarize_output
+from analysis.sampling import ParameterDesign
+from analysis.sobol_indices import StreamingSobolIndices
 from src.models import EconModel
+from storage import (
+    DEFAULT_CATALOG_PATH,
+    BatchResultReader,
+    BatchResultStore,
+    RunCatalog,
+    append_jsonl,
+    load_jsonl,
+)
+from storage.evaluations import DEFAULT_EVALUATION_PATH, open_evaluation_store
 from tqdm import tqdm
 
 
@@ -73,7 +86,23 @@ class SensitivityAnalyzer:
         budget=500,
         varlist_path="varlist.txt",
         num_seeds=50,
+        output_format="hdf5",
+        catalog_path=DEFAULT_CATALOG_PATH,
+        racing_var=None,
+        min_seeds=5,
+        rel_tol=0.05,
+        sampler="sobol",
+        sample_seed=0,
+        sobol_var=None,
+        sobol_ci_width=0.1,
+        evaluation_path=DEFAULT_EVALUATION_PATH,
     ):
+        if output_format not in ("hdf5", "json"):
+            raise ValueError(f"Unknown output format: {output_format}")
+        self.output_format = output_format
+        self.catalog_path = catalog_path
+        # Shared evaluation store: runs already simulated by any study are reused
+        self.evaluations = open_evaluation_store(evaluation_path)
         self.save_path = os.path.abspath(save_path)  # Use absolute paths
         self.budget = budget
         self.num_workers = (
@@ -86,22 +115,49 @@ class SensitivityAnalyzer:
         self.base_params = self._load_base_params()
         self.sensitivity_params = self._load_sensitivity_params()
         self.num_seeds = num_seeds
-
-        # Fix the upper bound to avoid int32 overflow
-        self.seeds = np.random.randint(0, 2**31 - 1, size=self.num_seeds)
+        self.sampler = sampler
+        self.sample_seed = sample_seed
+
+        # Seed racing: stop a sample once the mean of ``racing_var`` is precise
+        self.racing_var = racing_var
+        self.racing = None
+        if racing_var is not None:
+            if racing_var not in self.varlist:
+                raise ValueError(f"{racing_var} is not in {self.varlist_path}")
+            self.racing = RacingEvaluator(
+                min_seeds=min_seeds, max_seeds=num_seeds, rel_tol=rel_tol
+            )
+
+        # Streaming Sobol indices: stop launching samples once every index of
+        # ``sobol_var`` is estimated to within ``sobol_ci_width``
+        self.sobol_var = sobol_var
+        self.sobol_ci_width = sobol_ci_width
+        self.sobol_estimate = None
+        if sobol_var is not None:
+            if sampler != "saltelli":
+                raise ValueError("Streaming Sobol indices need sampler='saltelli'")
+            if sobol_var not in self.varlist:
+                raise ValueError(f"{sobol_var} is not in {self.varlist_path}")
+
+        # Fix the upper bound to avoid int32 overflow; seeded so a resumed or
+        # extended study runs new samples with the same seeds
+        self.seeds = np.random.default_rng(sample_seed).integers(
+            0, 2**31 - 1, size=self.num_seeds
+        )
 
         self.params_keys = list(self.sensitivity_params.keys())
         self.exploration_range = np.array(
             [self.sensitivity_params[k] for k in self.params_keys]
         )
         self.n_dims = self.exploration_range.shape[0]
-        self._prep_params_variations()
 
         self.experiment_folder = self._create_experiment_folder()
+        self._prep_params_variations()
 
     def _generate_filename(self):
+        # The budget is not part of the name: a larger budget extends the study
         param_string = "_".join([f"{key}" for key in self.params_keys])
-        return f"sensitivity_analysis_{param_string}_b{self.budget}_s{self.num_seeds}"
+        return f"sensitivity_analysis_{param_string}_{self.sampler}_s{self.num_seeds}"
 
     def _create_experiment_folder(self):
         experiment_name = self._generate_filename()
@@ -122,17 +178,86 @@ class SensitivityAnalyzer:
         return module.params
 
     def _prep_params_variations(self):
-        self.input_batch = self._get_sobol_samples(
-            self.n_dims, self.budget, self.exploration_range
+        self.design = ParameterDesign.open(
+            os.path.join(self.experiment_folder, "design.npz"),
+            dict(zip(self.params_keys, map(tuple, self.exploration_range))),
+            method=self.sampler,
+            seed=self.sample_seed,
         )
-
-    def _get_sobol_samples(self, n_dims, samples, parameter_support):
-        support_range = parameter_support[:, 1] - parameter_support[:, 0]
-        random_samples = sobol_seq.i4_sobol_generate(n_dims, samples)
-        sobol_samples = (
-            np.multiply(random_samples, support_range) + parameter_support[:, 0]
-        )
-        return sobol_samples
+        self.design.extend_to(self.budget)
+        self.input_batch = self.design.points
+
+        done = self._completed_samples()
+        self.pending = [i for i in range(len(self.input_batch)) if i not in done]
+
+    def _completed_samples(self):
+        """Design rows already simulated by an earlier run of this study."""
+        if self.output_format == "json":
+            return {
+                int(name.split("_")[1])
+                for name in os.listdir(self.experiment_folder)
+                if name.startswith("batch_")
+            }
+        if not os.path.exists(self.results_file):
+            return set()
+        with BatchResultReader(self.results_file) as reader:
+            return set(reader.sample_idx.tolist())
+
+    def _sample_output(self, results):
+        """Seed-averaged scalar of ``sobol_var`` for one design row."""
+        values = [summarize_output(r.get(self.sobol_var, np.nan)) for r in results]
+        values = [v for v in values if np.isfinite(v)]
+        return float(np.mean(values)) if values else float("nan")
+
+    @property
+    def sobol_file(self):
+        return os.path.join(self.experiment_folder, "sobol_history.json")
+
+    def _sobol_estimator(self):
+        """Streaming estimator seeded with the rows of earlier runs."""
+        estimator = StreamingSobolIndices(self.design, ci_width=self.sobol_ci_width)
+        if self.output_format == "json":
+            for name in sorted(os.listdir(self.experiment_folder)):
+                if not name.startswith("batch_"):
+                    continue
+                results = []
+                batch_dir = os.path.join(self.experiment_folder, name)
+                for filename in os.listdir(batch_dir):
+                    with open(os.path.join(batch_dir, filename)) as f:
+                        results.append(json.load(f))
+                estimator.add(int(name.split("_")[1]), self._sample_output(results))
+        elif os.path.exists(self.results_file):
+            with BatchResultReader(self.results_file) as reader:
+                if self.sobol_var in reader.variables:
+                    values, batch_idx, _ = reader.outputs(self.sobol_var)
+                    for idx in np.unique(batch_idx):
+                        rows = values[batch_idx == idx]
+                        estimator.add(
+                            int(idx),
+                            self._sample_output([{self.sobol_var: v} for v in rows]),
+                        )
+        return estimator
+
+    def _stream_samples(self, estimator, stop):
+        """
+        Pending samples for ``imap_unordered``, with bounded look-ahead.
+
+        The pool's task thread pulls from this generator eagerly, so each
+        sample waits for a slot (released as results come back) and the
+        generator ends once the indices have converged.
+        """
+        slots = threading.Semaphore(2 * self.num_workers)
+
+        def samples():
+            for i in self.pending:
+                while not slots.acquire(timeout=0.5):
+                    if stop.is_set():
+                        return
+                if stop.is_set() or estimator.converged:
+                    return
+                yield i, self.input_batch[i]
+
+        return samples(), slots
 
     def _run_sim(self, params_combination, seed):
         # Start with base parameters
@@ -155,41 +280,168 @@ class SensitivityAnalyzer:
                     parameters["subsistenceLevelOfConsumption"] = params_combination[i]
                 parameters[key] = params_combination[i]
 
-        # Set the random seed
-        np.random.seed(seed)
-
-        model = EconModel(parameters)
-        parameters["seed"] = seed
-        results = model.run()
-
-        output = {}
-        for var in self.varlist:
-            if var in results.variables.EconModel:
-                output[var] = results.variables.EconModel[var]
+        found = None
+        if self.evaluations is not None:
+            found = self.evaluations.get(parameters, seed=seed, variables=self.varlist)
+        if found is not None:
+            parameters["seed"] = seed
+            output = found["series"]
+            wall_time = found["wall_time"]
+        else:
+            # Set the random seed
+            np.random.seed(seed)
+
+            start = time.perf_counter()
+            model = EconModel(parameters)
+            parameters["seed"] = seed
+            results = model.run()
+            wall_time = time.perf_counter() - start
+
+            # Monthly rows of the recorded variables
+            frame = results["model"]
+            monthly = frame.filter(frame["date"].is_not_null())
+            output = {
+                var: monthly[var].to_list()
+                for var in self.varlist
+                if var in monthly.columns
+            }
+            if self.evaluations is not None:
+                self.evaluations.put(
+                    parameters,
+                    {var: output.get(var) for var in self.varlist},
+                    seed=seed,
+                    driver="sensitivity",
+                    wall_time=wall_time,
+                )
 
         # Combine input parameters, seed, and output
-        return {**parameters, "seed": seed, **output}
+        return {**parameters, "seed": seed, "wall_time": wall_time, **output}
 
     def _process_sample(self, args):
         batch_idx, params_combination = args
+        if self.racing is not None:
+            return self._race_sample(batch_idx, params_combination)
+
         results = []
         for seed in self.seeds:
             result = self._run_sim(params_combination, seed)
             result["batch_idx"] = batch_idx
             results.append(result)
-        return results
+        return results, None
+
+    def _race_sample(self, batch_idx, params_combination):
+        def evaluate(seed):
+            result = self._run_sim(params_combination, seed)
+            result["batch_idx"] = batch_idx
+            return summarize_output(result.get(self.racing_var, np.nan)), result
+
+        record, results = self.racing.race(evaluate, self.seeds)
+        return results, dict(record, batch_idx=batch_idx, variable=self.racing_var)
+
+    @property
+    def racing_file(self):
+        return os.path.join(self.experiment_folder, "racing.jsonl")
+
+    def _record_race(self, race):
+        if race is not None:
+            append_jsonl(self.racing_file, race)
 
     def _process_batch(self):
-        total_simulations = self.budget * self.num_seeds
+        total_simulations = len(self.pending) * self.num_seeds
+        estimator = slots = None
+        stop = threading.Event()
+        if self.sobol_var is not None:
+            estimator = self._sobol_estimator()
+            samples, slots = self._stream_samples(estimator, stop)
+        else:
+            samples = ((i, self.input_batch[i]) for i in self.pending)
+
+        def collected(results, race):
+            self._record_race(race)
+            if estimator is not None:
+                entry = estimator.add(
+                    results[0]["batch_idx"], self._sample_output(results)
+                )
+                if entry is not None:
+                    estimator.save_history(self.sobol_file)
+                slots.release()
+
+        try:
+            self._run_pool(samples, total_simulations, collected)
+        finally:
+            stop.set()
+        if estimator is not None:
+            self.sobol_estimate = estimator.latest
+            estimator.save_history(self.sobol_file)
+
+    def _run_pool(self, samples, total_simulations, collected):
         with tqdm(
             total=total_simulations, desc="Processing samples", unit="simulation"
         ) as pbar:
+            catalog = RunCatalog(self.catalog_path) if self.catalog_path else None
             with Pool(processes=self.num_workers) as pool:
-                for results in pool.imap_unordered(
-                    self._process_sample, enumerate(self.input_batch)
-                ):
-                    self._save_results(results)
-                    pbar.update(len(results))
+                if self.output_format == "json":
+                    for results, race in pool.imap_unordered(
+                        self._process_sample, samples
+                    ):
+                        self._save_results(results)
+                        self._register_results(catalog, results)
+                        collected(results, race)
+                        pbar.update(len(results))
+                else:
+                    # Only this (parent) process writes; workers just return results
+                    with BatchResultStore(
+                        self.results_file,
+                        self.params_keys,
+                        base_params=self.base_params,
+                    ) as store:
+                        for results, race in pool.imap_unordered(
+                            self._process_sample, samples
+                        ):
+                            self._store_results(store, results)
+                            self._register_results(catalog, results)
+                            collected(results, race)
+                            pbar.update(len(results))
+            if catalog is not None:
+                catalog.close()
+
+    def _register_results(self, catalog, results):
+        if catalog is None:
+            return
+        for result in results:
+            if self.output_format == "json":
+                output_path = os.path.join(
+                    self.experiment_folder, f"batch_{result['batch_idx']:04d}"
+                )
+            else:
+                output_path = self.results_file
+            catalog.register(
+                {
+                    k: v
+                    for k, v in result.items()
+                    if k not in self.varlist and k not in ("batch_idx", "wall_time")
+                },
+                output_path=output_path,
+                driver="sensitivity",
+                wall_time=result["wall_time"],
+                variables=result,
+                varying_params={
+                    key: result[key] for key in self.params_keys if key in result
+                },
+            )
+
+    @property
+    def results_file(self):
+        return os.path.join(self.experiment_folder, "results.h5")
+
+    def _store_results(self, store, results):
+        batch_idx = results[0]["batch_idx"]
+        store.append_sample(
+            batch_idx,
+            self.input_batch[batch_idx],
+            [result["seed"] for result in results],
+            [{var: r[var] for var in self.varlist if var in r} for r in results],
+        )
 
     def _save_results(self, results):
         for result in results:
@@ -215,14 +467,48 @@ class SensitivityAnalyzer:
         )
         print(f"Results zipped to {zip_filename}")
 
+    def _report_racing(self):
+        races = load_jsonl(self.racing_file)
+        if not races:
+            return
+        seeds = sum(r["n_seeds"] for r in races)
+        print(
+            f"Seed racing on {self.racing_var}: {seeds} simulations instead of "
+            f"{len(races) * self.num_seeds} "
+            f"(mean {seeds / len(races):.1f} seeds per sample)"
+        )
+
+    def _report_sobol(self):
+        entry = self.sobol_estimate
+        if entry is None or entry["S1"] is None:
+            print("Not enough complete samples to estimate Sobol indices")
+            return
+        status = "converged" if entry["converged"] else "not converged"
+        print(
+            f"Sobol indices of {self.sobol_var} from {entry['n_base']} base "
+            f"samples ({status}, widest interval {entry['max_width']}):"
+        )
+        for i, key in enumerate(self.params_keys):
+            print(
+                f"  {key}: S1 = {entry['S1'][i]:.3f} +/- {entry['S1_conf'][i]:.3f}, "
+                f"ST = {entry['ST'][i]:.3f} +/- {entry['ST_conf'][i]:.3f}"
+            )
+
     def analyze(self):
         print(
-            f"Starting sensitivity analysis with {self.budget} parameter combinations and {self.num_seeds} seeds each..."
+            f"Starting sensitivity analysis with {len(self.input_batch)} parameter "
+            f"combinations ({self.sampler}, {len(self.pending)} not yet simulated) "
+            f"and {self.num_seeds} seeds each..."
         )
         print(f"Results will be saved in {self.experiment_folder}")
         self._process_batch()
         print(f"Processing complete. Results saved in {self.experiment_folder}")
-        self._zip_results()
+        if self.racing is not None:
+            self._report_racing()
+        if self.sobol_var is not None:
+            self._report_sobol()
+        if self.output_format == "json":
+            self._zip_results()
 
 
 if __name__ == "__main__":
@@ -268,6 +554,73 @@ if __name__ == "__main__":
         default=50,
         help="number of random seeds to use for each parameter combination",
     )
+    parser.add_argument(
+        "-f",
+        "--output_format",
+        choices=["hdf5", "json"],
+        default="hdf5",
+        help="hdf5: one compressed results.h5 store; json: one file per seed, zipped",
+    )
+    parser.add_argument(
+        "--catalog",
+        type=str,
+        default=DEFAULT_CATALOG_PATH,
+        help="SQLite run catalog to register runs in (empty string to disable)",
+    )
+    parser.add_argument(
+        "-r",
+        "--racing_var",
+        type=str,
+        default=None,
+        help="race seeds on the mean of this variable (default: run all seeds)",
+    )
+    parser.add_argument(
+        "--min_seeds",
+        type=int,
+        default=5,
+        help="seeds run before a race may stop",
+    )
+    parser.add_argument(
+        "--rel_tol",
+        type=float,
+        default=0.05,
+        help="stop racing once the 95%% interval half-width is below this "
+        "fraction of the mean",
+    )
+    parser.add_argument(
+        "--sampler",
+        choices=["sobol", "lhs", "saltelli"],
+        default="sobol",
+        help="design: scrambled Sobol, Latin hypercube, or Saltelli (budget = "
+        "base samples, each expanded to n_params + 2 rows)",
+    )
+    parser.add_argument(
+        "--sample_seed",
+        type=int,
+        default=0,
+        help="seed of the design and of the simulation seeds",
+    )
+    parser.add_argument(
+        "--sobol_var",
+        type=str,
+        default=None,
+        help="estimate Sobol indices of this variable while running and stop "
+        "once they have converged (needs --sampler saltelli)",
+    )
+    parser.add_argument(
+        "--sobol_ci_width",
+        type=float,
+        default=0.1,
+        help="stop once every Sobol index's confidence interval is narrower "
+        "than this",
+    )
+    parser.add_argument(
+        "--eval_store",
+        type=str,
+        default=DEFAULT_EVALUATION_PATH,
+        help="shared evaluation database; identical runs are reused "
+        "(empty string to disable)",
+    )
     args = parser.parse_args()
 
     analyzer = SensitivityAnalyzer(
@@ -278,6 +631,16 @@ if __name__ == "__main__":
         num_workers=args.num_workers,
         varlist_path=args.varlist,
         num_seeds=args.num_seeds,
+        output_format=args.output_format,
+        catalog_path=args.catalog,
+        racing_var=args.racing_var,
+        min_seeds=args.min_seeds,
+        rel_tol=args.rel_tol,
+        sampler=args.sampler,
+        sample_seed=args.sample_seed,
+        sobol_var=args.sobol_var,
+        sobol_ci_width=args.sobol_ci_width,
+        evaluation_path=args.eval_store,
     )
     analyzer.analyze()
 
@@ -0,0 +1,164 @@
+"""
+CliMaPan-Lab: Climate-Pandemic Economic Modeling Laboratory
+Streaming Sobol Indices
+
+``StreamingSobolIndices`` estimates first-order (``S1``) and total (``ST``)
+Sobol indices of one scalar output while a Saltelli design (see
+``analysis.sampling``) is still being simulated. Results can arrive in any
+order; a base sample enters the estimate once all of its ``d + 2`` rows are
+in (base samples with a failed row are left out). Every time the set of
+complete base samples grows, the indices are re-estimated with SALib, with
+bootstrap confidence intervals, and the estimate is appended to a history.
+
+The study has converged once every index's interval (twice SALib's
+``*_conf`` half-width) is narrower than ``ci_width``, after at least
+``min_base_samples`` base samples. The sensitivity analyzer stops launching
+new samples at that point.
+"""
+
+import datetime
+import json
+import os
+import warnings
+
+import numpy as np
+
+
+class StreamingSobolIndices:
+    """Online first-order and total Sobol indices over a Saltelli design."""
+
+    def __init__(
+        self,
+        design,
+        ci_width=0.1,
+        min_base_samples=16,
+        num_resamples=100,
+        conf_level=0.95,
+        seed=0,
+    ):
+        """
+        Args:
+            design: ``ParameterDesign`` with ``method="saltelli"``
+            ci_width: Target width of every index's confidence interval
+            min_base_samples: Base samples required before convergence counts
+            num_resamples: Bootstrap resamples per estimate
+            conf_level: Confidence level of the intervals
+            seed: Bootstrap seed
+        """
+        if design.method != "saltelli":
+            raise ValueError("Streaming Sobol indices need a Saltelli design")
+        self.design = design
+        self.ci_width = ci_width
+        self.min_base_samples = min_base_samples
+        self.num_resamples = num_resamples
+        self.conf_level = conf_level
+        self.seed = seed
+
+        self.values = np.full(len(design), np.nan)
+        self.received = np.zeros(len(design), dtype=bool)
+        self.history = []
+        self._n_complete = 0
+
+    @property
+    def problem(self):
+        return {
+            "num_vars": self.design.n_dims,
+            "names": list(self.design.param_names),
+            "bounds": self.design.bounds.tolist(),
+        }
+
+    def _grow(self):
+        # The design may have been extended after this estimator was created
+        missing = len(self.design) - len(self.values)
+        if missing > 0:
+            self.values = np.concatenate([self.values, np.full(missing, np.nan)])
+            self.received = np.concatenate([self.received, np.zeros(missing, bool)])
+
+    def complete_samples(self):
+        """Indices of base samples whose rows are all in and finite."""
+        self._grow()
+        k = self.design.rows_per_sample
+        n = len(self.values) // k
+        received = self.received[: n * k].reshape(n, k).all(axis=1)
+        finite = np.isfinite(self.values[: n * k]).reshape(n, k).all(axis=1)
+        return np.flatnonzero(received & finite)
+
+    def add(self, row, value):
+        """
+        Record the output of one design row.
+
+        Returns:
+            The new estimate if a base sample was completed, else None
+        """
+        self._grow()
+        self.values[row] = value
+        self.received[row] = True
+        complete = self.complete_samples()
+        if len(complete) == self._n_complete:
+            return None
+        self._n_complete = len(complete)
+        return self.estimate(complete)
+
+    def estimate(self, complete=None):
+        """Estimate the indices from the complete base samples and log it."""
+        from SALib.analyze import sobol
+
+        complete = self.complete_samples() if complete is None else complete
+        entry = {
+            "time": datetime.datetime.now().isoformat(),
+            "n_base": int(len(complete)),
+            "n_rows": int(self.received.sum()),
+            "S1": None,
+            "S1_conf": None,
+            "ST": None,
+            "ST_conf": None,
+            "max_width": None,
+            "converged": False,
+        }
+        if len(complete) >= 2:
+            k = self.design.rows_per_sample
+            Y = self.values[: len(self.values) // k * k].reshape(-1, k)[complete]
+            with warnings.catch_warnings(), np.errstate(all="ignore"):
+                warnings.simplefilter("ignore", RuntimeWarning)
+                indices = sobol.analyze(
+                    self.problem,
+                    Y.ravel(),
+                    calc_second_order=False,
+                    num_resamples=self.num_resamples,
+                    conf_level=self.conf_level,
+                    seed=self.seed,
+                )
+            for key in ("S1", "S1_conf", "ST", "ST_conf"):
+                entry[key] = [float(v) for v in indices[key]]
+            widths = 2 * np.concatenate([indices["S1_conf"], indices["ST_conf"]])
+            if np.all(np.isfinite(widths)):
+                entry["max_width"] = float(widths.max())
+                entry["converged"] = bool(
+                    len(complete) >= self.min_base_samples
+                    and entry["max_width"] <= self.ci_width
+                )
+        self.history.append(entry)
+        return entry
+
+    @property
+    def converged(self):
+        return bool(self.history) and self.history[-1]["converged"]
+
+    @property
+    def latest(self):
+        return self.history[-1] if self.history else None
+
+    def save_history(self, path):
+        """Write the parameter names, settings and estimate history to JSON."""
+        state = {
+            "param_names": list(self.design.param_names),
+            "ci_width": self.ci_width,
+            "conf_level": self.conf_level,
+            "min_base_samples": self.min_base_samples,
+            "converged": self.converged,
+            "history": self.history,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=1)
+        os.replace(tmp_path, path)
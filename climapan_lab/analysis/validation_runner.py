@@ -0,0 +1,200 @@
+"""
+CliMaPan-Lab: Climate-Pandemic Economic Modeling Laboratory
+Validation Runner
+
+``Validator`` used to write each sample into the module-level ``parameters``
+dict of ``src/params.py`` (shared by every sample a worker runs) and always
+simulated the full horizon, even when the economy had long since blown up.
+``ValidationRunner`` runs one sample on a private copy of the base parameters
+and advances the model a year at a time (``model.run(steps=...)`` runs up to
+an absolute step). At every boundary it checks the months recorded since the
+last one and aborts the run when:
+
+  - it has diverged: non-finite GDP or loans, or no consumers left; or
+  - it can no longer beat the incumbent: the loss of the series so far
+    exceeds ``margin`` times the best loss found yet (after ``min_steps``).
+    As with ABC early rejection this treats the partial loss as a predictor of
+    the final one, so ``margin`` trades savings against false rejections.
+
+Each run returns a JSON-compatible record of how far it got, which the caller
+appends to an abort log (``storage.append_jsonl``). Runs that reach the
+horizon are registered in a ``RunCatalog`` when one is given; aborted runs are
+not, as their summary statistics would only cover part of the horizon.
+"""
+
+import time
+
+import numpy as np
+
+# Agent counts are sampled as floats but must reach the model as integers
+INTEGER_PARAMS = (
+    "c_agents",
+    "capitalists",
+    "green_energy_owners",
+    "brown_energy_owners",
+    "b_agents",
+    "csf_agents",
+    "cpf_agents",
+)
+DIVERGENCE_COLUMNS = ("GDP", "Loans", "People")
+
+
+def sample_parameters(base_params, overrides, seed=None):
+    """Private copy of ``base_params`` with one sample's values applied."""
+    params = dict(base_params)
+    for key, value in overrides.items():
+        if key in INTEGER_PARAMS:
+            params[key] = int(value)
+        else:
+            if key == "unemploymentDole":
+                params["subsistenceLevelOfConsumption"] = value
+            params[key] = value
+    if seed is not None:
+        params["seed"] = int(seed)
+    return params
+
+
+def _float_values(column):
+    values = column.to_numpy()
+    if values.dtype == object:
+        # Per-agent records (e.g. bank loans) hold one array per month
+        parts = [np.ravel(np.asarray(v, dtype=float)) for v in values if v is not None]
+        return np.concatenate(parts) if parts else np.zeros(0)
+    return values.astype(float)
+
+
+def divergence_reason(monthly, columns=DIVERGENCE_COLUMNS):
+    """Why the recorded months show a blown-up economy, or None."""
+    for name in columns:
+        if name not in monthly.columns or not len(monthly):
+            continue
+        values = _float_values(monthly[name])
+        if not np.all(np.isfinite(values)):
+            return f"non-finite {name}"
+        if name == "People" and values[-1] <= 0:
+            return "no consumers left"
+    return None
+
+
+class ValidationRunner:
+    """Year-by-year simulation of one validation sample with early abort."""
+
+    def __init__(
+        self,
+        base_params,
+        loss_fn=None,
+        model_cls=None,
+        check_every=365,
+        min_steps=0,
+        margin=1.0,
+        catalog=None,
+        output_path=None,
+    ):
+        """
+        Args:
+            base_params: Parameters shared by all samples (never modified)
+            loss_fn: ``f(monthly_frame) -> loss`` used against the incumbent;
+                None disables incumbent aborts
+            model_cls: Model class (defaults to ``EconModel``)
+            check_every: Steps between checks (one year of daily steps)
+            min_steps: Steps simulated before incumbent aborts apply
+            margin: Abort once the partial loss exceeds ``margin * incumbent``
+            catalog: Optional ``RunCatalog`` completed runs are registered in
+            output_path: Output file recorded with the catalog entries
+        """
+        if model_cls is None:
+            from ..src.models import EconModel
+
+            model_cls = EconModel
+        self.base_params = base_params
+        self.loss_fn = loss_fn
+        self.model_cls = model_cls
+        self.check_every = check_every
+        self.min_steps = min_steps
+        self.margin = margin
+        self.catalog = catalog
+        self.output_path = output_path
+
+    def run(self, overrides, seed=None, incumbent=None):
+        """
+        Simulate one sample until the horizon or an abort.
+
+        Args:
+            overrides: ``{name: value}`` of the sampled parameters
+            seed: Optional seed stored in the private parameters
+            incumbent: Best loss so far (None or inf disables the check)
+
+        Returns:
+            ``(monthly, record)``: the monthly rows (polars frame) and a record
+            with ``status`` (``completed``, ``diverged`` or ``beaten``),
+            ``reason``, ``steps_run``, ``steps`` and ``partial_loss``
+        """
+        params = sample_parameters(self.base_params, overrides, seed)
+        steps = int(params["steps"])
+        start = time.perf_counter()
+        model = self.model_cls(params)
+
+        record = {
+            "status": "completed",
+            "reason": None,
+            "steps_run": 0,
+            "steps": steps,
+            "partial_loss": None,
+        }
+        monthly, n_checked = None, 0
+        while record["steps_run"] < steps:
+            record["steps_run"] = min(record["steps_run"] + self.check_every, steps)
+            results = model.run(steps=record["steps_run"])
+            frame = results["model"]
+            if "date" in frame.columns:
+                frame = frame.filter(frame["date"].is_not_null())
+            monthly = frame
+
+            # Only the months recorded since the last check need scanning
+            reason = divergence_reason(monthly[n_checked:])
+            n_checked = len(monthly)
+            if reason is not None:
+                record.update(status="diverged", reason=reason)
+                break
+
+            if (
+                record["steps_run"] < steps
+                and self.loss_fn is not None
+                and incumbent is not None
+                and np.isfinite(incumbent)
+                and record["steps_run"] >= self.min_steps
+            ):
+                partial = float(self.loss_fn(monthly))
+                record["partial_loss"] = partial if np.isfinite(partial) else None
+                # Too short a series for the loss (inf) is not evidence either way
+                if np.isfinite(partial) and partial > self.margin * incumbent:
+                    record.update(
+                        status="beaten",
+                        reason=f"partial loss above {self.margin} x incumbent",
+                    )
+                    break
+
+        if self.catalog is not None and record["status"] == "completed":
+            self.catalog.register(
+                params,
+                output_path=self.output_path,
+                driver="validation",
+                wall_time=time.perf_counter() - start,
+                variables=monthly,
+                varying_params=dict(overrides),
+            )
+        return monthly, record
+
+
+def summarize_aborts(records):
+    """Counts and simulated-step savings of a list of run records."""
+    aborted = [r for r in records if r["status"] != "completed"]
+    total = sum(r["steps"] for r in records)
+    saved = sum(r["steps"] - r["steps_run"] for r in aborted)
+    return {
+        "runs": len(records),
+        "diverged": sum(r["status"] == "diverged" for r in records),
+        "beaten": sum(r["status"] == "beaten" for r in records),
+        "steps_saved": saved,
+        "fraction_saved": saved / total if total else 0.0,
+    }
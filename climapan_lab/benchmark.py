@@ -0,0 +1,453 @@
+"""
+CliMaPan-Lab: Climate-Pandemic Economic Modeling Laboratory
+Benchmark Suite
+
+``tests/test_performance.py`` only checks that toy models finish under a
+ceiling. This suite measures how the model scales and where the time goes:
+
+  - macro benchmarks simulate full years at several ``c_agents`` counts, for
+    the economy alone and with the climate module, and time the setup (with
+    the first day) and the simulated years separately;
+  - micro benchmarks run a profiled year with the climate module (see
+    ``src.profiling``) and report the mean time per call of the hot paths:
+    the goods-market transactions, hiring, the wage bill, ``Bank.sommaW`` and
+    ``update``.
+
+COVID is left out (``COVID_NOTE``): every run that reaches the epidemic
+currently fails, so neither the COVID configurations nor the contact and
+COVID hot paths could be timed.
+
+For every configuration and hot path a scaling exponent ``b`` is fitted to
+``time ~ c_agents^b`` on a log-log scale. Each session is appended to a JSON
+history (with the code version and machine), and ``compare`` flags cases that
+got slower than a stored baseline by more than a tolerance, or whose scaling
+exponent grew.
+
+Usage:
+    climapan-bench run --agents 1000 5000 20000 100000
+    climapan-bench baseline            # latest session becomes the baseline
+    climapan-bench compare --tolerance 0.2
+"""
+
+import argparse
+import copy
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from .src.models import EconModel
+from .src.params import parameters
+from .src.profiling import AGENT_PHASES
+from .storage.evaluations import code_version
+
+DEFAULT_HISTORY_PATH = os.path.join("results", "benchmarks", "history.json")
+DEFAULT_BASELINE_PATH = os.path.join("results", "benchmarks", "baseline.json")
+
+DEFAULT_AGENTS = (1000, 5000, 20000, 100000)
+DEFAULT_MICRO_AGENTS = (1000, 5000)
+
+# Macro configurations: climate module on or off
+CONFIGS = {
+    "economy": False,
+    "climate": True,
+}
+
+# Printed with every session instead of recording runs that are known to fail
+COVID_NOTE = (
+    "COVID configurations and the contact/COVID hot paths (_make_random_contacts, "
+    "_propagate_contacts, progressCovid) are not benchmarked: runs that reach the "
+    "epidemic fail, as the contact routines refer to self.model and self.id, "
+    "which EconModel does not have"
+)
+
+# Agent methods timed in the micro benchmarks besides the profiler defaults
+BENCHMARK_AGENT_PHASES = AGENT_PHASES + (
+    ("csfirm_agents", "calculate_all_wages"),
+    ("cpfirm_agents", "calculate_all_wages"),
+)
+
+HOT_PATHS = (
+    "_csf_transaction",
+    "_cpf_transaction",
+    "_hire",
+    "csfirm_agents.calculate_all_wages",
+    "cpfirm_agents.calculate_all_wages",
+    "bank_agents.sommaW",
+    "update",
+)
+
+
+def benchmark_params(c_agents, climate=False, steps=365, base=None):
+    """Parameters of one benchmark run (without COVID, see ``COVID_NOTE``)."""
+    params = copy.deepcopy(parameters if base is None else base)
+    params.update(
+        {
+            "c_agents": int(c_agents),
+            "steps": int(steps),
+            "verboseFlag": False,
+            "show_progress": False,
+            "climateModuleFlag": climate,
+            "climateShockMode": "None",
+            "covid_settings": None,
+        }
+    )
+    return params
+
+
+def _error(exc):
+    return f"{type(exc).__name__}: {exc}"
+
+
+def run_macro(c_agents, config, steps=365, base=None):
+    """
+    Wall time of the setup (with the first day) and of ``steps`` further days.
+
+    A run that raises is recorded with its ``error`` and no timings, so one
+    broken configuration does not end the session.
+    """
+    model = EconModel(benchmark_params(c_agents, CONFIGS[config], steps, base))
+    case = {
+        "config": config,
+        "c_agents": int(c_agents),
+        "steps": int(steps),
+        "setup": None,
+        "simulate": None,
+        "per_step": None,
+        "error": None,
+    }
+    try:
+        start = time.perf_counter()
+        model.run(steps=1)
+        case["setup"] = time.perf_counter() - start
+        start = time.perf_counter()
+        model.run(steps=steps + 1)
+        case["simulate"] = time.perf_counter() - start
+        case["per_step"] = case["simulate"] / steps
+    except Exception as e:
+        case["error"] = _error(e)
+    return case
+
+
+def run_micro(c_agents, steps=365, base=None):
+    """Per-call timings of the hot paths over a profiled run with the climate module."""
+    params = benchmark_params(c_agents, True, steps + 1, base)
+    params["profile"] = True
+    model = EconModel(params)
+    # The first step sets the model up and is left out
+    model.run(steps=1)
+    model.profiler.instrument_agents(model, BENCHMARK_AGENT_PHASES[len(AGENT_PHASES) :])
+    model.profiler.reset()
+    error = None
+    try:
+        model.run(steps=steps + 1)
+    except Exception as e:
+        error = _error(e)
+    # A failed run still reports the calls made before the failure
+    report = model.profiler.report()
+    return {
+        "c_agents": int(c_agents),
+        "steps": int(steps),
+        "error": error,
+        "phases": {
+            name: {
+                "calls": report["phases"][name]["calls"],
+                "mean": report["phases"][name]["mean"],
+                "total": report["phases"][name]["total"],
+            }
+            for name in HOT_PATHS
+            if name in report["phases"]
+        },
+    }
+
+
+def scaling_exponent(sizes, times):
+    """Slope of ``log(time)`` against ``log(size)``, or None with < 2 sizes."""
+    sizes, times = np.asarray(sizes, dtype=float), np.asarray(times, dtype=float)
+    keep = (sizes > 0) & (times > 0)
+    if len(np.unique(sizes[keep])) < 2:
+        return None
+    return float(np.polyfit(np.log(sizes[keep]), np.log(times[keep]), 1)[0])
+
+
+def fit_exponents(macro, micro):
+    """Scaling exponents per macro configuration and per hot path."""
+    exponents = {"macro": {}, "micro": {}}
+    for config in sorted({case["config"] for case in macro}):
+        cases = [
+            case
+            for case in macro
+            if case["config"] == config and case["simulate"] is not None
+        ]
+        exponents["macro"][config] = scaling_exponent(
+            [case["c_agents"] for case in cases], [case["simulate"] for case in cases]
+        )
+    for name in HOT_PATHS:
+        cases = [case for case in micro if name in case["phases"] and not case["error"]]
+        exponents["micro"][name] = scaling_exponent(
+            [case["c_agents"] for case in cases],
+            [case["phases"][name]["mean"] for case in cases],
+        )
+    return exponents
+
+
+def run_benchmarks(
+    agents=DEFAULT_AGENTS,
+    configs=tuple(CONFIGS),
+    micro_agents=DEFAULT_MICRO_AGENTS,
+    steps=365,
+    base=None,
+    label=None,
+    verbose=True,
+):
+    """
+    Run the macro and micro benchmarks.
+
+    Args:
+        agents: ``c_agents`` counts of the macro benchmarks
+        configs: Names from ``CONFIGS``
+        micro_agents: ``c_agents`` counts of the micro benchmarks
+        steps: Simulated days per run (365 = one year)
+        base: Base parameters (defaults to ``src.params.parameters``)
+        label: Free-text label stored with the session
+
+    Returns:
+        History entry (JSON-compatible dict)
+    """
+    if verbose:
+        print(f"Note: {COVID_NOTE}")
+    macro, micro = [], []
+    for config in configs:
+        for n in agents:
+            case = run_macro(n, config, steps, base)
+            macro.append(case)
+            if verbose and case["error"]:
+                print(f"{config:<14} c_agents={n:<7} failed: {case['error']}")
+            elif verbose:
+                print(
+                    f"{config:<14} c_agents={n:<7} setup {case['setup']:8.2f} s  "
+                    f"{steps} steps {case['simulate']:9.2f} s"
+                )
+    for n in micro_agents:
+        case = run_micro(n, steps, base)
+        micro.append(case)
+        if verbose:
+            print(
+                f"{'micro':<14} c_agents={n:<7} profiled {len(case['phases'])} paths"
+                + (f", failed: {case['error']}" if case["error"] else "")
+            )
+
+    return {
+        "time": datetime.datetime.now().isoformat(),
+        "label": label,
+        "code_version": code_version(),
+        "machine": {
+            "node": platform.node(),
+            "processor": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+        },
+        "macro": macro,
+        "micro": micro,
+        "exponents": fit_exponents(macro, micro),
+    }
+
+
+def load_history(path=DEFAULT_HISTORY_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_json(data, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def append_history(entry, path=DEFAULT_HISTORY_PATH):
+    """Append one session to the JSON history file."""
+    history = load_history(path)
+    history.append(entry)
+    _write_json(history, path)
+    return len(history) - 1
+
+
+def _timings(entry):
+    """``{case key: seconds}`` of the timed cases of a history entry."""
+    timings = {}
+    for case in entry["macro"]:
+        if case["simulate"] is not None:
+            timings[f"{case['config']}@{case['c_agents']}"] = case["simulate"]
+    for case in entry["micro"]:
+        if case["error"]:
+            continue
+        for name, stats in case["phases"].items():
+            timings[f"{name}@{case['c_agents']}"] = stats["mean"]
+    return timings
+
+
+def compare(current, baseline, tolerance=0.2, exponent_tolerance=0.15):
+    """
+    Compare a session against a baseline.
+
+    Args:
+        current, baseline: History entries
+        tolerance: Allowed relative slow-down of a case
+        exponent_tolerance: Allowed increase of a scaling exponent
+
+    Returns:
+        List of ``{kind, case, baseline, current, change}`` for every case
+        present in both; regressions have ``regression=True``
+    """
+    rows = []
+    now, before = _timings(current), _timings(baseline)
+    for key in sorted(set(now) & set(before)):
+        ratio = now[key] / before[key] if before[key] > 0 else np.inf
+        rows.append(
+            {
+                "kind": "time",
+                "case": key,
+                "baseline": before[key],
+                "current": now[key],
+                "change": ratio - 1,
+                "regression": bool(ratio > 1 + tolerance),
+            }
+        )
+    for kind in ("macro", "micro"):
+        now_exp = current["exponents"][kind]
+        before_exp = baseline["exponents"][kind]
+        for key in sorted(set(now_exp) & set(before_exp)):
+            if now_exp[key] is None or before_exp[key] is None:
+                continue
+            rows.append(
+                {
+                    "kind": "exponent",
+                    "case": f"{kind}:{key}",
+                    "baseline": before_exp[key],
+                    "current": now_exp[key],
+                    "change": now_exp[key] - before_exp[key],
+                    "regression": bool(
+                        now_exp[key] - before_exp[key] > exponent_tolerance
+                    ),
+                }
+            )
+    return rows
+
+
+def format_comparison(rows):
+    width = max([len("Case")] + [len(row["case"]) for row in rows])
+    lines = [f"{'Case':<{width}}  {'Baseline':>11}  {'Current':>11}  {'Change':>8}"]
+    for row in rows:
+        if row["kind"] == "time":
+            change = f"{row['change'] * 100:+7.1f}%"
+        else:
+            change = f"{row['change']:+8.2f}"
+        lines.append(
+            f"{row['case']:<{width}}  {row['baseline']:>11.4g}  {row['current']:>11.4g}"
+            f"  {change}{'  REGRESSION' if row['regression'] else ''}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Command-line interface: run benchmarks, set a baseline, compare."""
+    parser = argparse.ArgumentParser(description="CliMaPan-Lab benchmark suite")
+    parser.add_argument(
+        "--history", default=DEFAULT_HISTORY_PATH, help="JSON history file"
+    )
+    parser.add_argument(
+        "--baseline", default=DEFAULT_BASELINE_PATH, help="Baseline session file"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the suite and append to history")
+    run_parser.add_argument("--agents", type=int, nargs="+", default=DEFAULT_AGENTS)
+    run_parser.add_argument(
+        "--configs", nargs="+", choices=list(CONFIGS), default=list(CONFIGS)
+    )
+    run_parser.add_argument(
+        "--microAgents", type=int, nargs="*", default=DEFAULT_MICRO_AGENTS
+    )
+    run_parser.add_argument(
+        "--steps", type=int, default=365, help="Simulated days per run"
+    )
+    run_parser.add_argument("--label", default=None)
+
+    baseline_parser = commands.add_parser(
+        "baseline", help="Store a history session as the baseline"
+    )
+    baseline_parser.add_argument(
+        "--index", type=int, default=-1, help="History index (default: latest)"
+    )
+
+    compare_parser = commands.add_parser(
+        "compare", help="Flag regressions of a session against the baseline"
+    )
+    compare_parser.add_argument(
+        "--index", type=int, default=-1, help="History index (default: latest)"
+    )
+    compare_parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Allowed relative slow-down"
+    )
+    compare_parser.add_argument(
+        "--exponentTolerance",
+        type=float,
+        default=0.15,
+        help="Allowed increase of a scaling exponent",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        entry = run_benchmarks(
+            args.agents,
+            args.configs,
+            args.microAgents,
+            args.steps,
+            label=args.label,
+        )
+        index = append_history(entry, args.history)
+        for kind, exponents in entry["exponents"].items():
+            for name, value in exponents.items():
+                if value is not None:
+                    print(f"exponent {kind}:{name} = {value:.2f}")
+        print(f"Saved session {index} to {args.history}")
+        return
+
+    history = load_history(args.history)
+    if not history:
+        print(f"No benchmark history at {args.history}")
+        sys.exit(1)
+    entry = history[args.index]
+
+    if args.command == "baseline":
+        _write_json(entry, args.baseline)
+        print(f"Baseline set to session {entry['time']} ({args.baseline})")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run 'climapan-bench baseline' first")
+        sys.exit(1)
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline["machine"] != entry["machine"]:
+        print("Warning: baseline was recorded on a different machine or environment")
+    rows = compare(entry, baseline, args.tolerance, args.exponentTolerance)
+    print(format_comparison(rows))
+    regressions = [row for row in rows if row["regression"]]
+    print(f"{len(regressions)} regression(s) in {len(rows)} case(s)")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -21,11 +21,13 @@ Important limitations (see docs for detail)
   CO2 definition) are not part of the objective.
 """
 
+import argparse
 import json
 import os
 import sys
 import time
-from typing import Any, Dict, List, Tuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Tuple
 
 import numpy as np
 import pandas as pd
@@ -34,7 +36,12 @@ import pandas as pd
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from climapan_lab.base_params import economic_params as parameters
+from climapan_lab.src.logs import get_logger
 from climapan_lab.src.models import EconModel
+from climapan_lab.storage.catalog import DEFAULT_CATALOG_PATH, RunCatalog
+from climapan_lab.storage.evaluations import DEFAULT_EVALUATION_PATH
+
+log = get_logger("calibration")
 
 # =============================================================================
 # Load Target Data
@@ -176,26 +183,79 @@ PARAM_SPACE = {
 # =============================================================================
 
 
-def run_simulation(params: dict, n_years: int = 10) -> dict:
-    """Run simulation and return yearly aggregated metrics."""
-    steps = n_years * 365
+# Monthly series the calibration objective is computed from
+CALIBRATION_SERIES = ("GDP", "UnemploymentRate", "Investment", "Climate C02")
+
+# Shared evaluation store (see ``use_evaluation_store``); None = always simulate
+_evaluation_store = None
+
+
+def use_evaluation_store(store):
+    """
+    Look simulations up in (and record them to) a shared evaluation store.
+
+    Args:
+        store: ``EvaluationStore``, database path, or None/"" to disable
+
+    The store is a module-level setting, so forked worker processes inherit it.
+    """
+    global _evaluation_store
+    if isinstance(store, str):
+        from climapan_lab.storage.evaluations import open_evaluation_store
+
+        store = open_evaluation_store(store)
+    _evaluation_store = store
+    return store
+
+
+# Run catalog completed simulations are registered in (see ``use_run_catalog``)
+_run_catalog_path = None
+
+
+def use_run_catalog(path):
+    """
+    Register completed simulations in a run catalog.
 
+    Args:
+        path: Catalog database path, or None/"" to disable
+
+    Only the path is kept: each registration opens its own connection, so
+    forked worker processes never share one.
+    """
+    global _run_catalog_path
+    _run_catalog_path = path or None
+
+
+def _sim_params(params: dict, n_years: int) -> dict:
     sim_params = parameters.copy()
     sim_params.update(params)
-    sim_params["steps"] = steps
+    sim_params["steps"] = n_years * 365
     sim_params["show_progress"] = False
     sim_params["climateModuleFlag"] = True
+    return sim_params
+
+
+def _build_model(params: dict, n_years: int) -> EconModel:
+    return EconModel(_sim_params(params, n_years))
+
 
-    model = EconModel(sim_params)
-    results = model.run()
+def _monthly_series(model_df) -> dict:
+    """Monthly values of the calibrated series recorded in a model frame."""
+    return {
+        name: model_df[name].drop_nulls().to_list()
+        for name in CALIBRATION_SERIES
+        if name in model_df.columns
+    }
 
-    # Extract monthly data from the model's recorded DataFrame.
-    model_df = results["model"]
+
+def _yearly_metrics(series: dict, n_years: int) -> dict:
+    """Yearly means of the calibrated monthly series (``_monthly_series``)."""
 
     def yearly_aggregate(col_name: str, n_years: int, default: float = 0) -> np.ndarray:
-        if col_name not in model_df.columns:
+        if col_name not in series:
             return np.full(n_years, default)
-        values = model_df[col_name].drop_nulls().to_numpy()
+        # Array-valued records (e.g. "Climate C02") are summed like in validate_sim
+        values = np.array([np.sum(v) for v in series[col_name]], dtype=float)
         if len(values) == 0:
             return np.full(n_years, default)
         years = []
@@ -216,11 +276,143 @@ def run_simulation(params: dict, n_years: int = 10) -> dict:
     }
 
 
+def _stored_series(params: dict, n_years: int):
+    """Monthly series of an earlier identical run from the store, or None."""
+    if _evaluation_store is None:
+        return None
+    found = _evaluation_store.get(
+        _sim_params(params, n_years), variables=CALIBRATION_SERIES
+    )
+    if found is None or found["status"] != "completed":
+        return None
+    return found["series"]
+
+
+def _store_series(params: dict, n_years: int, series: dict, wall_time: float):
+    if _evaluation_store is not None:
+        _evaluation_store.put(
+            _sim_params(params, n_years),
+            # Series the model did not record are stored as absent
+            {name: series.get(name) for name in CALIBRATION_SERIES},
+            driver="calibration",
+            wall_time=wall_time,
+        )
+    if _run_catalog_path is not None:
+        with RunCatalog(_run_catalog_path) as catalog:
+            catalog.register(
+                _sim_params(params, n_years),
+                driver="calibration",
+                wall_time=wall_time,
+                variables=series,
+                varying_params=params,
+            )
+
+
+def run_simulation(params: dict, n_years: int = 10) -> dict:
+    """Run simulation (or reuse a stored run) and return yearly aggregated metrics."""
+    series = _stored_series(params, n_years)
+    if series is None:
+        start = time.time()
+        model = _build_model(params, n_years)
+        results = model.run()
+
+        # Extract monthly data from the model's recorded DataFrame.
+        series = _monthly_series(results["model"])
+        _store_series(params, n_years, series, time.time() - start)
+    return _yearly_metrics(series, n_years)
+
+
+def iter_simulation_years(params: dict, n_years: int = 10) -> Iterator[dict]:
+    """
+    Run a simulation one year at a time.
+
+    Yields the yearly aggregated metrics of the years simulated so far (one
+    more year each time), so callers can stop a run early; after the last year
+    they match ``run_simulation``. Stored runs are replayed without simulating,
+    and runs that reach the last year are stored.
+    """
+    series = _stored_series(params, n_years)
+    if series is not None:
+        for year in range(1, n_years + 1):
+            yield _yearly_metrics(series, year)
+        return
+
+    start = time.time()
+    model = _build_model(params, n_years)
+    for year in range(1, n_years + 1):
+        # ``steps`` is the absolute step to run up to
+        results = model.run(steps=year * 365)
+        series = _monthly_series(results["model"])
+        yield _yearly_metrics(series, year)
+    _store_series(params, n_years, series, time.time() - start)
+
+
 # =============================================================================
 # Autocorrelation-Based Objective Function
 # =============================================================================
 
 
+def series_distance(
+    sim_results: dict, target_data: pd.DataFrame, n_years: int
+) -> float:
+    """
+    Autocorrelation-based distance between yearly simulated and target series.
+
+    Args:
+        sim_results: Yearly metrics (as returned by ``run_simulation``)
+        target_data: Target DataFrame
+        n_years: Number of leading years to compare
+
+    Returns:
+        Mean weighted ACF/CV/trend distance over the matched metrics
+    """
+    total_distance = 0.0
+    n_metrics = 0
+
+    for metric in ["GDP", "UnemploymentRate", "Investment", "Climate C02"]:
+        if metric not in target_data.columns:
+            continue
+
+        target = target_data[metric].values[:n_years]
+        sim = sim_results.get(metric, np.zeros(n_years))[:n_years]
+
+        # Handle NaN
+        valid_mask = ~np.isnan(target)
+        if not np.any(valid_mask):
+            continue
+
+        target_valid = target[valid_mask]
+        sim_valid = (
+            sim[valid_mask] if len(sim) >= len(target) else sim[: len(target_valid)]
+        )
+
+        if len(sim_valid) < 3 or len(target_valid) < 3:
+            continue
+
+        # Compute statistics for both
+        target_stats = compute_statistics(target_valid)
+        sim_stats = compute_statistics(sim_valid)
+
+        # 1. ACF distance (most important - matches dynamics)
+        acf_distance = np.mean((target_stats["acf"] - sim_stats["acf"]) ** 2)
+
+        # 2. CV distance (matches relative variability)
+        cv_distance = (target_stats["cv"] - sim_stats["cv"]) ** 2
+
+        # 3. Trend distance (matches direction of change)
+        trend_distance = (target_stats["trend"] - sim_stats["trend"]) ** 2
+
+        # Combined distance (weighted)
+        metric_distance = (
+            0.6 * acf_distance + 0.25 * cv_distance + 0.15 * trend_distance
+        )
+
+        total_distance += metric_distance
+        n_metrics += 1
+
+    return total_distance / max(n_metrics, 1)
+
+
 def objective_function(
     params: dict, target_data: pd.DataFrame, n_years: int = 10
 ) -> float:
@@ -242,54 +434,10 @@ def objective_function(
     """
     try:
         sim_results = run_simulation(params, n_years)
-        total_distance = 0.0
-        n_metrics = 0
-
-        for metric in ["GDP", "UnemploymentRate", "Investment", "Climate C02"]:
-            if metric not in target_data.columns:
-                continue
-
-            target = target_data[metric].values[:n_years]
-            sim = sim_results.get(metric, np.zeros(n_years))[:n_years]
-
-            # Handle NaN
-            valid_mask = ~np.isnan(target)
-            if not np.any(valid_mask):
-                continue
-
-            target_valid = target[valid_mask]
-            sim_valid = (
-                sim[valid_mask] if len(sim) >= len(target) else sim[: len(target_valid)]
-            )
-
-            if len(sim_valid) < 3 or len(target_valid) < 3:
-                continue
-
-            # Compute statistics for both
-            target_stats = compute_statistics(target_valid)
-            sim_stats = compute_statistics(sim_valid)
-
-            # 1. ACF distance (most important - matches dynamics)
-            acf_distance = np.mean((target_stats["acf"] - sim_stats["acf"]) ** 2)
-
-            # 2. CV distance (matches relative variability)
-            cv_distance = (target_stats["cv"] - sim_stats["cv"]) ** 2
-
-            # 3. Trend distance (matches direction of change)
-            trend_distance = (target_stats["trend"] - sim_stats["trend"]) ** 2
-
-            # Combined distance (weighted)
-            metric_distance = (
-                0.6 * acf_distance + 0.25 * cv_distance + 0.15 * trend_distance
-            )
-
-            total_distance += metric_distance
-            n_metrics += 1
-
-        return total_distance / max(n_metrics, 1)
+        return series_distance(sim_results, target_data, n_years)
 
     except Exception as e:
-        print(f"Error in objective: {e}")
+        log.warning("Error in objective: %s", e)
         return float("inf")
 
 
@@ -298,15 +446,70 @@ def objective_function(
 # =============================================================================
 
 
+def sample_param_space(param_space: dict) -> dict:
+    """Draw one candidate (log-uniform for ranges spanning > 2 decades)."""
+    params = {}
+    for name, (low, high) in param_space.items():
+        if low > 0 and high / low > 100:
+            params[name] = np.exp(np.random.uniform(np.log(low), np.log(high)))
+        else:
+            params[name] = np.random.uniform(low, high)
+    return params
+
+
+def _timed_objective(
+    objective_fn: Callable, params: dict, target_data: pd.DataFrame, n_years: int
+) -> Tuple[float, float]:
+    """Evaluate one candidate and return (objective, seconds); runs in workers."""
+    trial_start = time.time()
+    objective = objective_fn(params, target_data, n_years)
+    return objective, time.time() - trial_start
+
+
 def bayesian_optimization(
     target_data: pd.DataFrame,
     n_calls: int = 30,
     n_years: int = 5,
     n_initial: int = 10,
     seed: int = 42,
+    batch_size: int = 1,
+    n_workers: int = None,
+    objective_fn: Callable = objective_function,
+    emulator: Any = None,
+    n_screen: int = 2000,
 ) -> list:
-    """Perform Bayesian optimization for model calibration."""
+    """
+    Perform Bayesian optimization for model calibration.
+
+    With ``batch_size > 1`` up to ``batch_size`` candidates are evaluated
+    concurrently in a process pool. Each free slot is filled as soon as a
+    result arrives, with a proposal that treats still-running candidates as
+    observed at the best score so far ("constant liar"), which keeps the
+    in-flight candidates apart.
+
+    With an ``emulator`` (``analysis.emulator.ObjectiveEmulator``), proposals
+    come from screening ``n_screen`` random candidates on the emulator's lower
+    confidence bound instead, and every new evaluation updates (and, if it has
+    a path, saves) the emulator. Stored evaluations count towards the random
+    phase, so a warm emulator skips it.
+
+    Args:
+        target_data: Target DataFrame
+        n_calls: Total number of objective evaluations
+        n_years: Number of years to simulate per trial
+        n_initial: Number of random samples before model-based proposals
+        seed: Random seed for candidate generation
+        batch_size: Number of candidates evaluated concurrently (1 = serial)
+        n_workers: Pool size (defaults to ``batch_size``)
+        objective_fn: Objective ``f(params, target_data, n_years)`` to minimize
+        emulator: Optional ``ObjectiveEmulator`` over ``PARAM_SPACE``
+        n_screen: Candidates screened by the emulator per proposal
+
+    Returns:
+        Trial results sorted by objective (best first)
+    """
     np.random.seed(seed)
+    n_workers = n_workers or batch_size
 
     print(f"\n{'='*60}")
     print(f"Autocorrelation-Based Bayesian Calibration")
@@ -314,6 +517,9 @@ def bayesian_optimization(
     print(f"  Initial random samples: {n_initial}")
     print(f"  Years per trial: {n_years}")
     print(f"  Parameters: {len(PARAM_SPACE)}")
+    print(f"  Parallel candidates: {batch_size} ({n_workers} workers)")
+    if emulator is not None:
+        print(f"  Emulator: {len(emulator)} stored evaluations, {n_screen} screened")
     print(f"  Objective: ACF + CV + Trend matching")
     print(f"{'='*60}\n")
 
@@ -326,13 +532,7 @@ def bayesian_optimization(
     start_time = time.time()
 
     def sample_random() -> dict:
-        params = {}
-        for name, (low, high) in PARAM_SPACE.items():
-            if low > 0 and high / low > 100:
-                params[name] = np.exp(np.random.uniform(np.log(low), np.log(high)))
-            else:
-                params[name] = np.random.uniform(low, high)
-        return params
+        return sample_param_space(PARAM_SPACE)
 
     def params_to_vector(params: dict) -> np.ndarray:
         vec = []
@@ -348,50 +548,54 @@ def bayesian_optimization(
             params[name] = low + vec[i] * (high - low)
         return params
 
-    def acquisition_function(x: np.ndarray) -> float:
-        if len(X_observed) < 2:
-            return np.random.random()
+    def acquisition_function(candidates: np.ndarray, X: list, y: list) -> np.ndarray:
+        """Inverse-distance mean minus exploration bonus, for all candidates."""
+        if len(X) < 2:
+            return np.random.random(len(candidates))
 
-        X = np.array(X_observed)
-        y = np.array(y_observed)
+        X = np.array(X)
+        y = np.array(y)
 
-        distances = np.linalg.norm(X - x, axis=1)
+        distances = np.linalg.norm(candidates[:, None, :] - X[None, :, :], axis=2)
         weights = 1 / (distances + 0.01)
-        weights /= weights.sum()
+        weights /= weights.sum(axis=1, keepdims=True)
 
-        mu = np.dot(weights, y)
-        min_dist = np.min(distances)
+        mu = weights @ y
+        min_dist = distances.min(axis=1)
         sigma = min_dist * np.std(y) if np.std(y) > 0 else 0.1
 
         return mu - 1.5 * sigma
 
-    def suggest_next() -> dict:
-        best_acq = float("inf")
-        best_x = None
-
-        for _ in range(100):
-            x = np.random.random(len(param_names))
-            acq = acquisition_function(x)
-            if acq < best_acq:
-                best_acq = acq
-                best_x = x
-
-        return vector_to_params(best_x)
-
-    for i in range(n_calls):
+    def screen_next(pending: list = ()) -> dict:
+        candidates = [sample_random() for _ in range(n_screen)]
+        pending_params = [vector_to_params(v) for v in pending]
+        selected = emulator.screen(candidates, n_select=1, pending=pending_params)
+        return candidates[selected[0]] if selected else candidates[0]
+
+    def suggest_next(pending: list = ()) -> dict:
+        # Constant liar: pending candidates count as observed at the best score
+        lie = min(y_observed) if y_observed else 0.0
+        X = X_observed + list(pending)
+        y = y_observed + [lie] * len(pending)
+
+        candidates = np.random.random((100, len(param_names)))
+        acq = acquisition_function(candidates, X, y)
+        return vector_to_params(candidates[np.argmin(acq)])
+
+    def propose(i: int, pending: list = ()) -> Tuple[dict, str]:
+        if emulator is not None:
+            if i + len(emulator) - len(results) < n_initial:
+                return sample_random(), "random"
+            return screen_next(pending), "emulator"
         if i < n_initial:
-            params = sample_random()
-            phase = "random"
-        else:
-            params = suggest_next()
-            phase = "bayesian"
-
-        trial_start = time.time()
-        objective = objective_function(params, target_data, n_years)
-        trial_time = time.time() - trial_start
+            return sample_random(), "random"
+        return suggest_next(pending), "bayesian"
 
+    def record(params: dict, phase: str, objective: float, trial_time: float):
         X_observed.append(params_to_vector(params))
         y_observed.append(objective if objective != float("inf") else 1e6)
+        if emulator is not None:
+            emulator.update(params, objective, source=f"bayesian_optimization/{phase}")
 
         results.append(
             {
@@ -404,9 +608,45 @@ def bayesian_optimization(
 
         best_obj = min(r["objective"] for r in results)
         print(
-            f"[{i+1}/{n_calls}] ({phase}) Score: {objective:.6f} | Best: {best_obj:.6f} | {trial_time:.1f}s"
+            f"[{len(results)}/{n_calls}] ({phase}) Score: {objective:.6f} | Best: {best_obj:.6f} | {trial_time:.1f}s"
         )
 
+    if batch_size <= 1:
+        for i in range(n_calls):
+            params, phase = propose(i)
+            objective, trial_time = _timed_objective(
+                objective_fn, params, target_data, n_years
+            )
+            record(params, phase, objective, trial_time)
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            in_flight = {}  # future -> (params, phase)
+            submitted = 0
+
+            def fill_slots():
+                nonlocal submitted
+                while submitted < n_calls and len(in_flight) < batch_size:
+                    pending = [params_to_vector(p) for p, _ in in_flight.values()]
+                    params, phase = propose(submitted, pending)
+                    future = pool.submit(
+                        _timed_objective, objective_fn, params, target_data, n_years
+                    )
+                    in_flight[future] = (params, phase)
+                    submitted += 1
+
+            fill_slots()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    params, phase = in_flight.pop(future)
+                    try:
+                        objective, trial_time = future.result()
+                    except Exception as e:
+                        log.warning("Error in objective: %s", e)
+                        objective, trial_time = float("inf"), 0.0
+                    record(params, phase, objective, trial_time)
+                fill_slots()
+
     total_time = time.time() - start_time
 
     results.sort(key=lambda x: x["objective"])
@@ -420,20 +660,585 @@ def bayesian_optimization(
     return results
 
 
+# =============================================================================
+# Multi-Fidelity Search (Successive Halving)
+# =============================================================================
+
+
+def fidelity_levels(
+    n_years: int,
+    n_rungs: int = 3,
+    eta: int = 3,
+    min_years: int = 2,
+    min_agents: int = 500,
+    n_seeds: int = 1,
+    base_params: dict = None,
+) -> List[dict]:
+    """
+    Fidelity schedule for successive halving, cheapest first.
+
+    Rung ``i`` simulates a fraction ``eta ** (i - n_rungs + 1)`` of the full
+    horizon and consumer population (at least ``min_years`` / ``min_agents``),
+    with a single seed; the last rung is full fidelity with ``n_seeds`` seeds.
+    Capitalists are scaled with ``c_agents``; firm counts are kept.
+    """
+    base_params = base_params or parameters
+    levels = []
+    for rung in range(n_rungs):
+        fraction = float(eta) ** (rung - n_rungs + 1)
+        overrides = {}
+        if fraction < 1:
+            c_agents = max(min_agents, int(round(base_params["c_agents"] * fraction)))
+            c_agents = min(c_agents, base_params["c_agents"])
+            ratio = c_agents / base_params["c_agents"]
+            overrides = {
+                "c_agents": c_agents,
+                "capitalists": max(1, int(round(base_params["capitalists"] * ratio))),
+            }
+        levels.append(
+            {
+                "level": rung,
+                "n_years": min(n_years, max(min_years, int(round(n_years * fraction)))),
+                "n_seeds": n_seeds if rung == n_rungs - 1 else 1,
+                "overrides": overrides,
+            }
+        )
+    return levels
+
+
+def _fidelity_objective(
+    objective_fn: Callable,
+    params: dict,
+    target_data: pd.DataFrame,
+    fidelity: dict,
+    base_seed: int,
+) -> Tuple[float, float]:
+    """Mean objective over the seeds of one fidelity level; runs in workers."""
+    trial_start = time.time()
+    scores = []
+    for k in range(fidelity["n_seeds"]):
+        trial = dict(params, **fidelity["overrides"])
+        if fidelity["n_seeds"] > 1:
+            trial["seed"] = base_seed + k
+        scores.append(objective_fn(trial, target_data, fidelity["n_years"]))
+    return float(np.mean(scores)), time.time() - trial_start
+
+
+def successive_halving(
+    target_data: pd.DataFrame,
+    n_candidates: int = 81,
+    n_years: int = 5,
+    eta: int = 3,
+    n_rungs: int = 3,
+    min_years: int = 2,
+    min_agents: int = 500,
+    n_seeds: int = 1,
+    seed: int = 42,
+    n_workers: int = 1,
+    param_space: dict = None,
+    objective_fn: Callable = objective_function,
+    emulator: Any = None,
+    n_screen: int = 2000,
+) -> list:
+    """
+    Multi-fidelity calibration by successive halving.
+
+    All ``n_candidates`` random candidates are scored at the cheapest fidelity
+    (few agents, short horizon, one seed); the best ``1/eta`` of each rung are
+    promoted to the next, up to full fidelity at the last rung (see
+    ``fidelity_levels``). Every evaluation is kept with its ``fidelity``.
+
+    With an ``emulator`` fitted on full-fidelity objectives, the first rung is
+    the ``n_candidates`` best of ``n_screen`` random draws by the emulator's
+    lower confidence bound, and the full-fidelity results are added to it.
+
+    Args:
+        target_data: Target DataFrame
+        n_candidates: Number of random candidates in the first rung
+        n_years: Full-fidelity horizon in years
+        eta: Promotion ratio and fidelity growth factor between rungs
+        n_rungs: Number of fidelity levels (the last one is full fidelity)
+        min_years: Shortest horizon used at low fidelity
+        min_agents: Smallest consumer population used at low fidelity
+        n_seeds: Seeds averaged at full fidelity
+        seed: Random seed for candidate generation
+        n_workers: Process pool size for evaluating a rung (1 = serial)
+        param_space: Search space (defaults to ``PARAM_SPACE``)
+        objective_fn: Objective ``f(params, target_data, n_years)`` to minimize
+        emulator: Optional ``ObjectiveEmulator`` over ``param_space``
+        n_screen: Random draws screened by the emulator for the first rung
+
+    Returns:
+        All evaluations, highest fidelity first, each level ranked by objective
+    """
+    np.random.seed(seed)
+    param_space = param_space or PARAM_SPACE
+    levels = fidelity_levels(n_years, n_rungs, eta, min_years, min_agents, n_seeds)
+    base_seed = parameters.get("seed", 0)
+
+    print(f"\n{'='*60}")
+    print(f"Successive Halving Calibration")
+    print(f"  Candidates: {n_candidates} (eta={eta})")
+    for fidelity in levels:
+        agents = fidelity["overrides"].get("c_agents", parameters["c_agents"])
+        print(
+            f"  Level {fidelity['level']}: {fidelity['n_years']} years, "
+            f"{agents} consumers, {fidelity['n_seeds']} seed(s)"
+        )
+    print(f"  Parameters: {len(param_space)}")
+    print(f"{'='*60}\n")
+
+    start_time = time.time()
+    candidates = [sample_param_space(param_space) for _ in range(n_candidates)]
+    if emulator is not None and len(emulator):
+        draws = candidates + [
+            sample_param_space(param_space)
+            for _ in range(max(0, n_screen - n_candidates))
+        ]
+        candidates = [draws[i] for i in emulator.screen(draws, n_candidates)]
+        print(f"Emulator screened {len(draws)} draws down to {len(candidates)}")
+    results = []
+
+    pool = ProcessPoolExecutor(max_workers=n_workers) if n_workers > 1 else None
+    try:
+        for fidelity in levels:
+            jobs = [
+                (objective_fn, params, target_data, fidelity, base_seed)
+                for params in candidates
+            ]
+            if pool is None:
+                scores = [_fidelity_objective(*job) for job in jobs]
+            else:
+                scores = list(pool.map(_fidelity_objective, *zip(*jobs)))
+
+            rung = []
+            for params, (objective, trial_time) in zip(candidates, scores):
+                rung.append(
+                    {
+                        "params": params,
+                        "objective": objective,
+                        "time": trial_time,
+                        "phase": f"halving_{fidelity['level']}",
+                        "fidelity": {
+                            "level": fidelity["level"],
+                            "n_years": fidelity["n_years"],
+                            "n_seeds": fidelity["n_seeds"],
+                            "c_agents": fidelity["overrides"].get(
+                                "c_agents", parameters["c_agents"]
+                            ),
+                        },
+                    }
+                )
+            rung.sort(key=lambda r: r["objective"])
+            results = rung + results
+            if emulator is not None and fidelity is levels[-1]:
+                for r in rung:
+                    emulator.add(r["params"], r["objective"], "successive_halving")
+                emulator.fit()
+                if emulator.path:
+                    emulator.save()
+
+            n_keep = max(1, len(rung) // eta)
+            print(
+                f"Level {fidelity['level']}: {len(rung)} evaluated | "
+                f"Best: {rung[0]['objective']:.6f} | promoting {n_keep}"
+            )
+            candidates = [r["params"] for r in rung[:n_keep]]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    total_time = time.time() - start_time
+    print(f"\n{'='*60}")
+    print(f"Optimization Complete!")
+    print(f"  Total time: {total_time:.1f}s")
+    print(f"  Best Score (full fidelity): {results[0]['objective']:.6f}")
+    print(f"{'='*60}\n")
+
+    return results
+
+
+# =============================================================================
+# Approximate Bayesian Computation (ABC-SMC)
+# =============================================================================
+
+
+def _to_unit(params: dict, param_space: dict) -> np.ndarray:
+    """Map a candidate to the unit cube of the prior (log axes as sampled)."""
+    u = []
+    for name, (low, high) in param_space.items():
+        value = params[name]
+        if low > 0 and high / low > 100:
+            u.append((np.log(value) - np.log(low)) / (np.log(high) - np.log(low)))
+        else:
+            u.append((value - low) / (high - low))
+    return np.array(u)
+
+
+def _from_unit(u: np.ndarray, param_space: dict) -> dict:
+    params = {}
+    for x, (name, (low, high)) in zip(u, param_space.items()):
+        if low > 0 and high / low > 100:
+            params[name] = float(np.exp(np.log(low) + x * (np.log(high) - np.log(low))))
+        else:
+            params[name] = float(low + x * (high - low))
+    return params
+
+
+def _reflect_unit(u: np.ndarray) -> np.ndarray:
+    """Fold a vector back into the unit cube by reflecting it at the faces."""
+    u = np.mod(u, 2.0)
+    return np.where(u > 1, 2.0 - u, u)
+
+
+# Kernel draws per ABC-SMC proposal before the last one is reflected into the
+# prior box instead (a narrow kernel on a particle at a corner can need many)
+MAX_PROPOSAL_ATTEMPTS = 1000
+
+
+def _abc_particle(
+    simulate_fn: Callable,
+    params: dict,
+    target_data: pd.DataFrame,
+    n_years: int,
+    tolerance: float,
+    min_years: int,
+) -> Tuple[float, int, float]:
+    """
+    Simulate one particle with early rejection; runs in workers.
+
+    The distance of the partial series is checked after every year from
+    ``min_years`` on and the run stops as soon as it exceeds ``tolerance``.
+
+    Returns:
+        (distance, years simulated, seconds)
+    """
+    trial_start = time.time()
+    distance, year = float("inf"), 0
+    try:
+        for year, sim_results in enumerate(simulate_fn(params, n_years), start=1):
+            if year < min_years and year < n_years:
+                continue
+            distance = series_distance(sim_results, target_data, year)
+            if distance > tolerance:
+                break
+    except Exception as e:
+        log.warning("Error in simulation: %s", e)
+        distance = float("inf")
+    return distance, year, time.time() - trial_start
+
+
+def abc_smc(
+    target_data: pd.DataFrame,
+    n_particles: int = 100,
+    n_generations: int = 5,
+    n_years: int = 5,
+    quantile: float = 0.5,
+    min_tolerance: float = 0.0,
+    min_acceptance: float = 0.01,
+    min_years: int = 3,
+    max_simulations: int = None,
+    seed: int = 42,
+    n_workers: int = 1,
+    param_space: dict = None,
+    simulate_fn: Callable = iter_simulation_years,
+) -> dict:
+    """
+    Approximate Bayesian Computation by sequential Monte Carlo.
+
+    Generation 0 draws ``n_particles`` from the prior (``sample_param_space``)
+    and keeps them all. Each later generation sets its tolerance to the
+    ``quantile`` of the previous accepted distances, perturbs particles drawn
+    by weight with a Gaussian kernel (twice the weighted covariance, in the
+    unit cube of the prior) and accepts new particles until ``n_particles``
+    have a distance within the tolerance. Weights are prior over
+    kernel-mixture density, so the final population is a weighted sample of
+    the posterior.
+
+    Every simulation uses its own seed, so seed noise is part of the
+    likelihood rather than fitted away. Runs are simulated year by year
+    (``simulate_fn``) and abandoned once the partial-series distance exceeds
+    the tolerance (after ``min_years``, the shortest series
+    ``series_distance`` scores); the distance of a short series is only an
+    indication of the full one, so this trades a few false rejections for
+    most of the compute on bad particles.
+
+    Perturbed particles outside the prior box are redrawn; after
+    ``MAX_PROPOSAL_ATTEMPTS`` misses in a row the last draw is reflected into
+    the box and weighted as if it had been drawn there, which is logged and
+    counted per generation.
+
+    Args:
+        target_data: Target DataFrame
+        n_particles: Population size
+        n_generations: Maximum number of generations (including generation 0)
+        n_years: Number of years to simulate per particle
+        quantile: Quantile of accepted distances used as the next tolerance
+        min_tolerance: Stop once the tolerance falls to this value
+        min_acceptance: Stop once a generation accepts fewer of its simulations
+        min_years: First year at which partial series may be rejected
+        max_simulations: Optional total simulation budget (the last complete
+            generation is returned when it runs out)
+        seed: Random seed for sampling and simulation seeds
+        n_workers: Process pool size for simulating particles (1 = serial)
+        param_space: Prior box (defaults to ``PARAM_SPACE``)
+        simulate_fn: Generator ``f(params, n_years)`` yielding yearly metrics
+
+    Returns:
+        Posterior dict with ``particles`` (``params``, ``distance``, ``weight``,
+        ``time``), the per-generation ``tolerances`` and ``generations``
+        statistics (simulations, acceptances, early rejections, simulated
+        years, reflected proposals)
+    """
+    np.random.seed(seed)
+    param_space = param_space or PARAM_SPACE
+    base_seed = parameters.get("seed", 0)
+
+    print(f"\n{'='*60}")
+    print(f"ABC-SMC Calibration")
+    print(f"  Particles: {n_particles}")
+    print(f"  Generations: {n_generations} (tolerance quantile {quantile})")
+    print(f"  Years per particle: {n_years} (early rejection from year {min_years})")
+    print(f"  Parameters: {len(param_space)}")
+    print(f"  Workers: {n_workers}")
+    print(f"{'='*60}\n")
+
+    start_time = time.time()
+    n_simulations = 0
+    population = None  # (unit vectors, weights, distances, params, times)
+    tolerances = []
+    generations = []
+
+    pool = ProcessPoolExecutor(max_workers=n_workers) if n_workers > 1 else None
+    try:
+        for generation in range(n_generations):
+            if population is None:
+                tolerance = float("inf")
+            else:
+                tolerance = float(np.quantile(population[2], quantile))
+                if tolerance <= min_tolerance:
+                    print(f"Tolerance {tolerance:.6f} reached the minimum")
+                    break
+
+            if population is not None:
+                X_prev, w_prev = population[0], population[1]
+                cov = 2 * np.atleast_2d(np.cov(X_prev.T, aweights=w_prev))
+                cov += 1e-12 * np.eye(len(cov))
+                chol = np.linalg.cholesky(cov)
+                cov_inv = np.linalg.inv(cov)
+
+            accepted = []  # (u, distance, params, time)
+            stats = {"simulations": 0, "early_rejected": 0, "years": 0, "reflected": 0}
+
+            def propose() -> np.ndarray:
+                if population is None:
+                    return _to_unit(sample_param_space(param_space), param_space)
+                for _ in range(MAX_PROPOSAL_ATTEMPTS):
+                    parent = X_prev[np.random.choice(len(X_prev), p=w_prev)]
+                    u = parent + chol @ np.random.standard_normal(len(parent))
+                    if np.all((u >= 0) & (u <= 1)):  # Zero prior density outside
+                        return u
+                stats["reflected"] += 1
+                return _reflect_unit(u)
+
+            budget_left = (
+                None if max_simulations is None else max_simulations - n_simulations
+            )
+
+            def submit_job(u: np.ndarray):
+                params = _from_unit(u, param_space)
+                trial = dict(
+                    params, seed=base_seed + n_simulations + stats["simulations"]
+                )
+                stats["simulations"] += 1
+                job = (simulate_fn, trial, target_data, n_years, tolerance, min_years)
+                return u, params, job
+
+            def collect(u, params, outcome):
+                distance, years, trial_time = outcome
+                stats["years"] += years
+                if years < n_years:
+                    stats["early_rejected"] += 1
+                if np.isfinite(distance) and distance <= tolerance:
+                    accepted.append((u, distance, params, trial_time))
+
+            def can_submit(n_running: int) -> bool:
+                if len(accepted) + n_running >= n_particles:
+                    return False
+                return budget_left is None or stats["simulations"] < budget_left
+
+            if pool is None:
+                while can_submit(0):
+                    u, params, job = submit_job(propose())
+                    collect(u, params, _abc_particle(*job))
+            else:
+                in_flight = {}
+                while True:
+                    while can_submit(len(in_flight)):
+                        u, params, job = submit_job(propose())
+                        in_flight[pool.submit(_abc_particle, *job)] = (u, params)
+                    if not in_flight:
+                        break
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        u, params = in_flight.pop(future)
+                        try:
+                            outcome = future.result()
+                        except Exception as e:
+                            log.warning("Error in simulation: %s", e)
+                            outcome = (float("inf"), 0, 0.0)
+                        collect(u, params, outcome)
+
+            n_simulations += stats["simulations"]
+            if stats["reflected"]:
+                log.warning(
+                    "Generation %d: %d proposals reflected into the prior box "
+                    "after %d kernel draws outside it",
+                    generation,
+                    stats["reflected"],
+                    MAX_PROPOSAL_ATTEMPTS,
+                )
+            acceptance = len(accepted) / max(stats["simulations"], 1)
+            if len(accepted) < n_particles:
+                print(
+                    f"Generation {generation}: budget exhausted with "
+                    f"{len(accepted)}/{n_particles} particles, keeping the "
+                    f"previous population"
+                )
+                break
+
+            X = np.array([a[0] for a in accepted])
+            if population is None:
+                weights = np.ones(len(X))
+            else:
+                # Prior is uniform on the cube: w ~ 1 / sum_j w_j K(x | x_j)
+                diff = X[:, None, :] - X_prev[None, :, :]
+                mahalanobis = np.einsum("ijk,kl,ijl->ij", diff, cov_inv, diff)
+                weights = 1 / (np.exp(-0.5 * mahalanobis) @ w_prev)
+            weights /= weights.sum()
+            population = (
+                X,
+                weights,
+                np.array([a[1] for a in accepted]),
+                [a[2] for a in accepted],
+                [a[3] for a in accepted],
+            )
+
+            tolerances.append(tolerance)
+            generations.append(
+                {
+                    "generation": generation,
+                    "tolerance": tolerance,
+                    "accepted": len(accepted),
+                    "simulations": stats["simulations"],
+                    "early_rejected": stats["early_rejected"],
+                    "simulated_years": stats["years"],
+                    "full_years": stats["simulations"] * n_years,
+                    "reflected": stats["reflected"],
+                    "acceptance_rate": acceptance,
+                    "ess": float(1 / np.sum(weights**2)),
+                }
+            )
+            saved = 1 - stats["years"] / max(stats["simulations"] * n_years, 1)
+            print(
+                f"Generation {generation}: tolerance {tolerance:.6f} | "
+                f"accepted {len(accepted)}/{stats['simulations']} | "
+                f"early rejected {stats['early_rejected']} | "
+                f"years saved {saved:.0%} | "
+                f"best {population[2].min():.6f}"
+            )
+
+            if generation > 0 and acceptance < min_acceptance:
+                print(f"Acceptance rate {acceptance:.3f} below {min_acceptance}")
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if population is None:
+        raise RuntimeError("ABC-SMC did not complete a generation")
+
+    X, weights, distances, params_list, times = population
+    particles = [
+        {
+            "params": params,
+            "distance": float(distance),
+            "weight": float(weight),
+            "time": float(trial_time),
+        }
+        for params, distance, weight, trial_time in zip(
+            params_list, distances, weights, times
+        )
+    ]
+    particles.sort(key=lambda p: p["distance"])
+
+    total_time = time.time() - start_time
+    print(f"\n{'='*60}")
+    print(f"ABC-SMC Complete!")
+    print(f"  Total time: {total_time:.1f}s")
+    print(f"  Simulations: {n_simulations}")
+    print(f"  Final tolerance: {tolerances[-1]:.6f}")
+    print(f"  Best distance: {particles[0]['distance']:.6f}")
+    print(f"{'='*60}\n")
+
+    return {
+        "param_space": {k: list(v) for k, v in param_space.items()},
+        "n_years": n_years,
+        "particles": particles,
+        "tolerances": tolerances,
+        "generations": generations,
+    }
+
+
+def posterior_summary(posterior: dict) -> Dict[str, Dict[str, float]]:
+    """Weighted mean, standard deviation and 5/50/95 % quantiles per parameter."""
+    weights = np.array([p["weight"] for p in posterior["particles"]])
+    summary = {}
+    for name in posterior["param_space"]:
+        values = np.array([p["params"][name] for p in posterior["particles"]])
+        order = np.argsort(values)
+        cdf = np.cumsum(weights[order]) / weights.sum()
+        mean = float(np.average(values, weights=weights))
+        summary[name] = {
+            "mean": mean,
+            "std": float(np.sqrt(np.average((values - mean) ** 2, weights=weights))),
+        }
+        for q in (0.05, 0.5, 0.95):
+            index = min(np.searchsorted(cdf, q), len(values) - 1)
+            summary[name][f"q{int(q * 100):02d}"] = float(values[order][index])
+    return summary
+
+
+def save_posterior(posterior: dict, output_path: str):
+    """Save an ``abc_smc`` posterior (particles, weights, schedule) to JSON."""
+    serializable = dict(posterior, summary=posterior_summary(posterior))
+    serializable["particles"] = [
+        dict(p, distance=p["distance"] if np.isfinite(p["distance"]) else 1e10)
+        for p in posterior["particles"]
+    ]
+    with open(output_path, "w") as f:
+        json.dump(serializable, f, indent=2)
+
+    print(f"Posterior saved to: {output_path}")
+
+
 def save_results(results: list, output_path: str):
     """Save calibration results to JSON."""
     serializable_results = []
     for r in results[:10]:
-        serializable_results.append(
-            {
-                "params": {k: float(v) for k, v in r["params"].items()},
-                "objective": (
-                    float(r["objective"]) if r["objective"] != float("inf") else 1e10
-                ),
-                "time": float(r["time"]),
-                "phase": r.get("phase", "unknown"),
-            }
-        )
+        entry = {
+            "params": {k: float(v) for k, v in r["params"].items()},
+            "objective": (
+                float(r["objective"]) if r["objective"] != float("inf") else 1e10
+            ),
+            "time": float(r["time"]),
+            "phase": r.get("phase", "unknown"),
+        }
+        if "fidelity" in r:
+            entry["fidelity"] = r["fidelity"]
+        if "weight" in r:
+            entry["weight"] = float(r["weight"])
+        serializable_results.append(entry)
 
     with open(output_path, "w") as f:
         json.dump(serializable_results, f, indent=2)
@@ -446,6 +1251,70 @@ def save_results(results: list, output_path: str):
 # =============================================================================
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CliMaPan-Lab model calibration")
+    parser.add_argument(
+        "--batchSize",
+        type=int,
+        default=1,
+        help="Candidates evaluated concurrently (1 = serial)",
+    )
+    parser.add_argument(
+        "--halving",
+        action="store_true",
+        help="Multi-fidelity successive halving instead of Bayesian optimization",
+    )
+    parser.add_argument(
+        "--abc",
+        action="store_true",
+        help="ABC-SMC posterior instead of Bayesian optimization",
+    )
+    parser.add_argument(
+        "--particles", type=int, default=100, help="ABC-SMC population size"
+    )
+    parser.add_argument(
+        "--generations", type=int, default=5, help="Maximum ABC-SMC generations"
+    )
+    parser.add_argument(
+        "--candidates",
+        type=int,
+        default=81,
+        help="Candidates in the first successive-halving rung",
+    )
+    parser.add_argument(
+        "--emulator",
+        default=None,
+        help="Objective emulator JSON used to screen candidates (created if missing)",
+    )
+    parser.add_argument(
+        "--emulatorData",
+        nargs="*",
+        default=[],
+        help="Stored evaluations to seed the emulator with "
+        "(calibration_results.json, calibration_eval_ambr047.json, ...)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Process pool size (defaults to --batchSize, or serial with "
+        "--halving/--abc)",
+    )
+    parser.add_argument(
+        "--evalStore",
+        default=DEFAULT_EVALUATION_PATH,
+        help="Shared evaluation database; identical runs are reused "
+        "(empty string to disable)",
+    )
+    parser.add_argument(
+        "--catalog",
+        default=DEFAULT_CATALOG_PATH,
+        help="SQLite run catalog to register completed runs in "
+        "(empty string to disable)",
+    )
+    cli_args = parser.parse_args()
+
+    use_evaluation_store(cli_args.evalStore)
+    use_run_catalog(cli_args.catalog)
     target_data = load_target_data()
 
     # Compute target statistics for reference
@@ -459,13 +1328,63 @@ if __name__ == "__main__":
             print(f"  Trend: {stats['trend']:.4f}")
             print(f"  ACF[1-3]: {stats['acf'][:3]}")
 
-    results = bayesian_optimization(
-        target_data=target_data,
-        n_calls=20,  # 20 trials * 4 mins = ~80 mins
-        n_years=30,  # Match full dataset length
-        n_initial=5,  # Fewer random samples to save time
-        seed=42,
-    )
+    emulator = None
+    if cli_args.emulator:
+        from climapan_lab.analysis.emulator import ObjectiveEmulator, load_evaluations
+
+        emulator = ObjectiveEmulator.open(cli_args.emulator, PARAM_SPACE)
+        for data_path in cli_args.emulatorData:
+            emulator.add_evaluations(
+                load_evaluations(data_path, param_space=PARAM_SPACE),
+                source=os.path.basename(data_path),
+            )
+        print(f"Emulator: {len(emulator)} stored evaluations")
+
+    if cli_args.abc:
+        posterior = abc_smc(
+            target_data=target_data,
+            n_particles=cli_args.particles,
+            n_generations=cli_args.generations,
+            n_years=30,  # Match full dataset length
+            seed=42,
+            n_workers=cli_args.workers or 1,
+        )
+        save_posterior(
+            posterior,
+            os.path.join(
+                os.path.dirname(os.path.abspath(__file__)), "abc_posterior.json"
+            ),
+        )
+        results = [
+            {
+                "params": p["params"],
+                "objective": p["distance"],
+                "time": p["time"],
+                "phase": "abc_smc",
+                "weight": p["weight"],
+            }
+            for p in posterior["particles"]
+        ]
+    elif cli_args.halving:
+        results = successive_halving(
+            target_data=target_data,
+            n_candidates=cli_args.candidates,
+            n_years=30,  # Match full dataset length at full fidelity
+            seed=42,
+            n_workers=cli_args.workers or 1,
+            emulator=emulator,
+        )
+    else:
+        results = bayesian_optimization(
+            target_data=target_data,
+            n_calls=20,  # 20 trials * 4 mins = ~80 mins
+            n_years=30,  # Match full dataset length
+            n_initial=5,  # Fewer random samples to save time
+            seed=42,
+            batch_size=cli_args.batchSize,
+            n_workers=cli_args.workers,
+            emulator=emulator,
+        )
 
     print("\n" + "=" * 60)
     print("Best Parameters Found:")
@@ -6,6 +6,7 @@ Calibrates model parameters against a 2-country dataset using AUTOCORRELATION-BA
 This matches the dynamics/patterns of time series rather than absolute values.
 """
 
+import argparse
 import json
 import os
 import sys
@@ -19,6 +20,7 @@ import pandas as pd
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from climapan_lab.base_params import economic_params as parameters
+from climapan_lab.calibrate_model import successive_halving
 from climapan_lab.src.models import EconModel
 
 # =============================================================================
@@ -327,16 +329,17 @@ def save_results(results: list, output_path: str):
     """Save calibration results to JSON."""
     serializable_results = []
     for r in results[:10]:
-        serializable_results.append(
-            {
-                "params": {k: float(v) for k, v in r["params"].items()},
-                "objective": (
-                    float(r["objective"]) if r["objective"] != float("inf") else 1e10
-                ),
-                "time": float(r["time"]),
-                "phase": r.get("phase", "unknown"),
-            }
-        )
+        entry = {
+            "params": {k: float(v) for k, v in r["params"].items()},
+            "objective": (
+                float(r["objective"]) if r["objective"] != float("inf") else 1e10
+            ),
+            "time": float(r["time"]),
+            "phase": r.get("phase", "unknown"),
+        }
+        if "fidelity" in r:
+            entry["fidelity"] = r["fidelity"]
+        serializable_results.append(entry)
 
     with open(output_path, "w") as f:
         json.dump(serializable_results, f, indent=2)
@@ -347,6 +350,25 @@ def save_results(results: list, output_path: str):
 # =============================================================================
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="CliMaPan-Lab dual-country model calibration"
+    )
+    parser.add_argument(
+        "--halving",
+        action="store_true",
+        help="Multi-fidelity successive halving instead of Monte Carlo sampling",
+    )
+    parser.add_argument(
+        "--candidates",
+        type=int,
+        default=243,
+        help="Candidates in the first successive-halving rung",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Process pool size for --halving"
+    )
+    cli_args = parser.parse_args()
+
     target_data = load_target_data()
 
     if target_data.empty:
@@ -370,12 +392,23 @@ if __name__ == "__main__":
             print(f"  Trend: {stats['trend']:.4f}")
             print(f"  ACF[1-3]: {stats['acf'][:3]}")
 
-    results = monte_carlo_optimization(
-        target_data=target_data,
-        n_calls=100,  # Number of MC trials
-        n_years=30,  # Number of years to simulate matching target length
-        seed=42,
-    )
+    if cli_args.halving:
+        results = successive_halving(
+            target_data=target_data,
+            n_candidates=cli_args.candidates,
+            n_years=30,  # Full-fidelity horizon matching target length
+            seed=42,
+            n_workers=cli_args.workers,
+            param_space=PARAM_SPACE,
+            objective_fn=objective_function,
+        )
+    else:
+        results = monte_carlo_optimization(
+            target_data=target_data,
+            n_calls=100,  # Number of MC trials
+            n_years=30,  # Number of years to simulate matching target length
+            seed=42,
+        )
 
     print("\n" + "=" * 60)
     print("Best Parameters Found:")
@@ -11,45 +11,60 @@ Key Features:
   - Single experiment or batch simulations
   - Multi-parameter sweep capability (Cartesian product)
   - Parallel execution via joblib
-  - Flexible output formats (CSV, NumPy, pickle)
+  - Flexible output formats (CSV, NumPy, compact model artifact, optional pickle)
+  - Background writer overlapping output serialization with the next run
+  - Streaming ensemble statistics over batch and sweep runs (bounded memory)
+  - Figures rendered in a process pool, skipping unchanged ones on re-plot
+  - SQLite run catalog indexing every run by parameters, seed and headline stats
+  - Opt-in per-phase profiling of the model step (--profile)
   - Optional visualization generation
 """
 
 import argparse
+import contextlib
 import copy
 import json
 import os
 import pickle
+import time
 import warnings
 from datetime import datetime
 from itertools import product
 
 import ambr as am
+import matplotlib
 import numpy as np
 import pandas as pd
 from joblib import Parallel, delayed
 
 warnings.filterwarnings("ignore")
 
+from .analysis.ensemble import EnsembleAggregator
 from .base_params import economic_params as parameters
+from .src.logs import configure_logging, run_log
 from .src.models import EconModel
-from .src.utils import (
-    plotBankSummary,
-    plotClimateModuleEffects,
-    plotConsumersSummary,
-    plotConsumptionInflationSummary,
-    plotCovidStatistics,
-    plotEnergyFirmsDemands,
-    plotGoodsFirmSalesSummary,
-    plotGoodsFirmsDemandsSummary,
-    plotGoodsFirmsProfitSummary,
-    plotGoodsFirmWorkersSummary,
+from .src.profiling import format_profile
+from .storage import (
+    DEFAULT_CATALOG_PATH,
+    AsyncWriter,
+    RunCatalog,
+    run_or_submit,
+    save_model_artifact,
+    summary_statistics,
 )
+from .storage.figures import DRAFT_DPI, FigureRenderer, figure_names
 
 # Global variables for variable extraction configuration
 varListNpy = []  # Variables to export as NumPy arrays
 varListCsv = []  # Variables to export as CSV files
 
+# Command-line arguments, background writer for figures, exports and pickles,
+# figure renderer and run catalog (all set up in main)
+args = None
+writer = None
+renderer = None
+catalog = None
+
 
 class AgentPyCompatibleResults:
     """Wrapper to make ambr results compatible with AgentPy structure used in CliMaPan-Lab."""
@@ -64,16 +79,129 @@ class AgentPyCompatibleResults:
             # Also attach agents if needed, though mostly EconModel is used
             if "agents" in ambr_results:
                 setattr(self.variables, "agents", ambr_results["agents"].to_pandas())
+            # Per-phase timings of profiled runs (parameters["profile"])
+            self.profile = ambr_results.get("profile")
         else:
             # Fallback if it's already in the right format or something else
             # If it's already an AgentPy-like object, just assign its variables
             self.variables = (
                 ambr_results.variables if hasattr(ambr_results, "variables") else None
             )
+            self.profile = getattr(ambr_results, "profile", None)
+
+    @classmethod
+    def from_frame(cls, frame):
+        """Wrap an already converted EconModel DataFrame (e.g. a snapshot for plotting)."""
+        results = cls.__new__(cls)
+        results.variables = type("Variables", (), {})()
+        setattr(results.variables, "EconModel", frame)
+        results.profile = None
+        return results
+
+
+# ========================================
+# Output Jobs
+# ========================================
+# These run on the background writer when one is configured, so they only
+# touch the arguments they are given (never the live results object).
+
+
+def _plot_results(frame, save_folder, parameters, covid_plots=True):
+    """Render the standard figure set for one run (queued on the renderer)."""
+    print("Plotting the results...")
+    names = figure_names(parameters, covid_plots)
+    if renderer is not None:
+        renderer.submit(frame, save_folder, names)
+        return
+
+    # Called outside main(): render here and now
+    with FigureRenderer(max_workers=0) as local_renderer:
+        local_renderer.submit(frame, save_folder, names)
+
+
+def _save_npy(filename, values):
+    """Save a recorded column, keeping per-step arrays as nested lists."""
+    np.save(
+        filename,
+        np.array(
+            [
+                (list(i) if ("ndarray" in str(type(i)) and i.shape != ()) else i)
+                for i in values
+            ]
+        ),
+    )
+
+
+def _save_npy_nonnull(filename, values):
+    """Save the non-null entries of a recorded column."""
+    saving_var = np.array([i for i in values if (i is not None)])
+    saving_var = np.array([[i] if "ndarray" in str(type(i)) else i for i in saving_var])
+    np.save(filename, saving_var)
+
+
+def _save_csv(filename, values, strict=True):
+    """Save a recorded column as CSV (ragged arrays may fail unless strict=False)."""
+    try:
+        pd.DataFrame([i for i in values]).to_csv(filename)
+    except Exception:
+        if strict:
+            raise
+
+
+def _save_frame(frame, filename):
+    """Save the remaining DataFrame columns as compressed CSV."""
+    frame.to_csv(filename, compression="gzip")
+
+
+def _save_pickle(obj, filename):
+    """Pickle an object (e.g. the full model) for detailed post-analysis."""
+    with open(filename, "wb") as handle:
+        pickle.dump(obj, handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _expand_panels(frame, panels, unemployment_dole):
+    """
+    Rebuild the full per-agent list columns of change-only panels.
+
+    Only needed for consumers of the full lists (e.g. plots); UnemplDole is
+    derived from the Wage panel as in ``EconModel.update``.
+    """
+    frame = frame.copy()
+    monthly_rows = np.flatnonzero(frame["date"].notna().to_numpy())
+    for name in panels:
+        column = [None] * len(frame)
+        for row, values in zip(monthly_rows, panels[name].to_lists()):
+            column[row] = values
+        frame[name] = pd.Series(column, index=frame.index, dtype=object)
+
+    if "Wage" in panels:
+        frame["UnemplDole"] = [
+            (
+                [w for w in wages if w == unemployment_dole]
+                if isinstance(wages, list)
+                else None
+            )
+            for wages in frame["Wage"]
+        ]
+    return frame
+
+
+def _plot_frame(results, model, parameters):
+    """Snapshot of the results frame for plotting, with panels expanded."""
+    frame = results.variables.EconModel
+    if model.panels is not None:
+        return _expand_panels(frame, model.panels, parameters["unemploymentDole"])
+    return frame
 
 
 def single_run(
-    parameters, idx=0, parent_folder=None, make_stats=False, var_dict=None, args=None
+    parameters,
+    idx=0,
+    parent_folder=None,
+    make_stats=False,
+    var_dict=None,
+    args=None,
+    aggregator=None,
 ):
     """
     Execute a single simulation experiment.
@@ -87,6 +215,7 @@ def single_run(
         make_stats: Whether to collect results for later aggregation
         var_dict: Dictionary to store results across multiple runs
         args: Command-line arguments object
+        aggregator: EnsembleAggregator folding in the results (with make_stats)
 
     Returns:
         AgentPyCompatibleResults object containing simulation outputs
@@ -148,72 +277,52 @@ def single_run(
         save_folder += f"_{timestamp}"
 
     # ===== Model Execution =====
-    model = EconModel(parameters)
-    raw_results = model.run()
+    start = time.perf_counter()
+    with _run_log(save_folder, args):
+        model = EconModel(parameters)
+        raw_results = model.run()
+    wall_time = time.perf_counter() - start
 
     # Wrap results for compatibility
     results = AgentPyCompatibleResults(raw_results)
 
+    # Headline statistics, taken before exported columns are dropped
+    stats = summary_statistics(results.variables.EconModel) if catalog else None
+
     # Ensure output directory exists
     if not os.path.exists(save_folder):
         os.makedirs(save_folder)
 
+    # Change-only per-agent panels (deltaPanels) are stored beside the frame
+    if model.panels is not None:
+        run_or_submit(writer, model.panels.save, f"{save_folder}/panels.npz")
+
+    _save_profile(results, save_folder)
+
     # ===== Visualization Generation =====
+    # Figures are rendered from a snapshot of the full frame, since the exports
+    # below drop columns from the live results object.
     if args and hasattr(args, "plot") and args.plot:
-        print("Plotting the results...")
-
-        # Core economic indicators
-        plotConsumersSummary(results, save_folder)
-        plotConsumptionInflationSummary(results, save_folder)
-        plotBankSummary(results, save_folder)
-
-        # Firm-level analysis
-        plotGoodsFirmsProfitSummary(results, save_folder)
-        plotGoodsFirmsDemandsSummary(results, save_folder)
-        plotGoodsFirmWorkersSummary(results, save_folder)
-        plotGoodsFirmSalesSummary(results, save_folder)
-
-        # Sector-specific plots
-        if parameters["energySectorFlag"]:
-            plotEnergyFirmsDemands(results, save_folder)
-        if parameters["climateModuleFlag"]:
-            plotClimateModuleEffects(results, save_folder)
-        if parameters["covid_settings"]:
-            plotCovidStatistics(results, save_folder)
+        run_or_submit(
+            writer,
+            _plot_results,
+            _plot_frame(results, model, parameters),
+            save_folder,
+            parameters,
+        )
 
     # ===== NumPy Array Export =====
     # Export selected variables as .npy files for exact precision preservation
     if varListNpy is not None and len(varListNpy) > 0:
         for var in varListNpy:
             if var in results.variables.EconModel.columns:
-                # Extract non-null values and preserve array structure
-                saving_var = np.array(
-                    [
-                        i
-                        for i in list(results.variables.EconModel[var.strip()].values)
-                        if (i is not None)
-                    ]
-                )
-                saving_var = np.array(
-                    [[i] if "ndarray" in str(type(i)) else i for i in saving_var]
-                )
-
                 # Save with sanitized filename
                 filename = f"{save_folder}/{''.join(var.strip().split(' '))}.npy"
-                np.save(
+                run_or_submit(
+                    writer,
+                    _save_npy,
                     filename,
-                    np.array(
-                        [
-                            (
-                                list(i)
-                                if ("ndarray" in str(type(i)) and i.shape != ())
-                                else i
-                            )
-                            for i in list(
-                                results.variables.EconModel[var.strip()].values
-                            )
-                        ]
-                    ),
+                    list(results.variables.EconModel[var.strip()].values),
                 )
 
                 # Remove from main DataFrame to reduce memory footprint
@@ -225,30 +334,28 @@ def single_run(
     if varListCsv is not None and len(varListCsv) > 0:
         for var in varListCsv:
             if var in results.variables.EconModel.columns:
-                # Handle array-like values appropriately
-                varList = []
-                for i in results.variables.EconModel[var].values:
-                    if i is not None and "ndarray" in str(type(i)):
-                        varList.append([i])
-                    else:
-                        varList.append(i)
-
-                # Attempt CSV export (may fail for ragged arrays)
-                try:
-                    filename = f"{save_folder}/{''.join(var.strip().split(' '))}.csv"
-                    pd.DataFrame(
-                        [i for i in results.variables.EconModel[var].values]
-                    ).to_csv(filename)
-                except:
-                    pass  # Silently skip problematic columns
+                # CSV export may fail for ragged arrays; such columns are skipped
+                filename = f"{save_folder}/{''.join(var.strip().split(' '))}.csv"
+                run_or_submit(
+                    writer,
+                    _save_csv,
+                    filename,
+                    results.variables.EconModel[var].values,
+                    strict=False,
+                )
 
     # ===== Main Results Export =====
     # Save remaining DataFrame columns as compressed CSV
-    results.variables.EconModel.to_csv(
-        f"{save_folder}/single_run.csv.gz", compression="gzip"
+    run_or_submit(
+        writer,
+        _save_frame,
+        results.variables.EconModel,
+        f"{save_folder}/single_run.csv.gz",
     )
 
     # Collect results for aggregation (parameter sweep mode)
+    if make_stats and aggregator is not None:
+        aggregator.add(results.variables.EconModel, run_id=idx)
     if make_stats and var_dict is not None:
         var_dict[idx] = results.variables.EconModel
 
@@ -262,17 +369,27 @@ def single_run(
         with open(f"{save_folder}/varying_params.txt", "w") as params_file:
             params_file.write(json.dumps(varying_var))
 
+    if catalog is not None:
+        catalog.register(
+            parameters,
+            output_path=save_folder,
+            driver="single_run",
+            wall_time=wall_time,
+            varying_params=varying_var if multi_params else None,
+            stats=stats,
+        )
+
     return results
 
 
-def multi_run(overall_dict, i, save_folder):
+def multi_run(aggregator, i, save_folder):
     """
     Execute one simulation within a multi-run batch.
 
     Handles seed-based reproducibility and per-run output organization.
 
     Args:
-        overall_dict: Shared dictionary to collect results across runs
+        aggregator: EnsembleAggregator collecting statistics across runs
         i: Run index (seeds start at 60 by convention)
         save_folder: Parent directory for all batch runs
     """
@@ -288,47 +405,49 @@ def multi_run(overall_dict, i, save_folder):
         os.makedirs(process_save_path)
 
     # ===== Model Execution =====
-    model = EconModel(parameters)
-    results = model.run()
+    start = time.perf_counter()
+    with _run_log(process_save_path, args):
+        model = EconModel(parameters)
+        results = AgentPyCompatibleResults(model.run())
+    wall_time = time.perf_counter() - start
+
+    if catalog is not None:
+        catalog.register(
+            dict(parameters, seed=i),
+            output_path=process_save_path,
+            driver="multi_run",
+            wall_time=wall_time,
+            variables=results.variables.EconModel,
+        )
+
+    if model.panels is not None:
+        run_or_submit(writer, model.panels.save, f"{process_save_path}/panels.npz")
+
+    _save_profile(results, process_save_path)
 
     # ===== Optional Visualization =====
     if args and hasattr(args, "plot") and args.plot:
-        print("Plotting the results...")
-
-        # Generate all standard plots
-        plotConsumersSummary(results, process_save_path)
-        plotConsumptionInflationSummary(results, process_save_path)
-        plotBankSummary(results, process_save_path)
-        plotGoodsFirmsProfitSummary(results, process_save_path)
-        plotGoodsFirmsDemandsSummary(results, process_save_path)
-        plotGoodsFirmWorkersSummary(results, process_save_path)
-        plotGoodsFirmSalesSummary(results, process_save_path)
-
-        # Conditional plots based on model configuration
-        if parameters["energySectorFlag"]:
-            plotEnergyFirmsDemands(results, process_save_path)
-        if parameters["climateModuleFlag"]:
-            plotClimateModuleEffects(results, process_save_path)
+        run_or_submit(
+            writer,
+            _plot_results,
+            _plot_frame(results, model, parameters),
+            process_save_path,
+            parameters,
+            covid_plots=False,
+        )
 
     # ===== NumPy Export =====
     if varListNpy is not None and len(varListNpy) > 0:
         for var in varListNpy:
             if var in results.variables.EconModel.columns:
-                # Extract and structure data for NumPy storage
-                saving_var = np.array(
-                    [
-                        i
-                        for i in list(results.variables.EconModel[var.strip()].values)
-                        if (i is not None)
-                    ]
-                )
-                saving_var = np.array(
-                    [[i] if "ndarray" in str(type(i)) else i for i in saving_var]
-                )
-
-                # Save and remove from DataFrame
+                # Save non-null entries and remove from DataFrame
                 filename = f"{process_save_path}/{''.join(var.strip().split(' '))}.npy"
-                np.save(filename, saving_var)
+                run_or_submit(
+                    writer,
+                    _save_npy_nonnull,
+                    filename,
+                    list(results.variables.EconModel[var.strip()].values),
+                )
                 results.variables.EconModel = results.variables.EconModel.drop(
                     columns=[var.strip()]
                 )
@@ -337,26 +456,94 @@ def multi_run(overall_dict, i, save_folder):
     if varListCsv is not None and len(varListCsv) > 0:
         for var in varListCsv:
             if var in results.variables.EconModel.columns:
-                # Prepare data for CSV export
-                varList = []
-                for i in results.variables.EconModel[var].values:
-                    if i is not None and "ndarray" in str(type(i)):
-                        varList.append([i])
-                    else:
-                        varList.append(i)
-
                 filename = f"{process_save_path}/{''.join(var.strip().split(' '))}.csv"
-                pd.DataFrame(
-                    [i for i in results.variables.EconModel[var].values]
-                ).to_csv(filename)
+                run_or_submit(
+                    writer, _save_csv, filename, results.variables.EconModel[var].values
+                )
 
     # ===== Model Persistence =====
-    # Pickle the entire model object for detailed post-analysis
-    with open(f"{process_save_path}/model_run_{i-60}.pickle", "wb") as handle:
-        pickle.dump(model, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    # Compact, versioned end-of-run state (readable without the model classes)
+    run_or_submit(
+        writer,
+        save_model_artifact,
+        model,
+        f"{process_save_path}/model_run_{i-60}.npz",
+        extra={"run": i - 60, "seed": i},
+    )
+
+    # Pickle the entire model object only on request (large and slow)
+    if args and getattr(args, "pickleModel", False):
+        run_or_submit(
+            writer,
+            _save_pickle,
+            model,
+            f"{process_save_path}/model_run_{i-60}.pickle",
+        )
+
+    # Fold the run into the batch statistics
+    aggregator.add(results.variables.EconModel, run_id=f"Run_0{i-60}")
+
 
-    # Store results for batch aggregation
-    overall_dict[f"Run_0{i-60}"] = results.variables.EconModel
+def _run_log(save_folder, args):
+    """Send the model's log records to run.log in the run folder, if requested."""
+    if args is not None and getattr(args, "logToRunFolder", False):
+        return run_log(os.path.join(save_folder, "run.log"))
+    return contextlib.nullcontext()
+
+
+def _save_profile(results, save_folder):
+    """Print the phase timings of a profiled run and save them as profile.json."""
+    if results.profile is None:
+        return
+    print(format_profile(results.profile))
+    with open(f"{save_folder}/profile.json", "w") as profile_file:
+        json.dump(results.profile, profile_file, indent=1)
+
+
+def _save_ensemble(aggregator, save_folder):
+    """Write the per-variable, per-month statistics and any kept runs."""
+    aggregator.save(f"{save_folder}/ensemble_summary.csv.gz")
+    if aggregator.keep_runs:
+        # Full per-run data in a single DataFrame
+        result = aggregator.runs_frame()
+        result = result.rename(columns={"Unnamed: 0": "RunNo"})
+        result.to_csv(f"{save_folder}/multi_runs.csv.gz", compression="gzip")
+
+
+def _close_writer():
+    """Wait for pending background writes and shut the writer down."""
+    global writer
+    if writer is not None:
+        print("Waiting for pending writes...")
+        writer.close()
+        writer = None
+
+
+def _close_renderer():
+    """Wait for the queued figures and shut the render pool down.
+
+    Failed figures are logged by the renderer; they do not fail the run,
+    whose results are already written.
+    """
+    global renderer
+    if renderer is not None:
+        print("Waiting for figures...")
+        try:
+            renderer.close(raise_errors=False)
+        finally:
+            print(
+                f"Figures: {renderer.rendered} rendered, {renderer.skipped} unchanged, "
+                f"{len(renderer.errors)} failed"
+            )
+            renderer = None
+
+
+def _close_catalog():
+    """Close the run catalog opened by main()."""
+    global catalog
+    if catalog is not None:
+        catalog.close()
+        catalog = None
 
 
 def main():
@@ -424,11 +611,73 @@ def main():
     parser.add_argument(
         "-p", "--plot", action="store_true", help="Generate visualization plots"
     )
+    parser.add_argument(
+        "--plotWorkers",
+        type=int,
+        default=None,
+        help="Processes rendering figures (default: one per CPU but one, 0=render in the simulating process)",
+    )
+    parser.add_argument(
+        "--plotDraft",
+        action="store_true",
+        help=f"Render figures at {DRAFT_DPI} dpi for a quick look",
+    )
+    parser.add_argument(
+        "--forcePlot",
+        action="store_true",
+        help="Render every figure even if its inputs are unchanged",
+    )
+    parser.add_argument(
+        "--pickleModel",
+        action="store_true",
+        help="Also pickle the full model of each batch run (default: compact .npz artifact only)",
+    )
+    parser.add_argument(
+        "--writerQueueSize",
+        type=int,
+        default=8,
+        help="Max finished runs waiting to be written in the background (0=write synchronously)",
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time every model phase and helper; prints a table and saves profile.json per run",
+    )
+
+    parser.add_argument(
+        "--logLevel",
+        type=str,
+        default="WARNING",
+        help="Console log level of the model and its agents (e.g. INFO, DEBUG)",
+    )
+    parser.add_argument(
+        "--logToRunFolder",
+        action="store_true",
+        help="Write the log records of each run to run.log in its folder instead of the console",
+    )
+
+    parser.add_argument(
+        "--keepRuns",
+        action="store_true",
+        help="Also keep every run's frame in memory and write multi_runs.csv.gz (memory grows with the number of runs)",
+    )
+
+    parser.add_argument(
+        "--catalog",
+        type=str,
+        default=DEFAULT_CATALOG_PATH,
+        help="SQLite run catalog to register runs in (empty string to disable)",
+    )
 
     # Make args globally accessible for nested functions
     global args
     args = parser.parse_args()
 
+    if args.plot:
+        # Figures never need a GUI backend
+        matplotlib.use("Agg")
+
     # ========================================
     # Parameter Configuration
     # ========================================
@@ -439,6 +688,13 @@ def main():
     if args.covidSettings:
         parameters["covid_settings"] = args.covidSettings.strip()
 
+    if args.profile:
+        parameters["profile"] = True
+
+    # verboseFlag prints the debug records of all subsystems; the level is
+    # process-wide, so it is set here and not by each model
+    configure_logging("DEBUG" if parameters.get("verboseFlag") else args.logLevel)
+
     # ========================================
     # Variable Export List Loading
     # ========================================
@@ -472,6 +728,34 @@ def main():
     globals()["varListNpy"] = varListNpy
     globals()["varListCsv"] = varListCsv
 
+    # ========================================
+    # Background Writer
+    # ========================================
+    # Figures and exports are written while the next simulation runs
+    global writer
+    if args.writerQueueSize > 0:
+        # Figures are rendered off the main thread, which needs a non-GUI backend
+        matplotlib.use("Agg")
+        writer = AsyncWriter(max_queue=args.writerQueueSize)
+
+    # ========================================
+    # Run Catalog
+    # ========================================
+    global catalog
+    if args.catalog:
+        catalog = RunCatalog(args.catalog)
+
+    # ========================================
+    # Figure Renderer
+    # ========================================
+    global renderer
+    if args.plot:
+        renderer = FigureRenderer(
+            max_workers=args.plotWorkers,
+            dpi=DRAFT_DPI if args.plotDraft else None,
+            force=args.forcePlot,
+        )
+
     # ========================================
     # Execution Mode Selection
     # ========================================
@@ -485,7 +769,7 @@ def main():
 
         if count == 0:
             # Standard single run
-            single_run(parameters)
+            single_run(parameters, args=args)
         else:
             # ===== Parameter Sweep Mode =====
             print("Entering multi-parameter sweep mode...")
@@ -528,7 +812,8 @@ def main():
             if not os.path.exists(parent_folder):
                 os.makedirs(parent_folder)
 
-            var_dict = {}
+            # Statistics across the combinations, folded in as they finish
+            aggregator = EnsembleAggregator(keep_runs=args.keepRuns)
 
             # Execute all combinations in parallel
             Parallel(n_jobs=-1, prefer="threads")(
@@ -537,16 +822,20 @@ def main():
                     idx,
                     parent_folder=parent_folder,
                     make_stats=True,
-                    var_dict=var_dict,
                     args=args,
+                    aggregator=aggregator,
                 )
                 for idx, params in enumerate(parameters_combinations)
             )
+            _save_ensemble(aggregator, parent_folder)
 
             # Save base parameter configuration
             with open(f"{parent_folder}/params.txt", "w") as params_file:
                 params_file.write(json.dumps(parameters))
 
+        _close_writer()
+        _close_renderer()
+        _close_catalog()
         print("Simulation completed.")
 
     elif args.noOfRuns > 1:
@@ -557,8 +846,9 @@ def main():
         count = sum(1 for v in parameters.values() if isinstance(v, list))
 
         if count == 0:
-            # Standard multi-run over seeds
-            overall_dict = {}
+            # Standard multi-run over seeds; runs are folded into running
+            # statistics and only kept in memory with --keepRuns
+            aggregator = EnsembleAggregator(keep_runs=args.keepRuns)
             timestamp = datetime.timestamp(datetime.now())
 
             # Configure output directory with appropriate naming
@@ -581,14 +871,11 @@ def main():
 
             # Execute runs in parallel (seeds 60 to 60+N-1)
             Parallel(n_jobs=-1, prefer="threads")(
-                delayed(multi_run)(overall_dict, i, save_folder)
+                delayed(multi_run)(aggregator, i, save_folder)
                 for i in range(60, 60 + args.noOfRuns)
             )
 
-            # Aggregate results into single DataFrame
-            result = pd.concat(overall_dict)
-            result = result.rename(columns={"Unnamed: 0": "RunNo"})
-            result.to_csv(f"{save_folder}/multi_runs.csv.gz", compression="gzip")
+            _save_ensemble(aggregator, save_folder)
 
             # Save parameter configuration
             with open(f"{save_folder}/params.txt", "w") as params_file:
@@ -599,6 +886,9 @@ def main():
             print("ERROR: Parameter sweeps are not supported in multi-run mode.")
             print("Please use either parameter sweeps OR multiple runs, not both.")
 
+        _close_writer()
+        _close_renderer()
+        _close_catalog()
         print("Batch simulation completed.")
 
 
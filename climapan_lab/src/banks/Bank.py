@@ -4,7 +4,10 @@ from collections import OrderedDict
 import ambr as am
 import numpy as np
 import numpy.random as random
-import pandas as pd
+
+from ..logs import get_logger
+
+log = get_logger("banks")
 
 
 class Bank(am.Agent):
@@ -61,19 +64,20 @@ class Bank(am.Agent):
                 )
             )
         except ValueError as e:
-            print(f"Error concatenating defaultProb: {e}")
-            print(
-                f"updateCSFList.defaultProb: {updateCSFList.defaultProb}, type: {type(updateCSFList.defaultProb)}, shape: {getattr(updateCSFList.defaultProb, 'shape', 'N/A')}"
-            )
-            print(
-                f"updateCPList.defaultProb: {updateCPList.defaultProb}, type: {type(updateCPList.defaultProb)}, shape: {getattr(updateCPList.defaultProb, 'shape', 'N/A')}"
-            )
-            print(
-                f"greenEFirm.defaultProb: {self.model.greenEFirm.defaultProb}, type: {type(self.model.greenEFirm.defaultProb)}, shape: {getattr(self.model.greenEFirm.defaultProb, 'shape', 'N/A')}"
-            )
-            print(
-                f"brownEFirm.defaultProb: {self.model.brownEFirm.defaultProb}, type: {type(self.model.brownEFirm.defaultProb)}, shape: {getattr(self.model.brownEFirm.defaultProb, 'shape', 'N/A')}"
-            )
+            log.error("Error concatenating defaultProb: %s", e)
+            for name, probs in (
+                ("updateCSFList", updateCSFList.defaultProb),
+                ("updateCPList", updateCPList.defaultProb),
+                ("greenEFirm", self.model.greenEFirm.defaultProb),
+                ("brownEFirm", self.model.brownEFirm.defaultProb),
+            ):
+                log.error(
+                    "%s.defaultProb: %s, type: %s, shape: %s",
+                    name,
+                    probs,
+                    type(probs),
+                    getattr(probs, "shape", "N/A"),
+                )
             raise e
         self.orderedAgentsInterests = np.concatenate(
             [
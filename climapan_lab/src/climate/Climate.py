@@ -3,6 +3,10 @@ import copy
 import ambr as am
 import numpy as np
 
+from ..logs import get_logger
+
+log = get_logger("climate")
+
 # ============================================================================
 #                             Climate Module
 # ============================================================================
@@ -120,8 +124,7 @@ class Climate(am.Agent):
     def initGDP(self, GDP):
         """Store baseline GDP for normalization in damage functions or shock scaling."""
         self.GDP_t0 = GDP
-        if self.p.verboseFlag:
-            print("initial GDP", self.GDP_t0)
+        log.debug("Initial GDP %s", self.GDP_t0)
 
     def initAggregatedIncome(self):
         """Store baseline aggregate income (wage + non-wage) for later shock scaling."""
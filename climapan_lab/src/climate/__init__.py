@@ -1 +1,2 @@
 from .Climate import Climate
+from .replay import replay_climate
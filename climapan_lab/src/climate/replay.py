@@ -0,0 +1,154 @@
+"""
+CliMaPan-Lab: Climate-Pandemic Economic Modeling Laboratory
+Climate Replay
+
+The ``Climate`` agent only hears from the economy through the emissions of
+the firms (``step_EM`` per month, accumulated into ``EM``). Without climate
+shocks nothing flows back, so the concentration, forcing and temperature
+paths of a run are a deterministic function of its emission path and the
+climate parameters. Sweeping ``climateSensitivity``, ``climateAlpha_conc``,
+``climateBeta_conc`` or ``climateGammaRF`` therefore does not need the
+economy to be simulated again. ``replay_climate`` reruns the recursion of
+``Climate.progress`` over a recorded ``Climate EM Stepwise`` series for any
+number of parameter sets at once (one NumPy vector per month):
+
+    CO2_t  = log10(zb EM_t) / log10(log10(zb EM_t) 1e9 + offset) 1e9 + offset
+    conc_t = (conc_{t-1} + alpha_c CO2_t) - beta_c (... - conc_pre)
+    RF_t   = gammaRF log10(conc_t / conc_t0)
+    T_t    = (1 - 1/phi) T_{t-1} + (1/phi) CS / (5.35 ln 2) RF_t
+
+with ``phi = max(alpha_phi + beta_phiL CS + beta_phiQ CS^2, 1)``. The results
+match the model's ``Climate C02``, ``Climate C02 Concentration``, ``Climate
+Radiative Forcing`` and ``Climate Temperature`` records when climate shocks
+are disabled. The cumulative emissions are the running sum of the stepwise
+ones; the lump-sum green emissions of the ``S3MOD`` fiscal scenario are not in
+``step_EM``, so pass the recorded ``Climate EM`` series as ``cumulative`` for
+those runs.
+"""
+
+import numpy as np
+
+# Parameters read by the recursion (everything else in Climate only matters
+# for shocks and damages)
+REPLAY_PARAMS = (
+    "climateZetaBeta",
+    "CO2_offset",
+    "climateAlpha_conc",
+    "climateBeta_conc",
+    "climateConc_t0",
+    "climateConc_pre",
+    "climateGammaRF",
+    "climateSensitivity",
+    "climateAlpha_phi",
+    "climateBeta_phiL",
+    "climateBeta_phiQ",
+    "climateT0",
+)
+
+REPLAY_OUTPUTS = (
+    "Climate C02",
+    "Climate C02 Concentration",
+    "Climate Radiative Forcing",
+    "Climate Temperature",
+)
+
+
+def recorded_emissions(frame, name="Climate EM Stepwise"):
+    """
+    Monthly values of a recorded climate series as a float array.
+
+    Args:
+        frame: Model records (polars or pandas frame, or ``{name: values}``)
+        name: Recorded variable (``Climate EM Stepwise`` or ``Climate EM``)
+    """
+    values = frame[name]
+    if hasattr(values, "drop_nulls"):
+        values = values.drop_nulls().to_list()
+    elif hasattr(values, "dropna"):
+        values = values.dropna().tolist()
+    # Climate records are 1-element arrays per month
+    return np.array([np.sum(v) for v in values if v is not None], dtype=float)
+
+
+def replay_climate(emissions, param_sets=None, base_params=None, cumulative=None):
+    """
+    Evaluate the climate recursion for many parameter sets at once.
+
+    Args:
+        emissions: Monthly stepwise emissions, shape ``(T,)`` shared by all
+            sets or ``(K, T)`` per set
+        param_sets: ``{name: value or (K,) array}`` (dict or DataFrame) of the
+            ``REPLAY_PARAMS`` to vary; the rest come from ``base_params``
+        base_params: Parameter dict of the recorded run (defaults to
+            ``src.params.parameters``)
+        cumulative: Recorded cumulative emissions (``Climate EM``), used
+            instead of the running sum of ``emissions`` when given
+
+    Returns:
+        ``{output name: (K, T) array}`` for ``REPLAY_OUTPUTS``
+    """
+    if base_params is None:
+        from ..params import parameters as base_params
+
+    param_sets = param_sets if param_sets is not None else {}
+    unknown = set(param_sets.keys()) - set(REPLAY_PARAMS)
+    if unknown:
+        raise ValueError(f"Not climate replay parameters: {sorted(unknown)}")
+
+    # One column per parameter set, broadcast against the time axis
+    p = {
+        name: np.asarray(
+            param_sets[name] if name in param_sets else base_params[name],
+            dtype=float,
+        ).reshape(-1, 1)
+        for name in REPLAY_PARAMS
+    }
+    n_sets = max(len(v) for v in p.values())
+    if any(len(v) not in (1, n_sets) for v in p.values()):
+        raise ValueError("Parameter arrays must all have the same length")
+
+    emissions = np.atleast_2d(np.asarray(emissions, dtype=float))
+    if cumulative is None:
+        cumulative = np.cumsum(emissions, axis=-1)
+    cumulative = np.atleast_2d(np.asarray(cumulative, dtype=float))
+    n_steps = cumulative.shape[-1]
+    shape = (max(n_sets, cumulative.shape[0]), n_steps)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_em = np.log10(p["climateZetaBeta"] * cumulative)
+        co2 = np.broadcast_to(
+            log_em / np.log10(log_em * 1e9 + p["CO2_offset"]) * 1e9 + p["CO2_offset"],
+            shape,
+        )
+
+        alpha_c = p["climateAlpha_conc"][:, 0]
+        beta_c = p["climateBeta_conc"][:, 0]
+        conc_pre = p["climateConc_pre"][:, 0]
+        conc_t0 = p["climateConc_t0"][:, 0]
+        gamma_rf = p["climateGammaRF"][:, 0]
+        cs = p["climateSensitivity"][:, 0]
+        phi = np.maximum(
+            p["climateAlpha_phi"][:, 0]
+            + p["climateBeta_phiL"][:, 0] * cs
+            + p["climateBeta_phiQ"][:, 0] * cs**2,
+            1,
+        )
+        temp_gain = (1 / phi) * cs / (5.35 * np.log(2))
+
+        conc_out = np.empty(shape)
+        rf_out = np.empty(shape)
+        temp_out = np.empty(shape)
+        conc = np.broadcast_to(conc_t0, shape[:1]).astype(float)
+        temp = np.broadcast_to(p["climateT0"][:, 0], shape[:1]).astype(float)
+        for t in range(n_steps):
+            conc = conc + alpha_c * co2[:, t]
+            conc = conc - beta_c * (conc - conc_pre)
+            rf = gamma_rf * np.log10(conc / conc_t0)
+            temp = (1 - 1 / phi) * temp + temp_gain * rf
+            conc_out[:, t] = conc
+            rf_out[:, t] = rf
+            temp_out[:, t] = temp
+
+    return dict(
+        zip(REPLAY_OUTPUTS, (np.array(co2), conc_out, rf_out, temp_out)),
+    )
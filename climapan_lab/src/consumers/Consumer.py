@@ -5,7 +5,7 @@ import ambr as am
 import numpy as np
 import numpy.random as random
 
-from ..utils import lognormal
+from ..sim_utils import lognormal
 
 # ============================================================================
 #                           Consumer Agent
@@ -4,11 +4,13 @@ from collections import OrderedDict
 import ambr as am
 import numpy as np
 import numpy.random as random
-from scipy.optimize import minimize
 
-from ..utils import days_in_month
+from ..logs import get_logger
+from ..sim_utils import days_in_month
 from .GoodsFirmBase import GoodsFirmBase
 
+log = get_logger("firms")
+
 # ============================================================================
 #                           CapitalGoodsFirm
 # ============================================================================
@@ -148,13 +150,7 @@ class CapitalGoodsFirm(GoodsFirmBase):
         labour_input = self.labour_demand
         capital_input = self.get_capital()
         energy_input = self.get_energy()
-        if self.p.verboseFlag:
-            print(
-                "capital input",
-                self.get_energy(),
-                self.labour_demand,
-                self.get_capital(),
-            )
+        log.debug("capital input %s %s %s", energy_input, labour_input, capital_input)
 
         # Gross output from production function, reduced by sickness
         production_value = self.production_function(
@@ -201,10 +197,11 @@ class CapitalGoodsFirm(GoodsFirmBase):
 
         self.countWorkers = self.getNumberOfLabours()
 
-        if self.p.verboseFlag:
-            print(
-                f"Number of workers in Capital Goods Firm no. {self.id - self.p.c_agents - self.p.csf_agents - 1 - 1} is {self.countWorkers}"
-            )
+        log.debug(
+            "Number of workers in Capital Goods Firm no. %s is %s",
+            self.id - self.p.c_agents - self.p.csf_agents - 1 - 1,
+            self.countWorkers,
+        )
 
         # Update loan payback / carbon surcharge into price if applicable
         self.progressPayback()
@@ -1,14 +1,17 @@
 import copy
+import logging
 from collections import OrderedDict
 
 import ambr as am
 import numpy as np
 import numpy.random as random
-from scipy.optimize import minimize
 
-from ..utils import days_in_month
+from ..logs import get_logger
+from ..sim_utils import days_in_month
 from .GoodsFirmBase import GoodsFirmBase
 
+log = get_logger("firms")
+
 # ============================================================================
 #                           ConsumerGoodsFirm
 # ============================================================================
@@ -158,8 +161,7 @@ class ConsumerGoodsFirm(GoodsFirmBase):
             for aConsumer in self.consumersList
             if aConsumer.id in workers_set
         )
-        if self.p.verboseFlag:
-            print("sick leave", aggSickLeaves)
+        log.debug("Sick leave %s", aggSickLeaves)
 
         # Fraction of hours lost
         if len(self.workersList) > 0:
@@ -168,8 +170,7 @@ class ConsumerGoodsFirm(GoodsFirmBase):
             )
         else:
             sick_ratio = 0
-        if self.p.verboseFlag:
-            print("sick ratio", sick_ratio)
+        log.debug("Sick ratio %s", sick_ratio)
 
         # Inputs for the period
         labour_input = self.labour_demand
@@ -227,24 +228,24 @@ class ConsumerGoodsFirm(GoodsFirmBase):
 
         self.countWorkers = self.getNumberOfLabours()
 
-        if self.p.verboseFlag:
-            print(
-                f"Number of workers in Consumer Goods Firm no. {self.id - self.p.c_agents - self.p.csf_agents - 1 - 1} is {self.countWorkers}"
-            )
+        log.debug(
+            "Number of workers in Consumer Goods Firm no. %s is %s",
+            self.id - self.p.c_agents - self.p.csf_agents - 1 - 1,
+            self.countWorkers,
+        )
 
         # Update loan payback / carbon surcharge if applicable
         self.progressPayback()
 
         # printing firm report
-        if self.p.verboseFlag:
-            print()
-            print("Activity Report for firm", self.id, ":")
-            print("........................................")
+        verbose = log.isEnabledFor(logging.DEBUG)
+        if verbose:
+            log.debug("Activity Report for firm %s:", self.id)
 
         # Calculating Profit
-        if self.p.verboseFlag:
-            print(
-                "loan payback",
+        if verbose:
+            log.debug(
+                "loan payback %s, deposit %s, production cost %s",
                 self.payback,
                 self.deposit,
                 self.get_average_production_cost() * self.get_actual_production(),
@@ -274,33 +275,31 @@ class ConsumerGoodsFirm(GoodsFirmBase):
         # Owner payout = fraction of positive net profit
         self.ownerIncome = np.max([0, self.net_profit * self.div_ratio])
 
-        if self.p.verboseFlag:
-            print("deposit before", self.deposit)
+        if verbose:
+            log.debug("deposit before %s", self.deposit)
 
         # Retained earnings = net profit - ownerIncome
         self.updateDeposit(self.net_profit - self.ownerIncome)
 
-        if self.p.verboseFlag:
-            print("deposit after", self.deposit)
-            print("networth", self.netWorth)
-            print("production and sale", self.actual_production, self.sale_record)
-            print("profit", self.profits, self.net_profit)
-            print(
-                "owner income",
+        if verbose:
+            log.debug("deposit after %s", self.deposit)
+            log.debug("networth %s", self.netWorth)
+            log.debug(
+                "production and sale %s %s", self.actual_production, self.sale_record
+            )
+            log.debug("profit %s, net profit %s", self.profits, self.net_profit)
+            log.debug(
+                "owner income %s, deposit %s, total cost %s",
                 self.ownerIncome,
-                "deposit",
                 self.deposit,
-                "total cost",
                 self.get_average_production_cost() * self.get_actual_production(),
             )
-            print("DTE", self.DTE)
-            print(
-                "loan list",
+            log.debug("DTE %s", self.DTE)
+            log.debug(
+                "loan list %s %s, loan demand %s, loan granted %s",
                 sum(self.loanList),
                 self.loanList,
-                "loan demand",
                 self.loan_demand,
-                "loan granted",
                 self.loanObtained,
             )
 
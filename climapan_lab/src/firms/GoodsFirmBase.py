@@ -4,9 +4,11 @@ from collections import OrderedDict
 import ambr as am
 import numpy as np
 import numpy.random as random
-from scipy.optimize import minimize
 
-from ..utils import days_in_month
+from ..logs import get_logger
+from ..sim_utils import days_in_month
+
+log = get_logger("firms")
 
 # ============================================================================
 #                           GoodsFirmBase
@@ -148,7 +150,7 @@ class GoodsFirmBase(am.Agent):
     # ========================================
     def bankrupt_reset(self):
         """Reset firm state after bankruptcy"""
-        print("firm get bankrupt!!!", self.id)
+        log.info("Firm %s went bankrupt", self.id)
         self.netWorth = 0
         self.loanObtained = 0
         self.loanList = [0, 0]
@@ -593,8 +595,7 @@ class GoodsFirmBase(am.Agent):
         else:
             self.payback = 0
 
-        if self.p.verboseFlag:
-            print("payback value", self.payback)
+        log.debug("payback value %s", self.payback)
 
         # Carbon tax pass-through into price if brown and CT active
         brown_firm_coefficient = (
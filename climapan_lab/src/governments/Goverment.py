@@ -1,7 +1,6 @@
 # Government
 import ambr as am
 import numpy as np
-import pandas as pd
 
 
 class Government(am.Agent):
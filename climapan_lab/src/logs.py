@@ -0,0 +1,156 @@
+"""
+CliMaPan-Lab: Climate-Pandemic Economic Modeling Laboratory
+Logging
+
+The model and the drivers log through one ``logging`` logger per subsystem
+(``climapan_lab.model``, ``climapan_lab.firms``, ``climapan_lab.covid``, ...;
+see ``get_logger``). Messages use ``%``-style arguments, so nothing is
+formatted unless a handler will emit the record, and debug output that needs
+extra computation is guarded by ``log.isEnabledFor(logging.DEBUG)``. Without
+configuration only warnings reach the console (Python's default), so a
+disabled message costs one cached level check.
+
+``configure_logging`` sets the console level (globally or per subsystem).
+``run_log`` sends the records of one run to a file in its run folder instead
+of the console: records are routed by the thread that emits them, so runs
+executing side by side in threads, or in separate worker processes, each get
+their own file.
+"""
+
+import contextlib
+import logging
+import os
+import threading
+
+LOGGER_NAME = "climapan_lab"
+SUBSYSTEMS = (
+    "model",
+    "firms",
+    "banks",
+    "covid",
+    "climate",
+    "policy",
+    "plots",
+    "storage",
+    "calibration",
+    "validation",
+)
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+def get_logger(subsystem):
+    """Logger of one subsystem (``climapan_lab.<subsystem>``)."""
+    return logging.getLogger(f"{LOGGER_NAME}.{subsystem}")
+
+
+class _RunRouter(logging.Handler):
+    """Sends each record to the file of the run active on its thread."""
+
+    def __init__(self):
+        super().__init__()
+        self.files = {}
+
+    def emit(self, record):
+        handler = self.files.get(record.thread)
+        if handler is not None:
+            handler.handle(record)
+
+
+_lock = threading.Lock()
+_router = None
+_console = None
+# Console levels: None is the default, other keys are subsystems
+_console_levels = {None: logging.WARNING}
+
+
+def _level(value):
+    """Level number of a name such as ``"info"`` (numbers pass through)."""
+    if isinstance(value, int):
+        return value
+    level = logging.getLevelName(str(value).upper())
+    if not isinstance(level, int):
+        raise ValueError(f"Unknown log level: {value}")
+    return level
+
+
+def _console_filter(record):
+    # Records of runs logging to a file stay off the console
+    if record.thread in _router.files:
+        return False
+    subsystem = record.name[len(LOGGER_NAME) + 1 :].split(".")[0]
+    level = _console_levels.get(subsystem, _console_levels[None])
+    return record.levelno >= level
+
+
+def _package_logger():
+    """The package logger, with the console and run-file handlers installed."""
+    global _router, _console
+    logger = logging.getLogger(LOGGER_NAME)
+    if _router is None:
+        _router = _RunRouter()
+        _console = logging.StreamHandler()
+        _console.setFormatter(logging.Formatter(LOG_FORMAT))
+        _console.addFilter(_console_filter)
+        logger.addHandler(_router)
+        logger.addHandler(_console)
+        # The package prints its own records; avoid duplicates via the root
+        logger.propagate = False
+        _update_level(logger)
+    return logger
+
+
+def _update_level(logger):
+    # Let through what the console or any run file wants
+    levels = list(_console_levels.values())
+    levels += [handler.level for handler in _router.files.values()]
+    logger.setLevel(min(levels))
+
+
+def configure_logging(level=logging.WARNING, subsystems=None, fmt=LOG_FORMAT):
+    """
+    Print package log records of at least ``level`` to the console (stderr).
+
+    Can be called repeatedly, e.g. once per worker process.
+
+    Args:
+        level: Console level (name or number)
+        subsystems: Optional ``{subsystem: level}`` console overrides
+        fmt: Record format
+    """
+    with _lock:
+        logger = _package_logger()
+        _console_levels.clear()
+        _console_levels[None] = _level(level)
+        for name, sub_level in (subsystems or {}).items():
+            _console_levels[name] = _level(sub_level)
+        _console.setFormatter(logging.Formatter(fmt))
+        _update_level(logger)
+    return logger
+
+
+@contextlib.contextmanager
+def run_log(path, level=logging.INFO, fmt=LOG_FORMAT):
+    """
+    Log the records emitted on this thread to ``path`` instead of the console.
+
+    Args:
+        path: Log file (its folder is created if needed)
+        level: Lowest level written to the file
+        fmt: Record format
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    handler = logging.FileHandler(path)
+    handler.setLevel(_level(level))
+    handler.setFormatter(logging.Formatter(fmt))
+    thread = threading.get_ident()
+    with _lock:
+        logger = _package_logger()
+        _router.files[thread] = handler
+        _update_level(logger)
+    try:
+        yield handler
+    finally:
+        with _lock:
+            del _router.files[thread]
+            _update_level(logger)
+        handler.close()
@@ -7,7 +7,9 @@ simulation with climate and pandemic dynamics.
 """
 
 import copy
+import logging
 import math
+import time
 from collections import OrderedDict
 from datetime import date, timedelta
 
@@ -22,7 +24,22 @@ from .firms.CapitalGoodsFirm import CapitalGoodsFirm
 from .firms.ConsumerGoodsFirm import ConsumerGoodsFirm
 from .firms.GreenEnergyFirm import GreenEnergyFirm
 from .governments.Goverment import Government
-from .utils import _merge_edgelist, gini, listToArray, lognormal, normal
+from .logs import get_logger
+from .sim_utils import (
+    CONSUMER_TYPES,
+    _merge_edgelist,
+    gini,
+    listToArray,
+    lognormal,
+    normal,
+    sample_panel,
+)
+from .sketches import DEFAULT_ACCURACY, SKETCH_SUFFIX, DistributionSketch
+
+log = get_logger("model")
+covid_log = get_logger("covid")
+climate_log = get_logger("climate")
+policy_log = get_logger("policy")
 
 # ============================================================================
 #                              EconModel
@@ -48,6 +65,7 @@ class EconModel(am.Model):
 
     def setup(self):
         """Initialize the agents and network of the model."""
+        setup_start = time.perf_counter()
 
         # ----------------------------------------
         # Global / simulation-wide state
@@ -115,6 +133,13 @@ class EconModel(am.Model):
         self.month_no = 0
         self.demand_fluctuation = 0
 
+        # --- Change-only per-agent panels (None = record full lists) ---
+        self.panels = None
+        if self.p.get("deltaPanels", False):
+            from ..storage.panels import PanelSet
+
+            self.panels = PanelSet(self.p.get("panelKeyframeInterval", 12))
+
         # --- Initial endowments & policy multipliers ---
         self.owner_endownment = self.p.owner_endownment
         self.worker_endownment = self.p.worker_endownment
@@ -190,6 +215,22 @@ class EconModel(am.Model):
             self.aliveConsumers.isDead() != True
         )
 
+        # Representative micro panel: per-consumer series are only recorded
+        # for these ids (None = record every consumer)
+        self.micro_panel = None
+        if self.p.get("panelSize"):
+            panel_seed = self.p.get("panelSeed")
+            self.micro_panel = sample_panel(
+                self.aliveConsumers.ids.to_numpy(),
+                self.aliveConsumers.getConsumerType(),
+                self.p.panelSize,
+                self.p.seed if panel_seed is None else panel_seed,
+            )
+
+        # Per-consumer series recorded as distribution sketches instead
+        self.sketched = set(self.p.get("distributionSketches") or ())
+        self.sketch_accuracy = self.p.get("sketchAccuracy") or DEFAULT_ACCURACY
+
         ## Initiate bank agents
         self.bank_agents = am.AgentList(self, 1, Bank)
 
@@ -336,6 +377,23 @@ class EconModel(am.Model):
             else:
                 self.fiscalDate = np.inf
 
+        # ----------------------------------------
+        # Phase profiling (optional; None = methods run unwrapped)
+        # ----------------------------------------
+        self.profiler = None
+        if self.p.get("profile", False):
+            from .profiling import PhaseProfiler
+
+            self.profiler = PhaseProfiler().instrument(self)
+            self.profiler.add("setup", time.perf_counter() - setup_start)
+
+    def run(self, *args, **kwargs):
+        """Run the simulation; profiled runs also return ``results["profile"]``."""
+        results = super().run(*args, **kwargs)
+        if getattr(self, "profiler", None) is not None:
+            results["profile"] = self.profiler.report()
+        return results
+
     def step(self):
         """Define the models' events per simulation step."""
         self.initiate_step()
@@ -370,7 +428,9 @@ class EconModel(am.Model):
                 ):
                     self.fiscal_count += 1
                     self._fiscal_policy()
-                    print("implement fiscal policy")
+                    policy_log.info(
+                        "Day %d: fiscal policy round %d", self.t, self.fiscal_count
+                    )
                 self.stepwise_termination()
 
     def initiate_step(self):
@@ -523,13 +583,6 @@ class EconModel(am.Model):
             and self.p.settings == "S3MOD"
             and self.fiscal_count < 3
         ):
-            print(
-                len(
-                    self.csfirm_agents.select(
-                        self.csfirm_agents.getUseEnergy() == "green"
-                    )
-                )
-            )
             for i in range(
                 len(
                     self.csfirm_agents.select(
@@ -537,12 +590,16 @@ class EconModel(am.Model):
                     )
                 )
             ):
-                print("lumpsum_update")
-                print(self.csfirm_agents[i].get_actual_production())
+                production = self.csfirm_agents[i].get_actual_production()
                 self.csfirm_agents[i].update_actual_production(
                     self.p.lumpSum / self.csfirm_agents[i].getPrice()
                 )
-                print(self.csfirm_agents[i].get_actual_production())
+                policy_log.debug(
+                    "Lump sum raised production of firm %s from %s to %s",
+                    self.csfirm_agents[i].id,
+                    production,
+                    self.csfirm_agents[i].get_actual_production(),
+                )
 
     def stepwise_after_production(self, eps=1e-8):
         """
@@ -577,11 +634,14 @@ class EconModel(am.Model):
             self.cpfirm_agents[i].reset_non_loan()
         self.bank_agents.profit -= (1 + self.bankIL) * self.csfirm_agents[i].non_loan
 
-        if self.p.verboseFlag:
-            print("____bank profit", self.bank_agents.profit)
-            print("___bank DTE", self.bank_agents.DTE)
+        if log.isEnabledFor(logging.DEBUG):
             # print("capital firm growth", self.cpfirm_agents[i].capital, self.cpfirm_agents[i].capital_growth)
-            print("total non loan", self.bank_agents.NPL)
+            log.debug(
+                "Bank profit %s, DTE %s, non-performing loans %s",
+                self.bank_agents.profit,
+                self.bank_agents.DTE,
+                self.bank_agents.NPL,
+            )
 
         # Energy firms: profits and capital growth
         self.brownEFirm.compute_net_profit()
@@ -705,6 +765,50 @@ class EconModel(am.Model):
         self.csfirm_agents.resetLockDown()
         self.cpfirm_agents.resetLockDown()
 
+    def record_population_aggregates(self):
+        """Record exact population totals of the per-consumer series (micro panel and sketch modes)"""
+        consumers = self.aliveConsumers
+        wages = np.asarray(consumers.getWage(), dtype=float)
+        consumption = np.asarray(consumers.getConsumption(), dtype=float)
+        desired = np.asarray(consumers.get_desired_consumption(), dtype=float)
+        types = np.asarray(consumers.getConsumerType(), dtype=object)
+
+        self.record("Wage Total", float(wages.sum()))
+        self.record(
+            "UnemplDole Total",
+            float(wages[wages == self.p.unemploymentDole].sum()),
+        )
+        self.record(
+            "Owners Income Total", float(np.sum(consumers.getDiv(), dtype=float))
+        )
+        self.record("Employed Total", int(np.sum(consumers.isEmployed())))
+        self.record("Consumption Total", float(consumption.sum()))
+        self.record("Desired Consumption Total", float(desired.sum()))
+        # Totals per consumer type, in CONSUMER_TYPES order
+        self.record(
+            "Consumption by Type",
+            [float(consumption[types == t].sum()) for t in CONSUMER_TYPES],
+        )
+        self.record(
+            "Desired Consumption by Type",
+            [float(desired[types == t].sum()) for t in CONSUMER_TYPES],
+        )
+
+    def record_consumer_series(self, name, values_of, consumers):
+        """Record a per-consumer series: a sketch over everyone if ``name`` is sketched, else the values of ``consumers``"""
+        if name in self.sketched:
+            sketch = DistributionSketch.of(
+                values_of(self.aliveConsumers), self.sketch_accuracy
+            )
+            self.record(name + SKETCH_SUFFIX, sketch.to_record())
+        else:
+            self.record(name, listToArray(values_of(consumers)).tolist())
+
+    def dole_wages(self, consumers):
+        """Wages of the consumers living on the unemployment dole"""
+        wages = listToArray(consumers.getWage())
+        return wages[wages == self.p.unemploymentDole]
+
     def update(self, eps=1e-8):
         """Record metrics for analysis"""
         super().update()
@@ -717,27 +821,42 @@ class EconModel(am.Model):
             self.record("People", int(len(self.aliveConsumers)))
             self.record("Gini Consumption", float(self.consumption_gini))
 
+            # Per-consumer series cover everyone, only the micro panel or are
+            # sketched; exact population aggregates are then recorded alongside
+            consumers = self.aliveConsumers
+            if self.micro_panel is not None or self.sketched:
+                self.record_population_aggregates()
+            if self.micro_panel is not None:
+                consumers = consumers.select(
+                    np.isin(consumers.ids.to_numpy(), self.micro_panel)
+                )
+                self.record("Panel ID", consumers.ids.to_numpy().tolist())
+
             # For array-like data, convert to Python lists to avoid Polars/numpy interaction issues with sparse data
             # ambr handles list of lists better than list of numpy arrays mixed with None
-            self.record(
-                "UnemplDole",
-                listToArray(self.aliveConsumers.getWage())[
-                    self.aliveConsumers.getWage() == self.p.unemploymentDole
-                ].tolist(),
-            )
+            if self.panels is not None:
+                # Slowly varying per-agent panels: keyframes + changes only
+                # (UnemplDole is the Wage panel filtered on unemploymentDole)
+                ids = consumers.ids.to_numpy()
+                self.panels.append("Wage", ids, consumers.getWage())
+                self.panels.append("Employed", ids, list(consumers.isEmployed()))
+                self.panels.append(
+                    "Consumer Type", ids, list(consumers.getConsumerType())
+                )
+            else:
+                self.record_consumer_series("UnemplDole", self.dole_wages, consumers)
             self.record("Unemployment Expenditure", float(self.ue_gov))
-            self.record(
-                "Owners Income", listToArray(self.aliveConsumers.getDiv()).tolist()
-            )
-            self.record("Wage", listToArray(self.aliveConsumers.getWage()).tolist())
-            # self.record('Average Income', listToArray( np.mean(self.aliveConsumers.getIncome())))
-            self.record(
-                "Employed", listToArray(self.aliveConsumers.isEmployed()).tolist()
-            )
-            self.record(
-                "Consumer Type",
-                listToArray(self.aliveConsumers.getConsumerType()).tolist(),
+            self.record_consumer_series(
+                "Owners Income", lambda c: c.getDiv(), consumers
             )
+            if self.panels is None:
+                self.record_consumer_series("Wage", lambda c: c.getWage(), consumers)
+                # self.record('Average Income', listToArray( np.mean(self.aliveConsumers.getIncome())))
+                self.record("Employed", listToArray(consumers.isEmployed()).tolist())
+                self.record(
+                    "Consumer Type",
+                    listToArray(consumers.getConsumerType()).tolist(),
+                )
             self.record(
                 "UnemploymentRate",
                 float(
@@ -747,13 +866,13 @@ class EconModel(am.Model):
                     / (self.p.c_agents - self.num_owner)
                 ),
             )
-            self.record(
-                "Consumption",
-                listToArray(self.aliveConsumers.getConsumption()).tolist(),
+            self.record_consumer_series(
+                "Consumption", lambda c: c.getConsumption(), consumers
             )
-            self.record(
+            self.record_consumer_series(
                 "Desired Consumption",
-                listToArray(self.aliveConsumers.get_desired_consumption()).tolist(),
+                lambda c: c.get_desired_consumption(),
+                consumers,
             )
 
             # Bank metrics
@@ -1224,8 +1343,7 @@ class EconModel(am.Model):
                     chosenFirm.update_sale_record(actual_consumption)
                 break
             # print("total product sale", chosenFirm.getSoldProducts())
-        if self.p.verboseFlag:
-            print("total sale", self.total_good, total_production)
+        log.debug("Total sale %s of production %s", self.total_good, total_production)
 
     def _cpf_forecast_demand(self):
         """Build brown/green capital demand from CS+Energy firms"""
@@ -1512,7 +1630,7 @@ class EconModel(am.Model):
 
     def _init_covid_exposure(self):
         """Initialize COVID states for population"""
-        print("start covid")
+        covid_log.info("Day %d: COVID starts", self.t)
         count = 0
         for i in range(len(self.aliveConsumers)):
             if self.aliveConsumers[i].getCovidStateAttr("state") == None:
@@ -1781,7 +1899,6 @@ class EconModel(am.Model):
             self.climateShockMode == "AggPop"
             and self.climateModule.shockHappens[0] == True
         ):
-            print("start shock")
             # Number of deaths implied by climate module's population mortality (PM)
             deadIDs = np.random.permutation(self.aliveConsumers.getIdentity())[
                 : np.max([int(self.climateModule.getPM()[0]), 0])
@@ -1809,8 +1926,10 @@ class EconModel(am.Model):
             # Apply proportional wealth loss to survivors
             self.aliveConsumers.wealth_loss(loss_percentage)
             aliveIDs = self.aliveConsumers.getIdentity()
-            print(
-                f"Climate shock happens: {np.max([int(self.climateModule.getPM()[0]), 0])} people died!"
+            climate_log.info(
+                "Day %d: climate shock, %d people died",
+                self.t,
+                len(deadIDs),
             )
             # Remove deceased workers from firms' rosters
             for firm in self.firms:
@@ -4,6 +4,20 @@ parameters = {
     "verboseFlag": False,
     "energySectorFlag": True,
     "climateModuleFlag": False,
+    # Store Wage/Employed/Consumer Type panels as keyframes + changes
+    # (model.panels) instead of full monthly lists in the results frame
+    "deltaPanels": False,
+    "panelKeyframeInterval": 12,  # months between full keyframes
+    # Record per-consumer series (Wage, Consumption, ...) only for a random
+    # panel of this many consumers per type; exact totals are recorded as
+    # "<var> Total" / "<var> by Type" (None = every consumer)
+    "panelSize": None,
+    "panelSeed": None,  # seed of the panel draw (None = the model seed)
+    # Record these per-consumer series (Wage, UnemplDole, Owners Income,
+    # Consumption, Desired Consumption) as "<var> Sketch" distribution
+    # sketches of all consumers instead of full lists (None = full lists)
+    "distributionSketches": None,
+    "sketchAccuracy": 0.01,  # relative error of the sketch quantiles
     # Agents count (should be fixed)
     "c_agents": 5000,
     "capitalists": 150,
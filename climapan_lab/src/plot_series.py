@@ -0,0 +1,207 @@
+"""
+CliMaPan-Lab: Climate-Pandemic Economic Modeling Laboratory
+Plot Series
+
+The results frame has one row per simulated day, and monthly records are
+missing (``None``, or NaN in float columns) on every other row. The ``plot*Summary`` functions in ``utils.py``
+draw monthly series from row 50 onwards. ``PlotSeries`` extracts each
+requested variable once, in one pass over its column, into NumPy arrays:
+
+- ``values``: the monthly records, stacked (``(months,)`` for scalars,
+  ``(months, agents)`` for per-agent arrays)
+- ``totals`` / ``first`` / ``member``: per-month sums, first elements and
+  single-agent series
+- ``group_totals`` / ``state_counts``: per-month sums over a consumer type
+  and counts of a COVID state
+- ``growth``: month-on-month percentage change of the totals
+
+Results are cached per variable, and ``PlotSeries.of(results)`` keeps one
+instance on the results object, so all plot functions share the extraction.
+
+Variables a run did not record (the plots also draw series of optional
+modules and older model versions) extract as empty series, so their panels
+stay blank instead of failing the whole figure.
+
+Runs with a micro panel (``panelSize``) record per-consumer lists for the
+panel only, plus exact population totals (``<name> Total``, ``<name> by
+Type``); ``totals`` and ``group_totals`` read those when they are present.
+"""
+
+from collections import Counter
+
+import numpy as np
+
+from .logs import get_logger
+from .sim_utils import BURN_IN_STEPS, CONSUMER_TYPES
+
+log = get_logger("plots")
+
+
+class PlotSeries:
+    """Monthly NumPy series of one results frame, extracted once per variable."""
+
+    def __init__(self, frame, start=BURN_IN_STEPS):
+        """
+        Args:
+            frame: EconModel results DataFrame (one row per step)
+            start: First row considered
+        """
+        self.frame = frame
+        self.start = start
+        self._cache = {}
+
+    @classmethod
+    def of(cls, results, start=BURN_IN_STEPS):
+        """The (cached) series of ``results.variables.EconModel``."""
+        frame = results.variables.EconModel
+        series = getattr(results, "_plot_series", None)
+        if series is None or series.frame is not frame or series.start != start:
+            series = cls(frame, start)
+            try:
+                results._plot_series = series
+            except AttributeError:
+                pass
+        return series
+
+    def _cached(self, key, build):
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._cache[key] = build()
+            return value
+
+    def _rows(self, name, stop):
+        # Positions (from ``start``) and values of the rows recording ``name``;
+        # pandas stores the gaps of float columns as NaN rather than None
+        def build():
+            if name not in self.frame.columns:
+                log.debug("%s is not recorded; plotting an empty series", name)
+                return np.array([], dtype=int), []
+            column = self.frame[name].to_numpy(dtype=object)[self.start : stop]
+            rows = [
+                k
+                for k, v in enumerate(column)
+                if v is not None and not (isinstance(v, float) and v != v)
+            ]
+            return np.array(rows, dtype=int), [column[k] for k in rows]
+
+        return self._cached(("rows", name, stop), build)
+
+    def entries(self, name, stop=None):
+        """Raw monthly records of ``name`` (a list of scalars or arrays)."""
+        return self._rows(name, stop)[1]
+
+    def index(self, name, stop=None):
+        """Row labels of the monthly records of ``name``."""
+        rows = self._rows(name, stop)[0]
+        return self.frame.index[self.start + rows]
+
+    def width(self, name):
+        """Number of agents of a per-agent variable (in its first monthly record)."""
+        entries = self.entries(name)
+        return len(entries[0]) if entries else 0
+
+    def values(self, name, stop=None, dropna=False):
+        """
+        Monthly records stacked into an array.
+
+        Records of varying length (e.g. per-consumer arrays after deaths) are
+        returned as a list of arrays instead.
+
+        Args:
+            name: Recorded variable
+            stop: Row (exclusive) to stop at
+            dropna: Drop NaN records (scalar variables only)
+        """
+
+        def build():
+            entries = self.entries(name, stop)
+            try:
+                values = np.array(entries, dtype=float)
+            except (TypeError, ValueError):
+                return entries
+            if dropna:
+                values = values[~np.isnan(values)]
+            return values
+
+        return self._cached(("values", name, stop, dropna), build)
+
+    def totals(self, name, stop=None):
+        """Sum of each monthly record (e.g. over firms or consumers)."""
+        if f"{name} Total" in self.frame.columns:
+            return self.values(f"{name} Total", stop)
+        return self._cached(
+            ("totals", name, stop),
+            lambda: np.array(
+                [np.sum(v) for v in self.entries(name, stop)], dtype=float
+            ),
+        )
+
+    def first(self, name, stop=None):
+        """First element of each monthly record (single-agent variables)."""
+        return self._cached(
+            ("first", name, stop),
+            lambda: np.array([v[0] for v in self.entries(name, stop)], dtype=float),
+        )
+
+    def squeezed(self, name, stop=None):
+        """Monthly records with length-1 axes removed."""
+        return self._cached(
+            ("squeezed", name, stop),
+            lambda: np.array([np.squeeze(v) for v in self.entries(name, stop)]),
+        )
+
+    def member(self, name, j, stop=None):
+        """Series of agent ``j`` of a per-agent variable."""
+        values = self.values(name, stop)
+        if isinstance(values, np.ndarray) and values.ndim == 2:
+            return values[:, j]
+        return np.array([v[j] for v in self.entries(name, stop)])
+
+    def group_totals(self, name, groups, group, stop=None):
+        """
+        Monthly sums of ``name`` over the agents whose ``groups`` entry is ``group``.
+
+        Args:
+            name: Per-agent variable (e.g. ``"Consumption"``)
+            groups: Per-agent labels recorded alongside (e.g. ``"Consumer Type"``)
+            group: Label to sum over (e.g. ``"workers"``)
+        """
+
+        by_type = f"{name} by Type"
+        if by_type in self.frame.columns and group in CONSUMER_TYPES:
+            return self.values(by_type, stop)[:, CONSUMER_TYPES.index(group)]
+
+        def build():
+            rows, entries = self._rows(name, stop)
+            if groups not in self.frame.columns:
+                return np.zeros(len(entries))
+            labels = self.frame[groups].to_numpy(dtype=object)[self.start + rows]
+            return np.array(
+                [
+                    np.asarray(v)[np.asarray(g) == group].sum()
+                    for v, g in zip(entries, labels)
+                ],
+                dtype=float,
+            )
+
+        return self._cached(("group_totals", name, groups, group, stop), build)
+
+    def state_counts(self, name, state, stop=None):
+        """Number of agents in ``state`` each month (e.g. COVID states)."""
+
+        def build():
+            # All states are counted in the same pass
+            counts = [Counter(v) for v in self.entries(name, stop)]
+            return {
+                s: np.array([c.get(s, 0) for c in counts], dtype=int)
+                for s in set().union(*counts)
+            }, len(counts)
+
+        counts, n_months = self._cached(("state_counts", name, stop), build)
+        return counts.get(state, np.zeros(n_months, dtype=int))
+
+    def growth(self, name, eps=0.0, stop=None):
+        """Month-on-month change of the totals of ``name``, in percent."""
+        totals = self.totals(name, stop)
+        return (totals[1:] - totals[:-1]) * 100 / (totals[:-1] + eps)
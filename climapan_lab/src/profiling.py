@@ -0,0 +1,209 @@
+"""
+CliMaPan-Lab: Climate-Pandemic Economic Modeling Laboratory
+Phase Profiling
+
+``PhaseProfiler`` times the phases of ``EconModel.step`` (``initiate_step``,
+the ``stepwise_*`` blocks, ``update``) and the helper routines they call
+(markets, contacts, COVID propagation, policy, climate) without touching the
+model code. ``instrument`` replaces each method on the model instance (and
+``Bank.sommaW`` / ``Climate.progress`` on the agent instances) by a timing
+wrapper, so models created without ``profile=True`` run the plain methods at
+no cost at all.
+
+For every phase the profiler counts calls and accumulates inclusive time and
+self time (inclusive time minus that of the instrumented phases it called).
+Self times are also bucketed by ``model.month_no``, so the cost of each
+simulated month can be compared, e.g. before and after the pandemic starts.
+"""
+
+import json
+import os
+import time
+
+# Phases of one step, in call order
+STEP_PHASES = (
+    "step",
+    "initiate_step",
+    "stepwise_forecast",
+    "stepwise_produce",
+    "stepwise_after_production",
+    "stepwise_termination",
+    "update",
+)
+
+HELPER_PHASES = (
+    "_csf_forecast_demand",
+    "_csf_transaction",
+    "_cpf_forecast_demand",
+    "_cpf_transaction",
+    "_energy_demand",
+    "_make_random_contacts",
+    "_make_random_contacts_in_firms",
+    "_propagate_contacts",
+    "_init_covid_exposure",
+    "_propagate_covid",
+    "_carbon_tax_policy",
+    "_hire",
+    "_fiscal_policy",
+    "_induce_climate_shock",
+)
+
+# (model attribute holding an AgentList, agent method) timed per agent
+AGENT_PHASES = (
+    ("bank_agents", "sommaW"),
+    ("climateModule", "progress"),
+)
+
+
+class _Timed:
+    """Callable standing in for one instrumented method."""
+
+    __slots__ = ("profiler", "name", "func")
+
+    def __init__(self, profiler, name, func):
+        self.profiler = profiler
+        self.name = name
+        self.func = func
+
+    def __call__(self, *args, **kwargs):
+        profiler = self.profiler
+        profiler._children.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self.func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = profiler._children.pop()
+            if profiler._children:
+                profiler._children[-1] += elapsed
+            profiler.add(self.name, elapsed, elapsed - children)
+
+
+class PhaseProfiler:
+    """Call counts and timings of model phases, per run and per month."""
+
+    def __init__(self, model=None):
+        """
+        Args:
+            model: Model whose ``month_no`` keys the monthly buckets (None
+                puts everything in month 0)
+        """
+        self.model = model
+        self.phases = {}
+        self.months = {}
+        self._children = []
+
+    def instrument(self, model, agent_phases=AGENT_PHASES):
+        """Wrap the model's phases, helpers and agent methods with timers."""
+        self.model = model
+        for name in STEP_PHASES + HELPER_PHASES:
+            if hasattr(model, name):
+                setattr(model, name, _Timed(self, name, getattr(model, name)))
+        return self.instrument_agents(model, agent_phases)
+
+    def instrument_agents(self, model, agent_phases):
+        """
+        Wrap methods of existing agents, named ``"<list attribute>.<method>"``.
+
+        Args:
+            model: Model holding the agent lists
+            agent_phases: ``(model attribute, agent method)`` pairs; agents
+                created later (e.g. replacement firms) are not timed
+        """
+        for attr, method in agent_phases:
+            name = f"{attr}.{method}"
+            for agent in getattr(model, attr, None) or []:
+                # Bypass Agent.__setattr__, which would queue a frame write
+                object.__setattr__(
+                    agent, method, _Timed(self, name, getattr(agent, method))
+                )
+        return self
+
+    def reset(self):
+        """Drop everything recorded so far (e.g. the warm-up of a benchmark)."""
+        self.phases = {}
+        self.months = {}
+
+    def add(self, name, elapsed, self_time=None):
+        """Account one call of ``name`` (e.g. to time code outside methods)."""
+        self_time = elapsed if self_time is None else self_time
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = [0, 0.0, 0.0]
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] += self_time
+
+        month = getattr(self.model, "month_no", 0)
+        bucket = self.months.get(month)
+        if bucket is None:
+            bucket = self.months[month] = {}
+        bucket[name] = bucket.get(name, 0.0) + self_time
+
+    def report(self):
+        """
+        Summary as a JSON-compatible dict.
+
+        Returns:
+            ``total`` (seconds spent in instrumented code), ``steps``,
+            ``phases`` (``{name: {calls, total, self, mean, share}}``) and
+            ``months`` (``[{month, total, phases: {name: self seconds}}]``)
+        """
+        total = sum(stats[2] for stats in self.phases.values())
+        phases = {
+            name: {
+                "calls": calls,
+                "total": inclusive,
+                "self": own,
+                "mean": inclusive / calls,
+                "share": own / total if total else 0.0,
+            }
+            for name, (calls, inclusive, own) in sorted(
+                self.phases.items(), key=lambda item: -item[1][2]
+            )
+        }
+        months = [
+            {"month": month, "total": sum(bucket.values()), "phases": dict(bucket)}
+            for month, bucket in sorted(self.months.items())
+        ]
+        return {
+            "total": total,
+            "steps": self.phases.get("step", [0])[0],
+            "phases": phases,
+            "months": months,
+        }
+
+    def table(self, report=None):
+        """The per-phase summary as a text table, most expensive first."""
+        report = self.report() if report is None else report
+        return format_profile(report)
+
+    def save(self, path):
+        """Write ``report()`` to a JSON file."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.report(), f, indent=1)
+        os.replace(tmp_path, path)
+
+
+def format_profile(report):
+    """Text table of a profile report (as returned by ``PhaseProfiler.report``)."""
+    width = max([len("Phase")] + [len(name) for name in report["phases"]])
+    lines = [
+        f"{'Phase':<{width}}  {'Calls':>8}  {'Total s':>9}  {'Self s':>9}"
+        f"  {'Mean ms':>9}  {'Self %':>6}",
+        "-" * (width + 52),
+    ]
+    for name, stats in report["phases"].items():
+        lines.append(
+            f"{name:<{width}}  {stats['calls']:>8}  {stats['total']:>9.3f}"
+            f"  {stats['self']:>9.3f}  {stats['mean'] * 1e3:>9.3f}"
+            f"  {stats['share'] * 100:>6.1f}"
+        )
+    n_months = len(report["months"])
+    lines.append("-" * (width + 52))
+    lines.append(
+        f"{report['total']:.3f} s over {report['steps']} steps"
+        + (f", {report['total'] / n_months:.3f} s per month" if n_months else "")
+    )
+    return "\n".join(lines)
@@ -0,0 +1,149 @@
+"""
+CliMaPan-Lab: Climate-Pandemic Economic Modeling Laboratory
+Simulation Helpers
+
+Numeric helpers the model and agents call while simulating. They only need
+NumPy, so importing the model does not load the plotting and statistics stack
+of ``utils`` (matplotlib, plotly, SciPy, statsmodels); ``utils`` re-exports
+them for older imports.
+"""
+
+import math
+from datetime import date, timedelta
+
+import numpy as np
+
+# Consumer types of the economic roles (order of the per-type records)
+CONSUMER_TYPES = (
+    "capitalists",
+    "green_energy_owners",
+    "brown_energy_owners",
+    "workers",
+)
+
+# Rows (one per step) at the start of a run left out as burn-in by the summary
+# plots and the validation losses
+BURN_IN_STEPS = 50
+
+
+def burn_in_months(start_date, steps=BURN_IN_STEPS):
+    """
+    Monthly records a run starting on ``start_date`` makes in its first ``steps`` rows.
+
+    Row ``r`` of the results frame is step ``r + 1``, which simulates day
+    ``start_date + r`` and records the month when the next day is the 1st.
+    """
+    first = date.fromisoformat(start_date)
+    return sum((first + timedelta(days=r + 1)).day == 1 for r in range(steps))
+
+
+def listToArray(x):
+    try:
+        return np.array(x)
+    except ValueError:
+        return np.array(x, dtype=object)
+
+
+def leap_year(year):
+    if year % 400 == 0:
+        return True
+    if year % 100 == 0:
+        return False
+    if year % 4 == 0:
+        return True
+    return False
+
+
+def days_in_month(month, year):
+    if month in {1, 3, 5, 7, 8, 10, 12}:
+        return 31
+    if month == 2:
+        if leap_year(year):
+            return 29
+        return 28
+    return 30
+
+
+def _merge_edgelist(p1, p2, mapping, offset=0):
+    """Helper function to convert lists to arrays and optionally map arrays"""
+    p1 = np.array(p1, dtype=np.int32)
+    p2 = np.array(p2, dtype=np.int32)
+    if mapping is not None:
+        mapping = np.array(mapping, dtype=np.int32)
+        p1 = mapping[p1] - offset
+        p2 = mapping[p2] - offset
+    output = dict(p1=p1, p2=p2)
+    return output
+
+
+def gini(x, eps=1e-8):
+    """
+    Calculate Gini coefficient efficiently (O(N log N)).
+
+    Args:
+        x (array-like): Array of values (income/consumption)
+        eps (float): Small value to avoid division by zero
+
+    Returns:
+        float: Gini coefficient
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if x.size == 0:
+        return 0.0
+
+    # Filter NaNs if any, though model shouldn't produce them ideally
+    x = x[~np.isnan(x)]
+    if x.size == 0:
+        return 0.0
+
+    # Sort data for efficient calculation
+    sorted_x = np.sort(x)
+    n = x.size
+
+    # Gini formula using sorted values:
+    # G = (2 * sum(i * x_i) / (n * sum(x_i))) - (n + 1) / n
+    # where i is 1-based index (1 to n)
+
+    index = np.arange(1, n + 1)
+    return (2 * np.sum(index * sorted_x)) / (n * np.sum(sorted_x) + eps) - (n + 1) / n
+
+
+def lognormal(mu, sigma):
+    mean = math.log(mu**2 / math.sqrt(sigma + mu**2))
+    std = math.sqrt(math.log(sigma / mu**2 + 1))
+    y = np.random.lognormal(mean, std)
+    return y
+
+
+def normal(mu, sigma):
+    mean = mu
+    std = math.sqrt(sigma)
+    y = np.random.normal(mean, std)
+    return y
+
+
+def sample_panel(ids, groups, size, seed=None):
+    """
+    Reproducible random panel of up to ``size`` agents per group.
+
+    Args:
+        ids (array-like): Agent ids
+        groups (array-like): Group label of each agent (e.g. consumer type)
+        size (int): Agents drawn per group (all of a smaller group)
+        seed (int): Seed of the draw; uses its own generator, so the model's
+            random stream is untouched
+
+    Returns:
+        np.ndarray: Sorted ids of the panel members
+    """
+    ids = np.asarray(ids)
+    groups = np.asarray([str(g) for g in groups])
+    rng = np.random.default_rng(seed)
+    members = []
+    for group in sorted(set(groups)):
+        candidates = ids[groups == group]
+        take = min(size, len(candidates))
+        members.append(rng.choice(candidates, size=take, replace=False))
+    if not members:
+        return ids[:0]
+    return np.sort(np.concatenate(members))
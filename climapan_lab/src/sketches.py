@@ -0,0 +1,257 @@
+"""
+CliMaPan-Lab: Climate-Pandemic Economic Modeling Laboratory
+Distribution Sketches
+
+Per-consumer series such as ``Wage`` or ``Consumption`` are mostly used for
+histograms, means, percentiles and Gini coefficients, yet recording them
+stores one value per consumer every month. With ``distributionSketches`` the
+model records a ``DistributionSketch`` of the listed series instead (column
+``<name> Sketch``):
+
+  - values are counted in logarithmic buckets whose bounds grow by the
+    factor ``(1 + accuracy) / (1 - accuracy)`` (the DDSketch layout), so every
+    quantile is within ``accuracy`` relative error of the exact one;
+  - count, sum, minimum and maximum are kept exactly;
+  - only occupied buckets are stored; their number depends on the spread of
+    the values and the accuracy, not on the number of consumers;
+  - sketches with the same accuracy merge by adding bucket counts, so months
+    of different seeds combine into one ensemble distribution.
+
+``sketch_series`` reads the sketches of a results frame back and
+``merge_runs`` combines them month by month across runs.
+"""
+
+import numpy as np
+
+DEFAULT_ACCURACY = 0.01
+SKETCH_SUFFIX = " Sketch"
+
+# Magnitudes below this are counted as zeros
+_MIN_MAGNITUDE = 1e-12
+
+
+def _count_buckets(counts, keys):
+    unique, n = np.unique(keys, return_counts=True)
+    for key, k in zip(unique.tolist(), n.tolist()):
+        counts[key] = counts.get(key, 0) + k
+
+
+class DistributionSketch:
+    """Mergeable log-bucket histogram with relative-accuracy quantiles."""
+
+    def __init__(self, accuracy=DEFAULT_ACCURACY):
+        """
+        Args:
+            accuracy: Relative error bound of the quantiles (0 < accuracy < 1)
+        """
+        if not 0 < accuracy < 1:
+            raise ValueError("accuracy must lie strictly between 0 and 1")
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = np.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zeros = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    @classmethod
+    def of(cls, values, accuracy=DEFAULT_ACCURACY):
+        """Sketch of ``values`` (non-finite entries are skipped)."""
+        sketch = cls(accuracy)
+        sketch.add(values)
+        return sketch
+
+    def add(self, values):
+        """Count ``values`` (non-finite entries are skipped)."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return self
+        self.count += len(values)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        magnitude = np.abs(values)
+        zero = magnitude <= _MIN_MAGNITUDE
+        self.zeros += int(zero.sum())
+        keys = np.ceil(np.log(magnitude[~zero]) / self._log_gamma).astype(np.int64)
+        signs = values[~zero] > 0
+        _count_buckets(self.positive, keys[signs])
+        _count_buckets(self.negative, keys[~signs])
+        return self
+
+    def merge(self, other):
+        """Add the counts of another sketch with the same accuracy."""
+        if not np.isclose(other.accuracy, self.accuracy):
+            raise ValueError(
+                f"Cannot merge sketches of accuracy {other.accuracy} and {self.accuracy}"
+            )
+        for mine, theirs in (
+            (self.positive, other.positive),
+            (self.negative, other.negative),
+        ):
+            for key, n in theirs.items():
+                mine[key] = mine.get(key, 0) + n
+        self.zeros += other.zeros
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def _value(self, keys):
+        # Value of a bucket: within ``accuracy`` of everything it counts
+        return 2 * self.gamma ** np.asarray(keys, dtype=float) / (self.gamma + 1)
+
+    def _sorted_buckets(self):
+        """Bucket values in increasing order and their counts."""
+        negative = sorted(self.negative, reverse=True)
+        positive = sorted(self.positive)
+        values = np.concatenate(
+            [-self._value(negative), [0.0] if self.zeros else [], self._value(positive)]
+        )
+        counts = np.array(
+            [self.negative[k] for k in negative]
+            + ([self.zeros] if self.zeros else [])
+            + [self.positive[k] for k in positive],
+            dtype=float,
+        )
+        return values, counts
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else np.nan
+
+    @property
+    def size(self):
+        """Number of stored buckets."""
+        return len(self.positive) + len(self.negative) + bool(self.zeros)
+
+    def quantile(self, q):
+        """Approximate quantile(s) ``q`` (within ``accuracy`` relative error)."""
+        q = np.asarray(q, dtype=float)
+        if not self.count:
+            return np.full(q.shape, np.nan) if q.ndim else np.nan
+        values, counts = self._sorted_buckets()
+        rank = q * (self.count - 1)
+        index = np.searchsorted(np.cumsum(counts), rank, side="right")
+        result = np.clip(values[np.minimum(index, len(values) - 1)], self.min, self.max)
+        return result if q.ndim else float(result)
+
+    def histogram(self, bins=10, range=None):
+        """
+        Approximate histogram, like ``np.histogram`` of the sketched values.
+
+        Returns:
+            ``(counts, edges)``
+        """
+        values, counts = self._sorted_buckets()
+        if range is None and self.count:
+            range = (self.min, self.max)
+        values = np.clip(values, self.min, self.max) if self.count else values
+        return np.histogram(values, bins=bins, range=range, weights=counts)
+
+    def gini(self):
+        """Approximate Gini coefficient of the sketched values."""
+        values, counts = self._sorted_buckets()
+        weighted = values * counts
+        total = weighted.sum()
+        if not self.count or total == 0:
+            return 0.0
+        cumulative = np.cumsum(counts)
+        return float(
+            np.sum(weighted * (2 * cumulative - counts - self.count))
+            / (self.count * total)
+        )
+
+    def to_record(self):
+        """Flat list of floats, as recorded in the results frame."""
+        positive = sorted(self.positive)
+        negative = sorted(self.negative)
+        return (
+            [
+                self.accuracy,
+                self.count,
+                self.sum,
+                self.min,
+                self.max,
+                self.zeros,
+                len(positive),
+                len(negative),
+            ]
+            + [float(k) for k in positive]
+            + [float(self.positive[k]) for k in positive]
+            + [float(k) for k in negative]
+            + [float(self.negative[k]) for k in negative]
+        )
+
+    @classmethod
+    def from_record(cls, record):
+        """Sketch written by ``to_record``."""
+        record = np.asarray(record, dtype=float)
+        sketch = cls(float(record[0]))
+        sketch.count = int(record[1])
+        sketch.sum = float(record[2])
+        sketch.min = float(record[3])
+        sketch.max = float(record[4])
+        sketch.zeros = int(record[5])
+        n_pos, n_neg = int(record[6]), int(record[7])
+        body = record[8:]
+        pos_keys, pos_counts = body[:n_pos], body[n_pos : 2 * n_pos]
+        body = body[2 * n_pos :]
+        neg_keys, neg_counts = body[:n_neg], body[n_neg : 2 * n_neg]
+        sketch.positive = dict(
+            zip(pos_keys.astype(int).tolist(), pos_counts.astype(int).tolist())
+        )
+        sketch.negative = dict(
+            zip(neg_keys.astype(int).tolist(), neg_counts.astype(int).tolist())
+        )
+        return sketch
+
+
+def merge_sketches(sketches):
+    """One sketch counting everything in ``sketches`` (None if empty)."""
+    merged = None
+    for sketch in sketches:
+        if merged is None:
+            merged = DistributionSketch(sketch.accuracy)
+        merged.merge(sketch)
+    return merged
+
+
+def sketch_series(frame, name):
+    """
+    Monthly sketches of ``name`` recorded in a results frame.
+
+    Args:
+        frame: EconModel results DataFrame (pandas)
+        name: Sketched variable (e.g. ``"Wage"``) or its ``<name> Sketch`` column
+
+    Returns:
+        List of ``DistributionSketch``, one per monthly record
+    """
+    column = name if name.endswith(SKETCH_SUFFIX) else name + SKETCH_SUFFIX
+    return [
+        DistributionSketch.from_record(record)
+        for record in frame[column].to_numpy(dtype=object)
+        if record is not None and not (isinstance(record, float) and record != record)
+    ]
+
+
+def merge_runs(frames, name):
+    """
+    Month-by-month merge of the sketches of ``name`` over several runs.
+
+    Runs of different lengths contribute to the months they recorded.
+    """
+    months = []
+    for frame in frames:
+        for m, sketch in enumerate(sketch_series(frame, name)):
+            if m == len(months):
+                months.append(DistributionSketch(sketch.accuracy))
+            months[m].merge(sketch)
+    return months
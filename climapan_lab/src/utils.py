@@ -4,210 +4,86 @@ Utility Functions and Plotting
 
 This module contains utility functions for data processing, statistical calculations,
 and visualization of simulation results.
+
+The helpers used while simulating live in ``sim_utils`` (re-exported here).
+matplotlib, plotly, SciPy and statsmodels are only imported once a plotting or
+analysis function needs them, so that importing this module stays cheap.
+The ``plot*Summary`` functions read their monthly series from a shared
+``plot_series.PlotSeries`` extraction instead of indexing the results frame
+point by point.
 """
 
+import importlib
 import itertools
 import json
-import math
 import os
 import random
 import sys
 
-import h5py
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import plotly.io as pio
-from scipy.interpolate import griddata
-from statsmodels.tsa.filters.hp_filter import hpfilter
 
 from .params import parameters
+from .plot_series import PlotSeries
+from .sim_utils import (  # noqa: F401
+    _merge_edgelist,
+    days_in_month,
+    gini,
+    leap_year,
+    listToArray,
+    lognormal,
+    normal,
+)
 
 
-def listToArray(x):
-    try:
-        return np.array(x)
-    except ValueError:
-        return np.array(x, dtype=object)
-
-
-def leap_year(year):
-    if year % 400 == 0:
-        return True
-    if year % 100 == 0:
-        return False
-    if year % 4 == 0:
-        return True
-    return False
-
+class _LazyModule:
+    """Stand-in for a module that is imported on first attribute access."""
 
-def days_in_month(month, year):
-    if month in {1, 3, 5, 7, 8, 10, 12}:
-        return 31
-    if month == 2:
-        if leap_year(year):
-            return 29
-        return 28
-    return 30
+    def __init__(self, name):
+        self._name = name
+        self._module = None
 
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
 
-def _merge_edgelist(p1, p2, mapping, offset=0):
-    """Helper function to convert lists to arrays and optionally map arrays"""
-    p1 = np.array(p1, dtype=np.int32)
-    p2 = np.array(p2, dtype=np.int32)
-    if mapping is not None:
-        mapping = np.array(mapping, dtype=np.int32)
-        p1 = mapping[p1] - offset
-        p2 = mapping[p2] - offset
-    output = dict(p1=p1, p2=p2)
-    return output
 
-
-def gini(x, eps=1e-8):
-    """
-    Calculate Gini coefficient efficiently (O(N log N)).
-
-    Args:
-        x (array-like): Array of values (income/consumption)
-        eps (float): Small value to avoid division by zero
-
-    Returns:
-        float: Gini coefficient
-    """
-    x = np.asarray(x, dtype=np.float64)
-    if x.size == 0:
-        return 0.0
-
-    # Filter NaNs if any, though model shouldn't produce them ideally
-    x = x[~np.isnan(x)]
-    if x.size == 0:
-        return 0.0
-
-    # Sort data for efficient calculation
-    sorted_x = np.sort(x)
-    n = x.size
-
-    # Gini formula using sorted values:
-    # G = (2 * sum(i * x_i) / (n * sum(x_i))) - (n + 1) / n
-    # where i is 1-based index (1 to n)
-
-    index = np.arange(1, n + 1)
-    return (2 * np.sum(index * sorted_x)) / (n * np.sum(sorted_x) + eps) - (n + 1) / n
+plt = _LazyModule("matplotlib.pyplot")
+px = _LazyModule("plotly.express")
+go = _LazyModule("plotly.graph_objects")
+pio = _LazyModule("plotly.io")
 
 
 def plotConsumersSummary(results, saveFolder):
+    series = PlotSeries.of(results)
     plt.figure(figsize=(36, 27))
     plt.subplots_adjust(hspace=0.5)
 
     ax1 = plt.subplot2grid((6, 2), (5, 0))
     ax1.margins(0.1)
-    ax1.plot(
-        [
-            (
-                results.variables.EconModel["Gini"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Gini"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-            and not np.isnan(
-                results.variables.EconModel["Gini"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-        ]
-    )
+    ax1.plot(series.values("Gini", dropna=True))
     ax1.set_ylabel("Gini")
     ax1.set_xlabel("Year")
 
     ax1 = plt.subplot2grid((6, 2), (5, 1))
     ax1.margins(0.1)
-    ax1.hist(
-        np.array([np.sum(i) for i in results.variables.EconModel["Wage"]])
-        + results.variables.EconModel["Owners Income"],
-        1000,
-    )
+    ax1.hist(series.totals("Wage") + series.totals("Owners Income"), 1000)
     ax1.set_ylabel("Density")
     ax1.set_xlabel("Wage")
 
     ax1 = plt.subplot2grid((6, 2), (4, 0))
     ax1.margins(0.1)
-    ax1.plot(
-        [
-            (
-                results.variables.EconModel["UnemploymentRate"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            * 100
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["UnemploymentRate"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-            and not np.isnan(
-                results.variables.EconModel["UnemploymentRate"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-        ]
-    )
+    ax1.plot(series.values("UnemploymentRate", dropna=True) * 100)
     ax1.set_ylabel("Unemployment Rate (%)")
     ax1.set_xlabel("Year")
 
     ax2 = plt.subplot2grid((6, 2), (1, 0))
     ax2.margins(0.1)
     # ax2.plot([(results.variables.EconModel['Available Income'][results.variables.EconModel['BankDataWriter'].keys()[i]].sum()) for i in range(50,len(results.variables.EconModel['BankDataWriter']))], label = "Available Income")
-    ax2.plot(
-        [
-            np.sum(
-                results.variables.EconModel["UnemplDole"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["UnemplDole"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Unempl Dole",
-    )
-    ax2.plot(
-        [
-            np.sum(
-                results.variables.EconModel["Owners Income"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Owners Income"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Owners Income",
-    )
-    ax2.plot(
-        [
-            np.sum(
-                results.variables.EconModel["Wage"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Wage"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Wage",
-    )
+    ax2.plot(series.totals("UnemplDole"), label="Unempl Dole")
+    ax2.plot(series.totals("Owners Income"), label="Owners Income")
+    ax2.plot(series.totals("Wage"), label="Wage")
     ax2.set_ylabel("Available Income")
     ax2.set_xlabel("Year")
     ax2.legend()
@@ -216,82 +92,15 @@ def plotConsumersSummary(results, saveFolder):
     ax2.margins(0.1)
     data = []
     # data.append([(results.variables.EconModel['Available Income'][results.variables.EconModel['BankDataWriter'].keys()[i]].sum()) for i in range(50,len(results.variables.EconModel['BankDataWriter']))])
-    data.append(
-        [
-            np.sum(
-                np.array(
-                    (
-                        results.variables.EconModel["UnemplDole"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                    )
-                )
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["UnemplDole"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
-    data.append(
-        [
-            np.sum(
-                np.array(
-                    (
-                        results.variables.EconModel["Owners Income"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                    )
-                )
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Owners Income"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
-    data.append(
-        [
-            np.sum(
-                np.sum(
-                    np.array(
-                        (
-                            results.variables.EconModel["Wage"][
-                                results.variables.EconModel["BankDataWriter"].keys()[i]
-                            ]
-                        )
-                    )
-                )
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Wage"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data.append(series.totals("UnemplDole"))
+    data.append(series.totals("Owners Income"))
+    data.append(series.totals("Wage"))
     ax2.boxplot(data)
     ax2.set_ylabel("Available Income")
 
     ax2 = plt.subplot2grid((6, 2), (2, 0))
     ax2.margins(0.1)
-    ax2.plot(
-        [
-            (
-                results.variables.EconModel["Wage"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Wage"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Wage",
-    )
+    ax2.plot(series.totals("Wage"), label="Wage")
     ax2.set_ylabel("Wage")
     ax2.set_xlabel("Year")
     ax2.legend()
@@ -299,61 +108,14 @@ def plotConsumersSummary(results, saveFolder):
     ax2 = plt.subplot2grid((6, 2), (2, 1))
     ax2.margins(0.1)
     data = []
-    data.append(
-        [
-            np.sum(
-                np.sum(
-                    np.array(
-                        (
-                            results.variables.EconModel["Wage"][
-                                results.variables.EconModel["BankDataWriter"].keys()[i]
-                            ]
-                        )
-                    )
-                )
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Wage"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data.append(series.totals("Wage"))
     ax2.boxplot(data)
     ax2.set_ylabel("Wage")
 
     ax3 = plt.subplot2grid((6, 2), (3, 0))
     ax3.margins(0.1)
-    ax3.plot(
-        [
-            (
-                results.variables.EconModel["New Credit Asked"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["New Credit Asked"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="New Credit Asked",
-    )
-    ax3.plot(
-        [
-            (
-                results.variables.EconModel["Obtained Credit"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Obtained Credit"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Obtained Credit",
-    )
+    ax3.plot(series.totals("New Credit Asked"), label="New Credit Asked")
+    ax3.plot(series.totals("Obtained Credit"), label="Obtained Credit")
     ax3.set_ylabel("New Credit Asked vs Obtained Credit")
     ax3.set_xlabel("Year")
     ax3.legend()
@@ -361,72 +123,20 @@ def plotConsumersSummary(results, saveFolder):
     ax3 = plt.subplot2grid((6, 2), (3, 1))
     ax3.margins(0.1)
     data = []
-    data.append(
-        [
-            (
-                results.variables.EconModel["New Credit Asked"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["New Credit Asked"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
-    data.append(
-        [
-            (
-                results.variables.EconModel["Obtained Credit"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Obtained Credit"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data.append(series.totals("New Credit Asked"))
+    data.append(series.totals("Obtained Credit"))
     ax3.boxplot(data)
     ax3.set_ylabel("New Credit Asked vs Obtained Credit")
 
     ax5 = plt.subplot2grid((6, 2), (0, 0))
     ax5.margins(0.1)
-    ax5.plot(
-        [
-            (
-                results.variables.EconModel["Wealth"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Wealth"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    ax5.plot(series.totals("Wealth"))
     ax5.set_ylabel("Wealth")
     ax5.set_xlabel("Year")
 
     ax3 = plt.subplot2grid((6, 2), (0, 1))
     ax5.margins(0.1)
-    ax5.boxplot(
-        [
-            (
-                results.variables.EconModel["Wealth"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Wealth"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    ax5.boxplot(series.totals("Wealth"))
     ax5.set_ylabel("Wealth")
 
     if os.path.isdir(saveFolder):
@@ -437,98 +147,26 @@ def plotConsumersSummary(results, saveFolder):
 
 
 def plotConsumptionInflationSummary(results, saveFolder):
+    series = PlotSeries.of(results)
     plt.figure(figsize=(36, 27))
     plt.subplots_adjust(hspace=0.5)
 
     ax5 = plt.subplot2grid((5, 2), (0, 0))
     ax5.margins(0.1)
     ax5.plot(
-        [
-            (
-                results.variables.EconModel["Consumption"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][
-                    np.argwhere(
-                        results.variables.EconModel["Consumer Type"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                        == "capitalists"
-                    )
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Consumption"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
+        series.group_totals("Consumption", "Consumer Type", "capitalists"),
         label="Capitalists",
     )
     ax5.plot(
-        [
-            (
-                results.variables.EconModel["Consumption"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][
-                    np.argwhere(
-                        results.variables.EconModel["Consumer Type"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                        == "green_energy_owners"
-                    )
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Consumption"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
+        series.group_totals("Consumption", "Consumer Type", "green_energy_owners"),
         label="Green Energy Owners",
     )
     ax5.plot(
-        [
-            (
-                results.variables.EconModel["Consumption"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][
-                    np.argwhere(
-                        results.variables.EconModel["Consumer Type"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                        == "brown_energy_owners"
-                    )
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Consumption"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
+        series.group_totals("Consumption", "Consumer Type", "brown_energy_owners"),
         label="Brown Energy Owners",
     )
     ax5.plot(
-        [
-            (
-                results.variables.EconModel["Consumption"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][
-                    np.argwhere(
-                        results.variables.EconModel["Consumer Type"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                        == "workers"
-                    )
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Consumption"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Workers",
+        series.group_totals("Consumption", "Consumer Type", "workers"), label="Workers"
     )
     ax5.set_ylabel("Consumption")
     ax5.set_xlabel("Year")
@@ -537,205 +175,43 @@ def plotConsumptionInflationSummary(results, saveFolder):
     ax5 = plt.subplot2grid((5, 2), (0, 1))
     ax5.margins(0.1)
     data = []
+    data.append(series.group_totals("Consumption", "Consumer Type", "capitalists"))
     data.append(
-        [
-            (
-                results.variables.EconModel["Consumption"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][
-                    np.argwhere(
-                        results.variables.EconModel["Consumer Type"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                        == "capitalists"
-                    )
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Consumption"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
+        series.group_totals("Consumption", "Consumer Type", "green_energy_owners")
     )
     data.append(
-        [
-            (
-                results.variables.EconModel["Consumption"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][
-                    np.argwhere(
-                        results.variables.EconModel["Consumer Type"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                        == "green_energy_owners"
-                    )
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Consumption"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
-    data.append(
-        [
-            (
-                results.variables.EconModel["Consumption"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][
-                    np.argwhere(
-                        results.variables.EconModel["Consumer Type"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                        == "brown_energy_owners"
-                    )
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Consumption"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
-    data.append(
-        [
-            (
-                results.variables.EconModel["Consumption"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][
-                    np.argwhere(
-                        results.variables.EconModel["Consumer Type"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                        == "workers"
-                    )
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Consumption"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
+        series.group_totals("Consumption", "Consumer Type", "brown_energy_owners")
     )
+    data.append(series.group_totals("Consumption", "Consumer Type", "workers"))
     ax5.boxplot(data)
     ax5.set_ylabel("Consumption")
 
     ax1 = plt.subplot2grid((5, 2), (1, 0))
     ax1.margins(0.1)
-    ax1.plot(
-        [
-            (
-                results.variables.EconModel["Gini Consumption"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Gini Consumption"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-            and not np.isnan(
-                results.variables.EconModel["Gini Consumption"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-        ]
-    )
+    ax1.plot(series.values("Gini Consumption", dropna=True))
     ax1.set_ylabel("Gini Consumption")
     ax1.set_xlabel("Year")
 
     ax5 = plt.subplot2grid((5, 2), (2, 0))
     ax5.margins(0.1)
     ax5.plot(
-        [
-            (
-                results.variables.EconModel["Desired Consumption"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][
-                    np.argwhere(
-                        results.variables.EconModel["Consumer Type"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                        == "capitalists"
-                    )
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Desired Consumption"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
+        series.group_totals("Desired Consumption", "Consumer Type", "capitalists"),
         label="Capitalists",
     )
     ax5.plot(
-        [
-            (
-                results.variables.EconModel["Desired Consumption"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][
-                    np.argwhere(
-                        results.variables.EconModel["Consumer Type"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                        == "green_energy_owners"
-                    )
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Desired Consumption"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
+        series.group_totals(
+            "Desired Consumption", "Consumer Type", "green_energy_owners"
+        ),
         label="Green Energy Owners",
     )
     ax5.plot(
-        [
-            (
-                results.variables.EconModel["Desired Consumption"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][
-                    np.argwhere(
-                        results.variables.EconModel["Consumer Type"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                        == "brown_energy_owners"
-                    )
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Desired Consumption"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
+        series.group_totals(
+            "Desired Consumption", "Consumer Type", "brown_energy_owners"
+        ),
         label="Brown Energy Owners",
     )
     ax5.plot(
-        [
-            (
-                results.variables.EconModel["Desired Consumption"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][
-                    np.argwhere(
-                        results.variables.EconModel["Consumer Type"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                        == "workers"
-                    )
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Desired Consumption"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
+        series.group_totals("Desired Consumption", "Consumer Type", "workers"),
         label="Workers",
     )
     ax5.set_ylabel("Desired Consumption")
@@ -746,109 +222,25 @@ def plotConsumptionInflationSummary(results, saveFolder):
     ax5.margins(0.1)
     data = []
     data.append(
-        [
-            (
-                results.variables.EconModel["Desired Consumption"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][
-                    np.argwhere(
-                        results.variables.EconModel["Consumer Type"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                        == "capitalists"
-                    )
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Desired Consumption"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
-    data.append(
-        [
-            (
-                results.variables.EconModel["Desired Consumption"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][
-                    np.argwhere(
-                        results.variables.EconModel["Consumer Type"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                        == "green_energy_owners"
-                    )
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Desired Consumption"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
+        series.group_totals("Desired Consumption", "Consumer Type", "capitalists")
     )
     data.append(
-        [
-            (
-                results.variables.EconModel["Desired Consumption"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][
-                    np.argwhere(
-                        results.variables.EconModel["Consumer Type"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                        == "brown_energy_owners"
-                    )
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Desired Consumption"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
+        series.group_totals(
+            "Desired Consumption", "Consumer Type", "green_energy_owners"
+        )
     )
     data.append(
-        [
-            (
-                results.variables.EconModel["Desired Consumption"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][
-                    np.argwhere(
-                        results.variables.EconModel["Consumer Type"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                        == "workers"
-                    )
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Desired Consumption"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
+        series.group_totals(
+            "Desired Consumption", "Consumer Type", "brown_energy_owners"
+        )
     )
+    data.append(series.group_totals("Desired Consumption", "Consumer Type", "workers"))
     ax5.boxplot(data)
     ax5.set_ylabel("Desired Consumption")
 
     ax5 = plt.subplot2grid((5, 2), (3, 0))
     ax5.margins(0.1)
-    ax5.plot(
-        [
-            (
-                results.variables.EconModel["Expected Inflation Rate"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Expected Inflation Rate"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="expectedInflationRate",
-    )
+    ax5.plot(series.totals("Expected Inflation Rate"), label="expectedInflationRate")
     ax5.set_ylabel("expectedInflationRate")
     ax5.set_xlabel("Year")
     ax5.legend()
@@ -856,40 +248,13 @@ def plotConsumptionInflationSummary(results, saveFolder):
     ax5 = plt.subplot2grid((5, 2), (3, 1))
     ax5.margins(0.1)
     data = []
-    data.append(
-        [
-            (
-                results.variables.EconModel["Expected Inflation Rate"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Expected Inflation Rate"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data.append(series.totals("Expected Inflation Rate"))
     ax5.boxplot(data)
     ax5.set_ylabel("expectedInflationRate")
 
     ax5 = plt.subplot2grid((5, 2), (4, 0))
     ax5.margins(0.1)
-    ax5.plot(
-        [
-            (
-                results.variables.EconModel["Inflation Rate"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Inflation Rate"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="inflationRate",
-    )
+    ax5.plot(series.totals("Inflation Rate"), label="inflationRate")
     ax5.set_ylabel("inflationRate")
     ax5.set_xlabel("Year")
     ax5.legend()
@@ -897,20 +262,7 @@ def plotConsumptionInflationSummary(results, saveFolder):
     ax5 = plt.subplot2grid((5, 2), (4, 1))
     ax5.margins(0.1)
     data = []
-    data.append(
-        [
-            (
-                results.variables.EconModel["Inflation Rate"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Inflation Rate"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data.append(series.totals("Inflation Rate"))
     ax5.boxplot(data)
     ax5.set_ylabel("inflationRate")
 
@@ -922,113 +274,35 @@ def plotConsumptionInflationSummary(results, saveFolder):
 
 
 def plotBankSummary(results, saveFolder, eps=1e-8):
+    series = PlotSeries.of(results)
     plt.figure(figsize=(36, 27))
     plt.subplots_adjust(hspace=0.5)
 
     ax1 = plt.subplot2grid((9, 2), (0, 0))
     ax1.margins(0.1)
-    ax1.plot(
-        [
-            (
-                results.variables.EconModel["Bank totalLoanSupply"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Bank totalLoanSupply"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Total Loan Supply",
-    )
-    ax1.plot(
-        [
-            (
-                results.variables.EconModel["Bank Loan Demands"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Bank Loan Demands"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Loan Demand",
-    )
+    ax1.plot(series.totals("Bank totalLoanSupply"), label="Total Loan Supply")
+    ax1.plot(series.totals("Bank Loan Demands"), label="Loan Demand")
     ax1.set_ylabel("Bank Total Loan Supply vs Loan Demand")
     ax1.set_xlabel("Year")
     ax1.legend()
 
     ax1 = plt.subplot2grid((9, 2), (1, 0))
     ax1.margins(0.1)
-    ax1.plot(
-        [
-            (
-                results.variables.EconModel["Bank iL"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-                * 100
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Bank iL"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Bank Debt to Equity",
-    )
-    ax1.plot(
-        [
-            1.5
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Bank iL"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    ax1.plot(series.totals("Bank iL") * 100, label="Bank Debt to Equity")
+    ax1.plot(np.full(len(series.entries("Bank iL")), 1.5))
     ax1.set_ylabel("Bank Debt to Equity")
     ax1.set_xlabel("Year")
 
     ax3 = plt.subplot2grid((9, 2), (7, 1))
     ax3.margins(0.1)
     data = []
-    data.append(
-        [
-            (
-                results.variables.EconModel["Bank iL"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-                * 100
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Bank iL"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data.append(series.totals("Bank iL") * 100)
     ax3.boxplot(data)
     ax3.set_ylabel("Bank Debt to Equity")
 
     ax2 = plt.subplot2grid((9, 2), (2, 0))
     ax2.margins(0.1)
-    ax2.plot(
-        [
-            (
-                results.variables.EconModel["Bank Equity"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Bank Equity"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    ax2.plot(series.totals("Bank Equity"))
     ax2.set_ylabel("Bank Equity")
     ax2.set_xlabel("Year")
     ax2.legend()
@@ -1036,39 +310,13 @@ def plotBankSummary(results, saveFolder, eps=1e-8):
     ax3 = plt.subplot2grid((9, 2), (2, 1))
     ax3.margins(0.1)
     data = []
-    data.append(
-        [
-            (
-                results.variables.EconModel["Bank Equity"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Bank Equity"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data.append(series.totals("Bank Equity"))
     ax3.boxplot(data)
     ax3.set_ylabel("Bank Equity")
 
     ax2 = plt.subplot2grid((9, 2), (3, 0))
     ax2.margins(0.1)
-    ax2.plot(
-        [
-            (
-                results.variables.EconModel["Bank Deposits"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Bank Deposits"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    ax2.plot(series.totals("Bank Deposits"))
     ax2.set_ylabel("Bank Deposits")
     ax2.set_xlabel("Year")
     ax2.legend()
@@ -1076,72 +324,17 @@ def plotBankSummary(results, saveFolder, eps=1e-8):
     ax3 = plt.subplot2grid((9, 2), (3, 1))
     ax3.margins(0.1)
     data = []
-    data.append(
-        [
-            (
-                results.variables.EconModel["Bank Deposits"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Bank Deposits"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data.append(series.totals("Bank Deposits"))
     ax3.boxplot(data)
     ax3.set_ylabel("Bank Deposits")
 
     ax2 = plt.subplot2grid((9, 2), (4, 0))
     ax2.margins(0.1)
-    ax2.plot(
-        [
-            (
-                results.variables.EconModel["Consumer iL"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Consumer iL"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Consumer iL",
-    )
-    for j in range(len(results.variables.EconModel["CS iL"][0])):
-        ax2.plot(
-            [
-                (
-                    results.variables.EconModel["CS iL"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][j]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CS iL"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ],
-            label=f"CS {j} iL",
-        )
-    for j in range(len(results.variables.EconModel["CP iL"][0])):
-        ax2.plot(
-            [
-                (
-                    results.variables.EconModel["CP iL"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][j]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CP iL"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ],
-            label=f"CP {j} iL",
-        )
+    ax2.plot(series.totals("Consumer iL"), label="Consumer iL")
+    for j in range(series.width("CS iL")):
+        ax2.plot(series.member("CS iL", j), label=f"CS {j} iL")
+    for j in range(series.width("CP iL")):
+        ax2.plot(series.member("CP iL", j), label=f"CP {j} iL")
     ax2.set_ylabel("iL")
     ax2.set_xlabel("Year")
     ax2.legend()
@@ -1149,102 +342,21 @@ def plotBankSummary(results, saveFolder, eps=1e-8):
     ax3 = plt.subplot2grid((9, 2), (4, 1))
     ax3.margins(0.1)
     data = []
-    data.append(
-        [
-            (
-                results.variables.EconModel["Consumer iL"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Consumer iL"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
-    for j in range(len(results.variables.EconModel["CS iL"][0])):
-        data.append(
-            [
-                (
-                    results.variables.EconModel["CS iL"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][j]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CS iL"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    for j in range(len(results.variables.EconModel["CP iL"][0])):
-        data.append(
-            [
-                (
-                    results.variables.EconModel["CP iL"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][j]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CP iL"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
+    data.append(series.totals("Consumer iL"))
+    for j in range(series.width("CS iL")):
+        data.append(series.member("CS iL", j))
+    for j in range(series.width("CP iL")):
+        data.append(series.member("CP iL", j))
     ax3.boxplot(data)
     ax3.set_ylabel("iL")
 
     ax2 = plt.subplot2grid((9, 2), (5, 0))
     ax2.margins(0.1)
-    ax2.plot(
-        [
-            (
-                results.variables.EconModel["Consumer iH"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Consumer iH"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Consumer iH",
-    )
-    for j in range(len(results.variables.EconModel["CS iF"][0])):
-        ax2.plot(
-            [
-                (
-                    results.variables.EconModel["CS iF"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][j]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CS iF"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ],
-            label=f"CS {j} iF",
-        )
-    for j in range(len(results.variables.EconModel["CP iF"][0])):
-        ax2.plot(
-            [
-                (
-                    results.variables.EconModel["CP iF"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][j]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CP iF"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ],
-            label=f"CP {j} iF",
-        )
+    ax2.plot(series.totals("Consumer iH"), label="Consumer iH")
+    for j in range(series.width("CS iF")):
+        ax2.plot(series.member("CS iF", j), label=f"CS {j} iF")
+    for j in range(series.width("CP iF")):
+        ax2.plot(series.member("CP iF", j), label=f"CP {j} iF")
     ax2.set_ylabel("iF/iH")
     ax2.set_xlabel("Year")
     ax2.legend()
@@ -1252,85 +364,18 @@ def plotBankSummary(results, saveFolder, eps=1e-8):
     ax3 = plt.subplot2grid((9, 2), (5, 1))
     ax3.margins(0.1)
     data = []
-    data.append(
-        [
-            (
-                results.variables.EconModel["Consumer iH"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Consumer iH"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
-    for j in range(len(results.variables.EconModel["CS iF"][0])):
-        data.append(
-            [
-                (
-                    results.variables.EconModel["CS iF"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][j]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CS iF"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    for j in range(len(results.variables.EconModel["CP iF"][0])):
-        data.append(
-            [
-                (
-                    results.variables.EconModel["CP iF"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][j]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CP iF"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
+    data.append(series.totals("Consumer iH"))
+    for j in range(series.width("CS iF")):
+        data.append(series.member("CS iF", j))
+    for j in range(series.width("CP iF")):
+        data.append(series.member("CP iF", j))
     ax3.boxplot(data)
     ax3.set_ylabel("iF/iH")
 
     ax2 = plt.subplot2grid((9, 2), (6, 0))
     ax2.margins(0.1)
-    ax2.plot(
-        [
-            (
-                results.variables.EconModel["CS Num Bankrupt"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Num Bankrupt"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="CS Num Bankrupt",
-    )
-    ax2.plot(
-        [
-            (
-                results.variables.EconModel["CP Num Bankrupt"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CP Num Bankrupt"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="CP Num Bankrupt",
-    )
+    ax2.plot(series.totals("CS Num Bankrupt"), label="CS Num Bankrupt")
+    ax2.plot(series.totals("CP Num Bankrupt"), label="CP Num Bankrupt")
     ax2.set_ylabel("Number of Bankrupt Goods Firms")
     ax2.set_xlabel("Year")
     ax2.legend()
@@ -1338,64 +383,15 @@ def plotBankSummary(results, saveFolder, eps=1e-8):
     ax3 = plt.subplot2grid((9, 2), (6, 1))
     ax3.margins(0.1)
     data = []
-    data.append(
-        [
-            (
-                results.variables.EconModel["CS Num Bankrupt"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Num Bankrupt"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
-    data.append(
-        [
-            (
-                results.variables.EconModel["CP Num Bankrupt"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CP Num Bankrupt"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data.append(series.totals("CS Num Bankrupt"))
+    data.append(series.totals("CP Num Bankrupt"))
     ax3.boxplot(data)
     ax3.set_ylabel("Number of Bankrupt Goods Firms")
 
     ax2 = plt.subplot2grid((9, 2), (7, 0))
     ax2.margins(0.1)
-    ax2.plot(
-        [
-            (
-                results.variables.EconModel["Bank Loan Over Equity"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Bank Loan Over Equity"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Bank Leverage",
-    )
-    ax2.plot(
-        [
-            0.5
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Bank Loan Over Equity"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    ax2.plot(series.totals("Bank Loan Over Equity"), label="Bank Leverage")
+    ax2.plot(np.full(len(series.entries("Bank Loan Over Equity")), 0.5))
     ax2.set_ylabel("Bank Leverage")
     ax2.set_xlabel("Year")
     ax2.legend()
@@ -1403,53 +399,13 @@ def plotBankSummary(results, saveFolder, eps=1e-8):
     ax3 = plt.subplot2grid((9, 2), (7, 1))
     ax3.margins(0.1)
     data = []
-    data.append(
-        [
-            (
-                results.variables.EconModel["Bank Loan Over Equity"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Bank Loan Over Equity"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data.append(series.totals("Bank Loan Over Equity"))
     ax3.boxplot(data)
     ax3.set_ylabel("Bank Leverage")
 
     ax2 = plt.subplot2grid((9, 2), (8, 0))
     ax2.margins(0.1)
-    ax2.plot(
-        [
-            (
-                results.variables.EconModel["GDP"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-                - results.variables.EconModel["GDP"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i - 1]
-                ].sum()
-            )
-            * 100
-            / (
-                results.variables.EconModel["GDP"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i - 1]
-                ].sum()
-                + eps
-            )
-            for i in range(51, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["GDP"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-            and results.variables.EconModel["GDP"][
-                results.variables.EconModel["BankDataWriter"].keys()[i - 1]
-            ]
-            is not None
-        ]
-    )
+    ax2.plot(series.growth("GDP", eps))
     ax2.set_ylabel("GDP Increase")
     ax2.set_xlabel("Year")
     ax2.legend()
@@ -1457,34 +413,7 @@ def plotBankSummary(results, saveFolder, eps=1e-8):
     ax3 = plt.subplot2grid((9, 2), (8, 1))
     ax3.margins(0.1)
     data = []
-    data.append(
-        [
-            (
-                results.variables.EconModel["GDP"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-                - results.variables.EconModel["GDP"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i - 1]
-                ].sum()
-            )
-            * 100
-            / (
-                results.variables.EconModel["GDP"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i - 1]
-                ].sum()
-                + eps
-            )
-            for i in range(51, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["GDP"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-            and results.variables.EconModel["GDP"][
-                results.variables.EconModel["BankDataWriter"].keys()[i - 1]
-            ]
-            is not None
-        ]
-    )
+    data.append(series.growth("GDP", eps))
     ax3.boxplot(data)
     ax3.set_ylabel("GDP Increase")
 
@@ -1496,148 +425,41 @@ def plotBankSummary(results, saveFolder, eps=1e-8):
 
 
 def plotGoodsFirmsProfitSummary(results, saveFolder):
+    series = PlotSeries.of(results)
     plt.figure(figsize=(36, 27))
     plt.subplots_adjust(hspace=0.5)
 
     ax1 = plt.subplot2grid((5, 2), (0, 0))
     ax1.margins(0.1)
-    ax1.plot(
-        [
-            (
-                results.variables.EconModel["CS Net Profits"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Net Profits"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    ax1.plot(series.totals("CS Net Profits"))
     ax1.set_ylabel("Consumer Goods Firms Net Profits")
     ax1.set_xlabel("Year")
 
     ax1 = plt.subplot2grid((5, 2), (1, 0))
     ax1.margins(0.1)
-    ax1.plot(
-        [
-            (
-                results.variables.EconModel["CP Net Profits"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Net Profits"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    ax1.plot(series.totals("CP Net Profits"))
     ax1.set_ylabel("Capital Goods Firms Net Profits")
     ax1.set_xlabel("Year")
 
     ax2 = plt.subplot2grid((5, 2), (2, 0))
     ax2.margins(0.1)
-    ax2.plot(
-        [
-            (
-                results.variables.EconModel["CS Loan Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Loan Demand"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="ConsumptionGoods Loan Demand",
-    )
-    ax2.plot(
-        [
-            (
-                results.variables.EconModel["CS Loan Obtained"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Loan Obtained"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="ConsumptionGoods Loan Obtained",
-    )
-    ax2.plot(
-        [
-            (
-                results.variables.EconModel["CP Loan Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CP Loan Demand"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="CapitalGoods Loan Demand",
-    )
-    ax2.plot(
-        [
-            (
-                results.variables.EconModel["CP Loan Obtained"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CP Loan Obtained"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="CapitalGoods Loan Obtained",
-    )
+    ax2.plot(series.totals("CS Loan Demand"), label="ConsumptionGoods Loan Demand")
+    ax2.plot(series.totals("CS Loan Obtained"), label="ConsumptionGoods Loan Obtained")
+    ax2.plot(series.totals("CP Loan Demand"), label="CapitalGoods Loan Demand")
+    ax2.plot(series.totals("CP Loan Obtained"), label="CapitalGoods Loan Obtained")
     ax2.set_ylabel("Loans")
     ax2.set_xlabel("Year")
     ax2.legend()
 
     ax3 = plt.subplot2grid((5, 2), (3, 0))
     ax3.margins(0.1)
-    ax3.plot(
-        [
-            (
-                results.variables.EconModel["CS Firm Loans"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Firm Loans"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    ax3.plot(series.totals("CS Firm Loans"))
     ax3.set_ylabel("Consumer Goods Firms Loans")
     ax3.set_xlabel("Year")
 
     ax3 = plt.subplot2grid((5, 2), (4, 0))
     ax3.margins(0.1)
-    ax3.plot(
-        [
-            (
-                results.variables.EconModel["CP Firm Loans"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].sum()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CP Firm Loans"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    ax3.plot(series.totals("CP Firm Loans"))
     ax3.set_ylabel("Capital Goods Firms Loans")
     ax3.set_xlabel("Year")
 
@@ -1645,21 +467,8 @@ def plotGoodsFirmsProfitSummary(results, saveFolder):
     ax1.margins(0.1)
     data = []
     [
-        data.append(
-            [
-                (
-                    results.variables.EconModel["CS Net Profits"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][j]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CS Net Profits"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-        for j in range(len(results.variables.EconModel["CS Net Profits"][0]))
+        data.append(series.member("CS Net Profits", j))
+        for j in range(series.width("CS Net Profits"))
     ]
     ax1.boxplot(data)
     ax1.set_ylabel("Consumer Goods Firms Net Profits")
@@ -1668,21 +477,8 @@ def plotGoodsFirmsProfitSummary(results, saveFolder):
     ax1.margins(0.1)
     data = []
     [
-        data.append(
-            [
-                (
-                    results.variables.EconModel["CP Net Profits"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][j]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CP Net Profits"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-        for j in range(len(results.variables.EconModel["CP Net Profits"][0]))
+        data.append(series.member("CP Net Profits", j))
+        for j in range(series.width("CP Net Profits"))
     ]
     ax1.boxplot(data)
     ax1.set_ylabel("Capital Goods Firms Net Profits")
@@ -1691,21 +487,8 @@ def plotGoodsFirmsProfitSummary(results, saveFolder):
     ax3.margins(0.1)
     data = []
     [
-        data.append(
-            [
-                (
-                    results.variables.EconModel["CS Firm Loans"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][j]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CS Firm Loans"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-        for j in range(len(results.variables.EconModel["CS Firm Loans"][0]))
+        data.append(series.member("CS Firm Loans", j))
+        for j in range(series.width("CS Firm Loans"))
     ]
     ax3.boxplot(data)
     ax3.set_ylabel("Consumer Goods Firms Loans")
@@ -1714,21 +497,8 @@ def plotGoodsFirmsProfitSummary(results, saveFolder):
     ax3.margins(0.1)
     data = []
     [
-        data.append(
-            [
-                (
-                    results.variables.EconModel["CP Firm Loans"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][j]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CP Firm Loans"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-        for j in range(len(results.variables.EconModel["CP Firm Loans"][0]))
+        data.append(series.member("CP Firm Loans", j))
+        for j in range(series.width("CP Firm Loans"))
     ]
     ax3.boxplot(data)
     ax3.set_ylabel("Capital Goods Firms Loans")
@@ -1741,375 +511,146 @@ def plotGoodsFirmsProfitSummary(results, saveFolder):
 
 
 def plotGoodsFirmsDemandsSummary(results, saveFolder):
+    series = PlotSeries.of(results)
     plt.figure(figsize=(36, 27))
     plt.subplots_adjust(hspace=0.5)
 
     ax1 = plt.subplot2grid((8, 2), (0, 0))
     ax1.margins(0.1)
-    lines = ax1.plot(
-        [
-            (
-                results.variables.EconModel["CS Labour Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Labour Demand"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    lines = ax1.plot(series.values("CS Labour Demand"))
     ax1.set_ylabel("Consumer Goods Firms Labour Demand")
     ax1.set_xlabel("Year")
     plt.legend(
         lines,
         [
             f"Consumer Goods Firm no.{i+1}"
-            for i in range(len(results.variables.EconModel["CS Labour Demand"][0]))
+            for i in range(series.width("CS Labour Demand"))
         ],
     )
 
     ax3 = plt.subplot2grid((8, 2), (1, 0))
     ax3.margins(0.1)
-    lines = ax3.plot(
-        [
-            (
-                results.variables.EconModel["CS Capital Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Capital Demand"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    lines = ax3.plot(series.values("CS Capital Demand"))
     ax3.set_ylabel("Consumer Goods Capital Demand")
     ax3.set_xlabel("Year")
     plt.legend(
         lines,
         [
             f"Consumer Goods Firm no.{i+1}"
-            for i in range(len(results.variables.EconModel["CS Capital Demand"][0]))
+            for i in range(series.width("CS Capital Demand"))
         ],
     )
 
     ax3 = plt.subplot2grid((8, 2), (2, 0))
     ax3.margins(0.1)
-    lines = ax3.plot(
-        [
-            (
-                results.variables.EconModel["CS Capital"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Capital"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    lines = ax3.plot(series.values("CS Capital"))
     ax3.set_ylabel("Consumer Goods Capital")
     ax3.set_xlabel("Year")
     plt.legend(
         lines,
-        [
-            f"Consumer Goods Firm no.{i+1}"
-            for i in range(len(results.variables.EconModel["CS Capital"][0]))
-        ],
+        [f"Consumer Goods Firm no.{i+1}" for i in range(series.width("CS Capital"))],
     )
 
     ax3 = plt.subplot2grid((8, 2), (3, 0))
     ax3.margins(0.1)
-    lines = ax3.plot(
-        [
-            (
-                results.variables.EconModel["CS Demand Forecast"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].squeeze()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Demand Forecast"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    lines = ax3.plot(series.squeezed("CS Demand Forecast"))
     ax3.set_ylabel("Consumer Goods Forecast Demand")
     ax3.set_xlabel("Year")
     plt.legend(
         lines,
         [
             f"Consumer Goods Firm no.{i+1}"
-            for i in range(len(results.variables.EconModel["CS Demand Forecast"][0]))
+            for i in range(series.width("CS Demand Forecast"))
         ],
     )
 
     ax1 = plt.subplot2grid((8, 2), (4, 0))
     ax1.margins(0.1)
-    lines = ax1.plot(
-        [
-            (
-                results.variables.EconModel["CP Labour Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CP Labour Demand"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    lines = ax1.plot(series.values("CP Labour Demand"))
     ax1.set_ylabel("Capital Goods Firms Labour Demand")
     ax1.set_xlabel("Year")
     plt.legend(
         lines,
         [
             f"Capital Goods Firm no.{i+1}"
-            for i in range(len(results.variables.EconModel["CP Labour Demand"][0]))
+            for i in range(series.width("CP Labour Demand"))
         ],
     )
 
     ax3 = plt.subplot2grid((8, 2), (5, 0))
     ax3.margins(0.1)
-    lines = ax3.plot(
-        [
-            (
-                results.variables.EconModel["CP Capital Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CP Capital Demand"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    lines = ax3.plot(series.values("CP Capital Demand"))
     ax3.set_ylabel("Capital Goods Capital Demand")
     ax3.set_xlabel("Year")
     plt.legend(
         lines,
         [
             f"Capital Goods Firm no.{i+1}"
-            for i in range(len(results.variables.EconModel["CP Capital Demand"][0]))
+            for i in range(series.width("CP Capital Demand"))
         ],
     )
 
     ax3 = plt.subplot2grid((8, 2), (6, 0))
     ax3.margins(0.1)
-    lines = ax3.plot(
-        [
-            (
-                results.variables.EconModel["CP Capital"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CP Capital"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    lines = ax3.plot(series.values("CP Capital"))
     ax3.set_ylabel("Capital Goods Capital")
     ax3.set_xlabel("Year")
     plt.legend(
-        lines,
-        [
-            f"Capital Goods Firm no.{i+1}"
-            for i in range(len(results.variables.EconModel["CP Capital"][0]))
-        ],
-    )
-
-    ax3 = plt.subplot2grid((8, 2), (7, 0))
-    ax3.margins(0.1)
-    lines = ax3.plot(
-        [
-            (
-                results.variables.EconModel["CP Demand Forecast"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ].squeeze()
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CP Demand Forecast"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
+        lines,
+        [f"Capital Goods Firm no.{i+1}" for i in range(series.width("CP Capital"))],
     )
+
+    ax3 = plt.subplot2grid((8, 2), (7, 0))
+    ax3.margins(0.1)
+    lines = ax3.plot(series.squeezed("CP Demand Forecast"))
     ax3.set_ylabel("Capital Goods Forecast Demand")
     plt.legend(
         lines,
         [
             f"Capital Goods Firm no.{i+1}"
-            for i in range(len(results.variables.EconModel["CP Demand Forecast"][0]))
+            for i in range(series.width("CP Demand Forecast"))
         ],
     )
 
     ax1 = plt.subplot2grid((8, 2), (0, 1))
     ax1.margins(0.1)
-    data = np.array(
-        [
-            (
-                results.variables.EconModel["CS Labour Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Labour Demand"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data = np.array(series.values("CS Labour Demand"))
     ax1.boxplot(data)
     ax1.set_ylabel("Consumer Goods Firms Labour Demand")
 
     ax3 = plt.subplot2grid((8, 2), (1, 1))
     ax3.margins(0.1)
-    ax3.boxplot(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["CS Capital Demand"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CS Capital Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
+    ax3.boxplot(np.array(series.values("CS Capital Demand")))
     ax3.set_ylabel("Consumer Goods Capital Demand")
 
     ax3 = plt.subplot2grid((8, 2), (2, 1))
     ax3.margins(0.1)
-    ax3.boxplot(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["CS Capital"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CS Capital"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
+    ax3.boxplot(np.array(series.values("CS Capital")))
     ax3.set_ylabel("Consumer Goods Capital")
 
     ax3 = plt.subplot2grid((8, 2), (3, 1))
     ax3.margins(0.1)
-    ax3.boxplot(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["CS Demand Forecast"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ].squeeze()
-                )
-                for i in range(
-                    50, len(results.variables.EconModel["BankDataWriter"]) - 50
-                )
-                if results.variables.EconModel["CS Demand Forecast"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
+    ax3.boxplot(np.array(series.squeezed("CS Demand Forecast", stop=-50)))
     ax3.set_ylabel("Consumer Goods Forecast Demand")
 
     ax1 = plt.subplot2grid((8, 2), (4, 1))
     ax1.margins(0.1)
-    ax1.boxplot(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["CP Labour Demand"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CP Labour Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
+    ax1.boxplot(np.array(series.values("CP Labour Demand")))
     ax1.set_ylabel("Capital Goods Firms Labour Demand")
 
     ax3 = plt.subplot2grid((8, 2), (5, 1))
     ax3.margins(0.1)
-    ax3.boxplot(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["CP Capital Demand"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CP Capital Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
+    ax3.boxplot(np.array(series.values("CP Capital Demand")))
     ax3.set_ylabel("Capital Goods Capital Demand")
 
     ax3 = plt.subplot2grid((8, 2), (6, 1))
     ax3.margins(0.1)
-    ax3.boxplot(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["CP Capital"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CP Capital"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
+    ax3.boxplot(np.array(series.values("CP Capital")))
     ax3.set_ylabel("Capital Goods Capital")
 
     ax3 = plt.subplot2grid((8, 2), (7, 1))
     ax3.margins(0.1)
-    ax3.boxplot(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["CP Demand Forecast"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ].squeeze()
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CP Demand Forecast"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
+    ax3.boxplot(np.array(series.squeezed("CP Demand Forecast")))
     ax3.set_ylabel("Capital Goods Forecast Demand")
 
     if os.path.isdir(saveFolder):
@@ -2120,179 +661,40 @@ def plotGoodsFirmsDemandsSummary(results, saveFolder):
 
 
 def plotEnergyFirmsDemands(results, saveFolder):
+    series = PlotSeries.of(results)
     plt.figure(figsize=(36, 27))
     plt.subplots_adjust(hspace=0.5)
 
     ax3 = plt.subplot(521)
     ax3.margins(0.1)
-    ax3.plot(
-        [
-            (
-                results.variables.EconModel["GE Labour Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["GE Labour Demand"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Green Energy",
-    )
-    ax3.plot(
-        [
-            (
-                results.variables.EconModel["BE Labour Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["BE Labour Demand"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Brown Energy",
-    )
+    ax3.plot(series.values("GE Labour Demand"), label="Green Energy")
+    ax3.plot(series.values("BE Labour Demand"), label="Brown Energy")
     ax3.set_ylabel("Electricity Labour Demand")
     ax3.set_xlabel("Year")
     ax3.legend()
 
     ax3 = plt.subplot(523)
     ax3.margins(0.1)
-    ax3.plot(
-        [
-            (
-                results.variables.EconModel["GE Demand Forecast"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][0]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["GE Demand Forecast"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Green Energy",
-    )
-    ax3.plot(
-        [
-            (
-                results.variables.EconModel["BE Demand Forecast"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][0]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["BE Demand Forecast"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Brown Energy",
-    )
+    ax3.plot(series.first("GE Demand Forecast"), label="Green Energy")
+    ax3.plot(series.first("BE Demand Forecast"), label="Brown Energy")
     ax3.set_ylabel("Electricity Demand Forecast")
     ax3.set_xlabel("Year")
     ax3.legend()
 
     ax3 = plt.subplot(525)
     ax3.margins(0.1)
-    ax3.plot(
-        [
-            (
-                results.variables.EconModel["GE Price"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["GE Price"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Green Energy",
-    )
-    ax3.plot(
-        [
-            (
-                results.variables.EconModel["BE Price"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["BE Price"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Brown Energy",
-    )
+    ax3.plot(series.values("GE Price"), label="Green Energy")
+    ax3.plot(series.values("BE Price"), label="Brown Energy")
     ax3.set_ylabel("Electricity Price")
     ax3.set_xlabel("Year")
     ax3.legend()
 
     ax3 = plt.subplot(527)
     ax3.margins(0.1)
-    ax3.plot(
-        [
-            (
-                results.variables.EconModel["GE Capital"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["GE Capital"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Green Capital",
-    )
-    ax3.plot(
-        [
-            (
-                results.variables.EconModel["BE Capital"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["BE Capital"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Brown Capital",
-    )
-    ax3.plot(
-        [
-            (
-                results.variables.EconModel["GE Capital Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["GE Capital Demand"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Green Capital Demand",
-    )
-    ax3.plot(
-        [
-            (
-                results.variables.EconModel["BE Capital Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["BE Capital Demand"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Brown Capital Demand",
-    )
+    ax3.plot(series.values("GE Capital"), label="Green Capital")
+    ax3.plot(series.values("BE Capital"), label="Brown Capital")
+    ax3.plot(series.values("GE Capital Demand"), label="Green Capital Demand")
+    ax3.plot(series.values("BE Capital Demand"), label="Brown Capital Demand")
     ax3.set_ylabel("Electricity Capital")
     ax3.set_xlabel("Year")
     ax3.legend()
@@ -2300,180 +702,34 @@ def plotEnergyFirmsDemands(results, saveFolder):
     ax3 = plt.subplot(522)
     ax3.margins(0.1)
     data = []
-    data.append(
-        [
-            (
-                results.variables.EconModel["GE Labour Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][0]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["GE Labour Demand"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
-    data.append(
-        [
-            (
-                results.variables.EconModel["BE Labour Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][0]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["BE Labour Demand"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data.append(series.first("GE Labour Demand"))
+    data.append(series.first("BE Labour Demand"))
     ax3.boxplot(data)
     ax3.set_ylabel("Electricity Labour Demand")
 
     ax3 = plt.subplot(524)
     ax3.margins(0.1)
     data = []
-    data.append(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["GE Demand Forecast"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][0]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["GE Demand Forecast"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
-    data.append(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["BE Demand Forecast"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][0]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["BE Demand Forecast"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
+    data.append(np.array(series.first("GE Demand Forecast")))
+    data.append(np.array(series.first("BE Demand Forecast")))
     ax3.boxplot(data)
     ax3.set_ylabel("Electricity Demand Forecast")
 
     ax3 = plt.subplot(526)
     ax3.margins(0.1)
     data = []
-    data.append(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["GE Price"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][0]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["GE Price"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
-    data.append(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["BE Price"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][0]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["BE Price"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
+    data.append(np.array(series.first("GE Price")))
+    data.append(np.array(series.first("BE Price")))
     ax3.boxplot(data)
     ax3.set_ylabel("Electricity Price")
 
     ax3 = plt.subplot(528)
     ax3.margins(0.1)
     data = []
-    data.append(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["GE Capital"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][0]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["GE Capital"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
-    data.append(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["BE Capital"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][0]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["BE Capital"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
-    data.append(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["GE Capital Demand"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][0]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["GE Capital Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
-    data.append(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["BE Capital Demand"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][0]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["BE Capital Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
+    data.append(np.array(series.first("GE Capital")))
+    data.append(np.array(series.first("BE Capital")))
+    data.append(np.array(series.first("GE Capital Demand")))
+    data.append(np.array(series.first("BE Capital Demand")))
     ax3.boxplot(data)
     ax3.set_ylabel("Electricity Capital")
 
@@ -2485,191 +741,74 @@ def plotEnergyFirmsDemands(results, saveFolder):
 
 
 def plotGoodsFirmWorkersSummary(results, saveFolder):
+    series = PlotSeries.of(results)
     plt.figure(figsize=(36, 27))
     plt.subplots_adjust(hspace=0.5)
 
     ax1 = plt.subplot(421)
     ax1.margins(0.1)
-    lines = ax1.plot(
-        [
-            (
-                results.variables.EconModel["CS Number of Workers"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Number of Workers"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    lines = ax1.plot(series.values("CS Number of Workers"))
     ax1.set_ylabel("Consumer Goods Firms Number of Workers")
     ax1.set_xlabel("Year")
     plt.legend(
         lines,
         [
             f"Consumer Goods Firm no.{i+1}"
-            for i in range(len(results.variables.EconModel["CS Labour Demand"][0]))
+            for i in range(series.width("CS Labour Demand"))
         ],
     )
 
     ax1 = plt.subplot(425)
     ax1.margins(0.1)
-    lines = ax1.plot(
-        [
-            (
-                results.variables.EconModel["CP Number of Workers"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CP Number of Workers"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    lines = ax1.plot(series.values("CP Number of Workers"))
     ax1.set_ylabel("Capital Goods Firms Number of Workers")
     ax1.set_xlabel("Year")
     plt.legend(
         lines,
-        [
-            f"Capital Goods Firm no.{i+1}"
-            for i in range(len(results.variables.EconModel["CP Capital"][0]))
-        ],
+        [f"Capital Goods Firm no.{i+1}" for i in range(series.width("CP Capital"))],
     )
 
     ax2 = plt.subplot(423)
     ax2.margins(0.1)
-    lines = ax2.plot(
-        [
-            (
-                results.variables.EconModel["CS Number of Consumers"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Number of Consumers"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    lines = ax2.plot(series.values("CS Number of Consumers"))
     ax2.set_ylabel("Consumer Goods Firms Number of Consumers")
     ax2.set_xlabel("Year")
     plt.legend(
         lines,
         [
             f"Consumer Goods Firm no.{i+1}"
-            for i in range(len(results.variables.EconModel["CS Labour Demand"][0]))
+            for i in range(series.width("CS Labour Demand"))
         ],
     )
 
     ax3 = plt.subplot(427)
     ax3.margins(0.1)
-    lines = ax3.plot(
-        [
-            (
-                results.variables.EconModel["CP Number of Consumers"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CP Number of Consumers"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    lines = ax3.plot(series.values("CP Number of Consumers"))
     ax3.set_ylabel("Capital Goods Firms Number of Consumers")
     ax3.set_xlabel("Year")
     plt.legend(
         lines,
-        [
-            f"Capital Goods Firm no.{i+1}"
-            for i in range(len(results.variables.EconModel["CP Capital"][0]))
-        ],
+        [f"Capital Goods Firm no.{i+1}" for i in range(series.width("CP Capital"))],
     )
 
     ax1 = plt.subplot(422)
     ax1.margins(0.1)
-    ax1.boxplot(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["CS Number of Workers"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CS Number of Workers"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
+    ax1.boxplot(np.array(series.values("CS Number of Workers")))
     ax1.set_ylabel("Consumer Goods Firms Number of Workers")
 
     ax1 = plt.subplot(426)
     ax1.margins(0.1)
-    ax1.boxplot(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["CP Number of Workers"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CP Number of Workers"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
+    ax1.boxplot(np.array(series.values("CP Number of Workers")))
     ax1.set_ylabel("Capital Goods Firms Number of Workers")
 
     ax2 = plt.subplot(424)
     ax2.margins(0.1)
-    ax2.boxplot(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["CS Number of Consumers"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CS Number of Consumers"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
+    ax2.boxplot(np.array(series.values("CS Number of Consumers")))
     ax2.set_ylabel("Consumer Goods Firms Number of Consumers")
 
     ax3 = plt.subplot(428)
     ax3.margins(0.1)
-    ax3.boxplot(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["CP Number of Consumers"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CP Number of Consumers"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
+    ax3.boxplot(np.array(series.values("CP Number of Consumers")))
     ax3.set_ylabel("Capital Goods Firms Number of Consumers")
 
     if os.path.isdir(saveFolder):
@@ -2680,310 +819,121 @@ def plotGoodsFirmWorkersSummary(results, saveFolder):
 
 
 def plotGoodsFirmSalesSummary(results, saveFolder):
+    series = PlotSeries.of(results)
     plt.figure(figsize=(56, 27))
     plt.subplots_adjust(hspace=0.5)
 
     ax1 = plt.subplot2grid((10, 2), (0, 0))
     ax1.margins(0.1)
-    lines = ax1.plot(
-        [
-            (
-                results.variables.EconModel["CS Price"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Price"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    lines = ax1.plot(series.values("CS Price"))
     ax1.set_ylabel("Consumer Goods Firms Price")
     ax1.set_xlabel("Year")
     plt.legend(
         lines,
         [
             f"Consumer Goods Firm no.{i+1}"
-            for i in range(len(results.variables.EconModel["CS Labour Demand"][0]))
+            for i in range(series.width("CS Labour Demand"))
         ],
     )
 
     ax1 = plt.subplot2grid((10, 2), (1, 0))
     ax1.margins(0.1)
-    lines = ax1.plot(
-        [
-            (
-                results.variables.EconModel["CP Price"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CP Price"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    lines = ax1.plot(series.values("CP Price"))
     ax1.set_ylabel("Capital Goods Firms Price")
     ax1.set_xlabel("Year")
     plt.legend(
         lines,
-        [
-            f"Capital Goods Firm no.{i+1}"
-            for i in range(len(results.variables.EconModel["CP Capital"][0]))
-        ],
+        [f"Capital Goods Firm no.{i+1}" for i in range(series.width("CP Capital"))],
     )
 
     ax2 = plt.subplot2grid((10, 2), (2, 0))
     ax2.margins(0.1)
-    lines = ax2.plot(
-        [
-            (
-                results.variables.EconModel["CS Sold Products"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Sold Products"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    lines = ax2.plot(series.values("CS Sold Products"))
     ax2.set_ylabel("Consumer Goods Firms Sold Products")
     ax2.set_xlabel("Year")
     plt.legend(
         lines,
         [
             f"Consumer Goods Firm no.{i+1}"
-            for i in range(len(results.variables.EconModel["CS Labour Demand"][0]))
+            for i in range(series.width("CS Labour Demand"))
         ],
     )
 
     ax3 = plt.subplot2grid((10, 2), (3, 0))
     ax3.margins(0.1)
-    lines = ax3.plot(
-        [
-            (
-                results.variables.EconModel["CP Sold Products"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CP Sold Products"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    lines = ax3.plot(series.values("CP Sold Products"))
     ax3.set_ylabel("Capital Goods Firms Sold Products")
     ax3.set_xlabel("Year")
     plt.legend(
         lines,
-        [
-            f"Capital Goods Firm no.{i+1}"
-            for i in range(len(results.variables.EconModel["CP Capital"][0]))
-        ],
+        [f"Capital Goods Firm no.{i+1}" for i in range(series.width("CP Capital"))],
     )
 
     ax2 = plt.subplot2grid((10, 2), (4, 0))
     ax2.margins(0.1)
-    lines = ax2.plot(
-        [
-            (
-                results.variables.EconModel["CS Inventory"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Inventory"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    lines = ax2.plot(series.values("CS Inventory"))
     ax2.set_ylabel("Consumer Goods Firms Inventory")
     ax2.set_xlabel("Year")
     plt.legend(
         lines,
         [
             f"Consumer Goods Firm no.{i+1}"
-            for i in range(len(results.variables.EconModel["CS Labour Demand"][0]))
+            for i in range(series.width("CS Labour Demand"))
         ],
     )
 
     ax2 = plt.subplot2grid((10, 2), (5, 0))
     ax2.margins(0.1)
-    lines = ax2.plot(
-        [
-            (
-                results.variables.EconModel["CP Inventory"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CP Inventory"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    lines = ax2.plot(series.values("CP Inventory"))
     ax2.set_ylabel("Capital Goods Firms Inventory")
     ax2.set_xlabel("Year")
     plt.legend(
         lines,
         [
             f"Capital Goods Firm no.{i+1}"
-            for i in range(len(results.variables.EconModel["CS Labour Demand"][0]))
+            for i in range(series.width("CS Labour Demand"))
         ],
     )
 
     ax2 = plt.subplot2grid((10, 2), (6, 0))
     ax2.margins(0.1)
-    lines = ax2.plot(
-        [
-            (
-                results.variables.EconModel["CS Energy Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Energy Demand"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    lines = ax2.plot(series.values("CS Energy Demand"))
     ax2.set_ylabel("Consumer Goods Firms Energy Demand")
     ax2.set_xlabel("Year")
     plt.legend(
         lines,
         [
             f"Consumer Goods Firm no.{i+1}"
-            for i in range(len(results.variables.EconModel["CS Energy Demand"][0]))
+            for i in range(series.width("CS Energy Demand"))
         ],
     )
 
     ax2 = plt.subplot2grid((10, 2), (7, 0))
     ax2.margins(0.1)
-    lines = ax2.plot(
-        [
-            (
-                results.variables.EconModel["CP Energy Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CP Energy Demand"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    lines = ax2.plot(series.values("CP Energy Demand"))
     ax2.set_ylabel("Capital Goods Firms Energy Demand")
     ax2.set_xlabel("Year")
-    plt.legend(
-        lines,
-        [
-            f"Capital Goods Firm no.{i+1}"
-            for i in range(len(results.variables.EconModel["CP Energy Demand"][0]))
-        ],
-    )
-
-    ax2 = plt.subplot2grid((10, 2), (8, 0))
-    ax2.margins(0.1)
-    lines = ax2.plot(
-        [
-            (
-                np.sum(
-                    results.variables.EconModel["CS V Cost"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                )
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS V Cost"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="VC",
-    )
-    lines = ax2.plot(
-        [
-            (
-                np.sum(
-                    results.variables.EconModel["CS U Cost"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                )
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS U Cost"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="UC",
-    )
-    lines = ax2.plot(
+    plt.legend(
+        lines,
         [
-            (
-                np.sum(
-                    results.variables.EconModel["CS Q Cost"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                )
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Q Cost"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
+            f"Capital Goods Firm no.{i+1}"
+            for i in range(series.width("CP Energy Demand"))
         ],
-        label="QC",
     )
+
+    ax2 = plt.subplot2grid((10, 2), (8, 0))
+    ax2.margins(0.1)
+    lines = ax2.plot(series.totals("CS V Cost"), label="VC")
+    lines = ax2.plot(series.totals("CS U Cost"), label="UC")
+    lines = ax2.plot(series.totals("CS Q Cost"), label="QC")
     ax2.set_ylabel("Consumer Goods Firms Costs")
     ax2.set_xlabel("Year")
     plt.legend()
 
     ax2 = plt.subplot2grid((10, 2), (8, 0))
     ax2.margins(0.1)
-    lines = ax2.plot(
-        [
-            (
-                np.sum(
-                    results.variables.EconModel["CP V Cost"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                )
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CP V Cost"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="VC",
-    )
-    lines = ax2.plot(
-        [
-            (
-                np.sum(
-                    results.variables.EconModel["CP U Cost"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                )
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CP U Cost"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="UC",
-    )
+    lines = ax2.plot(series.totals("CP V Cost"), label="VC")
+    lines = ax2.plot(series.totals("CP U Cost"), label="UC")
     # lines=ax2.plot([(np.sum(results.variables.EconModel['CP Q Cost'][results.variables.EconModel['BankDataWriter'].keys()[i]])) for i in range(50,len(results.variables.EconModel['BankDataWriter'])) if results.variables.EconModel['Expected Inflation Rate'][results.variables.EconModel['BankDataWriter'].keys()[i]] is not None], label='QC')
     ax2.set_ylabel("Capital Goods Firms Costs")
     ax2.set_xlabel("Year")
@@ -2991,258 +941,69 @@ def plotGoodsFirmSalesSummary(results, saveFolder):
 
     ax1 = plt.subplot2grid((10, 2), (0, 1))
     ax1.margins(0.1)
-    data = np.array(
-        [
-            (
-                results.variables.EconModel["CS Price"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Price"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data = np.array(series.values("CS Price"))
     for d in data:
         ax1.boxplot(data)
     ax1.set_ylabel("Consumer Goods Firms Price")
 
     ax1 = plt.subplot2grid((10, 2), (1, 1))
     ax1.margins(0.1)
-    data = np.array(
-        [
-            (
-                results.variables.EconModel["CP Price"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CP Price"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data = np.array(series.values("CP Price"))
     for d in data:
         ax1.boxplot(data)
     ax1.set_ylabel("Capital Goods Firms Price")
 
     ax2 = plt.subplot2grid((10, 2), (2, 1))
     ax2.margins(0.1)
-    data = np.array(
-        [
-            (
-                results.variables.EconModel["CS Sold Products"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Sold Products"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data = np.array(series.values("CS Sold Products"))
     for d in data:
         ax2.boxplot(data)
     ax2.set_ylabel("Consumer Goods Firms Sold Products")
 
     ax3 = plt.subplot2grid((10, 2), (3, 1))
     ax3.margins(0.1)
-    data = np.array(
-        [
-            (
-                results.variables.EconModel["CP Sold Products"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CP Sold Products"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data = np.array(series.values("CP Sold Products"))
     ax3.boxplot(data)
     ax3.set_ylabel("Capital Goods Firms Sold Products")
 
     ax2 = plt.subplot2grid((10, 2), (4, 1))
     ax2.margins(0.1)
-    data = np.array(
-        [
-            (
-                results.variables.EconModel["CS Inventory"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Inventory"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data = np.array(series.values("CS Inventory"))
     ax2.boxplot(data)
     ax2.set_ylabel("Consumer Goods Firms Inventory")
 
     ax2 = plt.subplot2grid((10, 2), (5, 1))
     ax2.margins(0.1)
-    data = np.array(
-        [
-            (
-                results.variables.EconModel["CP Inventory"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CP Inventory"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data = np.array(series.values("CP Inventory"))
     ax2.boxplot(data)
     ax2.set_ylabel("Capital Goods Firms Inventory")
 
     ax2 = plt.subplot2grid((10, 2), (6, 1))
     ax2.margins(0.1)
-    data = np.array(
-        [
-            (
-                results.variables.EconModel["CS Energy Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CS Energy Demand"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data = np.array(series.values("CS Energy Demand"))
     ax2.boxplot(data)
     ax2.set_ylabel("Consumer Goods Firms Energy Demand")
 
     ax2 = plt.subplot2grid((10, 2), (7, 1))
     ax2.margins(0.1)
-    data = np.array(
-        [
-            (
-                results.variables.EconModel["CP Energy Demand"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["CP Energy Demand"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data = np.array(series.values("CP Energy Demand"))
     ax2.boxplot(data)
     ax2.set_ylabel("Capital Goods Firms Energy Demand")
 
     ax2 = plt.subplot2grid((10, 2), (8, 1))
     ax2.margins(0.1)
     data = []
-    data.append(
-        np.array(
-            [
-                (
-                    np.sum(
-                        results.variables.EconModel["CS V Cost"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                    )
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CS V Cost"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
-    data.append(
-        np.array(
-            [
-                (
-                    np.sum(
-                        results.variables.EconModel["CS U Cost"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                    )
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CS U Cost"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
-    data.append(
-        np.array(
-            [
-                (
-                    np.sum(
-                        results.variables.EconModel["CS Q Cost"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                    )
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CS Q Cost"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
+    data.append(np.array(series.totals("CS V Cost")))
+    data.append(np.array(series.totals("CS U Cost")))
+    data.append(np.array(series.totals("CS Q Cost")))
     ax2.boxplot(data)
     ax2.set_ylabel("Consumer Goods Firms Costs")
 
     ax2 = plt.subplot2grid((10, 2), (9, 1))
     ax2.margins(0.1)
     data = []
-    data.append(
-        np.array(
-            [
-                (
-                    np.sum(
-                        results.variables.EconModel["CP V Cost"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                    )
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CP V Cost"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
-    data.append(
-        np.array(
-            [
-                (
-                    np.sum(
-                        results.variables.EconModel["CP U Cost"][
-                            results.variables.EconModel["BankDataWriter"].keys()[i]
-                        ]
-                    )
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["CS U Cost"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
+    data.append(np.array(series.totals("CP V Cost")))
+    data.append(np.array(series.totals("CP U Cost")))
     # data.append(np.array([(np.sum(results.variables.EconModel['CP Q Cost'][results.variables.EconModel['BankDataWriter'].keys()[i]])) for i in range(50,len(results.variables.EconModel['BankDataWriter'])) if results.variables.EconModel['Expected Inflation Rate'][results.variables.EconModel['BankDataWriter'].keys()[i]] is not None]))
     ax2.boxplot(data)
     ax2.set_ylabel("Capital Goods Firms Costs")
@@ -3255,48 +1016,20 @@ def plotGoodsFirmSalesSummary(results, saveFolder):
 
 
 def plotClimateModuleEffects(results, saveFolder):
+    series = PlotSeries.of(results)
     plt.figure(figsize=(36, 27))
     plt.subplots_adjust(hspace=0.5)
 
     ax3 = plt.subplot2grid((10, 2), (0, 0))
     ax3.margins(0.1)
-    ax3.plot(
-        [
-            (
-                results.variables.EconModel["Climate C02 Taxes"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Climate C02 Taxes"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Climate C02 Taxes",
-    )
+    ax3.plot(series.values("Climate C02 Taxes"), label="Climate C02 Taxes")
     ax3.set_ylabel("Climate C02 Taxes")
     ax3.set_xlabel("Year")
     ax3.legend()
 
     ax3 = plt.subplot2grid((10, 2), (1, 0))
     ax3.margins(0.1)
-    ax3.plot(
-        [
-            (
-                results.variables.EconModel["Climate C02"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            / 1e9
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Climate C02"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Climate C02 (GtCO2)",
-    )
+    ax3.plot(series.values("Climate C02") / 1e9, label="Climate C02 (GtCO2)")
     ax3.set_ylabel("Climate C02")
     ax3.set_xlabel("Year")
     ax3.legend()
@@ -3304,19 +1037,7 @@ def plotClimateModuleEffects(results, saveFolder):
     ax3 = plt.subplot2grid((10, 2), (2, 0))
     ax3.margins(0.1)
     ax3.plot(
-        [
-            (
-                results.variables.EconModel["Climate Radiative Forcing"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][0]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Climate Radiative Forcing"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Climate Radiative Forcing",
+        series.first("Climate Radiative Forcing"), label="Climate Radiative Forcing"
     )
     ax3.set_ylabel("Climate Radiative Forcing")
     ax3.set_xlabel("Year")
@@ -3324,57 +1045,15 @@ def plotClimateModuleEffects(results, saveFolder):
 
     ax3 = plt.subplot2grid((10, 2), (3, 0))
     ax3.margins(0.1)
-    ax3.plot(
-        [
-            (
-                results.variables.EconModel["Climate Temperature"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Climate Temperature"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Climate Temperature",
-    )
+    ax3.plot(series.values("Climate Temperature"), label="Climate Temperature")
     ax3.set_ylabel("Climate Temperature")
     ax3.set_xlabel("Year")
     ax3.legend()
 
     ax3 = plt.subplot2grid((10, 2), (4, 0))
     ax3.margins(0.1)
-    ax3.plot(
-        [
-            (
-                results.variables.EconModel["Climate ETD"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Climate ETD"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Climate ETD",
-    )
-    ax3.plot(
-        [
-            (
-                results.variables.EconModel["Climate ETM"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Climate ETM"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Climate ETM",
-    )
+    ax3.plot(series.values("Climate ETD"), label="Climate ETD")
+    ax3.plot(series.values("Climate ETM"), label="Climate ETM")
     ax3.set_ylabel("Climate Aggregate Damage")
     ax3.set_xlabel("Year")
     ax3.legend()
@@ -3382,107 +1061,35 @@ def plotClimateModuleEffects(results, saveFolder):
     ax3 = plt.subplot2grid((10, 2), (0, 1))
     ax3.margins(0.1)
     data = []
-    data.append(
-        [
-            (
-                results.variables.EconModel["Climate C02 Taxes"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Climate C02 Taxes"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data.append(series.values("Climate C02 Taxes"))
     ax3.boxplot(data)
     ax3.set_ylabel("Climate C02 Taxes")
 
     ax3 = plt.subplot2grid((10, 2), (1, 1))
     ax3.margins(0.1)
     data = []
-    data.append(
-        [
-            (
-                results.variables.EconModel["Climate C02 Concentration"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ][0]
-                / 1e9
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Climate C02 Concentration"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data.append(series.first("Climate C02 Concentration") / 1e9)
     ax3.boxplot(data)
     ax3.set_ylabel("Climate C02 Concentration")
 
     ax3 = plt.subplot2grid((10, 2), (2, 1))
     ax3.margins(0.1)
     data = []
-    data.append(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["Climate Radiative Forcing"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][0]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["Climate Radiative Forcing"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
+    data.append(np.array(series.first("Climate Radiative Forcing")))
     ax3.boxplot(data)
     ax3.set_ylabel("Climate Radiative Forcing")
 
     ax3 = plt.subplot2grid((10, 2), (3, 1))
     ax3.margins(0.1)
     data = []
-    data.append(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["Climate Temperature"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][0]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["Climate Temperature"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
+    data.append(np.array(series.first("Climate Temperature")))
     ax3.boxplot(data)
     ax3.set_ylabel("Climate Temperature")
 
     ax3 = plt.subplot2grid((10, 2), (4, 1))
     ax3.margins(0.1)
     data = []
-    data.append(
-        np.array(
-            [
-                (
-                    results.variables.EconModel["Climate ETD"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ][0]
-                )
-                for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-                if results.variables.EconModel["Climate ETD"][
-                    results.variables.EconModel["BankDataWriter"].keys()[i]
-                ]
-                is not None
-            ]
-        )
-    )
+    data.append(np.array(series.first("Climate ETD")))
     ax3.boxplot(data)
     ax3.set_ylabel("Climate Aggregate Damage")
 
@@ -3495,182 +1102,24 @@ def plotClimateModuleEffects(results, saveFolder):
 
 def plotCovidStatistics(results, saveFolder):
 
+    series = PlotSeries.of(results)
     plt.figure(figsize=(36, 27))
     plt.subplots_adjust(hspace=0.5)
 
     ax3 = plt.subplot2grid((2, 2), (0, 0))
     ax3.margins(0.1)
+    ax3.plot(series.state_counts("Covid State", None), label="Normal")
+    ax3.plot(series.state_counts("Covid State", "susceptible"), label="Susceptible")
+    ax3.plot(series.state_counts("Covid State", "mild"), label="Mild")
     ax3.plot(
-        [
-            len(
-                [
-                    state
-                    for state in results.variables.EconModel["Covid State"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                    if state == None
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Covid State"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Normal",
-    )
-    ax3.plot(
-        [
-            len(
-                [
-                    state
-                    for state in results.variables.EconModel["Covid State"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                    if state == "susceptible"
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Covid State"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Susceptible",
-    )
-    ax3.plot(
-        [
-            len(
-                [
-                    state
-                    for state in results.variables.EconModel["Covid State"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                    if state == "mild"
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Covid State"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Mild",
-    )
-    ax3.plot(
-        [
-            len(
-                [
-                    state
-                    for state in results.variables.EconModel["Covid State"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                    if state == "infected non-sympotomatic"
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Covid State"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
+        series.state_counts("Covid State", "infected non-sympotomatic"),
         label="Infected non-sympotomatic",
     )
-    ax3.plot(
-        [
-            len(
-                [
-                    state
-                    for state in results.variables.EconModel["Covid State"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                    if state == "severe"
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Covid State"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Severe",
-    )
-    ax3.plot(
-        [
-            len(
-                [
-                    state
-                    for state in results.variables.EconModel["Covid State"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                    if state == "critical"
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Covid State"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Critical",
-    )
-    ax3.plot(
-        [
-            len(
-                [
-                    state
-                    for state in results.variables.EconModel["Covid State"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                    if state == "dead"
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Covid State"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Dead",
-    )
-    ax3.plot(
-        [
-            len(
-                [
-                    state
-                    for state in results.variables.EconModel["Covid State"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                    if state == "recovered"
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Covid State"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Recovered",
-    )
-    ax3.plot(
-        [
-            len(
-                [
-                    state
-                    for state in results.variables.EconModel["Covid State"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                    if state == "immunized"
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Covid State"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ],
-        label="Immunized",
-    )
+    ax3.plot(series.state_counts("Covid State", "severe"), label="Severe")
+    ax3.plot(series.state_counts("Covid State", "critical"), label="Critical")
+    ax3.plot(series.state_counts("Covid State", "dead"), label="Dead")
+    ax3.plot(series.state_counts("Covid State", "recovered"), label="Recovered")
+    ax3.plot(series.state_counts("Covid State", "immunized"), label="Immunized")
     ax3.set_ylabel("Covid State Over Time (Days)")
     ax3.set_xlabel("Day")
     ax3.legend()
@@ -3678,168 +1127,15 @@ def plotCovidStatistics(results, saveFolder):
     ax3 = plt.subplot2grid((2, 2), (0, 1))
     ax3.margins(0.1)
     data = []
-    data.append(
-        [
-            len(
-                [
-                    state
-                    for state in results.variables.EconModel["Covid State"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                    if state == None
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Covid State"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
-    data.append(
-        [
-            len(
-                [
-                    state
-                    for state in results.variables.EconModel["Covid State"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                    if state == "susceptible"
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Covid State"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
-    data.append(
-        [
-            len(
-                [
-                    state
-                    for state in results.variables.EconModel["Covid State"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                    if state == "mild"
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Covid State"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
-    data.append(
-        [
-            len(
-                [
-                    state
-                    for state in results.variables.EconModel["Covid State"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                    if state == "infected non-sympotomatic"
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Covid State"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
-    data.append(
-        [
-            len(
-                [
-                    state
-                    for state in results.variables.EconModel["Covid State"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                    if state == "severe"
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Covid State"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
-    data.append(
-        [
-            len(
-                [
-                    state
-                    for state in results.variables.EconModel["Covid State"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                    if state == "critical"
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Covid State"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
-    data.append(
-        [
-            len(
-                [
-                    state
-                    for state in results.variables.EconModel["Covid State"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                    if state == "dead"
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Covid State"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
-    data.append(
-        [
-            len(
-                [
-                    state
-                    for state in results.variables.EconModel["Covid State"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                    if state == "recovered"
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Covid State"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
-    data.append(
-        [
-            len(
-                [
-                    state
-                    for state in results.variables.EconModel["Covid State"][
-                        results.variables.EconModel["BankDataWriter"].keys()[i]
-                    ]
-                    if state == "immunized"
-                ]
-            )
-            for i in range(50, len(results.variables.EconModel["BankDataWriter"]))
-            if results.variables.EconModel["Covid State"][
-                results.variables.EconModel["BankDataWriter"].keys()[i]
-            ]
-            is not None
-        ]
-    )
+    data.append(series.state_counts("Covid State", None))
+    data.append(series.state_counts("Covid State", "susceptible"))
+    data.append(series.state_counts("Covid State", "mild"))
+    data.append(series.state_counts("Covid State", "infected non-sympotomatic"))
+    data.append(series.state_counts("Covid State", "severe"))
+    data.append(series.state_counts("Covid State", "critical"))
+    data.append(series.state_counts("Covid State", "dead"))
+    data.append(series.state_counts("Covid State", "recovered"))
+    data.append(series.state_counts("Covid State", "immunized"))
     ax3.boxplot(data)
     ax3.set_ylabel("Covid State Over Time")
 
@@ -4012,6 +1308,8 @@ def sensitivity_3d(
     xi = np.linspace(x_min, x_max, 900)
     yi = np.linspace(y_min, y_max, 900)
 
+    from scipy.interpolate import griddata
+
     X, Y = np.meshgrid(xi, yi)
     Z = griddata((x, y), z, (X, Y), method="cubic")
 
@@ -4138,6 +1436,8 @@ def pline_plot(
 
     # Apply Hodrick-Prescott filter if selected
     if apply_hp_filter:
+        from statsmodels.tsa.filters.hp_filter import hpfilter
+
         for i in range(len(x)):
             cycle, trend = hpfilter(x[i], lamb=hp_lambda)
             x[i] = trend  # Replace the original data with the trend component
@@ -4578,20 +1878,6 @@ def heatmap_plot(
 # - heatmap_plot(): Create heatmap visualizations
 
 
-def lognormal(mu, sigma):
-    mean = math.log(mu**2 / math.sqrt(sigma + mu**2))
-    std = math.sqrt(math.log(sigma / mu**2 + 1))
-    y = np.random.lognormal(mean, std)
-    return y
-
-
-def normal(mu, sigma):
-    mean = mu
-    std = math.sqrt(sigma)
-    y = np.random.normal(mean, std)
-    return y
-
-
 ### Unused functions:
 
 
@@ -0,0 +1,38 @@
+"""
+CliMaPan-Lab Storage Module
+
+This package contains the I/O helpers used by the simulation drivers to persist
+run outputs (figures, exported variables, model artifacts).
+"""
+
+from .artifact import ModelArtifact, load_model_artifact, save_model_artifact
+from .batch_store import BatchResultReader, BatchResultStore, load_batch_results
+from .catalog import DEFAULT_CATALOG_PATH, RunCatalog, param_hash, summary_statistics
+from .evaluations import DEFAULT_EVALUATION_PATH, EvaluationStore
+from .figures import FigureRenderer
+from .jsonl import append_jsonl, load_jsonl
+from .panels import DeltaPanel, PanelSet, load_panels
+from .writer import AsyncWriter, run_or_submit
+
+__all__ = [
+    "DEFAULT_CATALOG_PATH",
+    "DEFAULT_EVALUATION_PATH",
+    "AsyncWriter",
+    "BatchResultReader",
+    "BatchResultStore",
+    "DeltaPanel",
+    "EvaluationStore",
+    "FigureRenderer",
+    "ModelArtifact",
+    "PanelSet",
+    "RunCatalog",
+    "append_jsonl",
+    "load_batch_results",
+    "load_jsonl",
+    "load_model_artifact",
+    "load_panels",
+    "param_hash",
+    "run_or_submit",
+    "save_model_artifact",
+    "summary_statistics",
+]
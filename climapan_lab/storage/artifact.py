@@ -0,0 +1,271 @@
+"""
+CliMaPan-Lab: Climate-Pandemic Economic Modeling Laboratory
+Compact Model Artifact
+
+Pickling a finished ``EconModel`` serializes every agent object, every
+``AgentList`` view and all history lists, and the result can only be read back
+with the simulation classes importable. This module stores the end-of-run model
+state instead as a single compressed ``.npz`` file:
+
+  - one typed array per agent attribute and agent group (``consumers/wage``,
+    ``cs_firms/price``, ...);
+  - per-agent history lists (``wealthList``, ``priceList``, ...) as a flat
+    value array plus row offsets (``<column>__offsets``);
+  - a JSON manifest (format version, parameters, model scalars, column index)
+    stored under ``__manifest__``.
+
+Artifacts load with ``np.load(..., allow_pickle=False)`` only, so no simulation
+code is needed to read them. Attributes that do not map to typed arrays (agent
+references, id-keyed dicts) are listed in the manifest under ``skipped``; small
+string-keyed dicts such as ``covidState`` become ``covidState.<key>`` columns.
+"""
+
+import datetime
+import json
+
+import numpy as np
+
+ARTIFACT_FORMAT = "climapan-model-artifact"
+ARTIFACT_VERSION = 1
+
+# Artifact group name -> EconModel attribute holding the agents
+AGENT_GROUPS = {
+    "consumers": "consumer_agents",
+    "cs_firms": "csfirm_agents",
+    "cp_firms": "cpfirm_agents",
+    "green_energy_firms": "greenEFirm",
+    "brown_energy_firms": "brownEFirm",
+    "banks": "bank_agents",
+    "governments": "government_agents",
+    "climate": "climateModule",
+}
+
+_MANIFEST_KEY = "__manifest__"
+_OFFSETS_SUFFIX = "__offsets"
+_SKIP_ATTRS = {"model", "p"}
+# Small string-keyed dicts (e.g. ``covidState``) are split into sub-columns
+_MAX_DICT_KEYS = 32
+
+
+def _to_python(value):
+    """Convert numpy/date scalars to JSON-compatible Python values."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def _value_kind(value):
+    if value is None:
+        return "none"
+    if isinstance(value, (bool, np.bool_)):
+        return "bool"
+    if isinstance(value, (int, np.integer)):
+        return "int"
+    if isinstance(value, (float, np.floating)):
+        return "float"
+    if isinstance(value, str):
+        return "str"
+    if isinstance(value, (list, tuple, np.ndarray)):
+        try:
+            np.asarray(value, dtype=np.float64)
+        except (TypeError, ValueError):
+            return "other"
+        return "seq"
+    return "other"
+
+
+def _encode_column(values):
+    """
+    Encode one attribute across a group of agents.
+
+    Returns a dict of ``{suffix: array}`` (``""`` for the values, ``__offsets``
+    for ragged columns) or None if the attribute has no typed representation.
+    """
+    kinds = {_value_kind(v) for v in values}
+    numeric = kinds - {"none"}
+
+    if not numeric or "other" in kinds:
+        return None
+    if numeric == {"bool"} and "none" not in kinds:
+        return {"": np.array(values, dtype=np.bool_)}
+    if numeric == {"int"} and "none" not in kinds:
+        return {"": np.array(values, dtype=np.int64)}
+    if numeric <= {"bool", "int", "float"}:
+        return {
+            "": np.array(
+                [np.nan if v is None else float(v) for v in values], dtype=np.float64
+            )
+        }
+    if numeric == {"str"}:
+        return {"": np.array(["" if v is None else v for v in values], dtype=np.str_)}
+    if numeric == {"seq"}:
+        rows = [
+            np.ravel(np.asarray([] if v is None else v, dtype=np.float64))
+            for v in values
+        ]
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(r) for r in rows])
+        flat = np.concatenate(rows) if len(rows) else np.zeros(0, dtype=np.float64)
+        return {"": flat, _OFFSETS_SUFFIX: offsets}
+    return None
+
+
+def _agent_group_arrays(agents):
+    """Collect the typed columns of one agent group."""
+    agents = list(agents)
+    attrs = []
+    for agent in agents:
+        for name in vars(agent):
+            if (
+                name not in _SKIP_ATTRS
+                and not name.startswith("_")
+                and name not in attrs
+            ):
+                attrs.append(name)
+
+    columns, skipped = {}, []
+    for name in attrs:
+        values = [getattr(agent, name, None) for agent in agents]
+        for column, column_values in _split_dict_column(name, values):
+            encoded = _encode_column(column_values)
+            if encoded is None:
+                skipped.append(column)
+            else:
+                columns[column] = encoded
+    return len(agents), columns, skipped
+
+
+def _split_dict_column(name, values):
+    """Yield ``(column, values)`` pairs, expanding small string-keyed dicts."""
+    dicts = [v for v in values if v is not None]
+    if not dicts or not all(isinstance(v, dict) for v in dicts):
+        yield name, values
+        return
+
+    keys = []
+    for d in dicts:
+        keys.extend(k for k in d if k not in keys)
+    if len(keys) > _MAX_DICT_KEYS or not all(isinstance(k, str) for k in keys):
+        yield name, values
+        return
+
+    for key in keys:
+        yield f"{name}.{key}", [None if v is None else v.get(key) for v in values]
+
+
+def _model_scalars(model):
+    """JSON-compatible scalar state of the model itself."""
+    scalars = {}
+    for name, value in vars(model).items():
+        if name.startswith("_") or name in _SKIP_ATTRS:
+            continue
+        value = _to_python(value)
+        if isinstance(value, (bool, int, float, str)) or value is None:
+            scalars[name] = value
+    return scalars
+
+
+def save_model_artifact(model, path, extra=None):
+    """
+    Write the end-of-run state of ``model`` to a compressed ``.npz`` artifact.
+
+    Args:
+        model: A finished EconModel
+        path: Output file path (``.npz`` is appended by NumPy if missing)
+        extra: Optional JSON-compatible dict stored in the manifest
+
+    Returns:
+        The manifest dict written to the artifact
+    """
+    arrays = {}
+    manifest = {
+        "format": ARTIFACT_FORMAT,
+        "version": ARTIFACT_VERSION,
+        "created": datetime.datetime.now().isoformat(),
+        "params": json.loads(json.dumps(dict(model.p), default=_to_python)),
+        "scalars": _model_scalars(model),
+        "groups": {},
+        "extra": extra or {},
+    }
+
+    for group, attr in AGENT_GROUPS.items():
+        agents = getattr(model, attr, None)
+        if agents is None:
+            continue
+        size, columns, skipped = _agent_group_arrays(agents)
+        ragged = []
+        for name, encoded in columns.items():
+            for suffix, array in encoded.items():
+                arrays[f"{group}/{name}{suffix}"] = array
+            if _OFFSETS_SUFFIX in encoded:
+                ragged.append(name)
+        manifest["groups"][group] = {
+            "size": size,
+            "columns": list(columns),
+            "ragged": ragged,
+            "skipped": skipped,
+        }
+
+    arrays[_MANIFEST_KEY] = np.frombuffer(
+        json.dumps(manifest).encode("utf-8"), dtype=np.uint8
+    )
+    np.savez_compressed(path, **arrays)
+    return manifest
+
+
+class ModelArtifact:
+    """Read-only view of a saved model artifact."""
+
+    def __init__(self, manifest, arrays):
+        self.manifest = manifest
+        self.version = manifest["version"]
+        self.params = manifest["params"]
+        self.scalars = manifest["scalars"]
+        self.groups = manifest["groups"]
+        self._arrays = arrays
+
+    def columns(self, group):
+        """Column names stored for an agent group."""
+        return list(self.groups[group]["columns"])
+
+    def column(self, group, name):
+        """
+        Values of one column: a typed array, or a list of arrays (one per
+        agent) for ragged history columns.
+        """
+        values = self._arrays[f"{group}/{name}"]
+        if name in self.groups[group]["ragged"]:
+            offsets = self._arrays[f"{group}/{name}{_OFFSETS_SUFFIX}"]
+            return [
+                values[offsets[i] : offsets[i + 1]] for i in range(len(offsets) - 1)
+            ]
+        return values
+
+    def to_frame(self, group, include_ragged=False):
+        """Agent group as a pandas DataFrame (one row per agent)."""
+        import pandas as pd
+
+        data = {}
+        for name in self.columns(group):
+            if name in self.groups[group]["ragged"] and not include_ragged:
+                continue
+            data[name] = self.column(group, name)
+        return pd.DataFrame(data)
+
+
+def load_model_artifact(path):
+    """Load an artifact written by ``save_model_artifact``."""
+    with np.load(path, allow_pickle=False) as npz:
+        arrays = {key: npz[key] for key in npz.files}
+
+    manifest = json.loads(arrays.pop(_MANIFEST_KEY).tobytes().decode("utf-8"))
+    if manifest.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"{path} is not a CliMaPan-Lab model artifact")
+    if manifest["version"] > ARTIFACT_VERSION:
+        raise ValueError(
+            f"Artifact version {manifest['version']} is newer than supported "
+            f"version {ARTIFACT_VERSION}"
+        )
+    return ModelArtifact(manifest, arrays)
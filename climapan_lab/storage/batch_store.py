@@ -0,0 +1,274 @@
+"""
+CliMaPan-Lab: Climate-Pandemic Economic Modeling Laboratory
+Batch Result Store
+
+Sensitivity sweeps produce one output record per (parameter sample, seed).
+Writing each record as its own JSON file does not scale (``budget=500`` and
+``num_seeds=50`` is 25,000 files), so ``BatchResultStore`` appends them to a
+single chunked, gzip-compressed HDF5 file instead:
+
+  - ``/params``: one row per parameter sample (``batch_idx`` plus one column
+    per swept parameter, names stored in the ``names`` attribute);
+  - ``/runs``: one row per simulation (``batch_idx``, ``seed``);
+  - ``/outputs/<var>``: one row per simulation, aligned with ``/runs``; time
+    series of different lengths are NaN-padded to the longest one.
+
+The base parameters shared by every run are stored once as JSON in the file
+attributes. Appends go through a lock and are flushed immediately, so the
+store can be fed straight from a ``Pool.imap_unordered`` result loop and a
+crashed sweep keeps everything written so far.
+
+``BatchResultReader`` reads the file back and selects samples by parameter
+range without touching the outputs of other samples.
+"""
+
+import json
+import threading
+
+import h5py
+import numpy as np
+
+BATCH_STORE_FORMAT = "climapan-batch-store"
+BATCH_STORE_VERSION = 1
+
+_CHUNK_ROWS = 64
+
+
+def _as_row(value):
+    """Convert one output value (scalar, list, Series, array) to a 1-D float array."""
+    if hasattr(value, "to_numpy"):
+        value = value.to_numpy()
+    try:
+        return np.ravel(np.asarray(value, dtype=np.float64))
+    except (TypeError, ValueError):
+        return None
+
+
+def _append_rows(dataset, rows):
+    """Append ``rows`` along the first axis of a resizable dataset."""
+    start = dataset.shape[0]
+    dataset.resize(start + len(rows), axis=0)
+    dataset[start:] = rows
+
+
+class BatchResultStore:
+    """Append-only HDF5 store for sensitivity analysis results."""
+
+    def __init__(self, path, param_names, base_params=None, mode="a"):
+        """
+        Args:
+            path: HDF5 file path (created if missing)
+            param_names: Names of the swept parameters, in sample column order
+            base_params: Optional dict of parameters shared by all runs
+            mode: h5py file mode; ``"a"`` resumes an existing store
+        """
+        self.path = path
+        self.param_names = list(param_names)
+        self._lock = threading.Lock()
+        self._file = h5py.File(path, mode)
+
+        if "runs" in self._file:
+            stored = list(self._file["params"].attrs["names"])
+            if stored != self.param_names:
+                self._file.close()
+                raise ValueError(
+                    f"{path} stores parameters {stored}, not {self.param_names}"
+                )
+            return
+
+        self._file.attrs["format"] = BATCH_STORE_FORMAT
+        self._file.attrs["version"] = BATCH_STORE_VERSION
+        self._file.attrs["base_params"] = json.dumps(base_params or {}, default=str)
+
+        n_params = len(self.param_names)
+        params = self._file.create_group("params")
+        params.attrs["names"] = self.param_names
+        params.create_dataset(
+            "batch_idx", shape=(0,), maxshape=(None,), dtype=np.int64, chunks=True
+        )
+        params.create_dataset(
+            "values",
+            shape=(0, n_params),
+            maxshape=(None, n_params),
+            dtype=np.float64,
+            chunks=(_CHUNK_ROWS, max(n_params, 1)),
+            compression="gzip",
+        )
+
+        runs = self._file.create_group("runs")
+        for name in ("batch_idx", "seed"):
+            runs.create_dataset(
+                name, shape=(0,), maxshape=(None,), dtype=np.int64, chunks=True
+            )
+        self._file.create_group("outputs")
+        self._file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def append_sample(self, batch_idx, param_values, seeds, outputs):
+        """
+        Append all seeds of one parameter sample.
+
+        Args:
+            batch_idx: Index of the parameter sample
+            param_values: Swept parameter values, ordered like ``param_names``
+            seeds: Seeds of the runs, one per entry of ``outputs``
+            outputs: One ``{variable: series}`` dict per seed
+        """
+        seeds = np.asarray(seeds, dtype=np.int64)
+        if len(seeds) != len(outputs):
+            raise ValueError("seeds and outputs must have the same length")
+
+        with self._lock:
+            n_runs = self._file["runs/seed"].shape[0]
+            _append_rows(self._file["params/batch_idx"], [batch_idx])
+            _append_rows(
+                self._file["params/values"],
+                np.asarray(param_values, dtype=np.float64).reshape(1, -1),
+            )
+            _append_rows(self._file["runs/batch_idx"], np.full(len(seeds), batch_idx))
+            _append_rows(self._file["runs/seed"], seeds)
+
+            names = []
+            for output in outputs:
+                names.extend(name for name in output if name not in names)
+            for name in names:
+                self._append_output(name, [o.get(name) for o in outputs], n_runs)
+
+            # Variables missing from this sample still need aligned rows
+            for name, dataset in self._file["outputs"].items():
+                if dataset.shape[0] < n_runs + len(seeds):
+                    dataset.resize(n_runs + len(seeds), axis=0)
+
+            self._file.flush()
+
+    def _append_output(self, name, values, n_runs):
+        rows = [None if v is None else _as_row(v) for v in values]
+        if all(r is None for r in rows):
+            # Missing everywhere or not numeric: leave the variable out
+            return
+        length = max(len(r) for r in rows if r is not None)
+
+        outputs = self._file["outputs"]
+        if name not in outputs:
+            outputs.create_dataset(
+                name,
+                shape=(n_runs, length),
+                maxshape=(None, None),
+                dtype=np.float64,
+                chunks=(_CHUNK_ROWS, max(length, 1)),
+                compression="gzip",
+                fillvalue=np.nan,
+            )
+        dataset = outputs[name]
+        if dataset.shape[0] < n_runs:
+            dataset.resize(n_runs, axis=0)
+        if length > dataset.shape[1]:
+            dataset.resize(length, axis=1)
+
+        block = np.full((len(rows), dataset.shape[1]), np.nan)
+        for i, row in enumerate(rows):
+            if row is not None:
+                block[i, : len(row)] = row
+        _append_rows(dataset, block)
+
+    def close(self):
+        with self._lock:
+            if self._file.id.valid:
+                self._file.close()
+
+
+class BatchResultReader:
+    """Query a store written by ``BatchResultStore``."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = h5py.File(path, "r")
+        if self._file.attrs.get("format") != BATCH_STORE_FORMAT:
+            self._file.close()
+            raise ValueError(f"{path} is not a CliMaPan-Lab batch store")
+
+        self.param_names = [str(n) for n in self._file["params"].attrs["names"]]
+        self.base_params = json.loads(self._file.attrs["base_params"])
+        self.sample_idx = self._file["params/batch_idx"][:]
+        self.param_values = self._file["params/values"][:]
+        self.run_batch_idx = self._file["runs/batch_idx"][:]
+        self.run_seeds = self._file["runs/seed"][:]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def variables(self):
+        return list(self._file["outputs"])
+
+    def params_frame(self):
+        """Parameter samples as a pandas DataFrame indexed by ``batch_idx``."""
+        import pandas as pd
+
+        return pd.DataFrame(
+            self.param_values,
+            columns=self.param_names,
+            index=pd.Index(self.sample_idx, name="batch_idx"),
+        )
+
+    def query(self, ranges):
+        """
+        Batch indices whose parameters fall inside ``ranges``.
+
+        Args:
+            ranges: ``{param: (low, high)}`` (inclusive), e.g. the ``params``
+                dict of an ``analysis/sensitivity_params`` file
+        """
+        mask = np.ones(len(self.sample_idx), dtype=bool)
+        for name, (low, high) in ranges.items():
+            column = self.param_values[:, self.param_names.index(name)]
+            mask &= (column >= low) & (column <= high)
+        return self.sample_idx[mask]
+
+    def outputs(self, variable, batch_idx=None):
+        """
+        Rows of one recorded variable.
+
+        Args:
+            variable: Output variable name
+            batch_idx: Optional iterable of batch indices (e.g. from ``query``)
+
+        Returns:
+            ``(values, batch_idx, seeds)`` with one row per selected run
+        """
+        if batch_idx is None:
+            rows = np.arange(len(self.run_seeds))
+        else:
+            rows = np.flatnonzero(np.isin(self.run_batch_idx, list(batch_idx)))
+        dataset = self._file["outputs"][variable]
+        if len(rows):
+            values = dataset[rows]
+        else:
+            values = np.zeros((0, dataset.shape[1]))
+        return values, self.run_batch_idx[rows], self.run_seeds[rows]
+
+    def output_rows(self, variable, start, stop):
+        """
+        Rows ``start:stop`` of one recorded variable, in run order.
+
+        Only the chunks holding those rows are read, so a store larger than
+        memory can be scanned block by block.
+        """
+        return self._file["outputs"][variable][start:stop]
+
+    def close(self):
+        if self._file.id.valid:
+            self._file.close()
+
+
+def load_batch_results(path):
+    """Open a batch store for querying."""
+    return BatchResultReader(path)
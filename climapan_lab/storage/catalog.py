@@ -0,0 +1,429 @@
+"""
+CliMaPan-Lab: Climate-Pandemic Economic Modeling Laboratory
+Run Catalog
+
+Every driver writes timestamped result folders with ``params.txt`` sidecars,
+so finding runs by parameter value used to mean crawling the ``results/`` tree.
+``RunCatalog`` keeps a local SQLite index instead. Each simulation is
+registered with:
+
+  - a parameter hash (``seed`` excluded, so replicates share a hash) and the
+    full parameters as JSON;
+  - scenario flags (``settings``, ``covid_settings``, climate shock mode) and
+    the seed;
+  - wall time, the driver that ran it and its output path;
+  - headline statistics: mean GDP, final unemployment rate, peak infections.
+
+Runs can then be selected with ``RunCatalog.query`` or from the command line::
+
+    python -m climapan_lab.storage.catalog query --settings CT --param "alpha=0.1:0.3"
+    python -m climapan_lab.storage.catalog scan ./results
+
+``scan`` indexes folders written before the catalog existed.
+"""
+
+import argparse
+import datetime
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+DEFAULT_CATALOG_PATH = os.path.join("results", "catalog.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created TEXT NOT NULL,
+    driver TEXT,
+    param_hash TEXT NOT NULL,
+    settings TEXT,
+    covid_settings TEXT,
+    climate_shock TEXT,
+    seed INTEGER,
+    wall_time REAL,
+    output_path TEXT,
+    params TEXT NOT NULL,
+    varying_params TEXT,
+    mean_gdp REAL,
+    final_unemployment REAL,
+    peak_infections REAL
+);
+CREATE INDEX IF NOT EXISTS runs_param_hash ON runs (param_hash);
+CREATE INDEX IF NOT EXISTS runs_scenario ON runs (settings, covid_settings);
+CREATE INDEX IF NOT EXISTS runs_output_path ON runs (output_path);
+"""
+
+_COLUMNS = [
+    "id",
+    "created",
+    "driver",
+    "param_hash",
+    "settings",
+    "covid_settings",
+    "climate_shock",
+    "seed",
+    "wall_time",
+    "output_path",
+    "params",
+    "varying_params",
+    "mean_gdp",
+    "final_unemployment",
+    "peak_infections",
+]
+
+
+def _to_json(value):
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+# Run options that do not change a run's outputs; also ignored by the
+# evaluation store (``evaluations.IGNORED_PARAMS``)
+RUN_OPTIONS = ("show_progress", "verboseFlag", "profile")
+
+
+def param_hash(parameters):
+    """Stable hash of a parameter dict, ignoring the seed and ``RUN_OPTIONS``."""
+    params = {
+        k: v for k, v in parameters.items() if k != "seed" and k not in RUN_OPTIONS
+    }
+    return hashlib.sha1(_to_json(params).encode("utf-8")).hexdigest()
+
+
+def _series(variables, name):
+    """Non-null values of one recorded variable as a flat float array."""
+    if variables is None or name not in variables:
+        return np.zeros(0)
+    values = []
+    for value in variables[name]:
+        if value is None:
+            continue
+        try:
+            values.append(np.ravel(np.asarray(value, dtype=np.float64)))
+        except (TypeError, ValueError):
+            continue
+    if not values:
+        return np.zeros(0)
+    flat = np.concatenate(values)
+    return flat[~np.isnan(flat)]
+
+
+def summary_statistics(variables):
+    """
+    Headline statistics of a run.
+
+    Args:
+        variables: Recorded model variables (DataFrame or ``{name: series}``)
+
+    Returns:
+        Dict with ``mean_gdp``, ``final_unemployment`` and ``peak_infections``
+        (None when the variable was not recorded)
+    """
+    gdp = _series(variables, "GDP")
+    unemployment = _series(variables, "UnemploymentRate")
+    infections = _series(variables, "Infection")
+    return {
+        "mean_gdp": float(gdp.mean()) if len(gdp) else None,
+        "final_unemployment": float(unemployment[-1]) if len(unemployment) else None,
+        "peak_infections": float(infections.max()) if len(infections) else None,
+    }
+
+
+class RunCatalog:
+    """SQLite index of simulation runs, safe to share between threads."""
+
+    def __init__(self, path=DEFAULT_CATALOG_PATH):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def register(
+        self,
+        parameters,
+        output_path=None,
+        driver=None,
+        wall_time=None,
+        variables=None,
+        varying_params=None,
+        stats=None,
+    ):
+        """
+        Add one run to the catalog.
+
+        Args:
+            parameters: Full parameter dict of the run
+            output_path: Folder or file holding the run's outputs
+            driver: Name of the entry point that ran it (e.g. ``single_run``)
+            wall_time: Simulation wall time in seconds
+            variables: Recorded variables used to compute summary statistics
+            varying_params: Swept parameters of a parameter sweep
+            stats: Precomputed summary statistics (overrides ``variables``)
+
+        Returns:
+            The id of the new catalog row
+        """
+        stats = stats if stats is not None else summary_statistics(variables)
+        shock = parameters.get("climateShockMode")
+        if isinstance(shock, (list, tuple)):
+            shock = "".join(shock)
+
+        row = {
+            "created": datetime.datetime.now().isoformat(),
+            "driver": driver,
+            "param_hash": param_hash(parameters),
+            "settings": parameters.get("settings"),
+            "covid_settings": parameters.get("covid_settings"),
+            "climate_shock": shock,
+            "seed": parameters.get("seed"),
+            "wall_time": wall_time,
+            "output_path": os.path.abspath(output_path) if output_path else None,
+            "params": _to_json(parameters),
+            "varying_params": _to_json(varying_params) if varying_params else None,
+            "mean_gdp": stats.get("mean_gdp"),
+            "final_unemployment": stats.get("final_unemployment"),
+            "peak_infections": stats.get("peak_infections"),
+        }
+        if row["seed"] is not None:
+            row["seed"] = int(row["seed"])
+
+        names = ", ".join(row)
+        placeholders = ", ".join(f":{name}" for name in row)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"INSERT INTO runs ({names}) VALUES ({placeholders})", row
+            )
+        return cursor.lastrowid
+
+    def query(
+        self,
+        settings=None,
+        covid_settings=None,
+        climate_shock=None,
+        seed=None,
+        param_hash=None,
+        driver=None,
+        params=None,
+        limit=None,
+    ):
+        """
+        Select runs from the catalog.
+
+        Args:
+            settings, covid_settings, climate_shock, seed, param_hash, driver:
+                Exact-match filters (None = any)
+            params: ``{name: value}`` exact matches or ``{name: (low, high)}``
+                inclusive ranges on individual parameters
+            limit: Maximum number of rows
+
+        Returns:
+            List of dicts (``params``/``varying_params`` decoded), newest first
+        """
+        clauses, values = [], []
+        for column, value in (
+            ("settings", settings),
+            ("covid_settings", covid_settings),
+            ("climate_shock", climate_shock),
+            ("seed", seed),
+            ("param_hash", param_hash),
+            ("driver", driver),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                values.append(value)
+
+        for name, value in (params or {}).items():
+            # The JSON path is bound like the values, never formatted into SQL
+            path = f'$."{name}"'
+            if isinstance(value, (tuple, list)):
+                low, high = value
+                if low is not None:
+                    clauses.append("json_extract(params, ?) >= ?")
+                    values.extend([path, low])
+                if high is not None:
+                    clauses.append("json_extract(params, ?) <= ?")
+                    values.extend([path, high])
+            else:
+                clauses.append("json_extract(params, ?) = ?")
+                values.extend([path, value])
+
+        sql = "SELECT * FROM runs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id DESC"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+
+        with self._lock:
+            rows = self._conn.execute(sql, values).fetchall()
+        return [self._decode(row) for row in rows]
+
+    def paths(self, **filters):
+        """Output paths of the runs matching ``query(**filters)``."""
+        return [row["output_path"] for row in self.query(**filters)]
+
+    def scan(self, root):
+        """
+        Index result folders under ``root`` that are not in the catalog yet.
+
+        Any folder with a ``params.txt`` is registered; statistics are read from
+        its ``single_run.csv.gz`` when present.
+
+        Returns:
+            Number of folders added
+        """
+        with self._lock:
+            known = {
+                row[0]
+                for row in self._conn.execute("SELECT output_path FROM runs")
+                if row[0]
+            }
+
+        added = 0
+        pattern = os.path.join(root, "**", "params.txt")
+        for params_file in sorted(glob.glob(pattern, recursive=True)):
+            folder = os.path.abspath(os.path.dirname(params_file))
+            if folder in known:
+                continue
+            try:
+                with open(params_file) as f:
+                    parameters = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Skipping {params_file}: {e}")
+                continue
+
+            varying = None
+            varying_file = os.path.join(folder, "varying_params.txt")
+            if os.path.exists(varying_file):
+                with open(varying_file) as f:
+                    varying = json.load(f)
+
+            variables = None
+            frame_file = os.path.join(folder, "single_run.csv.gz")
+            if os.path.exists(frame_file):
+                import pandas as pd
+
+                variables = pd.read_csv(frame_file, compression="gzip")
+
+            self.register(
+                parameters,
+                output_path=folder,
+                driver="scan",
+                variables=variables,
+                varying_params=varying,
+            )
+            added += 1
+        return added
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _decode(row):
+        record = {column: row[column] for column in _COLUMNS}
+        record["params"] = json.loads(record["params"])
+        if record["varying_params"]:
+            record["varying_params"] = json.loads(record["varying_params"])
+        return record
+
+
+def _parse_param_filter(text):
+    """Parse ``name=value`` or ``name=low:high`` (either bound may be empty)."""
+    name, _, value = text.partition("=")
+    if not name or not value:
+        raise argparse.ArgumentTypeError(
+            f"Expected name=value or name=low:high: {text}"
+        )
+
+    def number(v):
+        try:
+            return float(v)
+        except ValueError:
+            return v
+
+    if ":" in value:
+        low, high = value.split(":", 1)
+        return name, (number(low) if low else None, number(high) if high else None)
+    return name, number(value)
+
+
+def main(argv=None):
+    """Command-line interface for querying and building the run catalog."""
+    parser = argparse.ArgumentParser(description="CliMaPan-Lab run catalog")
+    parser.add_argument(
+        "--catalog", default=DEFAULT_CATALOG_PATH, help="Path to the catalog database"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    query_parser = commands.add_parser("query", help="List runs matching filters")
+    query_parser.add_argument("--settings", default=None)
+    query_parser.add_argument("--covidSettings", default=None)
+    query_parser.add_argument("--climateShock", default=None)
+    query_parser.add_argument("--seed", type=int, default=None)
+    query_parser.add_argument("--paramHash", default=None)
+    query_parser.add_argument("--driver", default=None)
+    query_parser.add_argument(
+        "--param",
+        action="append",
+        type=_parse_param_filter,
+        default=[],
+        help="Parameter filter name=value or name=low:high (repeatable)",
+    )
+    query_parser.add_argument("--limit", type=int, default=None)
+    query_parser.add_argument(
+        "--paths", action="store_true", help="Print output paths only"
+    )
+
+    scan_parser = commands.add_parser("scan", help="Index existing result folders")
+    scan_parser.add_argument("root", help="Results directory to crawl")
+
+    args = parser.parse_args(argv)
+
+    with RunCatalog(args.catalog) as catalog:
+        if args.command == "scan":
+            added = catalog.scan(args.root)
+            print(f"Indexed {added} run(s) from {args.root}")
+            return
+
+        rows = catalog.query(
+            settings=args.settings,
+            covid_settings=args.covidSettings,
+            climate_shock=args.climateShock,
+            seed=args.seed,
+            param_hash=args.paramHash,
+            driver=args.driver,
+            params=dict(args.param),
+            limit=args.limit,
+        )
+        for row in rows:
+            if args.paths:
+                print(row["output_path"])
+                continue
+            print(
+                f"{row['id']:>6}  {row['created'][:19]}  {row['driver'] or '-':<14}"
+                f"{row['settings'] or '-':<6} {row['covid_settings'] or '-':<6} "
+                f"seed={row['seed']}  gdp={row['mean_gdp']}  "
+                f"unempl={row['final_unemployment']}  "
+                f"peak_inf={row['peak_infections']}  {row['output_path']}"
+            )
+        print(f"{len(rows)} run(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""
+CliMaPan-Lab: Climate-Pandemic Economic Modeling Laboratory
+Evaluation Store
+
+Calibration, validation and sensitivity studies keep re-simulating parameter
+points that earlier studies already ran with the same seed, and each driver
+keeps its results in its own JSON or text format. ``EvaluationStore`` is a
+local SQLite database shared by all three drivers. An evaluation is keyed by:
+
+  - the code version (a hash of the model sources under ``src/``);
+  - a canonical parameter hash (seed, horizon and display-only flags such as
+    ``show_progress`` excluded, numpy scalars normalized);
+  - the seed;
+  - the horizon in simulation steps.
+
+It holds the extracted monthly output series (one compressed blob per
+variable; per-agent records are stored as values plus offsets), a status
+(``completed`` or ``diverged``), the wall time and derived statistics. Drivers
+look a point up before simulating it and store what they extract afterwards;
+series stored by different drivers for the same key are merged, so
+overlapping studies reuse each other's runs.
+
+The database runs in WAL mode with a busy timeout, and each process opens its
+own connection (stores are picklable), so workers of a process pool can all
+write to it.
+"""
+
+import datetime
+import functools
+import glob
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+from .catalog import RUN_OPTIONS
+
+DEFAULT_EVALUATION_PATH = os.path.join("results", "evaluations.db")
+
+# Parameters that do not change a run's outputs (or are part of the key)
+IGNORED_PARAMS = ("seed", "steps") + RUN_OPTIONS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS evaluations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created TEXT NOT NULL,
+    driver TEXT,
+    code_version TEXT NOT NULL,
+    param_hash TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    horizon INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    wall_time REAL,
+    params TEXT NOT NULL,
+    stats TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS evaluations_key
+    ON evaluations (code_version, param_hash, seed, horizon);
+CREATE TABLE IF NOT EXISTS series (
+    evaluation_id INTEGER NOT NULL REFERENCES evaluations (id),
+    name TEXT NOT NULL,
+    data BLOB,
+    PRIMARY KEY (evaluation_id, name)
+);
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def code_version():
+    """Hash of the model sources, so results of older model code are not reused."""
+    src = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+    digest = hashlib.sha1()
+    for path in sorted(glob.glob(os.path.join(src, "**", "*.py"), recursive=True)):
+        digest.update(os.path.relpath(path, src).encode("utf-8"))
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def _canonical(value):
+    if isinstance(value, np.floating):
+        # Shortest repr, so float32(0.1) matches 0.1
+        value = float(str(value))
+    elif isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        # Sampled values pass through float32/64 conversions
+        return float(f"{value:.12g}")
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    return value
+
+
+def canonical_params(parameters):
+    """Parameters as compared by the store (``IGNORED_PARAMS`` removed)."""
+    return {k: _canonical(v) for k, v in parameters.items() if k not in IGNORED_PARAMS}
+
+
+def canonical_hash(parameters):
+    text = json.dumps(canonical_params(parameters), sort_keys=True, default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def encode_series(values):
+    """Monthly values (numbers or per-agent sequences) as a compressed blob."""
+    if hasattr(values, "to_list"):
+        values = values.to_list()
+    rows = [
+        np.ravel(np.asarray(np.nan if v is None else v, dtype=np.float64))
+        for v in values
+    ]
+    arrays = {"values": np.concatenate(rows) if rows else np.zeros(0)}
+    if any(len(r) != 1 for r in rows):
+        arrays["offsets"] = np.concatenate([[0], np.cumsum([len(r) for r in rows])])
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def decode_series(blob):
+    """Inverse of ``encode_series``: a float array or a list of per-month arrays."""
+    with np.load(io.BytesIO(blob), allow_pickle=False) as npz:
+        values = npz["values"]
+        if "offsets" not in npz:
+            return values
+        offsets = npz["offsets"]
+    return [values[offsets[i] : offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+class EvaluationStore:
+    """SQLite store of simulated evaluations, shared between processes."""
+
+    def __init__(self, path=DEFAULT_EVALUATION_PATH, version=None):
+        """
+        Args:
+            path: Database file (created if missing)
+            version: Code version to key on (defaults to ``code_version()``)
+        """
+        self.path = os.path.abspath(path)
+        self.version = version or code_version()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executescript(_SCHEMA)
+
+    def __getstate__(self):
+        # Worker processes open their own connection
+        return {"path": self.path, "version": self.version}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _connection(self):
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=60)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._pid = os.getpid()
+        return self._conn
+
+    def _key(self, parameters, seed, horizon):
+        seed = parameters.get("seed") if seed is None else seed
+        horizon = parameters.get("steps") if horizon is None else horizon
+        if seed is None or horizon is None:
+            raise ValueError("Evaluations need a seed and a horizon")
+        return self.version, canonical_hash(parameters), int(seed), int(horizon)
+
+    def get(self, parameters, seed=None, horizon=None, variables=None):
+        """
+        Look up an evaluation.
+
+        Args:
+            parameters: Full parameter dict of the run
+            seed: Seed (defaults to ``parameters["seed"]``)
+            horizon: Steps simulated (defaults to ``parameters["steps"]``)
+            variables: Series the caller needs; a hit requires all of them
+                (variables stored as not recorded by the model count as
+                present and are left out)
+
+        Returns:
+            Dict with ``status``, ``wall_time``, ``stats``, ``driver`` and
+            ``series`` (``{name: values}``), or None
+        """
+        key = self._key(parameters, seed, horizon)
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT id, status, wall_time, stats, driver FROM evaluations "
+                "WHERE code_version = ? AND param_hash = ? AND seed = ? "
+                "AND horizon = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+            names = list(variables) if variables is not None else None
+            sql = "SELECT name, data FROM series WHERE evaluation_id = ?"
+            stored = dict(conn.execute(sql, (row[0],)).fetchall())
+
+        # A diverged run has no complete series to offer, but is still a hit
+        if row[1] == "completed" and names is not None:
+            if any(name not in stored for name in names):
+                return None
+        wanted = names if names is not None else list(stored)
+        return {
+            "status": row[1],
+            "wall_time": row[2],
+            "stats": json.loads(row[3]) if row[3] else {},
+            "driver": row[4],
+            "series": {
+                name: decode_series(stored[name])
+                for name in wanted
+                if stored.get(name) is not None
+            },
+        }
+
+    def put(
+        self,
+        parameters,
+        series,
+        seed=None,
+        horizon=None,
+        status="completed",
+        stats=None,
+        driver=None,
+        wall_time=None,
+    ):
+        """
+        Store (or add series to) an evaluation.
+
+        Args:
+            parameters: Full parameter dict of the run
+            series: ``{name: monthly values}``; None marks a variable the model
+                did not record
+            seed, horizon: As in ``get``
+            status: ``completed`` or ``diverged``
+            stats: Derived statistics, merged into any stored ones
+            driver: Name of the driver that ran it
+            wall_time: Simulation wall time in seconds
+        """
+        key = self._key(parameters, seed, horizon)
+        blobs = [
+            (name, None if values is None else encode_series(values))
+            for name, values in series.items()
+        ]
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                # Take the write lock up front so read-merge-write is atomic
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    "INSERT OR IGNORE INTO evaluations (created, driver, "
+                    "code_version, param_hash, seed, horizon, status, wall_time, "
+                    "params, stats) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, '{}')",
+                    (
+                        datetime.datetime.now().isoformat(),
+                        driver,
+                        *key,
+                        status,
+                        wall_time,
+                        json.dumps(
+                            canonical_params(parameters), sort_keys=True, default=str
+                        ),
+                    ),
+                )
+                eval_id, stored_stats = conn.execute(
+                    "SELECT id, stats FROM evaluations WHERE code_version = ? "
+                    "AND param_hash = ? AND seed = ? AND horizon = ?",
+                    key,
+                ).fetchone()
+                merged = dict(json.loads(stored_stats or "{}"), **(stats or {}))
+                conn.execute(
+                    "UPDATE evaluations SET stats = ? WHERE id = ?",
+                    (json.dumps(merged, default=float), eval_id),
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO series (evaluation_id, name, data) "
+                    "VALUES (?, ?, ?)",
+                    [(eval_id, name, blob) for name, blob in blobs],
+                )
+
+    def __len__(self):
+        with self._lock:
+            return (
+                self._connection()
+                .execute(
+                    "SELECT COUNT(*) FROM evaluations WHERE code_version = ?",
+                    (self.version,),
+                )
+                .fetchone()[0]
+            )
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+
+def open_evaluation_store(path):
+    """``EvaluationStore`` at ``path``, or None for an empty/None path."""
+    return EvaluationStore(path) if path else None
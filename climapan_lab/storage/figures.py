@@ -0,0 +1,334 @@
+"""
+CliMaPan-Lab: Climate-Pandemic Economic Modeling Laboratory
+Figure Rendering
+
+The summary figures of a run (``src/utils.plot*``) are large multi-panel
+matplotlib figures, and rendering them dominates ``run_sim --plot``.
+``FigureRenderer`` turns each figure into an independent job:
+
+  - jobs run in a process pool (``max_workers=0`` renders in the calling
+    process), always on the non-interactive ``Agg`` backend, and close their
+    figure afterwards;
+  - each job only receives the frame columns its plot function reads;
+  - a content hash of those columns (plus the plotting code and resolution)
+    is kept in ``figures.json`` in the output folder, so re-plotting into the
+    folder skips every figure whose inputs did not change;
+  - ``dpi`` (e.g. ``DRAFT_DPI``) renders lower-resolution drafts.
+
+``submit`` returns immediately; ``close`` waits for the jobs and, like
+``AsyncWriter``, re-raises the first failure. Workers are spawned, so scripts
+using a pool need the usual ``if __name__ == "__main__":`` guard.
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Same logger as ``src.logs.get_logger("plots")``. No ``..`` import at module
+# level: scripts import ``storage`` as a top-level package (``analysis/
+# sensitivity_analyzer.py`` with ``PYTHONPATH=climapan_lab``)
+log = logging.getLogger("climapan_lab.plots")
+
+# (plot function in src/utils.py, output file, parameter enabling it)
+FIGURES = (
+    ("plotConsumersSummary", "ConsumerSummaryPlot.png", None),
+    ("plotConsumptionInflationSummary", "ConsumptionInflationSummary.png", None),
+    ("plotBankSummary", "BankSummary.png", None),
+    ("plotGoodsFirmsProfitSummary", "GoodsFirmsProfitSummary.png", None),
+    ("plotGoodsFirmsDemandsSummary", "GoodsFirmsDemandsSummary.png", None),
+    ("plotGoodsFirmWorkersSummary", "GoodsFirmWorkersSummary.png", None),
+    ("plotGoodsFirmSalesSummary", "GoodsFirmSalesSummary.png", None),
+    ("plotEnergyFirmsDemands", "EnergyFirmsDemands.png", "energySectorFlag"),
+    ("plotClimateModuleEffects", "ClimateModule.png", "climateModuleFlag"),
+    ("plotCovidStatistics", "CovidStat.png", "covid_settings"),
+)
+FIGURE_FILES = {name: filename for name, filename, _ in FIGURES}
+
+MANIFEST_NAME = "figures.json"
+DRAFT_DPI = 30
+
+
+def figure_names(parameters, covid_plots=True):
+    """Figures drawn for a run with ``parameters``, in rendering order."""
+    return [
+        name
+        for name, _, flag in FIGURES
+        if (flag is None or parameters.get(flag))
+        and (covid_plots or flag != "covid_settings")
+    ]
+
+
+_source_cache = {}
+
+
+def _plot_source(name):
+    # Source of a plot function: names the columns it reads and, hashed,
+    # makes code changes re-render the figure
+    if name not in _source_cache:
+        from ..src import utils
+
+        try:
+            _source_cache[name] = inspect.getsource(getattr(utils, name))
+        except (AttributeError, OSError, TypeError):
+            _source_cache[name] = ""
+    return _source_cache[name]
+
+
+def figure_columns(name, frame):
+    """
+    Frame columns read by a plot function (all of them if unknown).
+
+    The ``<name> Total`` and ``<name> by Type`` columns of every column read
+    are kept too: ``PlotSeries`` reads population totals from them when the
+    per-consumer lists only cover a micro panel.
+    """
+    source = _plot_source(name)
+    if not source:
+        return list(frame.columns)
+    read = {c for c in frame.columns if f'"{c}"' in source}
+    derived = {f"{c} Total" for c in read} | {f"{c} by Type" for c in read}
+    return [c for c in frame.columns if c in read or c in derived]
+
+
+def _update_digest(digest, value):
+    if value is None:
+        digest.update(b"N")
+    elif isinstance(value, np.ndarray):
+        digest.update(str((value.dtype.str, value.shape)).encode())
+        if value.dtype == object:
+            for item in value.ravel():
+                _update_digest(digest, item)
+        else:
+            digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(b"[%d" % len(value))
+        for item in value:
+            _update_digest(digest, item)
+    else:
+        digest.update(repr(value).encode())
+
+
+def column_hash(frame, column):
+    """Content hash of one frame column (scalars and per-agent arrays)."""
+    digest = hashlib.sha1()
+    _update_digest(digest, frame[column].to_numpy(dtype=object))
+    return digest.hexdigest()
+
+
+def figure_hash(name, frame, dpi=None, column_hashes=None):
+    """
+    Content hash of the inputs of one figure.
+
+    Args:
+        name: Plot function
+        frame: EconModel results DataFrame
+        dpi: Output resolution
+        column_hashes: Optional ``{column: column_hash}`` cache shared by the
+            figures of one run
+    """
+    column_hashes = {} if column_hashes is None else column_hashes
+    digest = hashlib.sha1()
+    digest.update(f"{name}|{dpi}|".encode())
+    digest.update(_plot_source(name).encode())
+    _update_digest(digest, np.asarray(frame.index))
+    for column in figure_columns(name, frame):
+        if column not in column_hashes:
+            column_hashes[column] = column_hash(frame, column)
+        digest.update(f"|{column}|{column_hashes[column]}".encode())
+    return digest.hexdigest()
+
+
+def _render_figure(name, frame, save_folder, dpi=None):
+    """Draw one figure with the Agg backend; runs in the pool workers."""
+    import matplotlib
+
+    matplotlib.use("Agg", force=True)
+    import matplotlib.pyplot as plt
+
+    from ..src import utils
+
+    results = type("Results", (), {})()
+    results.variables = type("Variables", (), {})()
+    results.variables.EconModel = frame
+
+    start = time.perf_counter()
+    rc = {"savefig.dpi": dpi} if dpi else {}
+    try:
+        with matplotlib.rc_context(rc):
+            getattr(utils, name)(results, save_folder)
+    finally:
+        plt.close("all")
+    return time.perf_counter() - start
+
+
+class FigureRenderer:
+    """Renders figure jobs in a process pool, skipping unchanged figures."""
+
+    def __init__(self, max_workers=None, dpi=None, force=False):
+        """
+        Args:
+            max_workers: Pool processes (None: one per CPU but one, 0: render
+                in the calling process)
+            dpi: Output resolution (None: matplotlib's default)
+            force: Render even when the inputs are unchanged
+        """
+        self.max_workers = max_workers
+        self.dpi = dpi
+        self.force = force
+        self.errors = []
+        self.rendered = 0
+        self.skipped = 0
+
+        if max_workers is None:
+            # Leave one core to the simulation
+            max_workers = (os.cpu_count() or 1) - 1
+        self._pool = None
+        if max_workers > 0:
+            # Fresh interpreters: no inherited pyplot state or simulation threads
+            self._pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        self._futures = []
+        self._manifests = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(raise_errors=exc_type is None)
+
+    def _manifest(self, save_folder):
+        # Loaded once per folder; callers hold the lock
+        if save_folder not in self._manifests:
+            path = os.path.join(save_folder, MANIFEST_NAME)
+            manifest = {}
+            if os.path.exists(path):
+                try:
+                    with open(path) as f:
+                        manifest = json.load(f)
+                except (OSError, ValueError):
+                    manifest = {}
+            self._manifests[save_folder] = manifest
+        return self._manifests[save_folder]
+
+    def _record(self, save_folder, name, digest, elapsed):
+        with self._lock:
+            manifest = self._manifest(save_folder)
+            manifest[name] = {
+                "file": FIGURE_FILES.get(name),
+                "hash": digest,
+                "dpi": self.dpi,
+                "seconds": round(elapsed, 3),
+            }
+            path = os.path.join(save_folder, MANIFEST_NAME)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(manifest, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, path)
+            self.rendered += 1
+
+    def _fail(self, name, save_folder, error):
+        with self._lock:
+            self.errors.append(error)
+        log.warning("Figure %s for %s failed: %r", name, save_folder, error)
+
+    def is_current(self, name, frame, save_folder, digest=None):
+        """Whether the saved figure was drawn from the same inputs."""
+        digest = digest or figure_hash(name, frame, self.dpi)
+        with self._lock:
+            entry = self._manifest(save_folder).get(name)
+        filename = FIGURE_FILES.get(name)
+        return (
+            entry is not None
+            and entry.get("hash") == digest
+            and filename is not None
+            and os.path.exists(os.path.join(save_folder, filename))
+        )
+
+    def submit(self, frame, save_folder, names):
+        """
+        Queue the figures ``names`` of one run.
+
+        Args:
+            frame: EconModel results DataFrame
+            save_folder: Output folder (created if needed)
+            names: Plot functions, e.g. from ``figure_names``
+
+        Returns:
+            Names of the figures skipped as unchanged
+        """
+        self._collect(block=False)
+        os.makedirs(save_folder, exist_ok=True)
+        skipped = []
+        column_hashes = {}
+        for name in names:
+            digest = figure_hash(name, frame, self.dpi, column_hashes)
+            if not self.force and self.is_current(name, frame, save_folder, digest):
+                skipped.append(name)
+                continue
+
+            # Workers only get the columns the figure reads
+            inputs = frame[figure_columns(name, frame)]
+            if self._pool is None:
+                try:
+                    elapsed = _render_figure(name, inputs, save_folder, self.dpi)
+                except Exception as e:
+                    self._fail(name, save_folder, e)
+                else:
+                    self._record(save_folder, name, digest, elapsed)
+                continue
+
+            future = self._pool.submit(
+                _render_figure, name, inputs, save_folder, self.dpi
+            )
+            with self._lock:
+                self._futures.append((future, save_folder, name, digest))
+
+        with self._lock:
+            self.skipped += len(skipped)
+        return skipped
+
+    def _collect(self, block):
+        # Record finished jobs (all of them when blocking)
+        with self._lock:
+            if block:
+                jobs, self._futures = self._futures, []
+            else:
+                # One done() check per job: a future finishing mid-split must
+                # land in exactly one of the two lists
+                jobs, pending = [], []
+                for job in self._futures:
+                    (jobs if job[0].done() else pending).append(job)
+                self._futures = pending
+        for future, save_folder, name, digest in jobs:
+            error = future.exception()
+            if error is not None:
+                self._fail(name, save_folder, error)
+            else:
+                self._record(save_folder, name, digest, future.result())
+
+    def wait(self):
+        """Block until every submitted figure is written."""
+        self._collect(block=True)
+
+    def close(self, raise_errors=True):
+        """Wait for the jobs, stop the pool and surface the first failure."""
+        self.wait()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if raise_errors and self.errors:
+            raise RuntimeError(
+                f"{len(self.errors)} figure(s) failed; "
+                f"first error: {self.errors[0]!r}"
+            ) from self.errors[0]
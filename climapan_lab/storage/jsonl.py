@@ -0,0 +1,35 @@
+"""
+CliMaPan-Lab: Climate-Pandemic Economic Modeling Laboratory
+JSON-Lines Logs
+
+Append-only logs of small JSON records (race records, validation run records)
+shared by the worker processes of one study. Each record is written as one
+line in a single ``write`` call, and readers skip a trailing line that a worker
+is still writing.
+"""
+
+import json
+import os
+
+
+def append_jsonl(path, record, **extra):
+    """Append one record (plus e.g. ``batch_idx``) to a JSON-lines file."""
+    with open(path, "a") as f:
+        f.write(json.dumps(dict(extra, **record)) + "\n")
+
+
+def load_jsonl(path):
+    """All records of a JSON-lines file (empty if it does not exist)."""
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # A worker may be halfway through appending
+                    continue
+    return records
@@ -0,0 +1,150 @@
+"""
+CliMaPan-Lab: Climate-Pandemic Economic Modeling Laboratory
+Background Writer
+
+Serializing a run (figures, ``.npy``/CSV exports, pickles) is mostly waiting on
+disk and matplotlib. ``AsyncWriter`` moves that work onto background threads so
+the simulating thread can start the next run straight away.
+
+Jobs are plain callables pushed onto a bounded queue:
+  - ``submit()`` blocks when the queue is full (backpressure), so at most
+    ``max_queue`` finished runs are held in memory waiting to be written.
+  - ``flush()`` waits until every submitted job has finished.
+  - ``close()`` flushes, stops the threads and re-raises the first job error.
+  - Open writers are flushed at interpreter exit.
+
+With the default single writer thread jobs run in submission order, which also
+keeps all pyplot calls on one thread.
+"""
+
+import atexit
+import logging
+import queue
+import sys
+import threading
+import weakref
+
+# Same logger as ``src.logs.get_logger("storage")`` (no ``..`` import, see
+# ``figures.py``)
+log = logging.getLogger("climapan_lab.storage")
+
+_STOP = object()
+_open_writers = weakref.WeakSet()
+
+
+class AsyncWriter:
+    """Bounded job queue drained by background writer threads."""
+
+    def __init__(self, max_queue=8, num_threads=1, name="climapan-writer"):
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1")
+        if num_threads < 1:
+            raise ValueError("num_threads must be at least 1")
+
+        self.max_queue = max_queue
+        self.num_threads = num_threads
+        self.errors = []
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._drain, name=f"{name}-{i}", daemon=True)
+            for i in range(num_threads)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+        _open_writers.add(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Do not mask an exception raised inside the ``with`` block
+        self.close(raise_errors=exc_type is None)
+
+    @property
+    def pending(self):
+        """Approximate number of queued (not yet started) jobs."""
+        return self._queue.qsize()
+
+    def submit(self, func, *args, **kwargs):
+        """Queue ``func(*args, **kwargs)``; blocks while the queue is full."""
+        if self._closed:
+            raise RuntimeError("Cannot submit to a closed AsyncWriter")
+        self._queue.put((func, args, kwargs, threading.get_ident()))
+
+    def flush(self):
+        """Block until all submitted jobs have been processed."""
+        self._queue.join()
+
+    def close(self, raise_errors=True):
+        """Flush pending jobs, stop the writer threads and surface job errors."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        self.flush()
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        _open_writers.discard(self)
+
+        if raise_errors and self.errors:
+            raise RuntimeError(
+                f"{len(self.errors)} background write job(s) failed; "
+                f"first error: {self.errors[0]!r}"
+            ) from self.errors[0]
+
+    def _drain(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                func, args, kwargs, submitter = job
+                try:
+                    func(*args, **kwargs)
+                except Exception as e:
+                    self.errors.append(e)
+                    _log_failure(func, submitter)
+            finally:
+                self._queue.task_done()
+
+
+def _log_failure(func, submitter):
+    """Log the job failure being handled, as if raised on the submitting thread."""
+    if not log.isEnabledFor(logging.ERROR):
+        return
+    record = log.makeRecord(
+        log.name,
+        logging.ERROR,
+        __file__,
+        0,
+        "Background write job %s failed",
+        (getattr(func, "__name__", func),),
+        sys.exc_info(),
+    )
+    # run_log routes records by thread: the failure belongs to the run that
+    # queued the job, not to the writer thread
+    record.thread = submitter
+    log.handle(record)
+
+
+def run_or_submit(writer, func, *args, **kwargs):
+    """Run ``func`` through ``writer`` if one is given, otherwise synchronously."""
+    if writer is None:
+        return func(*args, **kwargs)
+    writer.submit(func, *args, **kwargs)
+
+
+@atexit.register
+def _flush_open_writers():
+    for writer in list(_open_writers):
+        try:
+            writer.close(raise_errors=False)
+        except Exception:
+            pass
@@ -7,6 +7,10 @@ using autocorrelation analysis and parameter calibration.
 """
 
 import argparse
+import contextlib
+import os
+import re
+import time
 import warnings
 
 import ambr as am
@@ -18,9 +22,23 @@ from joblib import Parallel, delayed
 from tqdm.contrib.concurrent import thread_map
 
 warnings.filterwarnings("ignore")
+from .analysis.racing import RacingEvaluator, best_race_record
+from .analysis.sampling import ParameterDesign
 from .analysis.validation_params import params
+from .analysis.validation_runner import (
+    ValidationRunner,
+    sample_parameters,
+    summarize_aborts,
+)
+from .src.logs import configure_logging, get_logger
 from .src.models import EconModel
 from .src.params import parameters
+from .src.sim_utils import burn_in_months
+from .storage.catalog import DEFAULT_CATALOG_PATH, RunCatalog
+from .storage.evaluations import DEFAULT_EVALUATION_PATH, open_evaluation_store
+from .storage.jsonl import append_jsonl, load_jsonl
+
+log = get_logger("validation")
 
 
 class Validator:
@@ -34,14 +52,61 @@ class Validator:
         budget=500,
         multi_var=False,
         period="annually",
+        emulator_path=None,
+        n_simulate=None,
+        num_seeds=1,
+        min_seeds=3,
+        rel_tol=0.05,
+        sampler="sobol",
+        sample_seed=0,
+        abort_margin=2.0,
+        min_abort_years=10,
+        evaluation_path=None,
+        log_level=None,
+        catalog_path=DEFAULT_CATALOG_PATH,
     ):
         self.real_data_path = real_data_path  # path to real data csv file
         self.budget = budget
+        self.sampler = sampler
+        self.sample_seed = sample_seed
         self.multi_var = multi_var
         self.save_path = save_path.strip()
         self.num_workers = num_workers
         self.period = Validator.period_dict[period.strip()]
 
+        # Seed racing: up to num_seeds replicates per sample, stopped early once
+        # the loss is precise or clearly worse than the best sample so far
+        self.num_seeds = num_seeds
+        self.base_seed = parameters.get("seed", 0)
+        self.racing = None
+        if num_seeds > 1:
+            self.racing = RacingEvaluator(
+                min_seeds=min(min_seeds, num_seeds),
+                max_seeds=num_seeds,
+                rel_tol=rel_tol,
+                minimize=True,
+            )
+
+        # Runs are checked every simulated year and aborted once they diverge
+        # or their partial loss exceeds abort_margin x the best loss so far
+        self.abort_margin = abort_margin
+        self.min_abort_years = min_abort_years
+
+        # Monthly records in the burn-in rows the summary plots also leave out
+        self.burn_in = burn_in_months(parameters["start_date"])
+
+        # Shared evaluation store: runs already simulated by any study are reused
+        self.evaluations = open_evaluation_store(evaluation_path)
+        # Completed runs are registered in the run catalog (None disables it);
+        # each worker process opens its own connection
+        self.catalog_path = catalog_path or None
+
+        # Console log level, also applied in every worker process (None keeps
+        # the logging configuration as it is)
+        self.log_level = log_level
+        if log_level is not None:
+            configure_logging(log_level)
+
         # Load csv file
         self.real_df = pd.read_csv(self.real_data_path.strip())
         if "Unnamed: 0" in self.real_df.columns:
@@ -56,9 +121,40 @@ class Validator:
         self.n_dims = self.exploration_range.shape[0]
         self._prep_params_variations()
 
+        # Optional objective emulator: only simulate the most promising samples
+        self.emulator = None
+        if emulator_path is not None:
+            self._screen_params_variations(emulator_path, n_simulate)
+
         del self.n_dims
         del self.exploration_range
 
+    def _screen_params_variations(self, emulator_path, n_simulate):
+        from .analysis.emulator import ObjectiveEmulator
+
+        param_space = dict(zip(self.params_keys, map(tuple, self.exploration_range)))
+        self.emulator = ObjectiveEmulator.open(emulator_path, param_space)
+        if not len(self.emulator) or n_simulate is None:
+            return
+        candidates = [dict(zip(self.params_keys, row)) for row in self.input_batch]
+        keep = self.emulator.screen(candidates, n_select=n_simulate)
+        print(f"Emulator kept {len(keep)} of {len(self.input_batch)} samples")
+        self.input_batch = self.input_batch[keep]
+        self.batch_indices = self.batch_indices[keep]
+
+    def _update_emulator(self):
+        from .analysis.emulator import load_evaluations
+
+        # The save file holds every run of this validation, so replace its entries
+        self.emulator.observations = [
+            o for o in self.emulator.observations if o["source"] != self.save_path
+        ]
+        self.emulator.add_evaluations(
+            load_evaluations(self.save_path, self.params_keys), source=self.save_path
+        )
+        self.emulator.fit()
+        self.emulator.save()
+
     def _prep_real_autocorrelation(self):
         if not self.multi_var:
             self.ac = sm.tsa.acf(self.real_df[self.real_df.columns[0]], nlags=6)
@@ -69,96 +165,124 @@ class Validator:
                 self.ac.append(sm.tsa.acf(self.real_df[var].dropna(), nlags=6))
 
     def _prep_params_variations(self):
-        self.input_batch = self._get_sobol_samples(
-            self.n_dims, self.budget, self.exploration_range
+        # The design is kept next to the results, so a larger budget (or a
+        # restart) only simulates the samples missing from the save file
+        self.design = ParameterDesign.open(
+            self.save_path + ".design.npz",
+            dict(zip(self.params_keys, map(tuple, self.exploration_range))),
+            method=self.sampler,
+            seed=self.sample_seed,
         )
-
-    def _get_sobol_samples(self, n_dims, samples, parameter_support):
-        support_range = parameter_support[:, 1] - parameter_support[:, 0]
-
-        random_samples = sobol_seq.i4_sobol_generate(n_dims, samples)
-
-        sobol_samples = np.vstack(
-            [
-                np.multiply(s, support_range) + parameter_support[:, 0]
-                for s in random_samples
-            ]
+        self.design.extend_to(self.budget)
+        done = self._completed_samples()
+        self.batch_indices = np.array(
+            [i for i in range(len(self.design)) if i not in done], dtype=int
         )
+        self.input_batch = self.design.points[self.batch_indices]
+
+    def _completed_samples(self):
+        if not os.path.exists(self.save_path):
+            return set()
+        with open(self.save_path) as file:
+            return {int(i) for i in re.findall(r"^(\d+) \[", file.read(), re.M)}
+
+    @property
+    def aborts_path(self):
+        return self.save_path + ".runs.jsonl"
+
+    def _incumbent_loss(self):
+        """Best loss in the save file (shared by all workers), or None."""
+        if self.abort_margin is None or not os.path.exists(self.save_path):
+            return None
+        with open(self.save_path) as file:
+            losses = [
+                float(loss)
+                for loss in re.findall(r"\] (\S+)$", file.read(), re.M)
+                if loss not in ("inf", "nan")
+            ]
+        return min(losses) if losses else None
 
-        return sobol_samples
-
-    def _run_sim(self, params_combination):
-        for i in range(len(params_combination)):
-            if self.params_keys[i] in [
-                "c_agents",
-                "capitalists",
-                "green_energy_owners",
-                "brown_energy_owners",
-                "b_agents",
-                "csf_agents",
-                "cpf_agents",
-            ]:
-                parameters[self.params_keys[i]] = int(params_combination[i])
-            else:
-                if self.params_keys[i] == "unemploymentDole":
-                    parameters["subsistenceLevelOfConsumption"] = params_combination[i]
-                parameters[self.params_keys[i]] = params_combination[i]
-
-        model = EconModel(parameters)
-        results = model.run()
+    @property
+    def series_names(self):
+        return list(
+            self.real_df.columns if self.multi_var else self.real_df.columns[:1]
+        )
 
-        if not self.multi_var:
-            sim_res = np.array(
-                [
-                    results.variables.EconModel[self.real_df.columns[0]][i]
-                    for i in range(
-                        50, len(results.variables.EconModel["BankDataWriter"])
-                    )
-                ]
-            )
-            if len(sim_res.shape) > 1:
-                sim_res = np.sum(sim_res, axis=1)
+    def _extract_series(self, monthly):
+        """Calibrated series of the monthly rows, after the burn-in."""
+        sim_res = []
+        for var in self.series_names:
+            res = list(monthly[var])[self.burn_in :]
+            res = np.array([np.sum(v) if v is not None else np.nan for v in res])
 
             if self.period != 1:
-                interval = len(sim_res) // self.period
-                sim_rvals = []
+                interval = len(res) // self.period
+                rvals = []
                 for i in range(interval - 1):
-                    sim_rvals.append(
-                        np.sum(sim_res[i * self.period : (i + 1) * self.period])
-                    )
+                    rvals.append(np.sum(res[i * self.period : (i + 1) * self.period]))
 
-                sim_res = sim_rvals
-
-            sim_res = [sim_res]
-        else:
-            sim_res = []
-            for var in self.real_df.columns:
-                res = np.array(
-                    [
-                        results.variables.EconModel[var].values[i]
-                        for i in range(
-                            50, len(results.variables.EconModel["BankDataWriter"])
-                        )
-                    ]
-                )
-                if len(res.shape) > 1:
-                    res = np.sum(res, axis=1)
-
-                if self.period != 1:
-                    interval = len(res) // self.period
-                    rvals = []
-                    for i in range(interval - 1):
-                        rvals.append(
-                            np.sum(res[i * self.period : (i + 1) * self.period])
-                        )
-
-                    res = rvals
-
-                sim_res.append(res)
+                res = rvals
 
+            sim_res.append(res)
         return sim_res
 
-    def _measure_calibration(self, sim_res):
+    def _partial_loss(self, monthly):
+        return self._measure_calibration(self._extract_series(monthly), verbose=False)
+
+    def _run_sim(self, params_combination, batch_idx, seed=None):
+        """Series of one sample, or None if its run was aborted early."""
+        overrides = dict(zip(self.params_keys, params_combination))
+        if self.evaluations is not None:
+            sample = sample_parameters(parameters, overrides, seed)
+            found = self.evaluations.get(sample, variables=self.series_names)
+            if found is not None:
+                log.info("Reusing stored run for batch no. %s", batch_idx)
+                if found["status"] != "completed":
+                    return None
+                return self._extract_series(found["series"])
+
+        # Each run gets a private copy of the base parameters, so samples
+        # never leak into each other through the module-level dict
+        start = time.perf_counter()
+        catalog = RunCatalog(self.catalog_path) if self.catalog_path else None
+        with catalog if catalog is not None else contextlib.nullcontext():
+            runner = ValidationRunner(
+                parameters,
+                loss_fn=self._partial_loss if self.abort_margin is not None else None,
+                min_steps=self.min_abort_years * 365,
+                margin=self.abort_margin,
+                catalog=catalog,
+                output_path=self.save_path,
+            )
+            monthly, record = runner.run(
+                overrides, seed=seed, incumbent=self._incumbent_loss()
+            )
+        # A run that lost to the incumbent says nothing about the point itself
+        if self.evaluations is not None and record["status"] != "beaten":
+            self.evaluations.put(
+                sample,
+                {
+                    var: monthly[var] if var in monthly.columns else None
+                    for var in self.series_names
+                },
+                status=record["status"],
+                driver="validation",
+                wall_time=time.perf_counter() - start,
+            )
+        append_jsonl(
+            self.aborts_path,
+            record,
+            batch_idx=int(batch_idx),
+            seed=int(seed) if seed is not None else parameters.get("seed"),
+        )
+        if record["status"] != "completed":
+            log.info("Aborted batch no. %s (%s)", batch_idx, record["reason"])
+            return None
+        return self._extract_series(monthly)
+
+    def _measure_calibration(self, sim_res, verbose=True):
+        if sim_res is None:
+            return np.inf
         loss = 0
         for i in range(len(sim_res)):
             cleaned_sim_res = np.array(
@@ -170,13 +294,37 @@ class Validator:
                 return np.inf
             loss += np.mean((self.ac[i] - sim_ac) ** 2)
 
-            print(self.ac[i], sim_ac, loss)
+            if verbose:
+                log.debug("%s %s %s", self.ac[i], sim_ac, loss)
         return loss
 
+    @property
+    def racing_path(self):
+        return self.save_path + ".racing.jsonl"
+
+    def _race_sample(self, batch_idx, params_combination):
+        def evaluate(seed):
+            sim_res = self._run_sim(params_combination, batch_idx, seed=seed)
+            return self._measure_calibration(sim_res), None
+
+        # Workers share the current best sample through the race log
+        record, _ = self.racing.race(
+            evaluate,
+            self.base_seed + np.arange(self.num_seeds),
+            incumbent=best_race_record(load_jsonl(self.racing_path)),
+        )
+        append_jsonl(self.racing_path, record, batch_idx=batch_idx)
+        return record["mean"] if record["mean"] is not None else np.inf
+
     def _process_sample(self, batch_idx, params_combination):
-        print("Processing batch no. ", batch_idx)
-        sim_res = self._run_sim(params_combination)
-        loss = self._measure_calibration(sim_res)
+        if self.log_level is not None:
+            configure_logging(self.log_level)
+        log.info("Processing batch no. %s", batch_idx)
+        if self.racing is not None:
+            loss = self._race_sample(batch_idx, params_combination)
+        else:
+            sim_res = self._run_sim(params_combination, batch_idx)
+            loss = self._measure_calibration(sim_res)
         with open(self.save_path, "a+") as file:
             file.write(
                 str(batch_idx)
@@ -186,26 +334,38 @@ class Validator:
                 + str(loss)
             )
             file.write("\n")
-        print("Finished batch no. ", batch_idx)
+        log.info("Finished batch no. %s", batch_idx)
 
     def _process_batch(self):
         if self.num_workers is None:
             Parallel(n_jobs=-1, prefer="processes")(
                 [
                     delayed(self._process_sample)(idx, params)
-                    for idx, params in enumerate(self.input_batch)
+                    for idx, params in zip(self.batch_indices, self.input_batch)
                 ]
             )
         else:
             Parallel(n_jobs=self.num_workers, prefer="processes")(
                 [
                     delayed(self._process_sample)(idx, params)
-                    for idx, params in enumerate(self.input_batch)
+                    for idx, params in zip(self.batch_indices, self.input_batch)
                 ]
             )
 
+    def _report_aborts(self):
+        summary = summarize_aborts(load_jsonl(self.aborts_path))
+        if summary["runs"]:
+            print(
+                f"{summary['diverged']} of {summary['runs']} runs diverged and "
+                f"{summary['beaten']} could not beat the best loss; aborting them "
+                f"saved {summary['fraction_saved']:.0%} of the simulated days"
+            )
+
     def validate(self):
         self._process_batch()
+        self._report_aborts()
+        if self.emulator is not None:
+            self._update_emulator()
 
 
 class ValidatorAbs:
@@ -447,6 +607,71 @@ if __name__ == "__main__":
     parser.add_argument(
         "-w", "--num_workers", type=int, default=None, help="num_workers"
     )
+    parser.add_argument(
+        "--num_seeds",
+        type=int,
+        default=1,
+        help="maximum seeds per sample; more than 1 enables seed racing",
+    )
+    parser.add_argument(
+        "--min_seeds", type=int, default=3, help="seeds run before a race may stop"
+    )
+    parser.add_argument(
+        "--rel_tol",
+        type=float,
+        default=0.05,
+        help="racing stops once the loss interval is this tight (relative)",
+    )
+    parser.add_argument(
+        "--sampler",
+        choices=["sobol", "lhs", "saltelli"],
+        default="sobol",
+        help="parameter design (extended in place when the budget grows)",
+    )
+    parser.add_argument("--sample_seed", type=int, default=0, help="design seed")
+    parser.add_argument(
+        "-e", "--emulator", type=str, default=None, help="objective emulator path"
+    )
+    parser.add_argument(
+        "-n",
+        "--n_simulate",
+        type=int,
+        default=None,
+        help="samples simulated after emulator screening (default: all)",
+    )
+    parser.add_argument(
+        "--abort_margin",
+        type=float,
+        default=2.0,
+        help="abort runs whose partial loss exceeds this multiple of the best "
+        "loss so far (negative: only abort diverged runs)",
+    )
+    parser.add_argument(
+        "--min_abort_years",
+        type=int,
+        default=10,
+        help="simulated years before the partial loss is compared",
+    )
+    parser.add_argument(
+        "--eval_store",
+        type=str,
+        default=DEFAULT_EVALUATION_PATH,
+        help="shared evaluation database; identical runs are reused "
+        "(empty string to disable)",
+    )
+    parser.add_argument(
+        "--catalog",
+        type=str,
+        default=DEFAULT_CATALOG_PATH,
+        help="SQLite run catalog to register completed runs in (empty string "
+        "to disable)",
+    )
+    parser.add_argument(
+        "--log_level",
+        type=str,
+        default="INFO",
+        help="console log level (DEBUG prints the per-variable losses)",
+    )
     args = parser.parse_args()
 
     validator = Validator(
@@ -456,6 +681,18 @@ if __name__ == "__main__":
         num_workers=args.num_workers,
         multi_var=args.multi_var,
         period=args.period,
+        emulator_path=args.emulator,
+        n_simulate=args.n_simulate,
+        num_seeds=args.num_seeds,
+        min_seeds=args.min_seeds,
+        rel_tol=args.rel_tol,
+        sampler=args.sampler,
+        sample_seed=args.sample_seed,
+        abort_margin=args.abort_margin if args.abort_margin >= 0 else None,
+        min_abort_years=args.min_abort_years,
+        evaluation_path=args.eval_store,
+        log_level=args.log_level,
+        catalog_path=args.catalog,
     )
     validator.validate()
 
@@ -59,6 +59,8 @@ setup(
         "console_scripts": [
             "climapan-run=climapan_lab.run_sim:main",
             "climapan-example=climapan_lab.examples.simple_example:run_simple_simulation",
+            "climapan-catalog=climapan_lab.storage.catalog:main",
+            "climapan-bench=climapan_lab.benchmark:main",
         ],
     },
 )
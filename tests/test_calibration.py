@@ -0,0 +1,1132 @@
+#!/usr/bin/env python3
+"""
+Tests for the calibration search loops and analysis helpers of CliMaPan-Lab.
+"""
+
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Add the climapan_lab package to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+try:
+    from climapan_lab import calibrate_model
+    from climapan_lab.analysis.emulator import ObjectiveEmulator, load_evaluations
+    from climapan_lab.analysis.ensemble import (
+        EnsembleAggregator,
+        P2Quantile,
+        RunningMoments,
+    )
+    from climapan_lab.analysis.ensemble_analytics import (
+        ensemble_bands,
+        find_run_stores,
+        plot_inputs,
+    )
+    from climapan_lab.analysis.racing import (
+        RacingEvaluator,
+        ReplicateStats,
+        best_race_record,
+        summarize_output,
+    )
+    from climapan_lab.analysis.sampling import ParameterDesign
+    from climapan_lab.analysis.sobol_indices import StreamingSobolIndices
+    from climapan_lab.analysis.validation_runner import (
+        ValidationRunner,
+        sample_parameters,
+        summarize_aborts,
+    )
+    from climapan_lab.calibrate_model import (
+        PARAM_SPACE,
+        abc_smc,
+        bayesian_optimization,
+        fidelity_levels,
+        posterior_summary,
+        sample_param_space,
+        save_posterior,
+        save_results,
+        successive_halving,
+        use_evaluation_store,
+    )
+    from climapan_lab.storage import (
+        BatchResultStore,
+        RunCatalog,
+        append_jsonl,
+        load_batch_results,
+        load_jsonl,
+    )
+
+    IMPORTS_AVAILABLE = True
+except ImportError as e:
+    IMPORTS_AVAILABLE = False
+    IMPORT_ERROR = str(e)
+
+
+def _distance_to_midpoint(params, target_data, n_years):
+    """Cheap stand-in objective: squared distance to the centre of PARAM_SPACE."""
+    time.sleep(0.01)
+    return sum(
+        ((params[name] - (low + high) / 2) / (high - low)) ** 2
+        for name, (low, high) in PARAM_SPACE.items()
+    )
+
+
+def _growth_series(params, n_years):
+    """Cheap stand-in simulation: noisy GDP growing at rate ``growth``."""
+    rng = np.random.default_rng(params["seed"])
+    t = np.arange(n_years)
+    gdp = 100 * (1 + params["growth"]) ** t * (1 + 0.002 * rng.standard_normal(n_years))
+    for year in range(1, n_years + 1):
+        yield {"GDP": gdp[:year]}
+
+
+class _MonthlyModel:
+    """Stand-in model recording one month per 30 steps; GDP is inf from ``blowup``."""
+
+    def __init__(self, params):
+        self.p = params
+        self.t = 0
+        self.rows = []
+
+    def run(self, steps):
+        import polars as pl
+
+        while self.t < steps:
+            self.t += 1
+            if self.t % 30 == 0:
+                blown = self.t >= self.p.get("blowup", np.inf)
+                self.rows.append(
+                    {
+                        "date": str(self.t),
+                        "GDP": np.inf if blown else 100.0 + self.t,
+                        "People": 10,
+                        "Loans": [1.0, 2.0],
+                    }
+                )
+        return {"model": pl.DataFrame(self.rows)}
+
+
+class TestBayesianOptimization(unittest.TestCase):
+    """Test serial and batched Bayesian optimization."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def _run(self, **kwargs):
+        return bayesian_optimization(
+            target_data=None,
+            n_calls=8,
+            n_years=1,
+            n_initial=3,
+            objective_fn=_distance_to_midpoint,
+            **kwargs,
+        )
+
+    def test_serial_results_are_ranked(self):
+        """The serial loop returns every trial, best first."""
+        results = self._run()
+        self.assertEqual(len(results), 8)
+        objectives = [r["objective"] for r in results]
+        self.assertEqual(objectives, sorted(objectives))
+        self.assertEqual(sum(r["phase"] == "random" for r in results), 3)
+
+    def test_batch_mode_evaluates_distinct_candidates(self):
+        """Batched proposals run in a pool and keep the ranked output format."""
+        results = self._run(batch_size=3)
+        self.assertEqual(len(results), 8)
+        self.assertEqual(sum(r["phase"] == "bayesian" for r in results), 5)
+
+        vectors = {tuple(sorted(r["params"].items())) for r in results}
+        self.assertEqual(len(vectors), 8)
+
+        path = os.path.join(self.test_dir, "calibration_results.json")
+        save_results(results, path)
+        with open(path) as f:
+            saved = json.load(f)
+        self.assertEqual(saved[0]["objective"], results[0]["objective"])
+        self.assertEqual(set(saved[0]), {"params", "objective", "time", "phase"})
+
+
+class TestSuccessiveHalving(unittest.TestCase):
+    """Test the multi-fidelity successive halving search."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+    def test_fidelity_levels(self):
+        """Lower rungs shrink horizon and population; the last is full fidelity."""
+        levels = fidelity_levels(
+            n_years=27,
+            n_rungs=3,
+            eta=3,
+            min_agents=100,
+            n_seeds=2,
+            base_params={"c_agents": 5000, "capitalists": 150},
+        )
+        self.assertEqual([lv["n_years"] for lv in levels], [3, 9, 27])
+        self.assertEqual(levels[0]["overrides"], {"c_agents": 556, "capitalists": 17})
+        self.assertEqual(levels[-1]["overrides"], {})
+        self.assertEqual([lv["n_seeds"] for lv in levels], [1, 1, 2])
+
+    def test_promotes_top_fraction(self):
+        """Each rung keeps the best 1/eta and results carry their fidelity."""
+        results = successive_halving(
+            target_data=None,
+            n_candidates=9,
+            n_years=6,
+            eta=3,
+            n_rungs=3,
+            objective_fn=_distance_to_midpoint,
+        )
+        levels = [r["fidelity"]["level"] for r in results]
+        self.assertEqual(levels, [2] + [1] * 3 + [0] * 9)
+        self.assertEqual(results[0]["fidelity"]["n_years"], 6)
+
+        # The full-fidelity candidate was the best of the middle rung
+        self.assertEqual(results[0]["params"], results[1]["params"])
+        objectives = [r["objective"] for r in results[4:]]
+        self.assertEqual(objectives, sorted(objectives))
+
+
+class TestObjectiveEmulator(unittest.TestCase):
+    """Test the surrogate objective used to screen candidates."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        self.test_dir = tempfile.mkdtemp()
+        self.space = {"a": (0.0, 1.0), "b": (1e-4, 1e-1)}
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def _objective(self, params):
+        return (params["a"] - 0.3) ** 2 + 0.1 * params["b"] * 10
+
+    def _grid(self, n=6):
+        return [
+            {"a": a, "b": b}
+            for a in np.linspace(0, 1, n)
+            for b in np.geomspace(1e-4, 1e-1, n)
+        ]
+
+    def test_predicts_and_screens_towards_minimum(self):
+        """Both surrogates rank candidates near the optimum first."""
+        for kind in ("gp", "gbr"):
+            emulator = ObjectiveEmulator(self.space, kind=kind)
+            for params in self._grid():
+                emulator.add(params, self._objective(params))
+            emulator.add({"a": 0.9, "b": 0.05}, float("inf"))
+
+            mean, std = emulator.predict([{"a": 0.3, "b": 1e-4}, {"a": 1.0, "b": 0.1}])
+            self.assertLess(mean[0], mean[1], kind)
+            self.assertTrue(np.all(std >= 0), kind)
+
+            candidates = [{"a": a, "b": 1e-3} for a in np.linspace(0, 1, 41)]
+            best = emulator.screen(candidates, n_select=3, kappa=0.0)
+            self.assertEqual(len(best), 3)
+            self.assertLess(abs(candidates[best[0]]["a"] - 0.3), 0.15, kind)
+
+    def test_save_load_and_incremental_update(self):
+        """The emulator round-trips through JSON and autosaves on update."""
+        path = os.path.join(self.test_dir, "emulator.json")
+        emulator = ObjectiveEmulator.open(path, self.space)
+        for params in self._grid(4):
+            emulator.add(params, self._objective(params))
+        emulator.update({"a": 0.3, "b": 1e-3}, 0.0, source="test")
+        self.assertIsNotNone(emulator._kernel_theta)
+
+        loaded = ObjectiveEmulator.open(path, self.space)
+        self.assertEqual(len(loaded), 17)
+        self.assertEqual(loaded.observations[-1]["source"], "test")
+        np.testing.assert_allclose(
+            loaded.predict({"a": 0.5, "b": 0.01})[0],
+            emulator.predict({"a": 0.5, "b": 0.01})[0],
+            rtol=1e-6,
+        )
+
+        with self.assertRaises(ValueError):
+            ObjectiveEmulator.open(path, {"other": (0, 1)})
+
+    def test_load_evaluations(self):
+        """Trial logs, the re-score snapshot and Validator output are readable."""
+        log = os.path.join(self.test_dir, "calibration_results.json")
+        with open(log, "w") as f:
+            json.dump([{"params": {"a": 0.1, "b": 0.01}, "objective": 1e10}], f)
+        [(params, objective)] = load_evaluations(log)
+        self.assertEqual(params["a"], 0.1)
+        emulator = ObjectiveEmulator(self.space)
+        emulator.add(params, objective)
+        self.assertEqual(emulator.observations[0]["objective"], float("inf"))
+
+        snapshot = os.path.join(
+            os.path.dirname(__file__),
+            "..",
+            "climapan_lab",
+            "calibration_eval_ambr047.json",
+        )
+        evaluations = load_evaluations(snapshot, param_space=PARAM_SPACE)
+        self.assertEqual(len(evaluations), 3)  # random_0 has no parameters
+
+        validator_log = os.path.join(self.test_dir, "validation.txt")
+        with open(validator_log, "w") as f:
+            f.write("0 [0.5 0.01] 0.25\n1 [0.2\n 0.001] inf\n")
+        evaluations = load_evaluations(validator_log, ["a", "b"])
+        self.assertEqual([e[1] for e in evaluations], [0.25, float("inf")])
+        self.assertEqual(evaluations[1][0]["b"], 0.001)
+
+    def test_bayesian_optimization_with_emulator(self):
+        """Stored evaluations skip the random phase and new trials are saved."""
+        path = os.path.join(self.test_dir, "emulator.json")
+        emulator = ObjectiveEmulator.open(path, PARAM_SPACE)
+        np.random.seed(0)
+        for _ in range(6):
+            params = sample_param_space(PARAM_SPACE)
+            emulator.add(params, _distance_to_midpoint(params, None, 1))
+
+        results = bayesian_optimization(
+            target_data=None,
+            n_calls=4,
+            n_years=1,
+            n_initial=5,
+            objective_fn=_distance_to_midpoint,
+            emulator=emulator,
+            n_screen=200,
+        )
+        self.assertEqual({r["phase"] for r in results}, {"emulator"})
+        self.assertEqual(len(ObjectiveEmulator.load(path)), 10)
+
+
+class TestABCSMC(unittest.TestCase):
+    """Test the ABC-SMC posterior and early rejection."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        self.test_dir = tempfile.mkdtemp()
+        self.space = {"growth": (0.0, 0.2), "unused": (1.0, 2.0)}
+        self.target = pd.DataFrame({"GDP": 100 * 1.05 ** np.arange(8)})
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def _run(self, **kwargs):
+        return abc_smc(
+            target_data=self.target,
+            n_particles=30,
+            n_generations=4,
+            n_years=8,
+            param_space=self.space,
+            simulate_fn=_growth_series,
+            **kwargs,
+        )
+
+    def test_posterior_concentrates(self):
+        """Tolerances shrink and the weighted posterior moves to the truth."""
+        posterior = self._run()
+        self.assertEqual(len(posterior["particles"]), 30)
+        self.assertTrue(np.all(np.diff(posterior["tolerances"]) < 0))
+        weights = [p["weight"] for p in posterior["particles"]]
+        self.assertAlmostEqual(sum(weights), 1.0)
+
+        summary = posterior_summary(posterior)
+        self.assertLess(abs(summary["growth"]["mean"] - 0.05), 0.02)
+        self.assertLess(summary["growth"]["std"], 0.2 / np.sqrt(12) / 2)
+        self.assertLessEqual(summary["growth"]["q05"], summary["growth"]["q95"])
+
+        # Later generations abandon most bad particles before the last year
+        later = posterior["generations"][1:]
+        self.assertGreater(sum(g["early_rejected"] for g in later), 0)
+        self.assertLess(
+            sum(g["simulated_years"] for g in later),
+            sum(g["full_years"] for g in later),
+        )
+
+        path = os.path.join(self.test_dir, "abc_posterior.json")
+        save_posterior(posterior, path)
+        with open(path) as f:
+            saved = json.load(f)
+        self.assertEqual(len(saved["particles"]), 30)
+        self.assertIn("growth", saved["summary"])
+
+    def test_parallel_population_and_budget(self):
+        """Particles run in a pool; an exhausted budget keeps the last generation."""
+        posterior = self._run(n_workers=2, max_simulations=80)
+        self.assertEqual(len(posterior["particles"]), 30)
+        self.assertLessEqual(
+            sum(g["simulations"] for g in posterior["generations"]), 80
+        )
+
+    def test_proposals_outside_the_prior_are_reflected(self):
+        """Proposals give up redrawing after the attempt cap and stay in the box."""
+        with mock.patch.object(calibrate_model, "MAX_PROPOSAL_ATTEMPTS", 1):
+            with self.assertLogs("climapan_lab.calibration", "WARNING") as logs:
+                posterior = self._run()
+        generations = posterior["generations"]
+        self.assertEqual(generations[0]["reflected"], 0)
+        self.assertGreater(generations[1]["reflected"], 0)
+        self.assertIn(
+            f"{generations[1]['reflected']} proposals reflected", logs.output[0]
+        )
+        for particle in posterior["particles"]:
+            for name, (low, high) in self.space.items():
+                self.assertTrue(low <= particle["params"][name] <= high)
+
+
+class TestSeedRacing(unittest.TestCase):
+    """Test adaptive replicate counts per parameter point."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    @staticmethod
+    def _noisy(mean, sd):
+        def evaluate(seed):
+            value = mean + sd * np.random.default_rng(seed).standard_normal()
+            return value, {"seed": seed}
+
+        return evaluate
+
+    def test_replicate_stats(self):
+        """Running mean/std match NumPy and the interval shrinks with n."""
+        values = np.random.default_rng(0).normal(5, 2, 30)
+        replicates = ReplicateStats()
+        widths = []
+        for v in values:
+            replicates.add(v)
+            widths.append(replicates.half_width)
+        self.assertAlmostEqual(replicates.mean, values.mean())
+        self.assertAlmostEqual(replicates.std, values.std(ddof=1))
+        self.assertLess(widths[-1], widths[4])
+
+    def test_stops_when_interval_is_tight(self):
+        """Quiet points stop at min_seeds, noisy ones run longer."""
+        racing = RacingEvaluator(min_seeds=3, max_seeds=50, rel_tol=0.05)
+        quiet, payloads = racing.race(self._noisy(10, 0.01), range(50))
+        self.assertEqual(quiet["n_seeds"], 3)
+        self.assertEqual(quiet["stop_reason"], "converged")
+        self.assertEqual([p["seed"] for p in payloads], [0, 1, 2])
+
+        noisy, _ = racing.race(self._noisy(10, 1.0), range(3, 53))
+        self.assertGreater(noisy["n_seeds"], 3)
+        self.assertLessEqual(noisy["lower"], 10 + noisy["half_width"])
+
+        capped, _ = racing.race(self._noisy(10, 50.0), range(50))
+        self.assertEqual(capped["n_seeds"], 50)
+        self.assertEqual(capped["stop_reason"], "max_seeds")
+
+    def test_dominated_points_stop_early(self):
+        """A point clearly worse than the incumbent is abandoned."""
+        racing = RacingEvaluator(min_seeds=3, rel_tol=0.001, minimize=True)
+        best, _ = racing.race(self._noisy(1.0, 0.05), range(20))
+        self.assertIs(racing.incumbent, best)
+
+        worse, _ = racing.race(self._noisy(5.0, 0.5), range(20))
+        self.assertEqual(worse["stop_reason"], "dominated")
+        self.assertEqual(worse["n_seeds"], 3)
+
+        failed, _ = racing.race(lambda seed: (float("inf"), None), range(20))
+        self.assertEqual(failed["stop_reason"], "failed")
+        self.assertIs(racing.incumbent, best)
+
+    def test_race_log(self):
+        """Workers share the best finished point through a JSON-lines log."""
+        path = os.path.join(self.test_dir, "races.jsonl")
+        self.assertIsNone(best_race_record(load_jsonl(path)))
+        racing = RacingEvaluator(min_seeds=3, rel_tol=0.05, minimize=True)
+        for i, mean in enumerate([3.0, 1.0, 2.0]):
+            record, _ = racing.race(self._noisy(mean, 0.01), range(10))
+            append_jsonl(path, record, batch_idx=i)
+        best = best_race_record(load_jsonl(path))
+        self.assertEqual(best["batch_idx"], 1)
+        self.assertEqual(best["n_seeds"], 3)
+
+    def test_summarize_output(self):
+        """Series, nested per-agent lists and missing values reduce to a mean."""
+        self.assertEqual(summarize_output([1.0, None, 3.0, [2.0, 2.0]]), 2.0)
+        self.assertEqual(summarize_output(pd.Series([1.0, np.nan, 3.0])), 2.0)
+        self.assertTrue(np.isnan(summarize_output(["a", None])))
+
+
+class TestParameterDesign(unittest.TestCase):
+    """Test extendable, persisted Sobol/LHS/Saltelli designs."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        self.test_dir = tempfile.mkdtemp()
+        self.space = {"a": (0.0, 1.0), "b": (10.0, 20.0), "c": (-1.0, 1.0)}
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_sobol_extension_keeps_prefix(self):
+        """Extending a reopened design appends to the same sequence."""
+        path = os.path.join(self.test_dir, "design.npz")
+        design = ParameterDesign.open(path, self.space, "sobol", seed=3)
+        self.assertEqual(list(design.extend_to(16)), list(range(16)))
+        first = design.points.copy()
+        self.assertTrue(np.all(first[:, 1] >= 10) and np.all(first[:, 1] <= 20))
+
+        reopened = ParameterDesign.open(path, self.space, "sobol", seed=3)
+        np.testing.assert_array_equal(reopened.points, first)
+        self.assertEqual(list(reopened.extend_to(32)), list(range(16, 32)))
+        self.assertEqual(len(reopened.extend_to(20)), 0)
+
+        direct = ParameterDesign(self.space, "sobol", seed=3)
+        direct.extend(32)
+        np.testing.assert_allclose(ParameterDesign.load(path).points, direct.points)
+
+        with self.assertRaises(ValueError):
+            ParameterDesign.open(path, self.space, "lhs", seed=3)
+
+    def test_lhs_blocks_are_stratified(self):
+        """Each LHS extension is a Latin hypercube of its own."""
+        design = ParameterDesign(self.space, "lhs", seed=1)
+        design.extend(10)
+        new = design.extend(10)
+        for block in (design.unit[:10], design.unit[new]):
+            for column in block.T:
+                self.assertEqual(
+                    sorted(np.floor(column * 10).astype(int)), list(range(10))
+                )
+
+    def test_saltelli_layout(self):
+        """Saltelli rows are A, AB_1..AB_d, B per base sample."""
+        design = ParameterDesign(self.space, "saltelli", seed=0)
+        rows = design.extend_to(8)
+        d = len(self.space)
+        self.assertEqual(design.rows_per_sample, d + 2)
+        self.assertEqual(len(rows), 8 * (d + 2))
+
+        block = design.unit[: d + 2]
+        A, B = block[0], block[-1]
+        for i in range(d):
+            expected = A.copy()
+            expected[i] = B[i]
+            np.testing.assert_array_equal(block[i + 1], expected)
+
+        design.extend_to(12)
+        self.assertEqual(len(design), 12 * (d + 2))
+        self.assertEqual(design.n_base, 12)
+
+
+class TestStreamingSobolIndices(unittest.TestCase):
+    """Test online Sobol indices over a Saltelli design."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        self.test_dir = tempfile.mkdtemp()
+        self.space = {"a": (0.0, 1.0), "b": (10.0, 20.0), "c": (-1.0, 1.0)}
+        self.design = ParameterDesign(self.space, "saltelli", seed=0)
+        self.design.extend_to(256)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    @staticmethod
+    def _linear(point):
+        # Var(4a) = 16/12, Var(0.2b) = 4/12: S1 = ST = (0.8, 0.2, 0)
+        return 4 * point[0] + 0.2 * point[1]
+
+    def test_converges_to_analytic_indices(self):
+        """Streaming rows in order stops early with the known indices."""
+        estimator = StreamingSobolIndices(
+            self.design, ci_width=0.3, min_base_samples=16
+        )
+        points = self.design.points
+        for row in range(len(self.design)):
+            estimator.add(row, self._linear(points[row]))
+            if estimator.converged:
+                break
+
+        latest = estimator.latest
+        self.assertTrue(estimator.converged)
+        self.assertLess(row + 1, len(self.design))
+        self.assertLessEqual(latest["max_width"], 0.3)
+        np.testing.assert_allclose(latest["S1"], [0.8, 0.2, 0.0], atol=0.1)
+        np.testing.assert_allclose(latest["ST"], [0.8, 0.2, 0.0], atol=0.1)
+        self.assertEqual(len(estimator.history), latest["n_base"])
+
+        path = os.path.join(self.test_dir, "sobol_history.json")
+        estimator.save_history(path)
+        with open(path) as f:
+            saved = json.load(f)
+        self.assertTrue(saved["converged"])
+        self.assertEqual(saved["param_names"], ["a", "b", "c"])
+        self.assertEqual(saved["history"][-1]["n_base"], latest["n_base"])
+
+    def test_incomplete_and_failed_samples_are_skipped(self):
+        """Only base samples with all rows in and finite are used."""
+        estimator = StreamingSobolIndices(self.design, ci_width=0.3)
+        k = self.design.rows_per_sample
+        points = self.design.points
+        for row in range(k - 1):
+            self.assertIsNone(estimator.add(row, self._linear(points[row])))
+        self.assertIsNotNone(estimator.add(k - 1, self._linear(points[k - 1])))
+
+        for row in range(k, 2 * k):
+            value = np.nan if row == k else self._linear(points[row])
+            self.assertIsNone(estimator.add(row, value))
+        self.assertEqual(list(estimator.complete_samples()), [0])
+
+        with self.assertRaises(ValueError):
+            StreamingSobolIndices(ParameterDesign(self.space, "sobol"))
+
+
+class TestEnsembleAggregator(unittest.TestCase):
+    """Test the streaming per-month statistics over runs."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    @staticmethod
+    def _frame(rng, months=4, days=3):
+        # One row per day; monthly records on the first day of each month
+        rows = months * days
+        frame = pd.DataFrame(
+            {
+                "t": np.arange(rows),
+                "date": [None] * rows,
+                "GDP": [None] * rows,
+                "Wage": [None] * rows,
+                "Consumer Type": [None] * rows,
+            },
+            dtype=object,
+        )
+        for m in range(months):
+            frame.at[m * days, "date"] = f"2020-{m + 1:02d}"
+            frame.at[m * days, "GDP"] = 100 + rng.normal()
+            frame.at[m * days, "Wage"] = rng.uniform(size=5)
+            frame.at[m * days, "Consumer Type"] = ["workers"] * 5
+        return frame
+
+    def test_moments_and_quantiles_match_numpy(self):
+        """Welford and P² track the batch statistics of the observations."""
+        rng = np.random.default_rng(0)
+        data = rng.lognormal(size=(2000, 3))
+        data[::7, 1] = np.nan
+        moments = RunningMoments()
+        medians = P2Quantile(0.5)
+        tails = P2Quantile(0.95)
+        for row in data:
+            moments.add(row)
+            medians.add(row)
+            tails.add(row)
+
+        np.testing.assert_allclose(moments.mean, np.nanmean(data, axis=0))
+        np.testing.assert_allclose(moments.variance, np.nanvar(data, axis=0, ddof=1))
+        np.testing.assert_array_equal(moments.n, (~np.isnan(data)).sum(axis=0))
+        np.testing.assert_allclose(moments.max, np.nanmax(data, axis=0))
+        np.testing.assert_allclose(
+            medians.value, np.nanquantile(data, 0.5, axis=0), rtol=0.05
+        )
+        np.testing.assert_allclose(
+            tails.value, np.nanquantile(data, 0.95, axis=0), rtol=0.1
+        )
+
+    def test_quantiles_are_exact_before_five_observations(self):
+        """The first observations give the exact sample quantile."""
+        data = np.array([[3.0], [1.0], [2.0]])
+        estimator = P2Quantile(0.5)
+        for row in data:
+            estimator.add(row)
+        self.assertEqual(estimator.value[0], 2.0)
+        self.assertTrue(np.isnan(P2Quantile(0.5, size=1).value[0]))
+
+    def test_summary_table(self):
+        """Runs are reduced to monthly values and summarized per variable."""
+        rng = np.random.default_rng(1)
+        frames = [self._frame(rng) for _ in range(6)]
+        aggregator = EnsembleAggregator()
+        for i, frame in enumerate(frames):
+            aggregator.add(frame, run_id=i)
+
+        summary = aggregator.summary()
+        self.assertEqual(aggregator.n_runs, 6)
+        self.assertEqual(aggregator.runs, {})
+        self.assertEqual(set(summary["variable"]), {"GDP", "Wage"})
+        self.assertIn("q50", summary.columns)
+
+        gdp = summary[summary["variable"] == "GDP"]
+        expected = np.array([[f.at[m * 3, "GDP"] for m in range(4)] for f in frames])
+        self.assertEqual(
+            list(gdp["date"]), ["2020-01", "2020-02", "2020-03", "2020-04"]
+        )
+        np.testing.assert_array_equal(gdp["n"], 6)
+        np.testing.assert_allclose(gdp["mean"], expected.mean(axis=0))
+        np.testing.assert_allclose(gdp["std"], expected.std(axis=0, ddof=1))
+        np.testing.assert_allclose(gdp["min"], expected.min(axis=0))
+
+        wage = summary[summary["variable"] == "Wage"]
+        totals = [np.sum(f.at[0, "Wage"]) for f in frames]
+        self.assertAlmostEqual(wage["mean"].iloc[0], np.mean(totals))
+
+        path = os.path.join(self.test_dir, "ensemble_summary.csv.gz")
+        aggregator.save(path)
+        pd.testing.assert_frame_equal(
+            pd.read_csv(path)[["n", "mean"]], summary[["n", "mean"]]
+        )
+
+    def test_keep_runs(self):
+        """Full frames are only retained on request."""
+        rng = np.random.default_rng(2)
+        aggregator = EnsembleAggregator(variables=["GDP"], keep_runs=True)
+        aggregator.add(self._frame(rng), run_id="Run_00")
+        aggregator.add(self._frame(rng, months=5), run_id="Run_01")
+
+        self.assertEqual(list(aggregator.runs), ["Run_00", "Run_01"])
+        self.assertEqual(len(aggregator.runs_frame()), 27)
+        summary = aggregator.summary()
+        self.assertEqual(list(summary["n"]), [2, 2, 2, 2, 1])
+        with self.assertRaises(ValueError):
+            EnsembleAggregator().runs_frame()
+
+
+class TestEnsembleAnalytics(unittest.TestCase):
+    """Test chunked ensemble statistics over a directory of run stores."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        self.test_dir = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+        self.series, self.alpha = [], []
+        for part in range(2):
+            path = os.path.join(self.test_dir, f"part_{part}", "results.h5")
+            os.makedirs(os.path.dirname(path))
+            with BatchResultStore(path, ["alpha"]) as store:
+                for batch_idx in range(20):
+                    alpha = float(batch_idx % 2)
+                    series = [rng.normal(alpha, 1.0, size=12) for _ in range(5)]
+                    store.append_sample(
+                        batch_idx,
+                        [alpha],
+                        list(range(5)),
+                        [{"GDP": s} for s in series],
+                    )
+                    self.series += series
+                    self.alpha += [alpha] * len(series)
+        self.series = np.array(self.series)
+        self.alpha = np.array(self.alpha)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_chunked_statistics_match_numpy(self):
+        """Moments are exact and quantiles within one histogram bin."""
+        stores = find_run_stores(self.test_dir)
+        self.assertEqual([kind for kind, _ in stores], ["batch", "batch"])
+
+        bands = ensemble_bands(self.test_dir, ["GDP"], chunk_runs=32, max_workers=0)
+        band = bands["GDP"]
+        np.testing.assert_array_equal(band.n, 200)
+        np.testing.assert_allclose(band.mean, self.series.mean(axis=0))
+        np.testing.assert_allclose(band.std, self.series.std(axis=0))
+
+        bin_width = (self.series.max(axis=0) - self.series.min(axis=0)) / 512
+        for p in (0.05, 0.5, 0.95):
+            exact = np.quantile(self.series, p, axis=0, method="inverted_cdf")
+            error = band.quantiles[p] - exact
+            self.assertTrue(np.all(np.abs(error) <= bin_width + 1e-12), p)
+
+        lower, upper = band.ci()
+        margin = 1.96 * self.series.std(axis=0) / np.sqrt(200)
+        np.testing.assert_allclose(upper - band.mean, margin, rtol=1e-3)
+        self.assertEqual(band.trend().shape, (12,))
+
+    def test_grouping_and_plot_inputs(self):
+        """Runs are grouped by parameter and arranged for pline_plot_with_ci."""
+        bands = ensemble_bands(
+            self.test_dir, ["GDP", "Missing"], group_by="alpha", max_workers=0
+        )
+        self.assertEqual(sorted(bands), [0.0, 1.0])
+        for alpha, group in bands.items():
+            self.assertEqual(list(group), ["GDP"])
+            np.testing.assert_allclose(
+                group["GDP"].mean, self.series[self.alpha == alpha].mean(axis=0)
+            )
+
+        data, ci_data = plot_inputs(
+            [bands[0.0]["GDP"], bands[1.0]["GDP"]], interval="quantile"
+        )
+        self.assertEqual(len(data), 2)
+        lower, upper = ci_data[1]
+        self.assertTrue(np.all(lower <= upper))
+        with self.assertRaises(ValueError):
+            plot_inputs(data, interval="range")
+
+    def test_run_frames(self):
+        """Run folders with single_run.csv.gz are read by their monthly rows."""
+        for run in range(3):
+            folder = os.path.join(self.test_dir, "sweep", f"run_{run}")
+            os.makedirs(folder)
+            frame = pd.DataFrame(
+                {
+                    "date": ["1980-01-31", None, "1980-02-29", None],
+                    "GDP": [1.0 + run, np.nan, 2.0 + run, np.nan],
+                    "Wage": ["[1.0, 2.0]", None, "[1.0]", None],
+                }
+            )
+            frame.to_csv(os.path.join(folder, "single_run.csv.gz"))
+            with open(os.path.join(folder, "params.txt"), "w") as f:
+                json.dump({"settings": "BAU" if run else "CT"}, f)
+
+        bands = ensemble_bands(
+            os.path.join(self.test_dir, "sweep"),
+            ["GDP"],
+            group_by="settings",
+            max_workers=0,
+        )
+        np.testing.assert_allclose(bands["BAU"]["GDP"].mean, [2.5, 3.5])
+        np.testing.assert_allclose(bands["CT"]["GDP"].quantiles[0.5], [1.0, 2.0])
+
+
+class TestEvaluationReuse(unittest.TestCase):
+    """Test that calibration simulations are looked up in the evaluation store."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        self.test_dir = tempfile.mkdtemp()
+        self.store = use_evaluation_store(os.path.join(self.test_dir, "eval.db"))
+
+    def tearDown(self):
+        use_evaluation_store(None)
+        self.store.close()
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_stored_runs_are_not_simulated(self):
+        """run_simulation and iter_simulation_years replay stored series."""
+        params = {"unemploymentDole": 100.0}
+        months = np.arange(24, dtype=float)
+        self.store.put(
+            calibrate_model._sim_params(params, 2),
+            {
+                "GDP": months,
+                "UnemploymentRate": months / 100,
+                "Investment": months,
+                "Climate C02": [[m] for m in months],
+            },
+        )
+
+        with mock.patch.object(
+            calibrate_model, "EconModel", side_effect=AssertionError
+        ):
+            metrics = calibrate_model.run_simulation(params, 2)
+            years = list(calibrate_model.iter_simulation_years(params, 2))
+
+        np.testing.assert_allclose(metrics["GDP"], [5.5, 17.5])
+        np.testing.assert_allclose(metrics["Climate C02"], [5.5, 17.5])
+        self.assertEqual(len(years), 2)
+        np.testing.assert_allclose(years[-1]["GDP"], metrics["GDP"])
+
+        # A different point is simulated
+        with mock.patch.object(calibrate_model, "EconModel", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                calibrate_model.run_simulation({"unemploymentDole": 120.0}, 2)
+
+    def test_simulated_runs_are_catalogued(self):
+        """New simulations are registered in the run catalog, stored ones not."""
+        import polars as pl
+
+        months = np.arange(24, dtype=float)
+        model = mock.Mock()
+        model.run.return_value = {
+            "model": pl.DataFrame({"GDP": months, "UnemploymentRate": months / 100})
+        }
+        path = os.path.join(self.test_dir, "catalog.db")
+        calibrate_model.use_run_catalog(path)
+        self.addCleanup(calibrate_model.use_run_catalog, None)
+
+        params = {"unemploymentDole": 100.0}
+        with mock.patch.object(calibrate_model, "EconModel", return_value=model):
+            calibrate_model.run_simulation(params, 2)
+            calibrate_model.run_simulation(params, 2)
+
+        with RunCatalog(path) as catalog:
+            rows = catalog.query()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["driver"], "calibration")
+        self.assertEqual(rows[0]["varying_params"], params)
+        self.assertEqual(rows[0]["params"]["steps"], 2 * 365)
+        self.assertAlmostEqual(rows[0]["mean_gdp"], months.mean())
+
+
+class TestValidationRunner(unittest.TestCase):
+    """Test year-by-year validation runs with early abort."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        self.base = {"steps": 3650, "seed": 1, "c_agents": 100}
+
+    def test_sample_parameters_are_private(self):
+        """Samples never modify the shared base parameters."""
+        params = sample_parameters(
+            self.base, {"c_agents": 42.7, "unemploymentDole": 0.3}, seed=9
+        )
+        self.assertEqual(params["c_agents"], 42)
+        self.assertEqual(params["subsistenceLevelOfConsumption"], 0.3)
+        self.assertEqual(params["seed"], 9)
+        self.assertEqual(self.base, {"steps": 3650, "seed": 1, "c_agents": 100})
+
+    def test_diverged_run_stops_at_next_year(self):
+        """A blow-up is caught at the first yearly boundary after it."""
+        runner = ValidationRunner(self.base, model_cls=_MonthlyModel)
+        monthly, record = runner.run({"blowup": 800})
+        self.assertEqual(record["status"], "diverged")
+        self.assertEqual(record["reason"], "non-finite GDP")
+        self.assertEqual(record["steps_run"], 3 * 365)
+        self.assertEqual(len(monthly), 3 * 365 // 30)
+
+        _, record = runner.run({})
+        self.assertEqual(record["status"], "completed")
+        self.assertEqual(record["steps_run"], 3650)
+
+    def test_incumbent_abort(self):
+        """Runs whose partial loss is far above the incumbent are abandoned."""
+        runner = ValidationRunner(
+            self.base,
+            loss_fn=lambda monthly: 5.0,
+            model_cls=_MonthlyModel,
+            min_steps=730,
+            margin=2.0,
+        )
+        _, beaten = runner.run({}, incumbent=1.0)
+        self.assertEqual(beaten["status"], "beaten")
+        self.assertEqual(beaten["steps_run"], 730)
+        self.assertEqual(beaten["partial_loss"], 5.0)
+
+        _, kept = runner.run({}, incumbent=3.0)
+        _, first = runner.run({}, incumbent=None)
+        self.assertEqual(kept["status"], "completed")
+        self.assertEqual(first["status"], "completed")
+
+        summary = summarize_aborts([beaten, kept, first])
+        self.assertEqual(summary["beaten"], 1)
+        self.assertEqual(summary["steps_saved"], 3650 - 730)
+        self.assertAlmostEqual(summary["fraction_saved"], (3650 - 730) / (3 * 3650))
+
+    def test_completed_runs_are_catalogued(self):
+        """Completed runs reach the run catalog, aborted ones do not."""
+        test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, test_dir, ignore_errors=True)
+        output = os.path.join(test_dir, "validation.csv")
+
+        with RunCatalog(os.path.join(test_dir, "catalog.db")) as catalog:
+            runner = ValidationRunner(
+                self.base,
+                model_cls=_MonthlyModel,
+                catalog=catalog,
+                output_path=output,
+            )
+            runner.run({"blowup": 800})
+            runner.run({"c_agents": 50}, seed=3)
+
+            rows = catalog.query()
+            self.assertEqual(len(rows), 1)
+            self.assertEqual(rows[0]["driver"], "validation")
+            self.assertEqual(rows[0]["seed"], 3)
+            self.assertEqual(rows[0]["output_path"], os.path.abspath(output))
+            self.assertEqual(rows[0]["varying_params"], {"c_agents": 50})
+            self.assertIsNotNone(rows[0]["mean_gdp"])
+
+
+class _StubEconModel:
+    """Stand-in for EconModel: two monthly GDP records, noisy for alpha > 0.5."""
+
+    runs = 0
+
+    def __init__(self, parameters):
+        self.p = dict(parameters)
+
+    def run(self):
+        import polars as pl
+
+        type(self).runs += 1
+        noise = 50.0 if self.p["alpha"] > 0.5 else 0.01
+        gdp = 100 + 10 * self.p["alpha"] + 5 * self.p["beta"]
+        gdp += noise * np.random.standard_normal()
+        frame = pl.DataFrame(
+            {
+                "date": [None, "2020-01-31", None, "2020-02-29"],
+                "GDP": [None, gdp, None, gdp + 1.0],
+            }
+        )
+        return {"model": frame}
+
+
+class TestSensitivityAnalyzer(unittest.TestCase):
+    """Test the sensitivity analysis script."""
+
+    PACKAGE_DIR = os.path.join(os.path.dirname(__file__), "..", "climapan_lab")
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+        if importlib.util.find_spec("tqdm") is None:
+            self.skipTest("tqdm not available")
+
+        self.test_dir = tempfile.mkdtemp()
+        self.files = {}
+        for name, content in (
+            ("base_params.py", "parameters = {'steps': 60}\n"),
+            ("sensitivity_params.py", "params = {'alpha': [0, 1], 'beta': [0, 1]}\n"),
+            ("varlist.txt", "GDP\n"),
+        ):
+            path = os.path.join(self.test_dir, name)
+            with open(path, "w") as f:
+                f.write(content)
+            self.files[name.split(".")[0]] = path
+        _StubEconModel.runs = 0
+
+    def tearDown(self):
+        if hasattr(self, "test_dir"):
+            shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _analyzer(self, **kwargs):
+        """Analyzer on the stub model, with a thread pool instead of processes."""
+        sys.path.insert(0, os.path.abspath(self.PACKAGE_DIR))
+        try:
+            from analysis import sensitivity_analyzer
+        finally:
+            sys.path.pop(0)
+        from multiprocessing.pool import ThreadPool
+
+        for name, stub in (("EconModel", _StubEconModel), ("Pool", ThreadPool)):
+            patcher = mock.patch.object(sensitivity_analyzer, name, stub)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        options = dict(
+            save_path=os.path.join(self.test_dir, "out"),
+            base_params_file=self.files["base_params"],
+            sensitivity_params_file=self.files["sensitivity_params"],
+            varlist_path=self.files["varlist"],
+            num_workers=1,
+            catalog_path="",
+            evaluation_path="",
+        )
+        options.update(kwargs)
+        return sensitivity_analyzer.SensitivityAnalyzer(**options)
+
+    def _stored_runs(self, analyzer):
+        with load_batch_results(analyzer.results_file) as reader:
+            return reader.sample_idx, reader.run_batch_idx
+
+    def test_imports_as_script(self):
+        """The script imports ``analysis``, ``src`` and ``storage`` top-level."""
+        env = dict(os.environ, PYTHONPATH=os.path.abspath(self.PACKAGE_DIR))
+        result = subprocess.run(
+            [sys.executable, "-c", "import analysis.sensitivity_analyzer"],
+            cwd=self.PACKAGE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_resumes_from_the_store(self):
+        """A larger budget only simulates the samples missing from results.h5."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            self._analyzer(budget=8, num_seeds=2).analyze()
+            self.assertEqual(_StubEconModel.runs, 16)
+
+            analyzer = self._analyzer(budget=12, num_seeds=2)
+            self.assertEqual(analyzer.pending, [8, 9, 10, 11])
+            analyzer.analyze()
+        self.assertEqual(_StubEconModel.runs, 16 + 8)
+
+        samples, runs = self._stored_runs(analyzer)
+        self.assertEqual(sorted(samples), list(range(12)))
+        self.assertEqual(np.bincount(runs).tolist(), [2] * 12)
+        self.assertEqual(self._analyzer(budget=12, num_seeds=2).pending, [])
+
+    def test_racing_stops_quiet_samples_early(self):
+        """Samples whose mean is already precise use fewer seeds."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer = self._analyzer(
+                budget=8, num_seeds=8, racing_var="GDP", min_seeds=3, rel_tol=0.01
+            )
+            analyzer.analyze()
+
+        races = {r["batch_idx"]: r for r in load_jsonl(analyzer.racing_file)}
+        self.assertEqual(sorted(races), list(range(8)))
+        _, runs = self._stored_runs(analyzer)
+        for idx, point in enumerate(analyzer.input_batch):
+            race = races[idx]
+            self.assertEqual(np.sum(runs == idx), race["n_seeds"])
+            if point[0] <= 0.5:
+                self.assertEqual(race["stop_reason"], "converged")
+                self.assertEqual(race["n_seeds"], 3)
+        self.assertLess(len(runs), 8 * 8)
+
+    def test_streaming_sobol_stops_the_study(self):
+        """Launching stops once the Sobol intervals are narrow enough."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer = self._analyzer(
+                budget=256,
+                num_seeds=1,
+                sampler="saltelli",
+                sobol_var="GDP",
+                sobol_ci_width=0.5,
+            )
+            analyzer.analyze()
+
+        self.assertTrue(analyzer.sobol_estimate["converged"])
+        samples, _ = self._stored_runs(analyzer)
+        self.assertLess(len(samples), len(analyzer.input_batch))
+        with open(analyzer.sobol_file) as f:
+            self.assertTrue(json.load(f)["converged"])
+
+
+if __name__ == "__main__":
+    unittest.main()
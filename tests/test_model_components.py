@@ -3,19 +3,45 @@
 Tests for individual model components in CliMaPan-Lab.
 """
 
+import io
+import logging
 import os
 import sys
+import tempfile
+import threading
 import unittest
 
 import numpy as np
+import pandas as pd
 
 # Add the climapan_lab package to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 try:
     from climapan_lab.base_params import economic_params
+    from climapan_lab.src import logs
+    from climapan_lab.src.climate.replay import (
+        REPLAY_OUTPUTS,
+        recorded_emissions,
+        replay_climate,
+    )
+    from climapan_lab.src.logs import configure_logging, get_logger, run_log
     from climapan_lab.src.models import EconModel
     from climapan_lab.src.params import parameters
+    from climapan_lab.src.plot_series import PlotSeries
+    from climapan_lab.src.profiling import format_profile
+    from climapan_lab.src.sim_utils import (
+        BURN_IN_STEPS,
+        burn_in_months,
+        gini,
+        sample_panel,
+    )
+    from climapan_lab.src.sketches import (
+        DistributionSketch,
+        merge_runs,
+        merge_sketches,
+        sketch_series,
+    )
 
     IMPORTS_AVAILABLE = True
 except ImportError as e:
@@ -261,6 +287,460 @@ class TestParameterStructure(unittest.TestCase):
                 self.assertGreater(params[param], 0, f"{param} should be positive")
 
 
+class TestClimateReplay(unittest.TestCase):
+    """Test replaying the climate recursion over recorded emissions."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        self.params = economic_params.copy()
+        self.params.update(
+            {
+                "c_agents": 20,
+                "csf_agents": 2,
+                "cpf_agents": 2,
+                "steps": 400,
+                "verboseFlag": False,
+                "show_progress": False,
+                "climateModuleFlag": True,
+                "climateShockMode": "None",
+                "covid_settings": None,
+            }
+        )
+
+    def test_replay_matches_model_and_sweeps(self):
+        """The replay reproduces the recorded climate and vectorizes over sets."""
+        frame = EconModel(self.params).run()["model"]
+        emissions = recorded_emissions(frame)
+        self.assertGreater(len(emissions), 10)
+
+        replayed = replay_climate(emissions, base_params=self.params)
+        for name in REPLAY_OUTPUTS:
+            np.testing.assert_allclose(
+                replayed[name][0], recorded_emissions(frame, name), rtol=1e-12
+            )
+
+        sensitivity = np.linspace(2.0, 8.0, 500)
+        sweep = replay_climate(
+            emissions,
+            {"climateSensitivity": sensitivity, "climateGammaRF": 5.0},
+            base_params=self.params,
+        )
+        self.assertEqual(sweep["Climate Temperature"].shape, (500, len(emissions)))
+        single = replay_climate(
+            emissions,
+            {"climateSensitivity": sensitivity[123], "climateGammaRF": 5.0},
+            base_params=self.params,
+        )
+        np.testing.assert_allclose(
+            sweep["Climate Temperature"][123], single["Climate Temperature"][0]
+        )
+
+        with self.assertRaises(ValueError):
+            replay_climate(emissions, {"c_agents": [1, 2]}, base_params=self.params)
+
+
+class TestPhaseProfiler(unittest.TestCase):
+    """Test the opt-in per-phase profiling of the model step."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        self.params = economic_params.copy()
+        self.params.update(
+            {
+                "c_agents": 20,
+                "csf_agents": 2,
+                "cpf_agents": 2,
+                "steps": 70,
+                "verboseFlag": False,
+                "show_progress": False,
+                "climateModuleFlag": True,
+                "climateShockMode": "None",
+                "covid_settings": None,
+            }
+        )
+
+    def test_profile_counts_phases_without_changing_results(self):
+        """Profiled runs report every phase and produce the same records."""
+        plain = EconModel(self.params)
+        plain_results = plain.run()
+        self.assertIsNone(plain.profiler)
+        self.assertNotIn("profile", plain_results)
+
+        profiled = EconModel(dict(self.params, profile=True))
+        results = profiled.run()
+        report = results["profile"]
+        phases = report["phases"]
+
+        self.assertEqual(report["steps"], self.params["steps"])
+        self.assertEqual(phases["update"]["calls"], self.params["steps"])
+        self.assertEqual(phases["setup"]["calls"], 1)
+        n_months = phases["stepwise_forecast"]["calls"]
+        self.assertGreaterEqual(n_months, 2)
+        self.assertEqual(phases["stepwise_termination"]["calls"], n_months)
+        self.assertEqual(phases["climateModule.progress"]["calls"], n_months)
+        self.assertIn("_csf_transaction", phases)
+
+        for stats in phases.values():
+            self.assertLessEqual(stats["self"], stats["total"] + 1e-9)
+        # Step time includes its phases; the top-level self times add up
+        self.assertGreaterEqual(
+            phases["step"]["total"], phases["stepwise_produce"]["total"]
+        )
+        self.assertAlmostEqual(
+            sum(month["total"] for month in report["months"]), report["total"]
+        )
+        self.assertEqual(len(report["months"]), n_months + 1)
+        self.assertIn("stepwise_produce", format_profile(report))
+
+        self.assertEqual(
+            results["model"]["GDP"].to_list(), plain_results["model"]["GDP"].to_list()
+        )
+
+
+class TestLogging(unittest.TestCase):
+    """Test the level-gated logging of the model and the per-run log files."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        configure_logging(logging.WARNING)
+        self.console = io.StringIO()
+        logs._console.setStream(self.console)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        configure_logging(logging.WARNING)
+        logs._console.setStream(sys.stderr)
+        self.tmp_dir.cleanup()
+
+    def test_disabled_levels_are_not_emitted(self):
+        """Records below the console level are dropped, per subsystem."""
+        firms, model = get_logger("firms"), get_logger("model")
+        self.assertFalse(model.isEnabledFor(logging.INFO))
+
+        configure_logging("warning", subsystems={"firms": "debug"})
+        firms.debug("firm detail")
+        model.debug("model detail")
+        model.warning("model warning")
+
+        console = self.console.getvalue()
+        self.assertIn("firm detail", console)
+        self.assertNotIn("model detail", console)
+        self.assertIn("model warning", console)
+
+    def test_run_log_routes_records_of_its_thread(self):
+        """A run log gets the records of its thread and keeps them off the console."""
+        path = os.path.join(self.tmp_dir.name, "run", "run.log")
+        model = get_logger("model")
+
+        with run_log(path, level=logging.DEBUG):
+            model.debug("own detail")
+            model.warning("own warning")
+            other = threading.Thread(target=model.warning, args=("other warning",))
+            other.start()
+            other.join()
+        model.warning("after the run")
+
+        with open(path) as f:
+            run_file = f.read()
+        console = self.console.getvalue()
+        self.assertIn("own detail", run_file)
+        self.assertIn("own warning", run_file)
+        self.assertNotIn("other warning", run_file)
+        self.assertNotIn("own warning", console)
+        self.assertIn("other warning", console)
+        self.assertIn("after the run", console)
+
+    def test_verbose_flag_leaves_process_level_alone(self):
+        """Models do not reconfigure logging for the whole process."""
+        params = economic_params.copy()
+        params.update(
+            {
+                "c_agents": 10,
+                "csf_agents": 2,
+                "cpf_agents": 1,
+                "steps": 5,
+                "verboseFlag": True,
+                "show_progress": False,
+            }
+        )
+        EconModel(params).run()
+        self.assertFalse(get_logger("model").isEnabledFor(logging.DEBUG))
+
+    def test_model_debug_records_reach_run_log(self):
+        """Agent diagnostics are logged instead of printed."""
+        params = economic_params.copy()
+        params.update(
+            {
+                "c_agents": 20,
+                "csf_agents": 2,
+                "cpf_agents": 2,
+                "steps": 40,
+                "verboseFlag": False,
+                "show_progress": False,
+                "climateModuleFlag": True,
+                "climateShockMode": "None",
+                "covid_settings": None,
+            }
+        )
+        path = os.path.join(self.tmp_dir.name, "run.log")
+        with run_log(path, level=logging.DEBUG):
+            EconModel(params).run()
+
+        with open(path) as f:
+            run_file = f.read()
+        self.assertIn("climapan_lab.firms", run_file)
+        self.assertIn("Initial GDP", run_file)
+        self.assertEqual(self.console.getvalue(), "")
+
+
+class TestPlotSeries(unittest.TestCase):
+    """Test the monthly series extraction shared by the summary plots."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        # Daily rows with a record every 30 days
+        n_rows = 200
+        monthly = [t % 30 == 0 for t in range(n_rows)]
+
+        def column(make):
+            return [make(t) if m else None for t, m in enumerate(monthly)]
+
+        self.frame = pd.DataFrame(
+            {
+                "GDP": column(lambda t: float(t)),
+                "CS Price": column(lambda t: np.array([t, 2.0 * t])),
+                "Consumption": column(lambda t: np.array([1.0, 2.0, 3.0])),
+                "Consumer Type": column(
+                    lambda t: np.array(["workers", "capitalists", "workers"])
+                ),
+                "Covid State": column(lambda t: [None, "mild", "mild"]),
+            }
+        )
+        self.results = type("Results", (), {})()
+        self.results.variables = type("Variables", (), {})()
+        self.results.variables.EconModel = self.frame
+
+    def test_series_match_row_lookups(self):
+        """Extracted arrays equal the per-row values from row 50 onwards."""
+        series = PlotSeries.of(self.results)
+        months = [60, 90, 120, 150, 180]
+
+        np.testing.assert_array_equal(series.values("GDP"), months)
+        self.assertEqual(list(series.index("GDP")), months)
+        self.assertEqual(series.values("CS Price").shape, (5, 2))
+        np.testing.assert_array_equal(
+            series.totals("CS Price"), [3.0 * t for t in months]
+        )
+        np.testing.assert_array_equal(
+            series.member("CS Price", 1), [2.0 * t for t in months]
+        )
+        self.assertEqual(series.width("CS Price"), 2)
+        np.testing.assert_array_equal(
+            series.group_totals("Consumption", "Consumer Type", "workers"), [4.0] * 5
+        )
+        np.testing.assert_array_equal(
+            series.state_counts("Covid State", "mild"), [2] * 5
+        )
+        np.testing.assert_array_equal(series.state_counts("Covid State", None), [1] * 5)
+        np.testing.assert_array_equal(
+            series.state_counts("Covid State", "dead"), [0] * 5
+        )
+        np.testing.assert_allclose(
+            series.growth("GDP"), [100 * 30 / t for t in months[:-1]]
+        )
+        self.assertEqual(len(series.values("GDP", stop=-50)), 3)
+
+    def test_burn_in_months_match_model_rows(self):
+        """The burn-in rows hold as many monthly records as burn_in_months says."""
+        params = economic_params.copy()
+        params.update(
+            {
+                "c_agents": 10,
+                "capitalists": 3,
+                "csf_agents": 2,
+                "cpf_agents": 1,
+                "steps": 100,
+                "verboseFlag": False,
+                "climateModuleFlag": False,
+                "start_date": "1980-01-15",
+            }
+        )
+        frame = EconModel(params).run()["model"].to_pandas()
+        dates = list(frame["date"][:BURN_IN_STEPS])
+        recorded = sum(isinstance(d, str) for d in dates)
+        self.assertEqual(recorded, 2)
+        self.assertEqual(burn_in_months("1980-01-15"), recorded)
+        self.assertEqual(burn_in_months("1980-01-01"), 1)
+
+    def test_extraction_is_shared(self):
+        """All plot functions of a run reuse one extraction."""
+        series = PlotSeries.of(self.results)
+        self.assertIs(PlotSeries.of(self.results), series)
+        self.assertIs(series.totals("CS Price"), series.totals("CS Price"))
+
+        # A new frame (e.g. another snapshot) gets a fresh extraction
+        self.results.variables.EconModel = self.frame.copy()
+        self.assertIsNot(PlotSeries.of(self.results), series)
+
+
+class TestMicroPanel(unittest.TestCase):
+    """Test recording per-consumer series for a random panel only."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        self.params = economic_params.copy()
+        self.params.update(
+            {
+                "c_agents": 40,
+                "capitalists": 4,
+                "csf_agents": 2,
+                "cpf_agents": 1,
+                "steps": 70,
+                "verboseFlag": False,
+                "climateModuleFlag": False,
+                "covid_settings": None,
+            }
+        )
+
+    def test_sample_panel(self):
+        """The draw is reproducible and capped per group."""
+        ids = np.arange(20)
+        groups = ["workers"] * 15 + ["capitalists"] * 3 + [None] * 2
+        panel = sample_panel(ids, groups, 4, seed=1)
+
+        np.testing.assert_array_equal(panel, sample_panel(ids, groups, 4, seed=1))
+        self.assertEqual(len(panel), 4 + 3 + 2)
+        self.assertEqual(int(np.sum(panel < 15)), 4)
+        self.assertTrue(np.all(np.diff(panel) > 0))
+
+    def test_panel_records_exact_totals(self):
+        """Micro lists shrink to the panel; totals and dynamics are unchanged."""
+        full = EconModel(self.params).run()["model"].to_pandas()
+        sub = EconModel(dict(self.params, panelSize=2)).run()["model"].to_pandas()
+        rows = np.flatnonzero(full["date"].notna().to_numpy())
+        self.assertGreater(len(rows), 1)
+
+        np.testing.assert_allclose(
+            sub["GDP"].to_numpy()[rows].astype(float),
+            full["GDP"].to_numpy()[rows].astype(float),
+        )
+        for row in rows:
+            panel = sub["Panel ID"][row]
+            self.assertLessEqual(len(sub["Wage"][row]), 2 * 5)
+            self.assertEqual(len(sub["Consumption"][row]), len(panel))
+            self.assertAlmostEqual(sub["Wage Total"][row], np.sum(full["Wage"][row]))
+            self.assertAlmostEqual(
+                sub["Consumption Total"][row], np.sum(full["Consumption"][row])
+            )
+            types = np.asarray(full["Consumer Type"][row])
+            workers = np.asarray(full["Consumption"][row])[types == "workers"]
+            self.assertAlmostEqual(sub["Consumption by Type"][row][3], np.sum(workers))
+
+        # The summary plots read the exact totals
+        series = PlotSeries(sub, start=0)
+        np.testing.assert_allclose(
+            series.totals("Wage"), [np.sum(full["Wage"][row]) for row in rows]
+        )
+        np.testing.assert_allclose(
+            series.group_totals("Consumption", "Consumer Type", "workers"),
+            [
+                np.sum(
+                    np.asarray(full["Consumption"][row])[
+                        np.asarray(full["Consumer Type"][row]) == "workers"
+                    ]
+                )
+                for row in rows
+            ],
+        )
+
+
+class TestDistributionSketch(unittest.TestCase):
+    """Test the mergeable distribution sketches of per-consumer series."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        rng = np.random.default_rng(0)
+        self.values = np.concatenate(
+            [rng.lognormal(7, 1, 3000), np.zeros(200), -rng.lognormal(2, 1, 30)]
+        )
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Quantiles are within the accuracy of the exact order statistics."""
+        sketch = DistributionSketch.of(self.values, accuracy=0.01)
+        q = np.array([0.0, 0.005, 0.1, 0.5, 0.9, 0.99, 1.0])
+        exact = np.quantile(self.values, q, method="lower")
+        np.testing.assert_allclose(sketch.quantile(q), exact, rtol=0.0101, atol=0)
+        self.assertAlmostEqual(sketch.mean, self.values.mean())
+        self.assertAlmostEqual(sketch.gini(), gini(self.values), places=2)
+        self.assertLess(sketch.size, 600)
+
+        counts, edges = sketch.histogram(5)
+        self.assertEqual(counts.sum(), len(self.values))
+        self.assertEqual(edges[0], self.values.min())
+        self.assertTrue(np.isnan(DistributionSketch().quantile(0.5)))
+
+    def test_merge_and_record_roundtrip(self):
+        """Merged parts equal the sketch of the whole, also after recording."""
+        whole = DistributionSketch.of(self.values)
+        parts = [DistributionSketch.of(part) for part in np.array_split(self.values, 3)]
+        merged = merge_sketches(parts)
+        restored = DistributionSketch.from_record(merged.to_record())
+
+        for sketch in (merged, restored):
+            self.assertEqual(sketch.count, whole.count)
+            self.assertEqual(sketch.positive, whole.positive)
+            self.assertEqual(sketch.negative, whole.negative)
+            self.assertEqual(sketch.zeros, whole.zeros)
+        with self.assertRaises(ValueError):
+            whole.merge(DistributionSketch(accuracy=0.05))
+
+    def test_model_records_sketches(self):
+        """Sketched series replace the lists and merge across seeds."""
+        params = economic_params.copy()
+        params.update(
+            {
+                "c_agents": 40,
+                "capitalists": 4,
+                "csf_agents": 2,
+                "cpf_agents": 1,
+                "steps": 70,
+                "verboseFlag": False,
+                "climateModuleFlag": False,
+                "covid_settings": None,
+            }
+        )
+        full = EconModel(params).run()["model"].to_pandas()
+        sketched = dict(params, distributionSketches=["Wage", "Consumption"])
+        frame = EconModel(sketched).run()["model"].to_pandas()
+
+        self.assertNotIn("Wage", frame.columns)
+        self.assertIn("Owners Income", frame.columns)
+        rows = np.flatnonzero(full["date"].notna().to_numpy())
+        sketches = sketch_series(frame, "Consumption")
+        self.assertEqual(len(sketches), len(rows))
+        for row, sketch in zip(rows, sketches):
+            consumption = np.asarray(full["Consumption"][row], dtype=float)
+            self.assertEqual(sketch.count, len(consumption))
+            self.assertAlmostEqual(sketch.sum, consumption.sum())
+            self.assertAlmostEqual(frame["Wage Total"][row], np.sum(full["Wage"][row]))
+
+        months = merge_runs([frame, frame], "Wage")
+        self.assertEqual(len(months), len(rows))
+        self.assertEqual(months[0].count, 2 * len(full["Wage"][rows[0]]))
+
+
 class TestErrorHandling(unittest.TestCase):
     """Test error handling and edge cases."""
 
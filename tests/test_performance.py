@@ -3,8 +3,10 @@
 Performance and scalability tests for CliMaPan-Lab.
 """
 
+import json
 import os
 import shutil
+import subprocess
 import sys
 import tempfile
 import time
@@ -14,7 +16,14 @@ import unittest
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 try:
+    from climapan_lab import benchmark
     from climapan_lab.base_params import economic_params
+    from climapan_lab.benchmark import (
+        append_history,
+        compare,
+        run_benchmarks,
+        scaling_exponent,
+    )
     from climapan_lab.model import EconModel
     from climapan_lab.run_sim import single_run
 
@@ -356,6 +365,115 @@ class TestScalability(unittest.TestCase):
                 self.assertIsNotNone(result, f"Configuration failed: {config}")
 
 
+class TestImportFootprint(unittest.TestCase):
+    """Test that the model imports without the plotting and statistics stack."""
+
+    HEAVY_MODULES = ("matplotlib", "plotly", "statsmodels", "h5py", "pandas")
+
+    def _loaded(self, code):
+        script = (
+            "import sys\n"
+            f"{code}\n"
+            f"print(','.join(m for m in {self.HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=os.path.join(os.path.dirname(__file__), ".."),
+            env=dict(os.environ, MPLBACKEND="Agg"),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        return set(filter(None, output.split(",")))
+
+    def test_model_import_is_lean(self):
+        """Importing the model loads none of the heavy modules."""
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+        self.assertEqual(
+            self._loaded("from climapan_lab.model import EconModel"), set()
+        )
+
+    def test_plotting_imports_on_first_use(self):
+        """``utils`` defers matplotlib until a plotting function needs it."""
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+        self.assertNotIn(
+            "matplotlib",
+            self._loaded("from climapan_lab.src.utils import gini, plotBankSummary"),
+        )
+        self.assertIn(
+            "matplotlib",
+            self._loaded("from climapan_lab.src import utils\nutils.plt.figure()"),
+        )
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    """Test the benchmark suite, its history and the regression check."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        self.test_dir = tempfile.mkdtemp()
+        self.base_params = economic_params.copy()
+        self.base_params.update(
+            {
+                "capitalists": 10,
+                "csf_agents": 2,
+                "cpf_agents": 2,
+                "green_energy_owners": 2,
+                "brown_energy_owners": 2,
+            }
+        )
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_scaling_exponent(self):
+        """The fitted exponent recovers a power law."""
+        sizes = [1000, 5000, 20000]
+        self.assertAlmostEqual(
+            scaling_exponent(sizes, [2e-6 * n**1.5 for n in sizes]), 1.5
+        )
+        self.assertIsNone(scaling_exponent([1000], [1.0]))
+
+    def test_history_and_regression_check(self):
+        """Sessions are stored with exponents; slow-downs are flagged."""
+        entry = run_benchmarks(
+            agents=[10, 30],
+            configs=["economy"],
+            micro_agents=[10, 30],
+            steps=35,
+            base=self.base_params,
+            verbose=False,
+        )
+        self.assertEqual(len(entry["macro"]), 2)
+        self.assertIsNotNone(entry["exponents"]["macro"]["economy"])
+        self.assertIn("_csf_transaction", entry["micro"][0]["phases"])
+        self.assertIn("bank_agents.sommaW", entry["micro"][0]["phases"])
+        self.assertIn("csfirm_agents.calculate_all_wages", entry["micro"][0]["phases"])
+
+        self.assertFalse(any(row["regression"] for row in compare(entry, entry)))
+        slower = json.loads(json.dumps(entry))
+        for case in slower["macro"]:
+            case["simulate"] *= 2
+        rows = compare(slower, entry, tolerance=0.2)
+        flagged = {row["case"] for row in rows if row["regression"]}
+        self.assertEqual(flagged, {"economy@10", "economy@30"})
+
+        history = os.path.join(self.test_dir, "history.json")
+        baseline = os.path.join(self.test_dir, "baseline.json")
+        self.assertEqual(append_history(entry, history), 0)
+        self.assertEqual(append_history(slower, history), 1)
+        paths = ["--history", history, "--baseline", baseline]
+        benchmark.main(paths + ["baseline", "--index", "0"])
+        benchmark.main(paths + ["compare", "--index", "0"])
+        with self.assertRaises(SystemExit):
+            benchmark.main(paths + ["compare"])
+
+
 @unittest.skipIf(
     not IMPORTS_AVAILABLE,
     f"Required imports not available: {IMPORT_ERROR if not IMPORTS_AVAILABLE else ''}",
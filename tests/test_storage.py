@@ -0,0 +1,798 @@
+#!/usr/bin/env python3
+"""
+Tests for the run output storage helpers of CliMaPan-Lab.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Add the climapan_lab package to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+try:
+    from climapan_lab import run_sim
+    from climapan_lab.analysis.inspect_results import inspect_results
+    from climapan_lab.base_params import economic_params
+    from climapan_lab.src.logs import run_log
+    from climapan_lab.src.models import EconModel
+    from climapan_lab.src.plot_series import PlotSeries
+    from climapan_lab.storage import (
+        AsyncWriter,
+        BatchResultStore,
+        DeltaPanel,
+        EvaluationStore,
+        FigureRenderer,
+        PanelSet,
+        RunCatalog,
+        append_jsonl,
+        load_batch_results,
+        load_jsonl,
+        load_model_artifact,
+        load_panels,
+        param_hash,
+        save_model_artifact,
+    )
+    from climapan_lab.storage.figures import (
+        DRAFT_DPI,
+        FIGURE_FILES,
+        MANIFEST_NAME,
+        figure_columns,
+        figure_names,
+    )
+
+    IMPORTS_AVAILABLE = True
+except ImportError as e:
+    IMPORTS_AVAILABLE = False
+    IMPORT_ERROR = str(e)
+
+
+class TestAsyncWriter(unittest.TestCase):
+    """Test the bounded background writer."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+    def test_jobs_run_in_order_and_flush(self):
+        """Jobs on a single thread run in submission order and flush waits for them."""
+        done = []
+        with AsyncWriter(max_queue=2) as writer:
+            for i in range(10):
+                writer.submit(done.append, i)
+            writer.flush()
+            self.assertEqual(done, list(range(10)))
+
+    def test_backpressure_blocks_submit(self):
+        """submit() blocks while the queue is full."""
+        release = threading.Event()
+        writer = AsyncWriter(max_queue=1)
+        writer.submit(release.wait)  # occupies the writer thread
+        writer.submit(lambda: None)  # fills the queue
+
+        blocked = threading.Thread(target=writer.submit, args=(lambda: None,))
+        blocked.start()
+        time.sleep(0.1)
+        self.assertTrue(blocked.is_alive())
+
+        release.set()
+        blocked.join(timeout=5)
+        self.assertFalse(blocked.is_alive())
+        writer.close()
+
+    def test_errors_surface_on_close(self):
+        """A failing job does not stop the writer and is re-raised on close."""
+        done = []
+        writer = AsyncWriter(max_queue=4)
+        with self.assertLogs("climapan_lab.storage", "ERROR") as logged:
+            writer.submit(lambda: 1 / 0)
+            writer.submit(done.append, "after")
+            with self.assertRaises(RuntimeError):
+                writer.close()
+        self.assertEqual(done, ["after"])
+        self.assertIn("ZeroDivisionError", logged.output[0])
+        with self.assertRaises(RuntimeError):
+            writer.submit(done.append, "closed")
+
+    def test_errors_reach_the_run_log_of_the_submitter(self):
+        """Failures are logged for the thread that queued the job."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "run.log")
+            writer = AsyncWriter(max_queue=2)
+            with run_log(path):
+                writer.submit(lambda: 1 / 0)
+                writer.flush()
+            writer.close(raise_errors=False)
+            with open(path) as f:
+                self.assertIn("ZeroDivisionError", f.read())
+
+
+class TestBackgroundRunOutputs(unittest.TestCase):
+    """Test that run outputs are written through the background writer."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        self.test_dir = tempfile.mkdtemp()
+        self.params = economic_params.copy()
+        self.params.update(
+            {
+                "c_agents": 10,
+                "capitalists": 3,
+                "csf_agents": 2,
+                "cpf_agents": 1,
+                "steps": 40,
+                "verboseFlag": False,
+                "climateModuleFlag": False,
+            }
+        )
+
+    def tearDown(self):
+        run_sim.writer = None
+        if run_sim.catalog is not None:
+            run_sim.catalog.close()
+            run_sim.catalog = None
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_single_run_writes_in_background(self):
+        """single_run queues its exports; closing the writer flushes them."""
+        run_sim.writer = AsyncWriter(max_queue=2)
+        cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        try:
+            run_sim.single_run(self.params, parent_folder="sweep")
+            run_sim.writer.close()
+        finally:
+            os.chdir(cwd)
+
+        (run_folder,) = os.listdir(os.path.join(self.test_dir, "sweep"))
+        self.assertTrue(
+            os.path.exists(
+                os.path.join(self.test_dir, "sweep", run_folder, "single_run.csv.gz")
+            )
+        )
+
+    def test_single_run_mode_passes_cli_options(self):
+        """run_sim without -n honours --logToRunFolder like the batch modes."""
+        argv = [
+            "run_sim",
+            "--logToRunFolder",
+            "--catalog",
+            "",
+            "--writerQueueSize",
+            "0",
+        ]
+        cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        try:
+            with mock.patch.dict(run_sim.parameters, self.params), mock.patch.object(
+                sys, "argv", argv
+            ):
+                run_sim.main()
+        finally:
+            os.chdir(cwd)
+
+        (run_folder,) = os.listdir(os.path.join(self.test_dir, "results"))
+        self.assertTrue(
+            os.path.exists(
+                os.path.join(self.test_dir, "results", run_folder, "run.log")
+            )
+        )
+
+    def test_sweep_keeps_runs_on_request(self):
+        """--keepRuns writes the runs of a parameter sweep like a batch."""
+        argv = ["run_sim", "--keepRuns", "--catalog", "", "--writerQueueSize", "0"]
+        cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        try:
+            params = dict(self.params, seed=[1, 2])
+            with mock.patch.dict(run_sim.parameters, params), mock.patch.object(
+                sys, "argv", argv
+            ):
+                run_sim.main()
+        finally:
+            os.chdir(cwd)
+
+        (sweep_folder,) = os.listdir(os.path.join(self.test_dir, "results"))
+        sweep_folder = os.path.join(self.test_dir, "results", sweep_folder)
+        self.assertTrue(
+            os.path.exists(os.path.join(sweep_folder, "ensemble_summary.csv.gz"))
+        )
+        runs = pd.read_csv(os.path.join(sweep_folder, "multi_runs.csv.gz"))
+        self.assertGreater(len(runs), 0)
+
+    def test_single_run_registers_in_catalog(self):
+        """single_run adds its folder, seed and headline stats to the catalog."""
+        run_sim.catalog = RunCatalog(os.path.join(self.test_dir, "catalog.db"))
+        cwd = os.getcwd()
+        os.chdir(self.test_dir)
+        try:
+            run_sim.single_run(self.params, parent_folder="sweep")
+        finally:
+            os.chdir(cwd)
+
+        (row,) = run_sim.catalog.query(driver="single_run")
+        self.assertTrue(row["output_path"].startswith(self.test_dir))
+        self.assertIsNotNone(row["mean_gdp"])
+        self.assertGreater(row["wall_time"], 0)
+
+
+class TestFigureRenderer(unittest.TestCase):
+    """Test the figure pipeline: pooled rendering and unchanged-figure skipping."""
+
+    @classmethod
+    def setUpClass(cls):
+        if not IMPORTS_AVAILABLE:
+            return
+        params = economic_params.copy()
+        params.update(
+            {
+                "c_agents": 10,
+                "csf_agents": 2,
+                "cpf_agents": 1,
+                "steps": 70,
+                "verboseFlag": False,
+                "show_progress": False,
+                "climateModuleFlag": True,
+                "climateShockMode": "None",
+                "covid_settings": None,
+            }
+        )
+        cls.params = params
+        cls.frame = EconModel(params).run()["model"].to_pandas()
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _render(self, frame, **kwargs):
+        with FigureRenderer(max_workers=0, **kwargs) as renderer:
+            skipped = renderer.submit(
+                frame, self.test_dir, ["plotClimateModuleEffects"]
+            )
+        return renderer.rendered, skipped
+
+    def test_figure_selection(self):
+        """Sector and COVID figures follow the run's flags."""
+        names = figure_names(
+            {
+                "energySectorFlag": False,
+                "climateModuleFlag": True,
+                "covid_settings": "BAU",
+            },
+            covid_plots=False,
+        )
+        self.assertIn("plotClimateModuleEffects", names)
+        self.assertNotIn("plotEnergyFirmsDemands", names)
+        self.assertNotIn("plotCovidStatistics", names)
+
+    def test_unchanged_figures_are_skipped(self):
+        """Re-plotting only redraws figures whose inputs or resolution changed."""
+        self.assertEqual(self._render(self.frame), (1, []))
+        self.assertTrue(
+            os.path.exists(os.path.join(self.test_dir, "ClimateModule.png"))
+        )
+        self.assertTrue(os.path.exists(os.path.join(self.test_dir, MANIFEST_NAME)))
+
+        self.assertEqual(self._render(self.frame), (0, ["plotClimateModuleEffects"]))
+        self.assertEqual(self._render(self.frame, force=True)[0], 1)
+        self.assertEqual(self._render(self.frame, dpi=30)[0], 1)
+
+        # A column the figure does not read leaves it current
+        other = self.frame.copy()
+        other["Gini"] = 0.0
+        self.assertEqual(self._render(other, dpi=30)[0], 0)
+
+        changed = self.frame.copy()
+        changed["Climate Temperature"] = [
+            None if v is None else v + 1 for v in changed["Climate Temperature"]
+        ]
+        self.assertEqual(self._render(changed, dpi=30)[0], 1)
+
+    def test_renders_every_figure_of_a_run(self):
+        """The utils.plot* figures draw from a model frame as recorded."""
+        names = figure_names(self.params)
+        self.assertIn("plotConsumersSummary", names)
+        with FigureRenderer(max_workers=0, dpi=DRAFT_DPI) as renderer:
+            renderer.submit(self.frame, self.test_dir, names)
+        self.assertEqual(renderer.errors, [])
+        self.assertEqual(renderer.rendered, len(names))
+        for name in names:
+            self.assertTrue(
+                os.path.exists(os.path.join(self.test_dir, FIGURE_FILES[name]))
+            )
+
+    def test_panel_runs_keep_population_totals(self):
+        """Figure inputs of a micro-panel run include the exact totals."""
+        frame = EconModel(dict(self.params, panelSize=1)).run()["model"].to_pandas()
+        columns = figure_columns("plotConsumersSummary", frame)
+        for name in ("Wage", "Owners Income", "UnemplDole"):
+            self.assertIn(f"{name} Total", columns)
+        self.assertIn(
+            "Consumption by Type",
+            figure_columns("plotConsumptionInflationSummary", frame),
+        )
+
+        inputs = PlotSeries(frame[columns])
+        np.testing.assert_allclose(
+            inputs.totals("Wage"), PlotSeries(frame).values("Wage Total")
+        )
+
+    def test_jobs_finishing_during_collection_are_kept(self):
+        """A job completing while finished jobs are collected is not dropped."""
+
+        class FinishesOnSecondCheck:
+            checks = 0
+
+            def done(self):
+                self.checks += 1
+                return self.checks > 1
+
+            def exception(self):
+                return None
+
+            def result(self):
+                return 0.0
+
+        renderer = FigureRenderer(max_workers=0)
+        renderer._futures.append(
+            (FinishesOnSecondCheck(), self.test_dir, "plotClimateModuleEffects", "x")
+        )
+        renderer._collect(block=False)
+        renderer.close()
+        self.assertEqual(renderer.rendered, 1)
+
+    def test_pool_renders_and_reports_failures(self):
+        """Pool workers write the figures; failed figures surface on close."""
+        renderer = FigureRenderer(max_workers=1)
+        renderer.submit(
+            self.frame,
+            self.test_dir,
+            ["plotClimateModuleEffects", "plotNotAFigure"],
+        )
+        with self.assertRaises(RuntimeError):
+            renderer.close()
+
+        self.assertEqual(renderer.rendered, 1)
+        self.assertEqual(len(renderer.errors), 1)
+
+        # run_sim reports failed figures without failing the run
+        run_sim.renderer = FigureRenderer(max_workers=0)
+        run_sim.renderer.submit(self.frame, self.test_dir, ["plotNotAFigure"])
+        run_sim._close_renderer()
+        self.assertIsNone(run_sim.renderer)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.test_dir, "ClimateModule.png"))
+        )
+
+
+class TestModelArtifact(unittest.TestCase):
+    """Test the compact end-of-run model artifact."""
+
+    @classmethod
+    def setUpClass(cls):
+        if not IMPORTS_AVAILABLE:
+            return
+        params = economic_params.copy()
+        params.update(
+            {
+                "c_agents": 10,
+                "capitalists": 3,
+                "csf_agents": 2,
+                "cpf_agents": 1,
+                "steps": 40,
+                "verboseFlag": False,
+                "climateModuleFlag": False,
+            }
+        )
+        cls.model = EconModel(params)
+        cls.model.run()
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "model_run_0.npz")
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_roundtrip(self):
+        """Agent groups, history columns and parameters survive a save/load."""
+        save_model_artifact(self.model, self.path, extra={"run": 0})
+        artifact = load_model_artifact(self.path)
+
+        self.assertEqual(artifact.params["c_agents"], 10)
+        self.assertEqual(artifact.manifest["extra"], {"run": 0})
+        self.assertEqual(
+            artifact.groups["consumers"]["size"], len(self.model.consumer_agents)
+        )
+
+        deposits = artifact.column("consumers", "deposit")
+        np.testing.assert_allclose(
+            deposits, [a.deposit for a in self.model.consumer_agents]
+        )
+
+        histories = artifact.column("consumers", "wealthList")
+        self.assertEqual(len(histories), len(self.model.consumer_agents))
+        np.testing.assert_allclose(
+            histories[0], self.model.consumer_agents[0].wealthList
+        )
+
+        frame = artifact.to_frame("cs_firms")
+        self.assertEqual(len(frame), len(self.model.csfirm_agents))
+
+    def test_rejects_foreign_npz(self):
+        """Loading an arbitrary .npz raises a clear error."""
+        np.savez(self.path, __manifest__=np.frombuffer(b'{"format": "x"}', np.uint8))
+        with self.assertRaises(ValueError):
+            load_model_artifact(self.path)
+
+    def test_inspect_results_reads_artifact(self):
+        """inspect_results summarises an artifact without the pickle path."""
+        save_model_artifact(self.model, self.path)
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            inspect_results(self.path)
+        self.assertIn("consumers: 10 agent(s)", out.getvalue())
+
+
+class TestBatchResultStore(unittest.TestCase):
+    """Test the append-only HDF5 store for sensitivity results."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "results.h5")
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def _fill(self, store, batches):
+        for batch_idx, alpha in batches:
+            outputs = [
+                {"GDP": np.arange(4) * alpha + seed, "Debt": [seed]} for seed in (1, 2)
+            ]
+            store.append_sample(batch_idx, [alpha, 10.0], [1, 2], outputs)
+
+    def test_append_and_query(self):
+        """Samples are queryable by parameter range and rows stay aligned."""
+        with BatchResultStore(self.path, ["alpha", "beta"], {"steps": 4}) as store:
+            self._fill(store, [(0, 0.1), (1, 0.5), (2, 0.9)])
+
+        with load_batch_results(self.path) as reader:
+            self.assertEqual(reader.base_params, {"steps": 4})
+            self.assertEqual(sorted(reader.variables), ["Debt", "GDP"])
+
+            selected = reader.query({"alpha": (0.4, 1.0)})
+            self.assertEqual(list(selected), [1, 2])
+
+            values, batch_idx, seeds = reader.outputs("GDP", selected)
+            self.assertEqual(values.shape, (4, 4))
+            self.assertEqual(list(batch_idx), [1, 1, 2, 2])
+            self.assertEqual(list(seeds), [1, 2, 1, 2])
+            np.testing.assert_allclose(values[1], np.arange(4) * 0.5 + 2)
+
+    def test_resume_and_ragged_outputs(self):
+        """Reopening appends; longer series NaN-pad earlier rows."""
+        with BatchResultStore(self.path, ["alpha", "beta"]) as store:
+            self._fill(store, [(0, 0.1)])
+        with BatchResultStore(self.path, ["alpha", "beta"]) as store:
+            store.append_sample(1, [0.2, 10.0], [3], [{"GDP": np.ones(6)}])
+
+        with load_batch_results(self.path) as reader:
+            values, _, seeds = reader.outputs("GDP")
+            self.assertEqual(values.shape, (3, 6))
+            self.assertTrue(np.isnan(values[0, 4:]).all())
+            debt, _, _ = reader.outputs("Debt")
+            self.assertTrue(np.isnan(debt[2]).all())
+            self.assertEqual(len(reader.params_frame()), 2)
+
+        with self.assertRaises(ValueError):
+            BatchResultStore(self.path, ["gamma"])
+
+
+class TestRunCatalog(unittest.TestCase):
+    """Test the SQLite run catalog."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        self.test_dir = tempfile.mkdtemp()
+        self.catalog = RunCatalog(os.path.join(self.test_dir, "catalog.db"))
+
+    def tearDown(self):
+        self.catalog.close()
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_register_and_query(self):
+        """Runs are selectable by scenario, parameter range and hash."""
+        for seed, alpha in [(1, 0.1), (2, 0.1), (3, 0.5)]:
+            self.catalog.register(
+                {
+                    "settings": "CT",
+                    "covid_settings": "BAU",
+                    "alpha": alpha,
+                    "seed": seed,
+                },
+                output_path=os.path.join(self.test_dir, f"run_{seed}"),
+                driver="multi_run",
+                variables={"GDP": [None, 1.0, 3.0], "Infection": [0, 5, 2]},
+            )
+
+        self.assertEqual(len(self.catalog.query(settings="CT")), 3)
+        self.assertEqual(self.catalog.query(settings="BAU"), [])
+
+        low = self.catalog.query(params={"alpha": (None, 0.2)})
+        self.assertEqual(sorted(row["seed"] for row in low), [1, 2])
+        # Replicates share a parameter hash, whatever their run options
+        self.assertEqual(low[0]["param_hash"], low[1]["param_hash"])
+        self.assertEqual(
+            param_hash({"alpha": 0.1, "seed": 1}),
+            param_hash({"alpha": 0.1, "seed": 2, "profile": True, "verboseFlag": 1}),
+        )
+        self.assertNotEqual(
+            param_hash({"alpha": 0.1, "steps": 10}),
+            param_hash({"alpha": 0.1, "steps": 20}),
+        )
+
+        (row,) = self.catalog.query(seed=3)
+        self.assertEqual(row["mean_gdp"], 2.0)
+        self.assertEqual(row["peak_infections"], 5.0)
+        self.assertIsNone(row["final_unemployment"])
+        self.assertEqual(row["params"]["alpha"], 0.5)
+
+    def test_parameter_names_are_not_sql(self):
+        """Quotes in a queried parameter name cannot change the query."""
+        self.catalog.register(
+            {"settings": "CT", "alpha": 0.1, "seed": 1},
+            output_path=os.path.join(self.test_dir, "run_1"),
+        )
+        for name in ["alpha') OR 1=1 --", "it's", 'a"b']:
+            self.assertEqual(self.catalog.query(params={name: 0.5}), [])
+            self.assertEqual(self.catalog.query(params={name: (None, 1.0)}), [])
+        self.assertEqual(len(self.catalog.query(params={"alpha": (0.0, 0.2)})), 1)
+
+    def test_scan_indexes_existing_folders_once(self):
+        """scan registers folders with params.txt and skips known ones."""
+        folder = os.path.join(self.test_dir, "results", "results_BAU_BAU_1")
+        os.makedirs(folder)
+        with open(os.path.join(folder, "params.txt"), "w") as f:
+            f.write('{"settings": "BAU", "covid_settings": "BAU"}')
+
+        self.assertEqual(self.catalog.scan(os.path.join(self.test_dir, "results")), 1)
+        self.assertEqual(self.catalog.scan(os.path.join(self.test_dir, "results")), 0)
+        self.assertEqual(self.catalog.paths(driver="scan"), [folder])
+
+
+def _put_evaluation(args):
+    """Worker for the concurrent-writer test (module level so it pickles)."""
+    store, i = args
+    store.put({"alpha": i / 10, "seed": 1, "steps": 365}, {"GDP": np.arange(12.0)})
+    return store.get({"alpha": i / 10, "seed": 1, "steps": 365}) is not None
+
+
+class TestEvaluationStore(unittest.TestCase):
+    """Test the shared evaluation store."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "evaluations.db")
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_roundtrip_and_merge(self):
+        """Series round-trip and later drivers add to the same evaluation."""
+        params = {"alpha": np.float32(0.1), "seed": 7, "steps": 730, "c_agents": 10}
+        with EvaluationStore(self.path) as store:
+            self.assertIsNone(store.get(params))
+            store.put(
+                params,
+                {"GDP": [1.0, 2.0, 3.0], "Loans": [[1.0, 2.0], [3.0], []]},
+                stats={"mean_gdp": 2.0},
+                driver="calibration",
+                wall_time=1.5,
+            )
+            # Same point: float32 noise, display flags and key order do not matter
+            same = {"c_agents": 10, "steps": 730, "seed": 7, "alpha": 0.1}
+            same["show_progress"] = False
+            found = store.get(same, variables=["GDP", "Loans"])
+            np.testing.assert_array_equal(found["series"]["GDP"], [1.0, 2.0, 3.0])
+            self.assertEqual([len(r) for r in found["series"]["Loans"]], [2, 1, 0])
+            self.assertEqual(found["stats"], {"mean_gdp": 2.0})
+            self.assertEqual(found["wall_time"], 1.5)
+
+            # Other seeds, horizons or missing variables are misses
+            self.assertIsNone(store.get(same, seed=8))
+            self.assertIsNone(store.get(same, horizon=365))
+            self.assertIsNone(store.get(same, variables=["GDP", "Wage"]))
+
+            store.put(same, {"Wage": None, "People": [5, 5, 4]}, stats={"n": 3})
+            found = store.get(same, variables=["GDP", "Wage", "People"])
+            self.assertEqual(sorted(found["series"]), ["GDP", "People"])
+            self.assertEqual(found["stats"], {"mean_gdp": 2.0, "n": 3})
+            self.assertEqual(len(store), 1)
+
+        # A different code version never sees these runs
+        with EvaluationStore(self.path, version="other") as store:
+            self.assertIsNone(store.get(same))
+
+    def test_concurrent_process_writers(self):
+        """Workers of a process pool can all write to one store."""
+        import multiprocessing
+
+        store = EvaluationStore(self.path)
+        with multiprocessing.Pool(4) as pool:
+            found = pool.map(_put_evaluation, [(store, i) for i in range(24)])
+        self.assertTrue(all(found))
+        self.assertEqual(len(store), 24)
+        store.close()
+
+
+class TestJsonLines(unittest.TestCase):
+    """Test the append-only JSON-lines logs shared by workers."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "runs.jsonl")
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_append_and_load(self):
+        """Records round-trip with their extra fields; partial lines are skipped."""
+        self.assertEqual(load_jsonl(self.path), [])
+        append_jsonl(self.path, {"status": "completed"}, batch_idx=0)
+        append_jsonl(self.path, {"status": "diverged", "batch_idx": 5}, batch_idx=1)
+        with open(self.path, "a") as f:
+            f.write('{"status": "comp')
+
+        self.assertEqual(
+            load_jsonl(self.path),
+            [
+                {"batch_idx": 0, "status": "completed"},
+                {"batch_idx": 5, "status": "diverged"},
+            ],
+        )
+
+
+class TestDeltaPanels(unittest.TestCase):
+    """Test the change-only encoding of per-agent panels."""
+
+    def setUp(self):
+        if not IMPORTS_AVAILABLE:
+            self.skipTest(f"Required imports not available: {IMPORT_ERROR}")
+
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_reconstructs_months_with_population_changes(self):
+        """Agents leaving and joining, strings and None decode exactly."""
+        months = [
+            ([0, 1, 2], ["workers", "capitalists", None]),
+            ([0, 1, 2], ["workers", "capitalists", None]),
+            ([0, 2], ["workers", "workers"]),
+            ([0, 2, 3], ["workers", "workers", "capitalists"]),
+        ]
+        panel = DeltaPanel(keyframe_interval=3)
+        for ids, values in months:
+            panel.append(ids, values)
+
+        for m, (ids, values) in enumerate(months):
+            got_ids, got_values = panel.month(m)
+            self.assertEqual(list(got_ids), ids)
+            self.assertEqual(list(got_values), values)
+        # Month 1 is unchanged, month 2 drops agent 1 and changes agent 2
+        self.assertEqual(panel.n_changes, 2)
+
+    def test_dense_changes_fall_back_to_keyframes(self):
+        """Months where every agent changes are stored as keyframes."""
+        panel = DeltaPanel(keyframe_interval=12)
+        for m in range(5):
+            panel.append([0, 1, 2, 3], [1800.0 + m] * 4)
+        self.assertEqual(panel.n_keyframes, 5)
+        self.assertEqual(panel.n_changes, 0)
+        np.testing.assert_allclose(panel.month(3)[1], [1803.0] * 4)
+        self.assertLess(panel.compression, 1.0)
+
+    def test_compression_is_measured_and_logged(self):
+        """Saving logs each panel's size against the full lists."""
+        panels = PanelSet(keyframe_interval=12)
+        for m in range(12):
+            panels.append(
+                "Employed", range(100), [m < 6 or i % 2 == 0 for i in range(100)]
+            )
+            panels.append("Wage", range(100), [1800.0 * 1.001**m] * 100)
+        self.assertEqual(panels["Employed"].n_values, 1200)
+        self.assertGreater(panels["Employed"].compression, 5.0)
+        self.assertLess(panels["Wage"].compression, 1.0)
+
+        path = os.path.join(self.test_dir, "panels.npz")
+        with self.assertLogs("climapan_lab.storage", "INFO") as logs:
+            panels.save(path)
+        self.assertEqual(len(logs.output), 2)
+        self.assertIn("Panel Employed:", logs.output[0])
+        loaded = load_panels(path)
+        self.assertAlmostEqual(
+            loaded["Employed"].compression, panels["Employed"].compression
+        )
+
+    def test_save_and_load(self):
+        """A saved PanelSet loads back with identical months."""
+        panels = PanelSet(keyframe_interval=2)
+        for m in range(5):
+            panels.append("Employed", [0, 1, 2], [True, m % 2 == 0, False])
+            panels.append("Wage", [0, 1, 2], [1800, 1800, 196.3 + (m > 2)])
+        path = os.path.join(self.test_dir, "panels.npz")
+        panels.save(path)
+
+        loaded = load_panels(path)
+        for name in ("Employed", "Wage"):
+            self.assertEqual(loaded[name].to_lists(), panels[name].to_lists())
+        self.assertIs(type(loaded["Employed"].month(1)[1][0]), np.bool_)
+
+    def test_model_panels_match_full_recording(self):
+        """deltaPanels reproduces the list columns recorded by update()."""
+        params = economic_params.copy()
+        params.update(
+            {
+                "c_agents": 10,
+                "capitalists": 3,
+                "csf_agents": 2,
+                "cpf_agents": 1,
+                "steps": 100,
+                "verboseFlag": False,
+                "climateModuleFlag": False,
+            }
+        )
+        full = EconModel(params).run()["model"].to_pandas()
+        model = EconModel(dict(params, deltaPanels=True))
+        frame = model.run()["model"].to_pandas()
+
+        self.assertNotIn("Wage", frame.columns)
+        expanded = run_sim._expand_panels(
+            frame, model.panels, params["unemploymentDole"]
+        )
+        for name in ("Wage", "Employed", "Consumer Type", "UnemplDole"):
+            expected = [list(v) for v in full[name] if v is not None]
+            actual = [list(v) for v in expanded[name] if v is not None]
+            self.assertEqual(actual, expected, name)
+
+
+if __name__ == "__main__":
+    unittest.main()